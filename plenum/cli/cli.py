@@ -9,7 +9,7 @@ from typing import Dict, Iterable
 from jsonpickle import json
 
 from ledger.compact_merkle_tree import CompactMerkleTree
-from ledger.ledger import Ledger
+from plenum.common.ledger import Ledger
 from ledger.stores.file_hash_store import FileHashStore
 from plenum import config
 from plenum.cli.command import helpCmd, statusNodeCmd, statusClientCmd, \
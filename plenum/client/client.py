@@ -22,6 +22,7 @@ from stp_core.types import HA
 from ledger.merkle_verifier import MerkleVerifier
 from ledger.serializers.compact_serializer import CompactSerializer
 from ledger.util import F, STH
+from plenum.client.expected_responses import ExpectedResponses
 from plenum.client.pool_manager import HasPoolManager
 from plenum.common.config_util import getConfig
 from plenum.common.exceptions import MissingNodeOp
@@ -166,11 +167,17 @@ class Client(Motor,
 
         # Tuple of identifier and reqId as key and value as tuple of set of
         # nodes which are expected to send REQACK
-        self.expectingAcksFor = {}
+        self.expectingAcksFor = ExpectedResponses(
+            lambda: self.config.CLIENT_REQACK_TIMEOUT)
 
         # Tuple of identifier and reqId as key and value as tuple of set of
         # nodes which are expected to send REPLY
-        self.expectingRepliesFor = {}
+        self.expectingRepliesFor = ExpectedResponses(
+            lambda: self.config.CLIENT_REPLY_TIMEOUT)
+
+        # Requests for which responses are expected, kept so that they can be
+        # resent without reading them from `reqRepStore`
+        self.expectedRequests = {}  # type: Dict[Tuple[str, int], Request]
 
         tp = loadPlugins(self.basedirpath)
         logger.debug("total plugins loaded in client: {}".format(tp))
@@ -337,6 +344,7 @@ class Client(Motor,
             if self.hashStore and not self.hashStore.closed:
                 self.hashStore.close()
         self.txnLog.close()
+        self.reqRepStore.close()
 
     def getReply(self, identifier: str, reqId: int) -> Optional[Reply]:
         """
@@ -479,6 +487,7 @@ class Client(Motor,
         now = time.perf_counter()
         self.expectingAcksFor[request.key] = (nodes, now, 0)
         self.expectingRepliesFor[request.key] = (copy.copy(nodes), now, 0)
+        self.expectedRequests[request.key] = request
         self.startRepeating(self.retryForExpected,
                             self.config.CLIENT_REQACK_TIMEOUT)
 
@@ -507,20 +516,25 @@ class Client(Motor,
                     coll[key][0].remove(frm)
                 if not coll[key][0]:
                     coll.pop(key)
+        self._forgetIfNotExpected(key)
 
         if not (self.expectingAcksFor or self.expectingRepliesFor):
             self.stopRetrying()
 
+    def _forgetIfNotExpected(self, key):
+        if key not in self.expectingAcksFor and \
+                key not in self.expectingRepliesFor:
+            self.expectedRequests.pop(key, None)
+
     def stopRetrying(self):
         self.stopRepeating(self.retryForExpected, strict=False)
 
-    def _filterExpected(self, now, queue, retryTimeout, maxRetry):
+    def _filterExpected(self, now, queue: ExpectedResponses, maxRetry):
         deadRequests = []
         aliveRequests = {}
         notAnsweredNodes = set()
-        for requestKey, (expectedFrom, lastTried, retries) in queue.items():
-            if now < lastTried + retryTimeout:
-                continue
+        for requestKey, (expectedFrom, lastTried, retries) in \
+                queue.expired(now):
             if retries >= maxRetry:
                 deadRequests.append(requestKey)
                 continue
@@ -536,13 +550,11 @@ class Client(Motor,
         requestsWithNoAck, aliveRequests, notAckedNodes = \
             self._filterExpected(now,
                                  self.expectingAcksFor,
-                                 self.config.CLIENT_REQACK_TIMEOUT,
                                  self.config.CLIENT_MAX_RETRY_ACK)
 
         requestsWithNoReply, aliveRequests, notRepliedNodes = \
             self._filterExpected(now,
                                  self.expectingRepliesFor,
-                                 self.config.CLIENT_REPLY_TIMEOUT,
                                  self.config.CLIENT_MAX_RETRY_REPLY)
 
         for requestKey in requestsWithNoAck:
@@ -555,6 +567,9 @@ class Client(Motor,
                          .format(self, requestKey))
             self.expectingRepliesFor.pop(requestKey)
 
+        for requestKey in requestsWithNoAck + requestsWithNoReply:
+            self._forgetIfNotExpected(requestKey)
+
         if notAckedNodes:
             logger.debug('{} going to retry for {}'
                          .format(self, self.expectingAcksFor.keys()))
@@ -587,14 +602,27 @@ class Client(Motor,
             self._schedule(partial(self.resendRequests, aliveRequests), delay)
 
     def resendRequests(self, keys):
+        # Each request is sent once to all the nodes it is resent to, so
+        # that it is serialized once and not once for every node
+        ridsByName = {r.name: rid for rid, r in self.nodestack.remotes.items()}
+        now = time.perf_counter()
         for key, nodes in keys.items():
             if not nodes:
                 continue
-            request = self.reqRepStore.getRequest(*key)
+            request = self.expectedRequests.get(key) or \
+                self.reqRepStore.getRequest(*key)
             logger.debug('{} resending request {} to {}'.
                          format(self, request, nodes))
-            self.sendToNodes(request, nodes)
-            now = time.perf_counter()
+            rids = []
+            for nm in nodes:
+                rid = ridsByName.get(nm)
+                if rid is None:
+                    logger.debug('{} could not find remote {} to resend '
+                                 'request {}'.format(self, nm, key))
+                else:
+                    rids.append(rid)
+            if rids:
+                self.send(request, *rids)
             for queue in [self.expectingAcksFor, self.expectingRepliesFor]:
                 if key in queue:
                     _, _, retries = queue[key]
@@ -0,0 +1,47 @@
+import heapq
+from typing import Callable, Iterator, Tuple
+
+
+class ExpectedResponses(dict):
+    """
+    Map of request key to a tuple of (set of nodes expected to respond, time
+    the request was last sent, number of retries). Alongside the map, a heap
+    of retry deadlines is kept so that the expectations whose retry timeout
+    has passed can be found without going over all of them.
+
+    Entries of the heap are not removed when an expectation is removed or
+    updated, they are skipped when they reach the top of the heap.
+    """
+
+    def __init__(self, retryTimeout: Callable[[], float]):
+        """
+        :param retryTimeout: returns the time after which a request is
+        retried, called whenever an expectation is set
+        """
+        super().__init__()
+        self.retryTimeout = retryTimeout
+        self._deadlines = []
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        _, lastTried, _ = value
+        heapq.heappush(self._deadlines,
+                       (lastTried + self.retryTimeout(), lastTried, key))
+
+    def expired(self, now) -> Iterator[Tuple]:
+        """
+        Yield (key, expectation) of expectations whose retry deadline is not
+        after `now`. Each expectation is yielded only once for every time it
+        is set.
+        """
+        while self._deadlines and self._deadlines[0][0] <= now:
+            _, lastTried, key = heapq.heappop(self._deadlines)
+            expectation = self.get(key)
+            if expectation is None or expectation[1] != lastTried:
+                # Stale deadline, the expectation was removed or set again
+                continue
+            yield key, expectation
+
+    def clear(self):
+        super().clear()
+        self._deadlines = []
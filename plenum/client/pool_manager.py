@@ -23,7 +23,7 @@ class HasPoolManager(TxnStackManager):
         self._ledgerLocation = None
         TxnStackManager.__init__(self, self.name, self.basedirpath,
                                  isNode=False)
-        _, cliNodeReg, nodeKeys = self.parseLedgerForHaAndKeys(self.ledger)
+        _, cliNodeReg, nodeKeys = self.poolMembership.haAndKeys()
         self.nodeReg = cliNodeReg
         self.addRemoteKeysFromLedger(nodeKeys)
         # Temporary place for keeping node transactions while this client is
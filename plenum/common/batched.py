@@ -1,8 +1,11 @@
 from collections import deque
-from typing import Any, Iterable
+from typing import Any, Iterable, List, Union
 from typing import Dict
 
-from plenum.common.constants import BATCH
+from plenum.common.config_util import getConfig
+from plenum.common.constants import BATCH, CODECS
+from plenum.common.message_codecs import MessageCodec, JSON_CODEC, \
+    availableCodecs, codecForPayload
 from stp_core.crypto.signer import Signer
 from stp_core.common.log import getlogger
 from plenum.common.types import Batch, OP_FIELD_NAME, f
@@ -10,6 +13,62 @@ from plenum.common.message_processor import MessageProcessor
 
 logger = getlogger()
 
+# Formats of batches sent to other nodes. A JSON batch is a `Batch` message
+# with the serialized messages in a list, a framed batch is a header followed
+# by each serialized message prefixed with its length, like `12:{"op": ...}`
+JSON_BATCH_FORMAT = 1
+FRAMED_BATCH_FORMAT = 2
+
+FRAMED_BATCH_MARKER = b'#B'
+FRAMED_BATCH_HEADER = FRAMED_BATCH_MARKER + \
+    str(FRAMED_BATCH_FORMAT).encode() + b'#'
+
+
+def frameBatch(msgs: Iterable[Union[bytes, str]]) -> bytes:
+    """
+    Build a framed batch from serialized messages
+    """
+    parts = [FRAMED_BATCH_HEADER]
+    for msg in msgs:
+        if isinstance(msg, str):
+            msg = msg.encode()
+        parts.append(str(len(msg)).encode())
+        parts.append(b':')
+        parts.append(msg)
+    return b''.join(parts)
+
+
+def isFramedBatch(data: Union[bytes, str]) -> bool:
+    marker = FRAMED_BATCH_MARKER if isinstance(data, (bytes, memoryview)) \
+        else FRAMED_BATCH_MARKER.decode()
+    return data[:len(marker)] == marker
+
+
+def unframeBatch(data: Union[bytes, str]) -> List[memoryview]:
+    """
+    Return the serialized messages of a framed batch. The messages are views
+    over `data`, nothing is copied.
+
+    :raises ValueError: if the batch is of an unknown version or malformed
+    """
+    if isinstance(data, str):
+        data = data.encode()
+    if not data.startswith(FRAMED_BATCH_HEADER):
+        raise ValueError("unknown batch format {}".
+                         format(data[:len(FRAMED_BATCH_HEADER)]))
+    view = memoryview(data)
+    msgs = []
+    pos = len(FRAMED_BATCH_HEADER)
+    while pos < len(data):
+        sep = data.index(b':', pos)
+        end = sep + 1 + int(data[pos:sep])
+        if end > len(data):
+            raise ValueError("batch truncated at {} of {} bytes".
+                             format(len(data), end))
+        msgs.append(view[sep + 1:end])
+        pos = end
+    return msgs
+
 
 class Batched(MessageProcessor):
     """
@@ -22,6 +81,17 @@ class Batched(MessageProcessor):
         :param self: 'NodeStacked'
         """
         self.outBoxes = {}  # type: Dict[int, deque]
+        config = getConfig()
+        self.batchFormat = config.NodeBatchFormat
+        self.maxBatchSize = config.NodeBatchMaxSize
+        # Codecs this stack can encode messages with, in order of preference
+        self.codecs = [availableCodecs[name] for name in config.NodeCodecs
+                       if name in availableCodecs]
+        if JSON_CODEC not in self.codecs:
+            self.codecs.append(JSON_CODEC)
+        # Codec negotiated with each remote, by remote name. Remotes not
+        # here are sent JSON
+        self.peerCodecs = {}  # type: Dict[str, MessageCodec]
 
     def _enqueue(self, msg: Any, rid: int, signer: Signer) -> None:
         """
@@ -55,13 +125,63 @@ class Batched(MessageProcessor):
         # Signing (if required) and serializing before enqueueing otherwise
         # each call to `_enqueue` will have to sign it and `transmit` will try
         # to serialize it which is waste of resources
-        serializedPayload = self.signAndSerialize(msg, signer)
+        if not self.peerCodecs:
+            serializedPayload = self.signAndSerialize(msg, signer)
+            if rids:
+                for r in rids:
+                    self._enqueue(serializedPayload, r, signer)
+            else:
+                self._enqueueIntoAllRemotes(serializedPayload, signer)
+            return
+
+        # Serializing once for every codec used by the remotes
+        payloads = {}
+        for r in rids or list(self.remotes.keys()):
+            codec = self._codecFor(r)
+            if codec.name not in payloads:
+                payloads[codec.name] = self.signAndSerialize(msg, signer,
+                                                             codec)
+            self._enqueue(payloads[codec.name], r, signer)
 
-        if rids:
-            for r in rids:
-                self._enqueue(serializedPayload, r, signer)
+    def advertiseCodecs(self, remoteName: str):
+        """
+        Tell the remote which codecs this stack supports. It is told even
+        when only JSON is supported, so that it does not keep using a codec
+        negotiated before
+        """
+        msg = {
+            OP_FIELD_NAME: CODECS,
+            f.CODECS.nm: [codec.name for codec in self.codecs]
+        }
+        rid = self.getRemote(remoteName).uid
+        self.transmit(self.serializeMsg(msg), rid, serialized=True)
+
+    def forgetCodecs(self, remoteName: str):
+        """
+        Go back to sending JSON to the remote till it advertises its codecs
+        again, it might have been restarted with different ones
+        """
+        self.peerCodecs.pop(remoteName, None)
+
+    def _onCodecsAdvertised(self, msg, frm):
+        supported = msg.get(f.CODECS.nm)
+        if not isinstance(supported, list):
+            logger.warning("{} got invalid codecs {} from {}".
+                           format(self, supported, frm))
+            return
+        codec = next((c for c in self.codecs if c.name in supported),
+                     JSON_CODEC)
+        logger.debug("{} using codec {} for {}".format(self, codec.name, frm))
+        if codec == JSON_CODEC:
+            self.peerCodecs.pop(frm, None)
         else:
-            self._enqueueIntoAllRemotes(serializedPayload, signer)
+            self.peerCodecs[frm] = codec
+
+    def _codecFor(self, rid) -> MessageCodec:
+        remote = self.remotes.get(rid)
+        if remote is None:
+            return JSON_CODEC
+        return self.peerCodecs.get(remote.name, JSON_CODEC)
 
     def flushOutBoxes(self) -> None:
         """
@@ -74,9 +194,10 @@ class Batched(MessageProcessor):
             except KeyError:
                 removedRemotes.append(rid)
                 continue
-            if msgs:
-                if len(msgs) == 1:
-                    msg = msgs.popleft()
+            while msgs:
+                batch = self._takeBatch(msgs)
+                if len(batch) == 1:
+                    msg = batch[0]
                     # Setting timeout to never expire
                     self.transmit(msg, rid, timeout=self.messageTimeout,
                                   serialized=True)
@@ -85,13 +206,9 @@ class Batched(MessageProcessor):
                 else:
                     logger.debug(
                         "{} batching {} msgs to {} into one transmission".
-                        format(self, len(msgs), dest))
-                    logger.trace("    messages: {}".format(msgs))
-                    batch = Batch(list(msgs), None)
-                    msgs.clear()
-                    # don't need to sign the batch, when the composed msgs are
-                    # signed
-                    payload = self.signAndSerialize(batch)
+                        format(self, len(batch), dest))
+                    logger.trace("    messages: {}".format(batch))
+                    payload = self._packBatch(batch)
                     logger.trace("{} sending payload to {}: {}".format(self,
                                                                        dest,
                                                                        payload))
@@ -107,13 +224,52 @@ class Batched(MessageProcessor):
                              logMethod=logger.debug)
             del self.outBoxes[rid]
 
+    def _takeBatch(self, msgs: deque) -> List:
+        """
+        Remove from the front of `msgs` the messages to send in one batch,
+        as many as fit in `maxBatchSize` bytes but at least one
+        """
+        batch = [msgs.popleft()]
+        size = len(batch[0])
+        while msgs and size + len(msgs[0]) <= self.maxBatchSize:
+            size += len(msgs[0])
+            batch.append(msgs.popleft())
+        return batch
+
+    def _packBatch(self, msgs: List):
+        if self.batchFormat == FRAMED_BATCH_FORMAT:
+            return frameBatch(msgs)
+        # don't need to sign the batch, when the composed msgs are
+        # signed
+        msgs = [m.decode() if isinstance(m, bytes) else m for m in msgs]
+        return self.signAndSerialize(Batch(msgs, None))
+
+    def deserializeMsg(self, msg):
+        # Framed batches are understood whatever the format used for sending
+        # so that nodes can be upgraded one at a time
+        if isFramedBatch(msg):
+            return {
+                OP_FIELD_NAME: BATCH,
+                f.MSGS.nm: unframeBatch(msg),
+                f.SIG.nm: None
+            }
+        codec = codecForPayload(msg)
+        if codec is not None:
+            return codec.decode(msg)
+        if isinstance(msg, memoryview):
+            msg = msg.tobytes()
+        return super().deserializeMsg(msg)
+
     def doProcessReceived(self, msg, frm, ident):
+        if OP_FIELD_NAME in msg and msg[OP_FIELD_NAME] == CODECS:
+            self._onCodecsAdvertised(msg, frm)
+            return None
         if OP_FIELD_NAME in msg and msg[OP_FIELD_NAME] == BATCH:
             if f.MSGS.nm in msg and isinstance(msg[f.MSGS.nm], list):
                 # Removing ping and pong messages from Batch
                 relevantMsgs = []
                 for m in msg[f.MSGS.nm]:
-                    r = self.handlePingPong(m, frm, ident)
+                    r = self.handlePingPong(self._asHealthMsg(m), frm, ident)
                     if not r:
                         relevantMsgs.append(m)
 
@@ -122,6 +278,20 @@ class Batched(MessageProcessor):
                 msg[f.MSGS.nm] = relevantMsgs
         return msg
 
-    def signAndSerialize(self, msg, signer=None):
+    def _asHealthMsg(self, msg):
+        """
+        The messages of framed batches are views over the batch while pings
+        and pongs are compared as text, so the views short enough to be one
+        are decoded. Others are left as they are, not to copy them
+        """
+        if isinstance(msg, memoryview) and \
+                len(msg) <= max(len(self.pingMessage), len(self.pongMessage)):
+            return msg.tobytes().decode(errors='replace')
+        return msg
+
+    def signAndSerialize(self, msg, signer=None,
+                         codec: MessageCodec = None):
         payload = self.prepForSending(msg, signer)
-        return self.serializeMsg(payload)
+        if codec is None or codec == JSON_CODEC:
+            return self.serializeMsg(payload)
+        return codec.encode(payload)
@@ -10,6 +10,8 @@ PRIMARY = "PRIMARY"
 PRIMDEC = "PRIMARYDECIDED"
 
 BATCH = "BATCH"
+# Sent by a node stack to tell another one which codecs it supports
+CODECS = "CODECS"
 
 REQACK = "REQACK"
 REQNACK = "REQNACK"
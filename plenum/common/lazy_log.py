@@ -0,0 +1,127 @@
+"""
+Logging facade for the modules on the consensus hot path.
+
+Messages are given as a format string and its arguments, like
+`logger.debug("{} sending {}", self, msg)`, instead of being formatted by the
+caller. Nothing is formatted, not even `__repr__` of the arguments, unless
+the level is enabled, and debug and trace messages are only formatted once a
+handler emits the record.
+"""
+import inspect
+import logging
+import sys
+
+from stp_core.common.log import getlogger as getStpLogger, TRACE_LOG_LEVEL
+
+# Level of `Logger.display` added by stp_core
+DISPLAY_LOG_LEVEL = 25
+
+
+class LazyMessage:
+    """
+    Log message formatted the first time it is converted to a string
+    """
+    __slots__ = ('fmt', 'args', '_formatted')
+
+    def __init__(self, fmt: str, args: tuple):
+        self.fmt = fmt
+        self.args = args
+        self._formatted = None
+
+    def __str__(self):
+        if self._formatted is None:
+            self._formatted = self.fmt.format(*self.args) if self.args \
+                else str(self.fmt)
+        return self._formatted
+
+
+class LazyLogger:
+    """
+    Wraps a `logging.Logger`. Methods not defined here are looked up on the
+    wrapped logger.
+    """
+
+    def __init__(self, logger: logging.Logger):
+        self.logger = logger
+        # Number of calls of `debugSampled` made for each format string
+        self._sampleCounts = {}
+
+    def trace(self, msg, *args, **kwargs):
+        if self.logger.isEnabledFor(TRACE_LOG_LEVEL):
+            self._log(TRACE_LOG_LEVEL, msg, args, kwargs)
+
+    def debug(self, msg, *args, **kwargs):
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self._log(logging.DEBUG, msg, args, kwargs)
+
+    def debugSampled(self, every: int, msg, *args, **kwargs):
+        """
+        Log only the first of every `every` calls made with the format
+        string `msg`, for events too frequent to log each of them
+        """
+        if not self.logger.isEnabledFor(logging.DEBUG):
+            return
+        count = self._sampleCounts.get(msg, 0)
+        self._sampleCounts[msg] = count + 1
+        if every <= 1 or count % every == 0:
+            self._log(logging.DEBUG, msg, args, kwargs)
+
+    def info(self, msg, *args, **kwargs):
+        if self.logger.isEnabledFor(logging.INFO):
+            self._log(logging.INFO, msg, args, kwargs)
+
+    def display(self, msg, *args, **kwargs):
+        if self.logger.isEnabledFor(DISPLAY_LOG_LEVEL):
+            self._log(DISPLAY_LOG_LEVEL, msg, args, kwargs)
+
+    def warning(self, msg, *args, **kwargs):
+        if self.logger.isEnabledFor(logging.WARNING):
+            self._log(logging.WARNING, msg, args, kwargs)
+
+    warn = warning
+
+    def error(self, msg, *args, **kwargs):
+        if self.logger.isEnabledFor(logging.ERROR):
+            self._log(logging.ERROR, msg, args, kwargs)
+
+    def exception(self, msg, *args, exc_info=True, **kwargs):
+        if self.logger.isEnabledFor(logging.ERROR):
+            kwargs['exc_info'] = exc_info
+            self._log(logging.ERROR, msg, args, kwargs)
+
+    def critical(self, msg, *args, **kwargs):
+        if self.logger.isEnabledFor(logging.CRITICAL):
+            self._log(logging.CRITICAL, msg, args, kwargs)
+
+    def log(self, level, msg, *args, **kwargs):
+        if self.logger.isEnabledFor(level):
+            self._log(level, msg, args, kwargs)
+
+    def __getattr__(self, item):
+        return getattr(self.logger, item)
+
+    def _log(self, level, msg, args, kwargs):
+        extra = kwargs.get('extra')
+        if level < logging.INFO and extra is None:
+            msg = LazyMessage(msg, args)
+        elif args:
+            # Records with extra data or of INFO and above can be handed to
+            # the CLI, which expects the message to be a string
+            msg = msg.format(*args)
+        exc_info = kwargs.get('exc_info')
+        if exc_info and not isinstance(exc_info, tuple):
+            exc_info = sys.exc_info()
+        # Report the caller of the logging method rather than this module
+        frame = sys._getframe(2)
+        record = self.logger.makeRecord(self.logger.name, level,
+                                        frame.f_code.co_filename,
+                                        frame.f_lineno, msg, (), exc_info,
+                                        frame.f_code.co_name, extra)
+        self.logger.handle(record)
+
+
+def getlogger(name: str = None) -> LazyLogger:
+    if not name:
+        caller = inspect.currentframe().f_back
+        name = inspect.getmodule(caller).__name__
+    return LazyLogger(getStpLogger(name))
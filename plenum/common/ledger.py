@@ -1,3 +1,5 @@
+import os
+from contextlib import contextmanager
 from copy import copy
 from typing import List, Tuple
 
@@ -9,6 +11,14 @@ from ledger.stores.file_store import FileStore
 from ledger.ledger import Ledger as _Ledger
 
 
+def ensureDurabilityOnWrite(config) -> bool:
+    """
+    Whether the ledgers fsync their files on every write. With group commit
+    the node syncs them once for many batches instead.
+    """
+    return config.EnsureLedgerDurability and not config.LedgerGroupCommit
+
+
 class Ledger(_Ledger):
     @staticmethod
     def _defaultStore(dataDir,
@@ -29,6 +39,10 @@ class Ledger(_Ledger):
         self.uncommittedTxns = []
         self.uncommittedRootHash = None
         self.uncommittedTree = None
+        # Size of the ledger and chunk of the transaction log when they were
+        # last synced to disk with `sync`
+        self._syncedSize = self.size
+        self._syncedChunk = getattr(self._transactionLog, 'currentChunk', None)
 
     @property
     def uncommitted_size(self) -> int:
@@ -73,6 +87,117 @@ class Ledger(_Ledger):
         for txn in txns:
             self.append(txn)
 
+    def addTxns(self, txns: List) -> Tuple[Tuple[int, int], List]:
+        """
+        Add already verified (committed) txns to the ledger in bulk, the
+        transaction log is synced to disk once for the whole range instead of
+        once per txn.
+        :param txns:
+        :return: a tuple of 2 seqNos indicating the start and end of sequence
+        numbers of the added txns and the added txns
+        """
+        start = self.seqNo + 1
+        with self.deferredDurability():
+            for txn in txns:
+                self.add(txn)
+        return (start, self.seqNo), txns
+
+    @contextmanager
+    def deferredDurability(self):
+        """
+        Disable fsync of the transaction log on every write for the duration
+        of the context and do a single flush and fsync when it exits
+        """
+        store = self._transactionLog
+        durable = getattr(store, 'ensureDurability', False)
+        if not durable:
+            yield
+            return
+        self._setStoreDurability(False)
+        try:
+            yield
+        finally:
+            self._setStoreDurability(True)
+            self._syncTransactionLog()
+
+    def _setStoreDurability(self, ensureDurability: bool):
+        store = self._transactionLog
+        store.ensureDurability = ensureDurability
+        # A chunked store keeps the flag on its currently open chunk too
+        chunk = getattr(store, 'currentChunk', None)
+        if chunk is not None:
+            chunk.ensureDurability = ensureDurability
+
+    def _syncTransactionLog(self):
+        self._syncStore(self._transactionLog)
+
+    def sync(self) -> bool:
+        """
+        Flush and fsync the transaction log and the hash store of the merkle
+        tree. Once it returns, every txn committed till now and the hashes of
+        the tree for them are on disk and survive a crash of the process or
+        of the host, so a group commit can acknowledge them. Uncommitted txns
+        are not written to the log so they are never durable. Does nothing if
+        no txn was committed since the last sync.
+        :return: whether anything was synced
+        """
+        if self.size == self._syncedSize:
+            return False
+        # A chunk the transaction log has moved past since the last sync got
+        # closed without an fsync
+        chunk = getattr(self._transactionLog, 'currentChunk', None)
+        if self._syncedChunk is not None and self._syncedChunk is not chunk:
+            self._syncPath(getattr(self._syncedChunk, 'dbPath', None))
+        self._syncTransactionLog()
+        self._syncHashStore(getattr(self.tree, 'hashStore', None))
+        self._syncedSize = self.size
+        self._syncedChunk = chunk
+        return True
+
+    @classmethod
+    def _syncHashStore(cls, hashStore):
+        # Hash stores make their hashes durable with their `sync`, like
+        # `LevelDbHashStore`. The file and memory ones of the ledger package
+        # have no such hook, the files of the first are synced here and the
+        # second keeps nothing on disk
+        if hasattr(hashStore, 'sync'):
+            hashStore.sync()
+            return
+        for name in ('nodesFile', 'leavesFile'):
+            cls._syncStore(getattr(hashStore, name, None))
+
+    @staticmethod
+    def _syncStore(store):
+        store = getattr(store, 'currentChunk', None) or store
+        # A store keeps its file as `dbFile`, a hash store may keep files
+        dbFile = getattr(store, 'dbFile', store)
+        if hasattr(dbFile, 'fileno') and not dbFile.closed:
+            dbFile.flush()
+            os.fsync(dbFile.fileno())
+
+    @staticmethod
+    def _syncPath(path):
+        if path is None or not os.path.exists(path):
+            return
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def iterTxns(self, frm: int = None, to: int = None, batchSize=1000):
+        """
+        Iterate over (seqNo, txn) of the committed txns from `frm` till `to`
+        (both inclusive), reading at most `batchSize` txns from the
+        transaction log at a time rather than loading all of them.
+        """
+        frm = frm or 1
+        to = self.size if to is None else min(to, self.size)
+        while frm <= to:
+            end = min(frm + batchSize - 1, to)
+            yield from self.getAllTxn(frm, end).items()
+            frm = end + 1
+
     def discardTxns(self, count: int):
         """
         The number of txns in `uncommittedTxns` which have to be
@@ -14,7 +14,8 @@ class LedgerInfo:
                  preCatchupCompleteClbk,
                  postCatchupCompleteClbk,
                  postTxnAddedToLedgerClbk,
-                 verifier):
+                 verifier,
+                 postTxnsAddedToLedgerClbk=None):
 
         self.ledger = ledger
 
@@ -25,6 +26,9 @@ class LedgerInfo:
         self.preCatchupCompleteClbk = preCatchupCompleteClbk
         self.postCatchupCompleteClbk = postCatchupCompleteClbk
         self.postTxnAddedToLedgerClbk = postTxnAddedToLedgerClbk
+        # Optional callback which is given a list of txns added to the ledger
+        # during catchup, used instead of `postTxnAddedToLedgerClbk` if set
+        self.postTxnsAddedToLedgerClbk = postTxnsAddedToLedgerClbk
         self.verifier = verifier
 
         # Ledger statuses received while the ledger was not ready to be synced
@@ -60,7 +60,8 @@ class LedgerManager(HasActionQueue):
                   postCatchupStartClbk: Callable=None,
                   preCatchupCompleteClbk: Callable=None,
                   postCatchupCompleteClbk: Callable=None,
-                  postTxnAddedToLedgerClbk: Callable=None):
+                  postTxnAddedToLedgerClbk: Callable=None,
+                  postTxnsAddedToLedgerClbk: Callable=None):
 
         if iD in self.ledgerRegistry:
             logger.error("{} already present in ledgers "
@@ -76,7 +77,8 @@ class LedgerManager(HasActionQueue):
             preCatchupCompleteClbk=preCatchupCompleteClbk,
             postCatchupCompleteClbk=postCatchupCompleteClbk,
             postTxnAddedToLedgerClbk=postTxnAddedToLedgerClbk,
-            verifier=MerkleVerifier(ledger.hasher)
+            verifier=MerkleVerifier(ledger.hasher),
+            postTxnsAddedToLedgerClbk=postTxnsAddedToLedgerClbk
         )
 
     def checkIfCPsNeeded(self, ledgerId):
@@ -466,11 +468,9 @@ class LedgerManager(HasActionQueue):
                 result, nodeName, toBeProcessed = self.hasValidCatchupReplies(
                     ledgerId, ledger, seqNo, catchUpReplies)
                 if result:
-                    ledgerInfo = self.getLedgerInfoByType(ledgerId)
-                    for _, txn in catchUpReplies[:toBeProcessed]:
-                        merkleInfo = ledger.add(self._transform(txn))
-                        txn[F.seqNo.name] = merkleInfo[F.seqNo.name]
-                        ledgerInfo.postTxnAddedToLedgerClbk(ledgerId, txn)
+                    self._addVerifiedTxns(ledgerId, ledger,
+                                          [txn for _, txn in
+                                           catchUpReplies[:toBeProcessed]])
                     self._removePrcdCatchupReply(ledgerId, nodeName, seqNo)
                     return numProcessed + toBeProcessed + \
                         self._processCatchupReplies(ledgerId, ledger,
@@ -489,6 +489,36 @@ class LedgerManager(HasActionQueue):
                         return numProcessed + toBeProcessed
         return numProcessed
 
+    def _addVerifiedTxns(self, ledgerId, ledger: Ledger, txns: List):
+        """
+        Add a verified range of txns to the ledger and run the post-add
+        callbacks for them.
+
+        The range is added with a single durable write if the ledger has a
+        batched callback, which is then called in batches of
+        `CatchupTxnApplyBatchSize`, or has no callback at all. A per-txn
+        callback is called right after its txn is added, before the next
+        one, since it can read the ledger as of that txn, like the pool
+        membership changes do
+        """
+        ledgerInfo = self.getLedgerInfoByType(ledgerId)
+        if ledgerInfo.postTxnAddedToLedgerClbk and \
+                not ledgerInfo.postTxnsAddedToLedgerClbk:
+            for txn in txns:
+                merkleInfo = ledger.add(self._transform(txn))
+                txn[F.seqNo.name] = merkleInfo[F.seqNo.name]
+                ledgerInfo.postTxnAddedToLedgerClbk(ledgerId, txn)
+            return
+
+        (start, _), _ = ledger.addTxns([self._transform(txn) for txn in txns])
+        for seqNo, txn in enumerate(txns, start=start):
+            txn[F.seqNo.name] = seqNo
+        if ledgerInfo.postTxnsAddedToLedgerClbk:
+            batchSize = self.config.CatchupTxnApplyBatchSize
+            for i in range(0, len(txns), batchSize):
+                ledgerInfo.postTxnsAddedToLedgerClbk(ledgerId,
+                                                     txns[i:i + batchSize])
+
     def _removePrcdCatchupReply(self, ledgerId, node, seqNo):
         ledgerInfo = self.getLedgerInfoByType(ledgerId)
         for i, rep in enumerate(ledgerInfo.recvdCatchupRepliesFrm[node]):
@@ -0,0 +1,74 @@
+import sys
+from collections import OrderedDict
+from itertools import islice
+from typing import Any, Dict, Iterable, Mapping, Sized, Tuple
+
+from plenum.common.perf_util import get_size
+
+
+class MemoryAccounting:
+    """
+    Estimates the memory taken by named containers without walking them.
+
+    The number of entries of a container is what its `len` gives, which the
+    container keeps anyway, and its size is its own size plus that number
+    times the size of an entry. The size of an entry is found with `get_size`
+    on the first few entries of a container, and only measured again every
+    `resampleEvery` accountings. A name given for more than one container,
+    like the queues of each ledger, adds them up.
+    """
+
+    def __init__(self, sampleSize: int = 5, resampleEvery: int = 10):
+        self.sampleSize = sampleSize
+        self.resampleEvery = resampleEvery
+        # Estimated bytes taken by an entry of the containers of each name
+        self._entrySizes = {}  # type: Dict[str, float]
+        self._accountings = 0
+        self.last = OrderedDict()  # type: OrderedDict[str, Dict[str, int]]
+
+    def account(self, containers: Iterable[Tuple[str, Sized]]) \
+            -> Dict[str, Dict[str, int]]:
+        resample = self._accountings % self.resampleEvery == 0
+        self._accountings += 1
+        sampled = set()
+        report = OrderedDict()
+        for name, container in containers:
+            count = len(container)
+            entry = report.get(name)
+            if entry is None:
+                entry = report[name] = {'count': 0, 'bytes': 0}
+            entry['count'] += count
+            entry['bytes'] += sys.getsizeof(container)
+            if count and name not in sampled and \
+                    (resample or name not in self._entrySizes):
+                self._entrySizes[name] = self._entrySize(container)
+                sampled.add(name)
+        for name, entry in report.items():
+            entry['bytes'] += int(entry['count'] *
+                                  self._entrySizes.get(name, 0))
+        self.last = report
+        return report
+
+    def _entrySize(self, container: Sized) -> float:
+        entries = container.items() if isinstance(container, Mapping) \
+            else container
+        sizes = [get_size(entry)
+                 for entry in islice(iter(entries), self.sampleSize)]
+        return sum(sizes) / len(sizes) if sizes else 0
+
+    @property
+    def totalBytes(self) -> int:
+        return sum(entry['bytes'] for entry in self.last.values())
+
+    def top(self, n: int):
+        """
+        The `n` names whose containers take the most memory
+        """
+        return sorted(self.last.items(), key=lambda item: item[1]['bytes'],
+                      reverse=True)[:n]
+
+    def asDict(self) -> Dict[str, Any]:
+        return {
+            'estimatedBytes': self.totalBytes,
+            'containers': self.last,
+        }
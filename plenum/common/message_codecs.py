@@ -0,0 +1,158 @@
+"""
+Codecs for the messages nodes send to each other.
+
+Nodes tell each other which codecs they support once connected and use the
+first codec of their preference (`NodeCodecs` in config) which the other node
+supports, JSON is supported by every node. Messages encoded with codecs other
+than JSON start with the codec's marker so they can be decoded without
+knowing what was negotiated.
+
+Encoded messages are valid UTF-8 since the stack decodes every message it
+receives as UTF-8.
+"""
+import json
+from collections import OrderedDict
+from typing import Mapping, Optional, Union
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+Encoded = Union[str, bytes, memoryview]
+
+
+class MessageCodec:
+    name = None  # type: str
+    # Prefix of the encoded messages, None for JSON
+    marker = None  # type: Optional[bytes]
+
+    @staticmethod
+    def isAvailable() -> bool:
+        return True
+
+    def encode(self, msg: Mapping) -> bytes:
+        raise NotImplementedError
+
+    def decode(self, data: Encoded):
+        raise NotImplementedError
+
+
+class JsonCodec(MessageCodec):
+    name = 'json'
+
+    def encode(self, msg: Mapping) -> bytes:
+        return json.dumps(msg).encode()
+
+    def decode(self, data: Encoded):
+        if isinstance(data, memoryview):
+            data = data.tobytes()
+        if isinstance(data, bytes):
+            data = data.decode()
+        return json.loads(data)
+
+
+def _jsonKey(key):
+    # Same conversion as `json.dumps` does for the keys of objects
+    if isinstance(key, str):
+        return key
+    if key is True:
+        return 'true'
+    if key is False:
+        return 'false'
+    if key is None:
+        return 'null'
+    if isinstance(key, float):
+        return repr(key)
+    if isinstance(key, int):
+        return str(key)
+    raise TypeError("key {!r} is not a string".format(key))
+
+
+def jsonKeys(obj):
+    """
+    Return `obj` with the keys of all its maps as strings, like JSON gives
+    them when decoded. Nothing is copied when all keys are strings already
+    """
+    if isinstance(obj, Mapping):
+        converted = {}
+        changed = False
+        for k, v in obj.items():
+            key = _jsonKey(k)
+            value = jsonKeys(v)
+            changed = changed or key is not k or value is not v
+            converted[key] = value
+        return converted if changed else obj
+    if isinstance(obj, (list, tuple)):
+        converted = [jsonKeys(v) for v in obj]
+        if any(c is not v for c, v in zip(converted, obj)):
+            return converted
+    return obj
+
+
+class MsgPackCodec(MessageCodec):
+    """
+    MessagePack, needs the optional `msgpack` dependency. The packed bytes
+    are sent as the UTF-8 encoding of the latin-1 text with the same code
+    points, which only takes more space for the non ASCII bytes, mostly the
+    type and length headers.
+
+    Keys of maps are sent as strings so that a message decodes the same as
+    with JSON, like the seqNo keys of the transactions of a catchup reply
+    which the catchup looks up as strings.
+    """
+    name = 'msgpack'
+    marker = b'#M'
+
+    def __init__(self):
+        self._unpackArgs = {}
+        if msgpack is not None:
+            self._unpackArgs['raw'] = False
+            if msgpack.version >= (1, 0, 0):
+                # Nodes which did not convert keys to strings sent the
+                # transactions of a catchup reply with integer keys
+                self._unpackArgs['strict_map_key'] = False
+
+    @staticmethod
+    def isAvailable() -> bool:
+        return msgpack is not None
+
+    def encode(self, msg: Mapping) -> bytes:
+        packed = msgpack.packb(jsonKeys(msg), use_bin_type=True)
+        return self.marker + packed.decode('latin-1').encode()
+
+    def decode(self, data: Encoded):
+        if isinstance(data, str):
+            packed = data[len(self.marker):].encode('latin-1')
+        else:
+            packed = bytes(data[len(self.marker):]).decode().encode('latin-1')
+        return msgpack.unpackb(packed, **self._unpackArgs)
+
+
+JSON_CODEC = JsonCodec()
+
+# Codecs which can be used, keyed by name
+availableCodecs = OrderedDict()  # type: OrderedDict[str, MessageCodec]
+
+
+def registerCodec(codec: MessageCodec):
+    if codec.isAvailable():
+        availableCodecs[codec.name] = codec
+
+
+for _codec in (JSON_CODEC, MsgPackCodec()):
+    registerCodec(_codec)
+
+
+def codecForPayload(data: Encoded) -> Optional[MessageCodec]:
+    """
+    Return the codec a message was encoded with if it has a marker
+    """
+    for codec in availableCodecs.values():
+        if codec.marker is None:
+            continue
+        marker = codec.marker if not isinstance(data, str) \
+            else codec.marker.decode()
+        if data[:len(marker)] == marker:
+            return codec
+    return None
@@ -1,4 +1,5 @@
 from functools import wraps
+from typing import Any, Dict, List, Optional, Tuple
 
 import sys
 import time
@@ -22,6 +23,14 @@ def get_size(obj, seen=None):
         size += get_size(obj.__dict__, seen)
     elif hasattr(obj, '__iter__') and not isinstance(obj, (str, bytes, bytearray)):
         size += sum([get_size(i, seen) for i in obj])
+    # Objects using `__slots__` keep their attributes outside `__dict__`
+    for cls in type(obj).__mro__:
+        slots = cls.__dict__.get('__slots__', ())
+        if isinstance(slots, str):
+            slots = (slots, )
+        for slot in slots:
+            if slot not in ('__dict__', '__weakref__') and hasattr(obj, slot):
+                size += get_size(getattr(obj, slot), seen)
     return size
 
 
@@ -38,3 +47,87 @@ def timeit(method):
         return result
 
     return timed
+
+
+class TimingStats:
+    """
+    Number of times something took place, the total and longest time it
+    took and a histogram of the times with buckets of powers of 2
+    microseconds
+    """
+    __slots__ = ('count', 'total', 'max', 'buckets')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        # Number of times which took less than 2 ** i microseconds but not
+        # less than 2 ** (i - 1) microseconds, by i
+        self.buckets = {}  # type: Dict[int, int]
+
+    def record(self, elapsed: float):
+        self.count += 1
+        self.total += elapsed
+        if elapsed > self.max:
+            self.max = elapsed
+        bucket = int(elapsed * 1000000).bit_length()
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+
+    def asDict(self) -> Dict[str, Any]:
+        return {
+            'count': self.count,
+            'total': self.total,
+            'mean': self.total / self.count if self.count else 0.0,
+            'max': self.max,
+            # Upper bound of each bucket in seconds with its count
+            'histogram': [[(2 ** bucket) / 1000000, self.buckets[bucket]]
+                          for bucket in sorted(self.buckets)],
+        }
+
+
+class HandlerTimings:
+    """
+    Times taken by message handlers and other steps of a node, by name. Like
+    `timeit` but collecting the times instead of printing them, and only
+    when enabled so that it costs next to nothing otherwise.
+    """
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.timings = {}  # type: Dict[str, TimingStats]
+
+    def record(self, name: str, elapsed: float):
+        stats = self.timings.get(name)
+        if stats is None:
+            stats = self.timings[name] = TimingStats()
+        stats.record(elapsed)
+
+    def clock(self) -> Optional[float]:
+        """
+        Start timing steps done one after another, None if not enabled
+        """
+        return time.perf_counter() if self.enabled else None
+
+    def lap(self, name: str, start: Optional[float]) -> Optional[float]:
+        """
+        Record the time since `start` as taken by `name` and return the time
+        the next step starts at
+        """
+        if start is None:
+            return None
+        now = time.perf_counter()
+        self.record(name, now - start)
+        return now
+
+    def reset(self):
+        self.timings = {}
+
+    def top(self, n: int) -> List[Tuple[str, TimingStats]]:
+        """
+        The `n` names which took the most time in all
+        """
+        return sorted(self.timings.items(),
+                      key=lambda item: item[1].total, reverse=True)[:n]
+
+    def asDict(self) -> Dict[str, Dict[str, Any]]:
+        return {name: stats.asDict() for name, stats in self.timings.items()}
@@ -0,0 +1,227 @@
+import json
+import os
+from collections import OrderedDict
+from copy import deepcopy
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from stp_core.common.log import getlogger
+from stp_core.types import HA
+
+from plenum.common.constants import DATA, ALIAS, TARGET_NYM, NODE_IP, \
+    CLIENT_IP, CLIENT_PORT, NODE_PORT, TXN_TYPE, NODE, SERVICES, VALIDATOR, \
+    CLIENT_STACK_SUFFIX
+from plenum.common.types import f
+from plenum.common.util import cryptonymToHex, updateNestedDict
+
+logger = getlogger()
+
+
+class PoolMembership:
+    """
+    Index of the nodes of the pool built from the NODE txns of the pool
+    ledger: their node and client HAs, keys, services and stewards, along
+    with the sequence numbers of their txns and their info merged from them.
+
+    The index remembers the sequence number of the last txn it has seen and
+    only reads the txns after it when caught up with the ledger, so the pool
+    ledger is read in full only when no saved index matches it. When given a
+    file, the index is saved to it every time it changes.
+    """
+
+    def __init__(self, filePath: str = None):
+        self.filePath = filePath
+        self.reset()
+
+    def reset(self):
+        self.seqNo = 0
+        # Root hash of the ledger when its txn at `seqNo` was the last one
+        self.rootHash = None
+        # nym -> {'seqNos': [..], 'steward': .., 'info': merged txns,
+        # 'previous': merged txns but the last}
+        self._nodes = OrderedDict()  # type: OrderedDict[str, Dict]
+        self.nodeReg = OrderedDict()  # type: OrderedDict[str, HA]
+        self.cliNodeReg = OrderedDict()  # type: OrderedDict[str, HA]
+        self.nodeKeys = {}  # type: Dict[str, bytes]
+        self.activeValidators = set()  # type: Set[str]
+        self.targetNyms = set()  # type: Set[str]
+
+    @classmethod
+    def forLedger(cls, ledger, filePath: str = None) -> 'PoolMembership':
+        """
+        The index of `ledger`, starting from the one saved in `filePath` if
+        it was saved for the ledger as it is
+        """
+        membership = cls.load(filePath) if filePath else None
+        if membership is None or membership.seqNo != ledger.size or \
+                membership.rootHash != cls._rootHash(ledger):
+            membership = cls(filePath)
+        membership.catchUp(ledger)
+        return membership
+
+    def catchUp(self, ledger) -> int:
+        """
+        Update the index with the txns of `ledger` it has not seen yet
+        :return: the number of txns read from the ledger
+        """
+        if ledger.size == self.seqNo:
+            return 0
+        if ledger.size < self.seqNo:
+            logger.warning('pool membership index is at txn {} but the pool '
+                           'ledger has {}, building it again'.
+                           format(self.seqNo, ledger.size))
+            self.reset()
+        start = self.seqNo
+        for seqNo, txn in ledger.iterTxns(self.seqNo + 1):
+            self.update(int(seqNo), txn)
+        self.rootHash = self._rootHash(ledger)
+        self.save()
+        return self.seqNo - start
+
+    def update(self, seqNo: int, txn: Dict):
+        if seqNo <= self.seqNo:
+            return
+        self.seqNo = seqNo
+        if TARGET_NYM in txn:
+            self.targetNyms.add(txn[TARGET_NYM])
+        if txn.get(TXN_TYPE) != NODE:
+            return
+        nym = txn[TARGET_NYM]
+        data = txn[DATA]
+        node = self._nodes.get(nym)
+        if node is None:
+            node = self._nodes[nym] = {
+                'seqNos': [],
+                'steward': txn.get(f.IDENTIFIER.nm),
+                'info': {},
+                'previous': None,
+            }
+        node['seqNos'].append(seqNo)
+        node['previous'] = deepcopy(node['info'])
+        updateNestedDict(node['info'], deepcopy(txn),
+                         nestedKeysToUpdate=[DATA, ])
+
+        # What a NODE txn changes is the same as when the whole ledger is
+        # parsed, like an HA changing only when it has both ip and port
+        nodeName = data[ALIAS]
+        if NODE_IP in data and NODE_PORT in data:
+            self.nodeReg[nodeName] = HA(data[NODE_IP], data[NODE_PORT])
+        if CLIENT_IP in data and CLIENT_PORT in data:
+            self.cliNodeReg[nodeName + CLIENT_STACK_SUFFIX] = \
+                HA(data[CLIENT_IP], data[CLIENT_PORT])
+        self.nodeKeys[nodeName] = cryptonymToHex(nym)
+        services = data.get(SERVICES)
+        if isinstance(services, list):
+            if VALIDATOR in services:
+                self.activeValidators.add(nodeName)
+            else:
+                self.activeValidators.discard(nodeName)
+
+    def haAndKeys(self, returnActive=True):
+        """
+        Validator HAs and keys like `TxnStackManager.parseLedgerForHaAndKeys`
+        gives them, as copies callers can change
+        """
+        nodeReg = OrderedDict(self.nodeReg)
+        cliNodeReg = OrderedDict(self.cliNodeReg)
+        nodeKeys = dict(self.nodeKeys)
+        if not returnActive:
+            return nodeReg, cliNodeReg, nodeKeys, set(self.activeValidators)
+        for nodeName in tuple(nodeReg.keys()):
+            if nodeName not in self.activeValidators:
+                nodeReg.pop(nodeName, None)
+                cliNodeReg.pop(nodeName + CLIENT_STACK_SUFFIX, None)
+                nodeKeys.pop(nodeName, None)
+        return nodeReg, cliNodeReg, nodeKeys
+
+    def hasNode(self, nym: str) -> bool:
+        return nym in self._nodes
+
+    def nodeInfo(self, nym: str, excludeLast=True) -> Tuple[List[int], Dict]:
+        """
+        Sequence numbers of the txns of the node and its info merged from
+        them, leaving out the last one if there are more than one and
+        `excludeLast` is set
+        """
+        node = self._nodes.get(nym)
+        if node is None:
+            return [], {}
+        info = node['previous'] if excludeLast and len(node['seqNos']) > 1 \
+            else node['info']
+        return list(node['seqNos']), deepcopy(info)
+
+    def stewardOf(self, nym: str) -> Optional[str]:
+        node = self._nodes.get(nym)
+        return node['steward'] if node else None
+
+    def nodesData(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Data of each node as the pool state keeps it, the merged data of
+        its txns along with its steward
+        """
+        nodesData = OrderedDict()
+        for nym, node in self._nodes.items():
+            data = {f.IDENTIFIER.nm: node['steward']}
+            data.update(deepcopy(node['info'].get(DATA, {})))
+            nodesData[nym] = data
+        return nodesData
+
+    def nodeAddress(self, nodeName: str) -> Optional[str]:
+        for node in self._nodes.values():
+            data = node['info'].get(DATA, {})
+            if data.get(ALIAS) == nodeName:
+                return data.get(NODE_IP)
+        return None
+
+    @staticmethod
+    def _rootHash(ledger):
+        rootHash = ledger.root_hash
+        return rootHash.decode() if isinstance(rootHash, bytes) else rootHash
+
+    def asDict(self) -> Dict:
+        return {
+            'seqNo': self.seqNo,
+            'rootHash': self.rootHash,
+            'nodes': list(self._nodes.items()),
+            'nodeReg': list(self.nodeReg.items()),
+            'cliNodeReg': list(self.cliNodeReg.items()),
+            'nodeKeys': {name: key.decode()
+                         for name, key in self.nodeKeys.items()},
+            'activeValidators': sorted(self.activeValidators),
+            'targetNyms': sorted(self.targetNyms),
+        }
+
+    @classmethod
+    def fromDict(cls, d: Dict, filePath: str = None) -> 'PoolMembership':
+        membership = cls(filePath)
+        membership.seqNo = d['seqNo']
+        membership.rootHash = d['rootHash']
+        membership._nodes = OrderedDict(d['nodes'])
+        membership.nodeReg = OrderedDict((name, HA(*ha))
+                                         for name, ha in d['nodeReg'])
+        membership.cliNodeReg = OrderedDict((name, HA(*ha))
+                                            for name, ha in d['cliNodeReg'])
+        membership.nodeKeys = {name: key.encode()
+                               for name, key in d['nodeKeys'].items()}
+        membership.activeValidators = set(d['activeValidators'])
+        membership.targetNyms = set(d['targetNyms'])
+        return membership
+
+    def save(self):
+        if not self.filePath:
+            return
+        tmpPath = self.filePath + '.tmp'
+        with open(tmpPath, 'w') as f_:
+            json.dump(self.asDict(), f_)
+        os.replace(tmpPath, self.filePath)
+
+    @classmethod
+    def load(cls, filePath: str) -> Optional['PoolMembership']:
+        if not os.path.exists(filePath):
+            return None
+        try:
+            with open(filePath) as f_:
+                return cls.fromDict(json.load(f_), filePath)
+        except (OSError, ValueError, KeyError, TypeError) as ex:
+            logger.warning('could not load pool membership index from {}: {}'.
+                           format(filePath, ex))
+            return None
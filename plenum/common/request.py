@@ -40,14 +40,31 @@ class Request:
         return self.identifier, self.reqId
 
     def getDigest(self):
-        return sha256(serializeMsg(self.signingState)).hexdigest()
+        """
+        Compute the digest of the request, also keeping the serialised
+        signing state it is computed from, see `signingBytes`
+        """
+        self._signingBytes = serializeMsg(self.signingState)
+        return sha256(self._signingBytes).hexdigest()
+
+    @property
+    def signingBytes(self) -> bytes:
+        """
+        The serialised signing state the client signs, which is what the
+        digest is computed from. It is computed once along with the digest
+        so it is as current as the digest.
+        """
+        if getattr(self, '_signingBytes', None) is None:
+            self._signingBytes = serializeMsg(self.signingState)
+        return self._signingBytes
 
     @property
     def reqDigest(self):
         return ReqDigest(self.identifier, self.reqId, self.digest)
 
     def __getstate__(self):
-        return self.__dict__
+        return {k: v for k, v in self.__dict__.items()
+                if k != '_signingBytes'}
 
     @property
     def signingState(self):
@@ -20,10 +20,9 @@ message coming from node j, node i first verifies the MAC
 authenticator.
 
 """
-from collections import Iterable
 from typing import Mapping
 
-from stp_core.common.log import getlogger
+from plenum.common.lazy_log import getlogger
 from plenum.common.types import f
 from plenum.common.error import error
 
@@ -50,41 +49,90 @@ def serialize(obj, level=0, objname=None, topLevelKeysToIgnore=None):
     '1:a|2:b|3:1,2:k'
 
     :param obj: the object to serlize
-    :param level: a parameter used internally for recursion to serialize nested
-     data structures
+    :param level: the nesting level of `obj`, keys are ignored only at level 0
+    :param objname: name of `obj` used in the error for an invalid type
      :param topLevelKeysToIgnore: the list of top level keys to ignore for
      serialization
     :return: a string representation of `obj`
     """
-    if not isinstance(obj, acceptableTypes):
-        error("invalid type found {}: {}".format(objname, obj))
-    if isinstance(obj, str):
-        return obj
-    if isinstance(obj, dict):
-        if level > 0:
-            keys = list(obj.keys())
+    # Nested objects are serialized with an explicit stack rather than by
+    # recursion and the pieces are joined once at the end. The stack has
+    # strings to output as they are and tuples of (object, level, name) to
+    # serialize. Values which are not dicts or lists are output right away,
+    # the rest of a dict or list is pushed only when reaching a nested one.
+    # A name is a (parent name, key) pair turned into a string for an error
+    parts = []
+    append = parts.append
+    pending = [(obj, level, objname)]
+    while pending:
+        item = pending.pop()
+        if item.__class__ is str:
+            append(item)
+            continue
+        obj, level, name = item
+        if isinstance(obj, dict):
+            if level > 0 or not topLevelKeysToIgnore:
+                keys = sorted(obj)
+            else:
+                keys = sorted(k for k in obj if k not in topLevelKeysToIgnore)
+            values = [obj[k] for k in keys]
+            sep = "|"
+        elif isinstance(obj, list):
+            keys = None
+            values = obj
+            sep = ","
+        elif isinstance(obj, acceptableTypes):
+            if isinstance(obj, str):
+                append(obj)
+            elif obj is not None:
+                append(str(obj))
+            continue
         else:
-            topLevelKeysToIgnore = topLevelKeysToIgnore or []
-            keys = [k for k in obj.keys() if k not in topLevelKeysToIgnore]
-        keys.sort()
-        strs = []
-        for k in keys:
-            onm = ".".join([objname, k]) if objname else k
-            strs.append(str(k) + ":" + serialize(obj[k], level + 1, onm))
-        return "|".join(strs)
-    if isinstance(obj, Iterable):
-        strs = []
-        for o in obj:
-            strs.append(serialize(o, level + 1, objname))
-        return ",".join(strs)
-    if obj is None:
-        return ""
-    else:
-        return str(obj)
+            error("invalid type found {}: {}".format(_objName(name), obj))
+        level += 1
+        for i, value in enumerate(values):
+            if i:
+                append(sep)
+            if keys is not None:
+                append(str(keys[i]) + ":")
+            cls = value.__class__
+            if cls is str:
+                append(value)
+            elif cls is int or cls is float or cls is bool:
+                append(str(value))
+            elif value is None:
+                pass
+            else:
+                # Serialize it and then the rest of the values
+                for j in range(len(values) - 1, i, -1):
+                    pending.append((values[j], level, _childName(
+                        name, keys[j] if keys is not None else None)))
+                    pending.append(sep if keys is None
+                                   else sep + str(keys[j]) + ":")
+                pending.append((value, level, _childName(
+                    name, keys[i] if keys is not None else None)))
+                break
+    return "".join(parts)
     # topLevelKeysToIgnore = topLevelKeysToIgnore or []
     # return ujson.dumps({k:obj[k] for k in obj.keys() if k not in topLevelKeysToIgnore}, sort_keys=True)
 
 
+def _childName(name, key):
+    if key is None:
+        return name
+    return (name, key) if name else key
+
+
+def _objName(name) -> str:
+    keys = []
+    while isinstance(name, tuple):
+        name, key = name
+        keys.append(str(key))
+    if name is not None:
+        keys.append(str(name))
+    return ".".join(reversed(keys))
+
+
 def serializeMsg(msg: Mapping, topLevelKeysToIgnore=None):
     """
     Serialize a message for signing.
@@ -95,5 +143,5 @@ def serializeMsg(msg: Mapping, topLevelKeysToIgnore=None):
     :return: a uft-8 encoded version of `msg`
     """
     ser = serialize(msg, topLevelKeysToIgnore=topLevelKeysToIgnore)
-    logger.trace("serialized msg {} into {}".format(msg, ser))
+    logger.trace("serialized msg {} into {}", msg, ser)
     return ser.encode('utf-8')
@@ -1,7 +1,6 @@
 import os
 import shutil
 from abc import abstractmethod
-from collections import OrderedDict
 
 from plenum.common.keygen_utils import initRemoteKeys
 from stp_core.types import HA
@@ -10,10 +9,11 @@ from stp_core.common.log import getlogger
 from ledger.compact_merkle_tree import CompactMerkleTree
 from ledger.stores.file_hash_store import FileHashStore
 
-from plenum.common.constants import DATA, ALIAS, TARGET_NYM, NODE_IP, CLIENT_IP, \
-    CLIENT_PORT, NODE_PORT, VERKEY, TXN_TYPE, NODE, SERVICES, VALIDATOR, CLIENT_STACK_SUFFIX
+from plenum.common.constants import DATA, TARGET_NYM, NODE_IP, CLIENT_IP, \
+    CLIENT_PORT, NODE_PORT, VERKEY, CLIENT_STACK_SUFFIX
 from plenum.common.util import cryptonymToHex, updateNestedDict
-from plenum.common.ledger import Ledger
+from plenum.common.ledger import Ledger, ensureDurabilityOnWrite
+from plenum.common.pool_membership import PoolMembership
 
 logger = getlogger()
 
@@ -24,6 +24,7 @@ class TxnStackManager:
         self.basedirpath = basedirpath
         self.isNode = isNode
         self.hashStore = None
+        self._poolMembership = None
 
     @property
     @abstractmethod
@@ -57,10 +58,23 @@ class TxnStackManager:
             self._ledger = Ledger(CompactMerkleTree(hashStore=self.hashStore),
                                   dataDir=dataDir,
                                   fileName=self.ledgerFile,
-                                  ensureDurability=self.config.EnsureLedgerDurability,
+                                  ensureDurability=ensureDurabilityOnWrite(self.config),
                                   defaultFile=defaultTxnFile)
         return self._ledger
 
+    @property
+    def poolMembership(self) -> PoolMembership:
+        """
+        Index of the nodes in the pool ledger, caught up with the ledger
+        """
+        if self._poolMembership is None:
+            self._poolMembership = PoolMembership.forLedger(
+                self.ledger, os.path.join(self.ledgerLocation,
+                                          self.config.poolMembershipFile))
+        else:
+            self._poolMembership.catchUp(self.ledger)
+        return self._poolMembership
+
     @staticmethod
     def parseLedgerForHaAndKeys(ledger, returnActive=True):
         """
@@ -70,45 +84,7 @@ class TxnStackManager:
         validators which are not out of service
         :return:
         """
-        nodeReg = OrderedDict()
-        cliNodeReg = OrderedDict()
-        nodeKeys = {}
-        activeValidators = set()
-        for _, txn in ledger.getAllTxn().items():
-            if txn[TXN_TYPE] == NODE:
-                nodeName = txn[DATA][ALIAS]
-                clientStackName = nodeName + CLIENT_STACK_SUFFIX
-                nHa = (txn[DATA][NODE_IP], txn[DATA][NODE_PORT]) \
-                    if (NODE_IP in txn[DATA] and NODE_PORT in txn[DATA]) \
-                    else None
-                cHa = (txn[DATA][CLIENT_IP], txn[DATA][CLIENT_PORT]) \
-                    if (CLIENT_IP in txn[DATA] and CLIENT_PORT in txn[DATA]) \
-                    else None
-                if nHa:
-                    nodeReg[nodeName] = HA(*nHa)
-                if cHa:
-                    cliNodeReg[clientStackName] = HA(*cHa)
-                verkey = cryptonymToHex(txn[TARGET_NYM])
-                nodeKeys[nodeName] = verkey
-
-                services = txn[DATA].get(SERVICES)
-                if isinstance(services, list):
-                    if VALIDATOR in services:
-                        activeValidators.add(nodeName)
-                    else:
-                        activeValidators.discard(nodeName)
-
-        if returnActive:
-            allNodes = tuple(nodeReg.keys())
-            for nodeName in allNodes:
-                if nodeName not in activeValidators:
-                    nodeReg.pop(nodeName, None)
-                    cliNodeReg.pop(nodeName + CLIENT_STACK_SUFFIX, None)
-                    nodeKeys.pop(nodeName, None)
-
-            return nodeReg, cliNodeReg, nodeKeys
-        else:
-            return nodeReg, cliNodeReg, nodeKeys, activeValidators
+        return PoolMembership.forLedger(ledger).haAndKeys(returnActive)
 
     def connectNewRemote(self, txn, remoteName, nodeOrClientObj, addRemote=True):
         verkey = cryptonymToHex(txn[TARGET_NYM])
@@ -212,33 +188,18 @@ class TxnStackManager:
                              format(ex))
 
     def nodeExistsInLedger(self, nym):
-        for txn in self.ledger.getAllTxn().values():
-            if txn[TXN_TYPE] == NODE and \
-                            txn[TARGET_NYM] == nym:
-                return True
-        return False
+        return self.poolMembership.hasNode(nym)
 
     @property
     def nodeIds(self) -> set:
-        return {txn[TARGET_NYM] for txn in self.ledger.getAllTxn().values()}
+        return set(self.poolMembership.targetNyms)
 
     def getNodeInfoFromLedger(self, nym, excludeLast=True):
         # Returns the info of the node from the ledger with transaction
         # sequence numbers that added or updated the info excluding the last
         # update transaction. The reason for ignoring last transactions is that
         #  it is used after update to the ledger has already been made
-        txns = []
-        nodeTxnSeqNos = []
-        for seqNo, txn in self.ledger.getAllTxn().items():
-            if txn[TXN_TYPE] == NODE and txn[TARGET_NYM] == nym:
-                txns.append(txn)
-                nodeTxnSeqNos.append(seqNo)
-        info = {}
-        if len(txns) > 1 and excludeLast:
-            txns = txns[:-1]
-        for txn in txns:
-            self.updateNodeTxns(info, txn)
-        return nodeTxnSeqNos, info
+        return self.poolMembership.nodeInfo(nym, excludeLast=excludeLast)
 
     @staticmethod
     def updateNodeTxns(oldTxn, newTxn):
@@ -1,7 +1,8 @@
 from typing import Callable, Any, List, Dict
 
 from plenum import config
-from plenum.common.batched import Batched, logger
+from plenum.common.batched import Batched, logger, JSON_BATCH_FORMAT
+from plenum.common.message_codecs import JSON_CODEC
 from plenum.common.message_processor import MessageProcessor
 from stp_raet.rstack import SimpleRStack, KITRStack
 from stp_core.types import HA
@@ -25,6 +26,13 @@ class ClientZStack(SimpleZStack, MessageProcessor):
     def newClientsConnected(self, newClients):
         raise NotImplementedError("{} must implement this method".format(self))
 
+    def memoryContainers(self):
+        """
+        Name and container of the messages queued by the stack. Messages to
+        clients are handed to ZeroMQ when sent, only received ones are queued
+        """
+        yield 'rxMsgs', self.rxMsgs
+
     def transmitToClient(self, msg: Any, remoteName: str):
         """
         Transmit the specified message to the remote client specified by `remoteName`.
@@ -92,6 +100,14 @@ class ClientRStack(SimpleRStack, MessageProcessor):
     def newClientsConnected(self, newClients):
         raise NotImplementedError("{} must implement this method".format(self))
 
+    def memoryContainers(self):
+        """
+        Name and container of the messages queued by the stack, received and
+        to send to clients
+        """
+        yield 'rxMsgs', self.rxMsgs
+        yield 'txMsgs', self.txMsgs
+
     def transmitToClient(self, msg: Any, remoteName: str):
         """
         Transmit the specified message to the remote client specified by `remoteName`.
@@ -127,6 +143,10 @@ class NodeRStack(Batched, KITRStack):
         stackParams["messageTimeout"] = config.RAETMessageTimeout
         KITRStack.__init__(self, stackParams, msgHandler, registry, sighex)
         MessageProcessor.__init__(self, allowDictOnly=True)
+        # RAET takes dictionaries as messages so batches cannot be framed
+        # and messages are not encoded by the stack
+        self.batchFormat = JSON_BATCH_FORMAT
+        self.codecs = [JSON_CODEC]
 
     def start(self):
         KITRStack.start(self)
@@ -0,0 +1,114 @@
+import threading
+import time
+from collections import namedtuple
+from typing import Any, Dict, Optional
+
+import psutil
+
+from stp_core.common.log import getlogger
+
+logger = getlogger()
+
+# Metrics of this process, `openFds` is None where psutil cannot count them
+ProcessMetrics = namedtuple('ProcessMetrics', [
+    'rss', 'cpuPercent', 'numThreads', 'openFds', 'voluntaryCtxSwitches',
+    'involuntaryCtxSwitches'])
+
+# Metrics of the host along with those of this process, `trafficKb` being the
+# kilobytes sent and received by all interfaces since the host started
+SystemMetrics = namedtuple('SystemMetrics', [
+    'time', 'cpuPercent', 'ramPercent', 'trafficKb', 'process'])
+
+
+def systemMetricsAsDict(metrics: SystemMetrics) -> Dict[str, Any]:
+    d = metrics._asdict()
+    d['process'] = metrics.process._asdict()
+    return d
+
+
+class SystemMetricsSampler:
+    """
+    Samples the metrics of the host and of this process with psutil, which
+    can take milliseconds on a busy host with many interfaces.
+
+    With a period, sampling is done by a daemon thread every `period`
+    seconds, and `latest` gives the last snapshot taken without calling
+    psutil. Snapshots are never changed, a new one replaces the last, so
+    they can be read from any thread. Without a period, `latest` samples
+    when called.
+    """
+
+    def __init__(self, period: float = 0):
+        self.period = period
+        self._process = psutil.Process()
+        self._thread = None  # type: Optional[threading.Thread]
+        self._stopped = None  # type: Optional[threading.Event]
+        # The first call of `cpu_percent` only starts measuring, the
+        # following ones give the usage since the call before
+        psutil.cpu_percent(interval=None)
+        self._process.cpu_percent(interval=None)
+        self.snapshot = self.sample()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.period <= 0 or self.running:
+            return
+        # Each thread gets its own event so that one being stopped cannot
+        # miss it when started again right away
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run,
+                                        args=(self._stopped,),
+                                        name='SystemMetricsSampler',
+                                        daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5):
+        if self._thread is None:
+            return
+        self._stopped.set()
+        self._thread.join(timeout)
+        self._thread = None
+
+    def _run(self, stopped: threading.Event):
+        while not stopped.wait(self.period):
+            try:
+                self.sample()
+            except Exception as ex:
+                logger.warning("cannot sample system metrics: {}".format(ex))
+
+    def latest(self) -> SystemMetrics:
+        if not self.running:
+            return self.sample()
+        return self.snapshot
+
+    def sample(self) -> SystemMetrics:
+        network = psutil.net_io_counters()
+        snapshot = SystemMetrics(
+            time=time.time(),
+            cpuPercent=psutil.cpu_percent(interval=None),
+            ramPercent=psutil.virtual_memory().percent,
+            trafficKb=(network.bytes_sent + network.bytes_recv) / 1024,
+            process=self.sampleProcess())
+        self.snapshot = snapshot
+        return snapshot
+
+    def sampleProcess(self) -> ProcessMetrics:
+        process = self._process
+        with process.oneshot():
+            ctxSwitches = process.num_ctx_switches()
+            if hasattr(process, 'num_fds'):
+                openFds = process.num_fds()
+            elif hasattr(process, 'num_handles'):
+                openFds = process.num_handles()
+            else:
+                openFds = None
+            return ProcessMetrics(
+                rss=process.memory_info().rss,
+                cpuPercent=process.cpu_percent(interval=None),
+                numThreads=process.num_threads(),
+                openFds=openFds,
+                voluntaryCtxSwitches=ctxSwitches.voluntary,
+                involuntaryCtxSwitches=ctxSwitches.involuntary)
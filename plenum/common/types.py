@@ -45,6 +45,7 @@ class f:  # provides a namespace for reusable field constants
     INST_ID = Field('instId', int)
     IS_STABLE = Field('isStable', bool)
     MSGS = Field('messages', List[Mapping])
+    CODECS = Field('codecs', List[str])
     SIG = Field('signature', Optional[str])
     SUSP_CODE = Field('suspicionCode', int)
     ELECTION_DATA = Field('electionData', Any)
@@ -478,3 +479,4 @@ EVENT_PERIODIC_STATS_NODES = "periodic_stats_nodes"
 EVENT_PERIODIC_STATS_NODE_INFO = "periodic_stats_node_info"
 EVENT_PERIODIC_STATS_SYSTEM_PERFORMANCE_INFO = "periodic_stats_system_performance_info"
 EVENT_PERIODIC_STATS_TOTAL_REQUESTS = "periodic_stats_total_requests"
+EVENT_PERIODIC_STATS_HANDLER_TIMINGS = "periodic_stats_handler_timings"
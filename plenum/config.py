@@ -33,6 +33,10 @@ walletDir = 'wallet'
 poolTransactionsFile = 'pool_transactions_sandbox'
 domainTransactionsFile = 'transactions_sandbox'
 
+# Index of the nodes in the pool ledger, kept next to it so that the pool
+# ledger is not read in full on every start
+poolMembershipFile = 'pool_membership.json'
+
 poolStateDbName = 'pool_state'
 domainStateDbName = 'domain_state'
 
@@ -40,6 +44,11 @@ domainStateDbName = 'domain_state'
 # request id to sequence numbers
 seqNoDbName = 'seq_no_db'
 
+# Stores the seqNo of the last transaction applied to each ledger's state and
+# the state root after it, so that only the missing transactions are replayed
+# on startup
+stateMarkersDbName = 'state_markers'
+
 clientBootStrategy = ClientBootStrategy.PoolTxn
 
 hashStore = {
@@ -51,6 +60,17 @@ primaryStorage = None
 domainStateStorage = KeyValueStorageType.Leveldb
 poolStateStorage = KeyValueStorageType.Leveldb
 reqIdToTxnStorage = KeyValueStorageType.Leveldb
+stateMarkersStorage = KeyValueStorageType.Leveldb
+
+# Number of transactions read from the ledger at a time while replaying them
+# to the state on startup
+StateRecoveryBatchSize = 1000
+
+# Number of keys of the pool and domain states whose values are cached, for
+# each of the committed and uncommitted heads, so that validating requests
+# does not read the same keys from the trie again and again. 0 disables the
+# cache
+StateCacheSize = 10000
 
 DefaultPluginPath = {
     # PLUGIN_BASE_DIR_PATH: "<abs path of plugin directory can be given here,
@@ -89,10 +109,39 @@ notifierEventTriggeringConfig = {
     }
 }
 
+# The metrics of the host and of the node's process, like CPU, RAM, traffic,
+# RSS, open fds and context switches, are sampled every
+# `SystemMetricsSamplingPeriod` seconds by a thread of their own and the
+# monitor reads the latest sample. 0 samples them when they are read instead
+SystemMetricsSamplingPeriod = 5
+
+# Record the time taken by the handler of each type of node and client message
+# and by each phase of the node's `prod`, exposed in node info and sent to
+# stats consumers. Can be switched at runtime with `node.handlerTimings`
+HandlerTimingsEnabled = False
+
+# Every `MemoryAccountingFreq` seconds the node estimates the memory taken by
+# its main containers from their number of entries, and exports it with node
+# info. The size of an entry is measured on `MemoryAccountingSampleSize`
+# entries of each container every `MemoryAccountingResampleEvery` times. 0
+# disables it
+MemoryAccountingFreq = 60
+MemoryAccountingSampleSize = 5
+MemoryAccountingResampleEvery = 10
+
 # Stats server configuration
 STATS_SERVER_IP = '127.0.0.1'
 STATS_SERVER_PORT = 30000
 STATS_SERVER_MESSAGE_BUFFER_MAX_SIZE = 1000
+# When set, stats are sent in batches of up to `STATS_SERVER_BATCH_MAX_SIZE`
+# messages per write, only the latest of the periodic stats not sent yet is
+# sent, and the connection is made again after a delay doubling from
+# `STATS_SERVER_RECONNECT_MIN_DELAY` to `STATS_SERVER_RECONNECT_MAX_DELAY`
+# seconds
+STATS_SERVER_BATCHING = False
+STATS_SERVER_BATCH_MAX_SIZE = 100
+STATS_SERVER_RECONNECT_MIN_DELAY = 1
+STATS_SERVER_RECONNECT_MAX_DELAY = 60
 
 RAETLogLevel = "terse"
 RAETLogLevelCli = "mute"
@@ -109,6 +158,13 @@ ViewChangeWindowSize = 60
 # wait for `ToleratePrimaryDisconnection` before sending a view change message
 ToleratePrimaryDisconnection = 2
 
+# On a view change, replicas send the PRE-PREPAREs they prepared in the
+# earlier views since their last stable checkpoint and the new primary, once
+# a quorum of nodes sent theirs, proposes again the ones of the latest views
+# that f+1 nodes sent and it did not order, instead of the clients sending
+# them again
+ViewChangePreparedCertificates = False
+
 # Timeout factor after which a node starts requesting consistency proofs if has
 # not found enough matching
 ConsistencyProofsTimeout = 5
@@ -116,6 +172,10 @@ ConsistencyProofsTimeout = 5
 # Timeout factor after which a node starts requesting transactions
 CatchupTransactionsTimeout = 5
 
+# Number of transactions received during catchup which are applied to the
+# state (and the other post-add processing is done) in one go
+CatchupTxnApplyBatchSize = 1000
+
 # Timeout after which the view change is performed
 ViewChangeTimeout = 10
 
@@ -129,6 +189,9 @@ logFormat = '{asctime:s} | {levelname:8s} | {filename:20s} ({lineno: >4}) | {fun
 logFormatStyle='{'
 logLevel=logging.NOTSET
 enableStdOutLogging=True
+# Only one of every `HighRateDebugLogSampleEvery` debug messages is logged for
+# events happening for every message, like a node sending or receiving one
+HighRateDebugLogSampleEvery = 1
 
 # OPTIONS RELATED TO TESTS
 
@@ -144,6 +207,15 @@ ExpectedConnectTime = 3.3 if sys.platform == 'win32' else 2
 # repository
 EnsureLedgerDurability = False
 
+# Instead of an fsync on every write, sync the ledgers once for all the
+# batches ordered within `LedgerGroupCommitWindow` seconds and only then send
+# the replies for them, so a client is never told of a txn which a crash can
+# lose. Takes the place of `EnsureLedgerDurability` when True
+LedgerGroupCommit = False
+# With 0 the ledgers are synced once for the batches ordered in an iteration
+# of the node's `prod`
+LedgerGroupCommitWindow = 0
+
 log_override_tags = dict(cli={}, demo={})
 
 # TODO needs to be refactored to use a transport protocol abstraction
@@ -154,6 +226,36 @@ UseZStack = True
 LISTENER_MESSAGE_QUOTA = 100
 REMOTES_MESSAGE_QUOTA = 100
 
+# Format of the batches of messages sent to other nodes, 1 for a JSON
+# encoded BATCH message and 2 for length prefixed frames. Nodes accept both
+# formats but nodes of versions before framed batches only understand JSON
+# ones, so a pool keeps sending JSON batches till every node is upgraded.
+# Then set it to 2 on each node, in any order, to send framed batches
+NodeBatchFormat = 1
+# Messages to the same node are put in one batch till the batch reaches
+# `NodeBatchMaxSize` bytes
+NodeBatchMaxSize = 128 * 1024
+
+# Codecs for messages to other nodes in order of preference, the first one
+# supported by the other node is used. JSON is always supported, msgpack needs
+# the `msgpack` extra to be installed
+NodeCodecs = ['msgpack', 'json']
+
+# Run the replicas of backup protocol instances in worker processes, one for
+# each instance, so that they do not take CPU time from the master instance's
+# replica which stays in the node's process
+BackupReplicasInProcesses = False
+# Time a worker process waits for messages from its node before servicing its
+# replica anyway, so that the replica's timers run
+BackupReplicaPollTimeout = 0.001
+# Longest time the node waits for a worker process to send the 3 phase state
+# of its replica
+BackupReplicaStateTimeout = 5
+# Start method of the worker processes, None for the platform's default. With
+# 'spawn' or 'forkserver' the workers read the config again and do not see
+# changes made to it at runtime
+BackupReplicaStartMethod = None
+
 # After `Max3PCBatchSize` requests or `Max3PCBatchWait`, whichever is earlier,
 # a 3 phase batch is sent
 # Max batch size for 3 phase commit
@@ -186,3 +288,8 @@ CLIENT_REQACK_TIMEOUT = 5
 CLIENT_REPLY_TIMEOUT = 15
 CLIENT_MAX_RETRY_ACK = 5
 CLIENT_MAX_RETRY_REPLY = 5
+
+# Number of most recent requests (with their acks and replies) the client
+# keeps in its request reply store, older ones are purged once the store
+# holds twice as many
+CLIENT_REQ_REP_STORE_MAX_REQUESTS = 10000
@@ -0,0 +1,217 @@
+"""
+Read-through cache in front of a `State`.
+
+Request validation reads the same keys of the state again and again, each
+read walking the trie and decoding the value. `CachedState` keeps the values
+read or written, and their decoded form, for both the committed and the
+uncommitted head of the state.
+
+The uncommitted cache follows the head: `set` and `remove` update it and
+`revertToHead` drops only the keys changed after the head reverted to. For
+this the keys changed since the committed head are kept in order, along with
+the position in that list of every head hash handed out by `headHash`, which
+is where a revert can go back to. `commit` drops from the committed cache the
+keys changed till the newly committed head. When the changed keys are not
+known, like after a revert to a head which was not handed out, the affected
+cache is dropped entirely.
+"""
+import json
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+from state.state import State
+
+# Marks a value to be decoded when first read
+_NOT_DECODED = object()
+
+
+def decodeJson(value: bytes):
+    return json.loads(value.decode())
+
+
+class StateCacheStats:
+    __slots__ = ('hits', 'misses', 'invalidations', 'flushes')
+
+    def __init__(self):
+        self.hits = 0
+        # Reads which went to the trie
+        self.misses = 0
+        # Keys dropped from a cache since they might have changed
+        self.invalidations = 0
+        # Caches dropped entirely since the changed keys were not known
+        self.flushes = 0
+
+    @property
+    def hitRate(self) -> float:
+        reads = self.hits + self.misses
+        return self.hits / reads if reads else 0.0
+
+    def asDict(self) -> Dict[str, Any]:
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hitRate': round(self.hitRate, 4),
+            'savedTrieReads': self.hits,
+            'invalidations': self.invalidations,
+            'flushes': self.flushes,
+        }
+
+
+class _Cache(OrderedDict):
+    """
+    Least recently used map of key to [value, decoded value] with at most
+    `maxSize` keys
+    """
+
+    def __init__(self, maxSize: int):
+        super().__init__()
+        self.maxSize = maxSize
+
+    def lookup(self, key):
+        entry = self.get(key)
+        if entry is not None:
+            self.move_to_end(key)
+        return entry
+
+    def store(self, key, value, decoded=_NOT_DECODED):
+        entry = [value, decoded]
+        self[key] = entry
+        self.move_to_end(key)
+        if len(self) > self.maxSize:
+            self.popitem(last=False)
+        return entry
+
+
+class CachedState:
+    """
+    Wraps a `State`, everything not defined here is looked up on the
+    wrapped state. All changes to the state have to be made through the
+    wrapper.
+    """
+
+    def __init__(self, state: State, maxSize: int,
+                 decode: Callable[[bytes], Any] = decodeJson):
+        self._state = state
+        self._decode = decode
+        self._committed = _Cache(maxSize)
+        self._uncommitted = _Cache(maxSize)
+        # Keys changed since the committed head, in order
+        self._changed = []
+        # Position in `_changed` of every head hash handed out
+        self._heads = {}  # type: Dict[bytes, int]
+        # Whether `_changed` has all the keys changed since the committed
+        # head, it does not after a revert to an unknown head
+        self._complete = True
+        self.stats = StateCacheStats()
+        self._restartChanges()
+
+    @property
+    def state(self) -> State:
+        return self._state
+
+    def __getattr__(self, item):
+        return getattr(self._state, item)
+
+    def get(self, key: bytes, isCommitted: bool = True) -> Optional[bytes]:
+        return self._entry(key, isCommitted)[0]
+
+    def getDecoded(self, key: bytes, isCommitted: bool = True):
+        """
+        Value of `key` decoded, None if there is no value. The decoded value
+        is shared by all the readers of the key and must not be modified.
+        """
+        entry = self._entry(key, isCommitted)
+        if entry[1] is _NOT_DECODED:
+            entry[1] = self._decode(entry[0]) if entry[0] else None
+        return entry[1]
+
+    def set(self, key: bytes, value: bytes):
+        self._state.set(key, value)
+        self._changed.append(key)
+        self._uncommitted.store(key, value)
+
+    def remove(self, key: bytes):
+        self._state.remove(key)
+        self._changed.append(key)
+        self._uncommitted.store(key, None, None)
+
+    @property
+    def headHash(self):
+        headHash = self._state.headHash
+        self._heads[headHash] = len(self._changed)
+        return headHash
+
+    def revertToHead(self, headHash=None):
+        self._state.revertToHead(headHash)
+        position = self._heads.get(headHash) if self._complete else None
+        if position is None:
+            self._uncommitted.clear()
+            self.stats.flushes += 1
+            self._restartChanges()
+            return
+        for key in self._changed[position:]:
+            self._drop(self._uncommitted, key)
+        del self._changed[position:]
+        self._heads = {h: p for h, p in self._heads.items() if p <= position}
+
+    def commit(self, rootHash=None, rootNode=None):
+        if rootHash is None and rootNode is None:
+            # Committing the current head, so note where it is
+            self.headHash
+        self._state.commit(rootHash=rootHash, rootNode=rootNode)
+        committedHeadHash = self._state.committedHeadHash
+        position = self._heads.get(committedHeadHash) \
+            if self._complete else None
+        if position is None:
+            self._committed.clear()
+            self.stats.flushes += 1
+            self._restartChanges()
+            return
+        for key in self._changed[:position]:
+            self._drop(self._committed, key)
+        del self._changed[:position]
+        self._heads = {h: p - position for h, p in self._heads.items()
+                       if p >= position}
+        self._heads[committedHeadHash] = 0
+
+    def _restartChanges(self):
+        # The keys changed since the committed head are not known any more,
+        # unless the head is the committed head
+        self._changed = []
+        self._heads = {}
+        committedHeadHash = self._state.committedHeadHash
+        self._complete = self._state.headHash == committedHeadHash
+        if self._complete:
+            self._heads[committedHeadHash] = 0
+
+    def _entry(self, key: bytes, isCommitted: bool):
+        cache = self._committed if isCommitted else self._uncommitted
+        entry = cache.lookup(key)
+        if entry is not None:
+            self.stats.hits += 1
+            return entry
+        self.stats.misses += 1
+        return cache.store(key, self._state.get(key, isCommitted))
+
+    def _drop(self, cache: _Cache, key):
+        if cache.pop(key, None) is not None:
+            self.stats.invalidations += 1
+
+
+def cacheState(state: State, maxSize: int) -> State:
+    """
+    Return `state` behind a cache of `maxSize` keys for each head, or
+    `state` itself if `maxSize` is 0
+    """
+    return CachedState(state, maxSize) if maxSize else state
+
+
+def getDecoded(state: State, key: bytes, isCommitted: bool = True):
+    """
+    Value of `key` in `state` decoded from JSON, None if there is no value.
+    Comes from the cache if the state has one, so must not be modified.
+    """
+    if isinstance(state, CachedState):
+        return state.getDecoded(key, isCommitted)
+    value = state.get(key, isCommitted)
+    return decodeJson(value) if value else None
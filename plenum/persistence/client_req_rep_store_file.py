@@ -1,23 +1,52 @@
 import json
 import os
-from collections import namedtuple
-from typing import Any, List, Dict
+from collections import namedtuple, OrderedDict
+from typing import Any, List, Dict, Optional, Tuple
 
 from plenum.common.constants import REQACK, REQNACK, REPLY, REJECT
 
-from ledger.stores.directory_store import DirectoryStore
+from plenum.common.config_util import getConfig
 from plenum.common.has_file_storage import HasFileStorage
 from plenum.common.txn_util import getTxnOrderedFields
 from plenum.common.types import f
 from plenum.common.request import Request
 from plenum.common.util import updateFieldsWithSeqNo
 from plenum.persistence.client_req_rep_store import ClientReqRepStore
+from stp_core.common.log import getlogger
+
+logger = getlogger()
+
+
+class ReqRepRecord:
+    """
+    Everything the client has stored about a single request: the request
+    itself and the acks, nacks, rejects and replies received from nodes.
+    Replies are kept serialized and only deserialized when asked for.
+    """
+    __slots__ = ('request', 'acks', 'nacks', 'rejects', 'replies')
+
+    def __init__(self):
+        self.request = None  # type: Optional[str]
+        self.acks = OrderedDict()  # type: Dict[str, None]
+        self.nacks = {}  # type: Dict[str, str]
+        self.rejects = {}  # type: Dict[str, str]
+        self.replies = {}  # type: Dict[str, str]
 
 
 class ClientReqRepStoreFile(ClientReqRepStore, HasFileStorage):
+    """
+    Stores requests and the responses to them in a single append-only log
+    file. The log is read once when the store is opened to build an in-memory
+    index of requests, so lookups and counts do not touch the disk. Once the
+    number of requests reaches twice `CLIENT_REQ_REP_STORE_MAX_REQUESTS`, the
+    oldest requests are purged and the log is compacted.
+    """
     LinePrefixes = namedtuple('LP', ['Request', REQACK, REQNACK, REJECT, REPLY])
+    logName = "req_rep_log"
+    # Directory used by earlier versions which kept one file per request
+    legacyStoreName = "Requests"
 
-    def __init__(self, name, baseDir):
+    def __init__(self, name, baseDir, maxRequests=None):
         self.baseDir = baseDir
         self.dataDir = "data/clients"
         self.name = name
@@ -25,103 +54,100 @@ class ClientReqRepStoreFile(ClientReqRepStore, HasFileStorage):
                                 dataDir=self.dataDir)
         if not os.path.exists(self.dataLocation):
             os.makedirs(self.dataLocation)
-        self.reqStore = DirectoryStore(self.dataLocation, "Requests")
         self._serializer = None
         self.linePrefixes = self.LinePrefixes('0', 'A', 'N', 'J', 'R')
         self.delimiter = '~'
+        self.maxRequests = maxRequests or \
+            getConfig().CLIENT_REQ_REP_STORE_MAX_REQUESTS
+
+        # Key is a tuple of identifier and request id
+        self._index = OrderedDict()  # type: Dict[Tuple[str, int], ReqRepRecord]
+        self._lastReqId = 0
+        self.logPath = os.path.join(self.dataLocation, self.logName)
+        if os.path.exists(self.logPath):
+            self._loadLog()
+            self._logFile = open(self.logPath, 'a')
+        else:
+            self._logFile = open(self.logPath, 'a')
+            self._importLegacyStore()
 
     @property
     def lastReqId(self) -> int:
-        reqIds = self.reqStore.keys
-        return max(map(int, reqIds)) if reqIds else 0
+        return self._lastReqId
+
+    @property
+    def size(self) -> int:
+        return len(self._index)
 
     def addRequest(self, req: Request):
-        idr = req.identifier
-        reqId = req.reqId
-        key = "{}{}".format(idr, reqId)
-        self.reqStore.appendToValue(key, "{}{}{}".
-                                    format(self.linePrefixes.Request,
-                                           self.delimiter,
-                                           self.serializeReq(req)))
+        self._write(self.linePrefixes.Request, req.identifier, req.reqId,
+                    self.serializeReq(req))
+        if len(self._index) >= 2 * self.maxRequests:
+            self.purge(self.maxRequests)
 
     def addAck(self, msg: Any, sender: str):
-        idr = msg[f.IDENTIFIER.nm]
-        reqId = msg[f.REQ_ID.nm]
-        key = "{}{}".format(idr, reqId)
-        self.reqStore.appendToValue(key, "{}{}{}".
-                                    format(self.linePrefixes.REQACK,
-                                           self.delimiter, sender))
+        self._write(self.linePrefixes.REQACK, msg[f.IDENTIFIER.nm],
+                    msg[f.REQ_ID.nm], sender)
 
     def addNack(self, msg: Any, sender: str):
-        idr = msg[f.IDENTIFIER.nm]
-        reqId = msg[f.REQ_ID.nm]
-        key = "{}{}".format(idr, reqId)
-        reason = msg[f.REASON.nm]
-        self.reqStore.appendToValue(key, "{}{}{}{}{}".
-                                    format(self.linePrefixes.REQNACK,
-                                           self.delimiter, sender,
-                                           self.delimiter, reason))
+        self._write(self.linePrefixes.REQNACK, msg[f.IDENTIFIER.nm],
+                    msg[f.REQ_ID.nm], sender, msg[f.REASON.nm])
 
     def addReject(self, msg: Any, sender: str):
-        idr = msg[f.IDENTIFIER.nm]
-        reqId = msg[f.REQ_ID.nm]
-        key = "{}{}".format(idr, reqId)
-        reason = msg[f.REASON.nm]
-        self.reqStore.appendToValue(key, "{}{}{}{}{}".
-                                    format(self.linePrefixes.REJECT,
-                                           self.delimiter, sender,
-                                           self.delimiter, reason))
+        self._write(self.linePrefixes.REJECT, msg[f.IDENTIFIER.nm],
+                    msg[f.REQ_ID.nm], sender, msg[f.REASON.nm])
 
     def addReply(self, identifier: str, reqId: int, sender: str,
                  result: Any) -> int:
         serializedReply = self.txnSerializer.serialize(result, toBytes=False)
-        key = "{}{}".format(identifier, reqId)
-        self.reqStore.appendToValue(key,
-                                    "{}{}{}{}{}".
-                                    format(self.linePrefixes.REPLY,
-                                           self.delimiter, sender,
-                                           self.delimiter, serializedReply))
-        return len(self._getSerializedReplies(identifier, reqId))
+        record = self._write(self.linePrefixes.REPLY, identifier, reqId,
+                             sender, serializedReply)
+        return len(record.replies)
 
     def hasRequest(self, identifier: str, reqId: int) -> bool:
-        key = '{}{}'.format(identifier, reqId)
-        return self.reqStore.exists(key)
+        return (identifier, int(reqId)) in self._index
 
     def getRequest(self, identifier: str, reqId: int) -> Request:
-        for r in self._getLinesWithPrefix(identifier, reqId, "{}{}".
-                format(self.linePrefixes.Request, self.delimiter)):
-            return self.deserializeReq(r[2:])
+        record = self._index.get((identifier, int(reqId)))
+        if record and record.request:
+            return self.deserializeReq(record.request)
 
     def getReplies(self, identifier: str, reqId: int):
-        replies = self._getSerializedReplies(identifier, reqId)
-        for sender, reply in replies.items():
-            replies[sender] = self.txnSerializer.deserialize(reply)
-        return replies
+        record = self._index.get((identifier, int(reqId)))
+        if not record:
+            return {}
+        return {sender: self.txnSerializer.deserialize(reply)
+                for sender, reply in record.replies.items()}
 
     def getAcks(self, identifier: str, reqId: int) -> List[str]:
-        ackLines = self._getLinesWithPrefix(identifier, reqId, "{}{}".
-                                            format(self.linePrefixes.REQACK,
-                                                   self.delimiter))
-        return [line[2:] for line in ackLines]
+        record = self._index.get((identifier, int(reqId)))
+        return list(record.acks) if record else []
 
     def getNacks(self, identifier: str, reqId: int) -> dict:
-        nackLines = self._getLinesWithPrefix(identifier, reqId, "{}{}".
-                                             format(self.linePrefixes.REQNACK,
-                                                    self.delimiter))
-        result = {}
-        for line in nackLines:
-            sender, reason = line[2:].split(self.delimiter, 1)
-            result[sender] = reason
-        return result
+        record = self._index.get((identifier, int(reqId)))
+        return dict(record.nacks) if record else {}
 
     def getRejects(self, identifier: str, reqId: int) -> dict:
-        nackLines = self._getLinesWithPrefix(identifier, reqId, "{}{}".
-                                             format(self.linePrefixes.REJECT, self.delimiter))
-        result = {}
-        for line in nackLines:
-            sender, reason = line[2:].split(self.delimiter, 1)
-            result[sender] = reason
-        return result
+        record = self._index.get((identifier, int(reqId)))
+        return dict(record.rejects) if record else {}
+
+    def purge(self, keep: int):
+        """
+        Remove all but the `keep` most recently added requests and rewrite
+        the log with only the remaining ones
+        """
+        toRemove = len(self._index) - keep
+        if toRemove <= 0:
+            return
+        for _ in range(toRemove):
+            self._index.popitem(last=False)
+        logger.debug("{} purged {} old requests from request reply store".
+                     format(self.name, toRemove))
+        self._compact()
+
+    def close(self):
+        if not self._logFile.closed:
+            self._logFile.close()
 
     @property
     def txnFieldOrdering(self):
@@ -136,22 +162,107 @@ class ClientReqRepStoreFile(ClientReqRepStore, HasFileStorage):
     def deserializeReq(serReq: str) -> Request:
         return Request.fromState(json.loads(serReq))
 
-    def _getLinesWithPrefix(self, identifier: str, reqId: int,
-                            prefix: str) -> List[str]:
-        key = '{}{}'.format(identifier, reqId)
-        data = self.reqStore.get(key)
-        return [line for line in data.splitlines()
-                if line.startswith(prefix)] if data else []
-
-    def _getSerializedReplies(self, identifier: str, reqId: int) -> \
-            Dict[str, str]:
-        replyLines = self._getLinesWithPrefix(identifier, reqId, "{}{}".
-                                              format(self.linePrefixes.REPLY,
-                                                     self.delimiter))
-        result = {}
-        for line in replyLines:
-            sender, reply = line[2:].split(self.delimiter, 1)
-            result[sender] = reply
-        return result
+    def _write(self, prefix, identifier, reqId, *values) -> ReqRepRecord:
+        reqId = int(reqId)
+        if self._logFile.closed:
+            # The store was closed when the client stopped
+            self._logFile = open(self.logPath, 'a')
+        self._logFile.write(self._toLine(prefix, identifier, reqId, *values))
+        self._logFile.flush()
+        return self._applyToIndex(prefix, identifier, reqId, *values)
+
+    def _toLine(self, prefix, identifier, reqId, *values) -> str:
+        return self.delimiter.join((prefix, identifier, str(reqId)) +
+                                   values) + '\n'
+
+    def _applyToIndex(self, prefix, identifier, reqId, *values) -> \
+            ReqRepRecord:
+        key = (identifier, reqId)
+        record = self._index.get(key)
+        if record is None:
+            record = self._index[key] = ReqRepRecord()
+            self._lastReqId = max(self._lastReqId, reqId)
+        if prefix == self.linePrefixes.Request:
+            record.request = values[0]
+        elif prefix == self.linePrefixes.REQACK:
+            record.acks[values[0]] = None
+        elif prefix == self.linePrefixes.REQNACK:
+            record.nacks[values[0]] = values[1]
+        elif prefix == self.linePrefixes.REJECT:
+            record.rejects[values[0]] = values[1]
+        elif prefix == self.linePrefixes.REPLY:
+            record.replies[values[0]] = values[1]
+        return record
+
+    def _parseLine(self, line: str):
+        prefix, identifier, reqId, rest = line.split(self.delimiter, 3)
+        if prefix in (self.linePrefixes.REQNACK, self.linePrefixes.REJECT,
+                      self.linePrefixes.REPLY):
+            values = tuple(rest.split(self.delimiter, 1))
+        else:
+            values = (rest,)
+        return (prefix, identifier, int(reqId)) + values
+
+    def _loadLog(self):
+        with open(self.logPath) as logFile:
+            for line in logFile:
+                line = line.rstrip('\n')
+                if not line:
+                    continue
+                try:
+                    self._applyToIndex(*self._parseLine(line))
+                except (ValueError, IndexError):
+                    logger.warning("{} found malformed line in request reply "
+                                   "store: {}".format(self.name, line))
+
+    def _compact(self):
+        tmpPath = self.logPath + '.tmp'
+        with open(tmpPath, 'w') as tmpFile:
+            for (identifier, reqId), record in self._index.items():
+                for line in self._recordLines(identifier, reqId, record):
+                    tmpFile.write(line)
+            tmpFile.flush()
+            os.fsync(tmpFile.fileno())
+        self._logFile.close()
+        os.replace(tmpPath, self.logPath)
+        self._logFile = open(self.logPath, 'a')
 
+    def _recordLines(self, identifier, reqId, record: ReqRepRecord):
+        lp = self.linePrefixes
+        if record.request is not None:
+            yield self._toLine(lp.Request, identifier, reqId, record.request)
+        for sender in record.acks:
+            yield self._toLine(lp.REQACK, identifier, reqId, sender)
+        for sender, reason in record.nacks.items():
+            yield self._toLine(lp.REQNACK, identifier, reqId, sender, reason)
+        for sender, reason in record.rejects.items():
+            yield self._toLine(lp.REJECT, identifier, reqId, sender, reason)
+        for sender, reply in record.replies.items():
+            yield self._toLine(lp.REPLY, identifier, reqId, sender, reply)
 
+    def _importLegacyStore(self):
+        # Requests stored by earlier versions, one file per request, are
+        # copied to the log the first time it is created
+        legacyDir = os.path.join(self.dataLocation, self.legacyStoreName)
+        if not os.path.isdir(legacyDir):
+            return
+        for fileName in sorted(os.listdir(legacyDir)):
+            with open(os.path.join(legacyDir, fileName)) as reqFile:
+                lines = reqFile.read().splitlines()
+            reqLine = next((l for l in lines if l.startswith(
+                self.linePrefixes.Request + self.delimiter)), None)
+            if reqLine is None:
+                continue
+            state = json.loads(reqLine[2:])
+            identifier, reqId = state[f.IDENTIFIER.nm], state[f.REQ_ID.nm]
+            for line in lines:
+                if not line:
+                    continue
+                prefix, payload = line.split(self.delimiter, 1)
+                if prefix in (self.linePrefixes.REQNACK,
+                              self.linePrefixes.REJECT,
+                              self.linePrefixes.REPLY):
+                    values = payload.split(self.delimiter, 1)
+                else:
+                    values = (payload,)
+                self._write(prefix, identifier, reqId, *values)
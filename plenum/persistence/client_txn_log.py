@@ -23,6 +23,10 @@ class ClientTxnLog(HasFileStorage):
         self.transactionLog = TextFileStore(self.clientDataLocation,
                                             "transactions")
         self.serializer = CompactSerializer(fields=self.txnFieldOrdering)
+        # Keys of all txns in the log, so that looking up a txn does not need
+        # a scan of the log
+        self._keys = set(self.transactionLog.iterator(includeKey=True,
+                                                      includeValue=False))
 
     def close(self):
         self.transactionLog.close()
@@ -33,14 +37,14 @@ class ClientTxnLog(HasFileStorage):
         return updateFieldsWithSeqNo(fields)
 
     def append(self, identifier: str, reqId, txn):
-        key = '{}{}'.format(identifier, reqId)
+        key = self.getKey(identifier, reqId)
         self.transactionLog.put(key=key, value=self.serializer.serialize(txn,
                                 fields=self.txnFieldOrdering, toBytes=False))
+        self._keys.add(key)
 
     def hasTxn(self, identifier, reqId) -> bool:
-        key = '{}{}'.format(identifier, reqId)
-        for key in self.transactionLog.iterator(includeKey=True,
-                                                includeValue=False):
-            if key == str(reqId):
-                return True
-        return False
+        return self.getKey(identifier, reqId) in self._keys
+
+    @staticmethod
+    def getKey(identifier, reqId):
+        return '{}{}'.format(identifier, reqId)
@@ -1,7 +1,7 @@
 import os
 
 from ledger.stores.hash_store import HashStore
-from state.kv.kv_store_leveldb import KeyValueStorageLeveldb
+from plenum.persistence.storage import SyncableKeyValueStorageLeveldb
 from stp_core.common.log import getlogger
 
 
@@ -67,13 +67,20 @@ class LevelDbHashStore(HashStore):
     def leafCount(self, count: int) -> None:
         self._leafCount = count
 
+    def sync(self):
+        """
+        Make the hashes written till now survive a crash of the host
+        """
+        self.nodesDb.sync()
+        self.leavesDb.sync()
+
     @property
     def closed(self):
         return self.nodesDb is None and self.leavesDb is None
 
     def open(self):
-        self.nodesDb = KeyValueStorageLeveldb(self.nodesDbPath)
-        self.leavesDb = KeyValueStorageLeveldb(self.leavesDbPath)
+        self.nodesDb = SyncableKeyValueStorageLeveldb(self.nodesDbPath)
+        self.leavesDb = SyncableKeyValueStorageLeveldb(self.leavesDbPath)
 
     def close(self):
         self.nodesDb.close()
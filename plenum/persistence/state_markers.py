@@ -0,0 +1,36 @@
+from binascii import hexlify, unhexlify
+from typing import Optional, Tuple
+
+from state.kv.kv_store import KeyValueStorage
+
+
+class StateMarkers:
+    """
+    Stores, for each ledger, the sequence number of the last transaction
+    applied to the committed state and the state root after applying it. Used
+    on startup to only replay the transactions which the state is missing.
+    """
+
+    def __init__(self, keyValueStorage: KeyValueStorage):
+        self._keyValueStorage = keyValueStorage
+
+    @staticmethod
+    def getKey(ledgerId):
+        return str(ledgerId).encode()
+
+    def set(self, ledgerId, seqNo, stateRoot: bytes):
+        val = '{}:{}'.format(seqNo, hexlify(stateRoot).decode())
+        self._keyValueStorage.put(self.getKey(ledgerId), val)
+
+    def get(self, ledgerId) -> Optional[Tuple[int, bytes]]:
+        try:
+            val = self._keyValueStorage.get(self.getKey(ledgerId))
+            if isinstance(val, bytes):
+                val = val.decode()
+            seqNo, stateRoot = val.split(':')
+            return int(seqNo), unhexlify(stateRoot.encode())
+        except (KeyError, ValueError):
+            return None
+
+    def close(self):
+        self._keyValueStorage.close()
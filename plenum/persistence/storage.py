@@ -1,6 +1,8 @@
 import os
 from abc import abstractmethod, ABC
 
+import leveldb
+
 from ledger.stores.text_file_store import TextFileStore
 from plenum.common.exceptions import DataDirectoryNotFound, KeyValueStorageConfigNotFound
 from plenum.common.constants import StorageType, KeyValueStorageType
@@ -28,10 +30,20 @@ class Storage(ABC):
         pass
 
 
+class SyncableKeyValueStorageLeveldb(KeyValueStorageLeveldb):
+    def sync(self):
+        """
+        Make the writes done till now survive a crash of the host. A synced
+        write makes LevelDB fsync its log, which has every write done before
+        it
+        """
+        self._db.Write(leveldb.WriteBatch(), sync=True)
+
+
 def initKeyValueStorage(keyValueType, dataLocation, keyValueStorageName) -> KeyValueStorage:
     if keyValueType == KeyValueStorageType.Leveldb:
         kvPath = os.path.join(dataLocation, keyValueStorageName)
-        return KeyValueStorageLeveldb(kvPath)
+        return SyncableKeyValueStorageLeveldb(kvPath)
     elif keyValueType == KeyValueStorageType.Memory:
         return KeyValueStorageInMemory()
     else:
@@ -29,7 +29,8 @@ class ClientAuthNr:
     def authenticate(self,
                      msg: Dict,
                      identifier: str = None,
-                     signature: str = None) -> str:
+                     signature: str = None,
+                     serialized: bytes = None) -> str:
         """
         Authenticate the client's message with the signature provided.
 
@@ -37,6 +38,8 @@ class ClientAuthNr:
         msg['identifier'] as identifier
         :param signature: a utf-8 and base58 encoded signature
         :param msg: the message to authenticate
+        :param serialized: `msg` serialised for signing, if already known,
+        like the `signingBytes` of a request
         :return: the identifier; an exception of type SigningException is
             raised if the signature is not valid
         """
@@ -70,7 +73,8 @@ class NaclAuthNr(ClientAuthNr):
     def authenticate(self,
                      msg: Dict,
                      identifier: str = None,
-                     signature: str = None) -> str:
+                     signature: str = None,
+                     serialized: bytes = None) -> str:
         try:
             if not signature:
                 try:
@@ -92,7 +96,8 @@ class NaclAuthNr(ClientAuthNr):
                 sig = base58.b58decode(signature)
             except Exception as ex:
                 raise InvalidSignatureFormat from ex
-            ser = self.serializeForSig(msg, topLevelKeysToIgnore=[f.SIG.nm])
+            ser = serialized if serialized is not None else \
+                self.serializeForSig(msg, topLevelKeysToIgnore=[f.SIG.nm])
             verkey = self.getVerkey(identifier)
             vr = DidVerifier(verkey, identifier=identifier)
             isVerified = vr.verify(sig, ser)
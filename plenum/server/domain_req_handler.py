@@ -1,4 +1,4 @@
-import json
+from copy import deepcopy
 
 from ledger.serializers.json_serializer import JsonSerializer
 from ledger.util import F
@@ -7,6 +7,7 @@ from plenum.common.exceptions import UnauthorizedClientRequest
 from plenum.common.request import Request
 from plenum.common.txn_util import reqToTxn
 from plenum.common.types import f
+from plenum.persistence.cached_state import getDecoded
 from plenum.persistence.util import txnsWithSeqNo
 from plenum.server.req_handler import RequestHandler
 from stp_core.common.log import getlogger
@@ -139,5 +140,7 @@ class DomainRequestHandler(RequestHandler):
     @staticmethod
     def getNymDetails(state, nym, isCommitted: bool = True):
         key = nym.encode()
-        data = state.get(key, isCommitted)
-        return json.loads(data.decode()) if data else {}
+        data = getDecoded(state, key, isCommitted)
+        # A deep copy since the decoded value can be shared through the
+        # state's cache and callers update what is returned, nested values too
+        return deepcopy(data) if data else {}
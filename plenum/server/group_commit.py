@@ -0,0 +1,81 @@
+import time
+from typing import Callable, Iterable, List, Tuple
+
+from stp_core.common.log import getlogger
+
+logger = getlogger()
+
+
+class GroupCommit:
+    """
+    Holds back the replies for the batches committed to the ledgers till the
+    ledgers are synced to disk, and syncs them once for all the batches
+    committed within `window` seconds of the first one held back, instead of
+    once for every write.
+    """
+
+    def __init__(self, window: float = 0, getTime: Callable = time.perf_counter):
+        self.window = window
+        self.getTime = getTime
+        # Replies held back with the keys of their requests
+        self._replies = []  # type: List[Tuple]
+        self._batches = 0
+        self._since = None
+        self.groups = 0
+        self.groupedBatches = 0
+        self.syncTime = 0.0
+
+    @property
+    def pending(self) -> int:
+        return len(self._replies)
+
+    @property
+    def heldReplies(self) -> List[Tuple]:
+        """
+        The (reply, reqKey) held back, not to be changed by the caller
+        """
+        return self._replies
+
+    def add(self, replies: Iterable[Tuple]):
+        """
+        Hold back the (reply, reqKey) of a committed batch
+        """
+        if self._since is None:
+            self._since = self.getTime()
+        self._replies.extend(replies)
+        self._batches += 1
+
+    def isDue(self) -> bool:
+        return self._since is not None and \
+            self.getTime() - self._since >= self.window
+
+    def flush(self, ledgers: Iterable) -> List[Tuple]:
+        """
+        Sync the `ledgers` and give the replies held back till now, which can
+        be sent now that their txns are on disk
+        """
+        if self._since is None:
+            return []
+        start = self.getTime()
+        for ledger in ledgers:
+            sync = getattr(ledger, 'sync', None)
+            if sync is not None:
+                sync()
+        self.syncTime += self.getTime() - start
+        replies = self._replies
+        logger.trace('synced ledgers for {} batches with {} replies'.
+                     format(self._batches, len(replies)))
+        self.groups += 1
+        self.groupedBatches += self._batches
+        self._replies = []
+        self._batches = 0
+        self._since = None
+        return replies
+
+    def asDict(self):
+        return {
+            'groups': self.groups,
+            'batchesPerGroup': self.groupedBatches / self.groups
+            if self.groups else 0,
+            'syncTime': self.syncTime,
+        }
@@ -2,7 +2,7 @@ import time
 from collections import deque
 from typing import Callable
 
-from stp_core.common.log import getlogger
+from plenum.common.lazy_log import getlogger
 
 logger = getlogger()
 
@@ -28,11 +28,11 @@ class HasActionQueue:
             if nxt < self.aqNextCheck:
                 self.aqNextCheck = nxt
             logger.debug("{} scheduling action {} with id {} to run in {} "
-                         "seconds".format(self, action, self.aid, seconds))
+                         "seconds", self, action, self.aid, seconds)
             self.aqStash.append((nxt, (action, self.aid)))
         else:
-            logger.debug("{} scheduling action {} with id {} to run now".
-                         format(self, action, self.aid))
+            logger.debug("{} scheduling action {} with id {} to run now",
+                         self, action, self.aid)
             self.actionQueue.append((action, self.aid))
         return self.aid
 
@@ -57,8 +57,8 @@ class HasActionQueue:
         count = len(self.actionQueue)
         while self.actionQueue:
             action, aid = self.actionQueue.popleft()
-            logger.debug("{} running action {} with id {}".
-                         format(self, action, aid))
+            logger.debug("{} running action {} with id {}",
+                         self, action, aid)
             action()
         return count
 
@@ -69,17 +69,17 @@ class HasActionQueue:
                 self._schedule(wrapper, seconds)
 
         if action not in self.repeatingActions:
-            logger.debug('{} will be repeating every {} seconds'.
-                         format(action, seconds))
+            logger.debug('{} will be repeating every {} seconds',
+                         action, seconds)
             self.repeatingActions.add(action)
             self._schedule(wrapper, seconds)
         else:
-            logger.debug('{} is already repeating'.format(action))
+            logger.debug('{} is already repeating', action)
 
     def stopRepeating(self, action: Callable, strict=True):
         try:
             self.repeatingActions.remove(action)
-            logger.debug('{} will not be repeating'.format(action))
+            logger.debug('{} will not be repeating', action)
         except KeyError:
             msg = '{} not found in repeating actions'.format(action)
             if strict:
@@ -1,20 +1,80 @@
 """
 Some model objects used in Plenum protocol.
 """
-from typing import NamedTuple, Set, Tuple, Dict
+from typing import Dict, FrozenSet, Hashable, List, Optional, Tuple
+
+from sortedcontainers import SortedList, SortedSet
 
 from plenum.common.types import Commit, Prepare
 
-ThreePhaseVotes = NamedTuple("ThreePhaseVotes", [
-    ("voters", Set[str])])
 
+def popcount(mask: int) -> int:
+    return bin(mask).count('1')
+
+
+class VoterIndex:
+    """
+    Gives each voter a small integer index the first time it votes so that
+    the voters of a message can be kept as the bits of an int. Voters are
+    the nodes or replicas of the pool, so the indices stay few.
+    """
+
+    def __init__(self):
+        self._indices = {}  # type: Dict[str, int]
+        self._names = []  # type: List[str]
+
+    def bit(self, voter: str) -> int:
+        index = self._indices.get(voter)
+        if index is None:
+            index = self._indices[voter] = len(self._names)
+            self._names.append(voter)
+        return 1 << index
+
+    def has(self, mask: int, voter: str) -> bool:
+        index = self._indices.get(voter)
+        return index is not None and bool(mask >> index & 1)
+
+    def names(self, mask: int) -> FrozenSet[str]:
+        return frozenset(name for index, name in enumerate(self._names)
+                         if mask >> index & 1)
+
+
+class ThreePhaseVotes:
+    __slots__ = ('mask', '_index')
+
+    def __init__(self, index: VoterIndex, mask: int = 0):
+        self._index = index
+        self.mask = mask
+
+    @property
+    def voters(self) -> FrozenSet[str]:
+        return self._index.names(self.mask)
 
-InsChgVotes = NamedTuple("InsChg", [
-    ("viewNo", int),
-    ("voters", Set[str])])
+    def __repr__(self):
+        return "{}(voters={})".format(self.__class__.__name__,
+                                      set(self.voters))
+
+
+class InsChgVotes(ThreePhaseVotes):
+    __slots__ = ('viewNo',)
+
+    def __init__(self, viewNo: int, index: VoterIndex, mask: int = 0):
+        super().__init__(index, mask)
+        self.viewNo = viewNo
 
 
 class TrackedMsgs(dict):
+    """
+    Votes for messages by the key of the message. The voters of a message
+    are kept as a bitmask of their indices in `voterIndex`, and the keys
+    are kept sorted by the number they are pruned by too so that the votes
+    till a number can be dropped at once with `pruneTill`.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.voterIndex = VoterIndex()
+        self._keys = SortedList(key=self.pruneNo)
 
     def newVoteMsg(self, msg):
         raise NotImplementedError
@@ -22,39 +82,78 @@ class TrackedMsgs(dict):
     def getKey(self, msg):
         raise NotImplementedError
 
+    @staticmethod
+    def pruneNo(key: Hashable) -> int:
+        raise NotImplementedError
+
     def addMsg(self, msg, voter: str):
         key = self.getKey(msg)
-        if key not in self:
-            self[key] = self.newVoteMsg(msg)
-        self[key].voters.add(voter)
+        votes = self.get(key)
+        if votes is None:
+            votes = self[key] = self.newVoteMsg(msg)
+            self._keys.add(key)
+        votes.mask |= self.voterIndex.bit(voter)
 
     def hasMsg(self, msg) -> bool:
         key = self.getKey(msg)
         return key in self
 
     def hasVote(self, msg, voter: str) -> bool:
-        key = self.getKey(msg)
-        return key in self and voter in self[key].voters
+        votes = self.get(self.getKey(msg))
+        return votes is not None and self.voterIndex.has(votes.mask, voter)
 
     def hasEnoughVotes(self, msg, count) -> bool:
-        key = self.getKey(msg)
-        return self.hasMsg(msg) and len(self[key].voters) >= count
+        votes = self.get(self.getKey(msg))
+        return votes is not None and popcount(votes.mask) >= count
 
+    def pop(self, key, *default):
+        if key in self:
+            self._keys.remove(key)
+        return super().pop(key, *default)
 
-class Prepares(TrackedMsgs):
-    """
-    Dictionary of received Prepare requests. Key of dictionary is a 2
-    element tuple with elements viewNo, seqNo and value is a 2 element
-    tuple containing request digest and set of sender node names(sender
-    replica names in case of multiple protocol instances)
-    (viewNo, seqNo) -> (digest, {senders})
-    """
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._keys.remove(key)
+
+    def clear(self):
+        super().clear()
+        self._keys.clear()
+
+    def pruneTill(self, no: int) -> int:
+        """
+        Drop the votes of every key whose `pruneNo` is at most `no`
+        :return: the number of keys dropped
+        """
+        end = self._keys.bisect_key_right(no)
+        for key in self._keys[:end]:
+            super().pop(key)
+        del self._keys[:end]
+        return end
+
+
+class ThreePhaseMsgs(TrackedMsgs):
+    # Since the sequence numbers of PRE-PREPAREs keep increasing across
+    # views, 3 phase keys are pruned by their ppSeqNo alone
 
     def newVoteMsg(self, msg):
-        return ThreePhaseVotes(set())
+        return ThreePhaseVotes(self.voterIndex)
 
-    def getKey(self, prepare):
-        return prepare.viewNo, prepare.ppSeqNo
+    def getKey(self, msg):
+        return msg.viewNo, msg.ppSeqNo
+
+    @staticmethod
+    def pruneNo(key: Tuple[int, int]) -> int:
+        return key[1]
+
+
+class Prepares(ThreePhaseMsgs):
+    """
+    Dictionary of received Prepare requests. Key of dictionary is a 2
+    element tuple with elements viewNo, seqNo and value is the votes of the
+    sender node names(sender replica names in case of multiple protocol
+    instances)
+    (viewNo, seqNo) -> votes of {senders}
+    """
 
     # noinspection PyMethodMayBeStatic
     def addVote(self, prepare: Prepare, voter: str) -> None:
@@ -79,20 +178,14 @@ class Prepares(TrackedMsgs):
         return self.hasEnoughVotes(prepare, 2 * f)
 
 
-class Commits(TrackedMsgs):
+class Commits(ThreePhaseMsgs):
     """
     Dictionary of received commit requests. Key of dictionary is a 2
-    element tuple with elements viewNo, seqNo and value is a 2 element
-    tuple containing request digest and set of sender node names(sender
-    replica names in case of multiple protocol instances)
+    element tuple with elements viewNo, seqNo and value is the votes of the
+    sender node names(sender replica names in case of multiple protocol
+    instances)
     """
 
-    def newVoteMsg(self, msg):
-        return ThreePhaseVotes(set())
-
-    def getKey(self, commit):
-        return commit.viewNo, commit.ppSeqNo
-
     # noinspection PyMethodMayBeStatic
     def addVote(self, commit: Commit, voter: str) -> None:
         """
@@ -119,7 +212,7 @@ class Commits(TrackedMsgs):
 class InstanceChanges(TrackedMsgs):
     """
     Stores senders of received instance change requests. Key is the view
-    no and and value is the set of senders
+    no and and value is the votes of the senders
     Does not differentiate between reason for view change. Maybe it should,
     but the current assumption is that since a malicious node can raise
     different suspicions on different nodes, its ok to consider all suspicions
@@ -127,11 +220,15 @@ class InstanceChanges(TrackedMsgs):
     """
 
     def newVoteMsg(self, msg):
-        return InsChgVotes(msg.viewNo, set())
+        return InsChgVotes(self.getKey(msg), self.voterIndex)
 
     def getKey(self, msg):
         return msg if isinstance(msg, int) else msg.viewNo
 
+    @staticmethod
+    def pruneNo(key: int) -> int:
+        return key
+
     # noinspection PyMethodMayBeStatic
     def addVote(self, msg: int, voter: str):
         super().addMsg(msg, voter)
@@ -146,3 +243,93 @@ class InstanceChanges(TrackedMsgs):
 
     def hasQuorum(self, viewNo: int, f: int) -> bool:
         return self.hasEnoughVotes(viewNo, 2 * f + 1)
+
+
+class OrderedTracker:
+    """
+    Keeps track of the 3 phase keys (viewNo, ppSeqNo) ordered by a replica
+    without keeping every key. For each view, the ordered ppSeqNos are kept
+    as a contiguous range along with a sorted set of the ppSeqNos which were
+    ordered outside that range, like the ones ordered after a catchup. Since
+    the sequence numbers of PRE-PREPAREs keep increasing across views, once a
+    checkpoint becomes stable every ppSeqNo till it is considered ordered and
+    whatever is kept for the sequence numbers till it is dropped.
+    """
+
+    def __init__(self):
+        # viewNo -> [first ppSeqNo of range, last ppSeqNo of range,
+        # ppSeqNos ordered outside the range]
+        self._views = {}  # type: Dict[int, list]
+        self.stableTill = 0
+        # The key that was added last, like the last element of an
+        # ordered set of keys
+        self.last = None  # type: Optional[Tuple[int, int]]
+
+    def add(self, viewNo: int, ppSeqNo: int):
+        if (viewNo, ppSeqNo) in self:
+            return
+        self.last = (viewNo, ppSeqNo)
+        view = self._views.get(viewNo)
+        if view is None:
+            self._views[viewNo] = [ppSeqNo, ppSeqNo, SortedSet()]
+        elif ppSeqNo in (view[0] - 1, view[1] + 1):
+            view[0] = min(view[0], ppSeqNo)
+            view[1] = max(view[1], ppSeqNo)
+            self._absorb(view)
+        else:
+            view[2].add(ppSeqNo)
+
+    def prune(self, tillSeqNo: int):
+        """
+        Consider all ppSeqNos till `tillSeqNo` as ordered and drop the keys
+        kept for them
+        """
+        self.stableTill = max(self.stableTill, tillSeqNo)
+        for viewNo in list(self._views.keys()):
+            view = self._views[viewNo]
+            others = view[2]
+            while others and others[0] <= self.stableTill:
+                others.pop(0)
+            if view[1] > self.stableTill:
+                view[0] = max(view[0], self.stableTill + 1)
+            elif others:
+                view[0] = view[1] = others.pop(0)
+                self._absorb(view)
+            else:
+                self._views.pop(viewNo)
+
+    @staticmethod
+    def _absorb(view):
+        # Extend the range with the ppSeqNos adjacent to it
+        start, end, others = view
+        while end + 1 in others:
+            others.remove(end + 1)
+            end += 1
+        while start - 1 in others:
+            others.remove(start - 1)
+            start -= 1
+        view[0], view[1] = start, end
+
+    def keptSeqNos(self) -> List[SortedSet]:
+        """
+        The ppSeqNos kept for each view apart from its range, what the
+        tracker takes grows with them
+        """
+        return [view[2] for view in self._views.values()]
+
+    def __contains__(self, key: Tuple[int, int]) -> bool:
+        viewNo, ppSeqNo = key
+        if ppSeqNo <= self.stableTill:
+            return True
+        view = self._views.get(viewNo)
+        if view is None:
+            return False
+        return view[0] <= ppSeqNo <= view[1] or ppSeqNo in view[2]
+
+    def __bool__(self):
+        return self.last is not None
+
+    def __repr__(self):
+        views = {v: (s, e, list(o)) for v, (s, e, o) in self._views.items()}
+        return "{}(stableTill={}, last={}, views={})".format(
+            self.__class__.__name__, self.stableTill, self.last, views)
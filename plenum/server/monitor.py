@@ -5,15 +5,16 @@ from typing import Dict, Iterable, Optional
 from typing import List
 from typing import Tuple
 
-import psutil
-
 from plenum.common.config_util import getConfig
+from plenum.common.perf_util import HandlerTimings
+from plenum.common.system_metrics import SystemMetricsSampler
 from stp_core.common.log import getlogger
 from plenum.common.types import EVENT_REQ_ORDERED, EVENT_NODE_STARTED, \
     EVENT_PERIODIC_STATS_THROUGHPUT, PLUGIN_TYPE_STATS_CONSUMER, \
     EVENT_VIEW_CHANGE, EVENT_PERIODIC_STATS_LATENCIES, \
     EVENT_PERIODIC_STATS_NODES, EVENT_PERIODIC_STATS_TOTAL_REQUESTS,\
-    EVENT_PERIODIC_STATS_NODE_INFO, EVENT_PERIODIC_STATS_SYSTEM_PERFORMANCE_INFO
+    EVENT_PERIODIC_STATS_NODE_INFO, EVENT_PERIODIC_STATS_SYSTEM_PERFORMANCE_INFO, \
+    EVENT_PERIODIC_STATS_HANDLER_TIMINGS
 from plenum.server.blacklister import Blacklister
 from plenum.server.has_action_queue import HasActionQueue
 from plenum.server.instances import Instances
@@ -39,13 +40,15 @@ class Monitor(HasActionQueue, PluginLoaderHelper):
                  instances: Instances, nodestack,
                  blacklister: Blacklister, nodeInfo: Dict,
                  notifierEventTriggeringConfig: Dict,
-                 pluginPaths: Iterable[str]=None):
+                 pluginPaths: Iterable[str]=None,
+                 handlerTimings: HandlerTimings=None):
         self.name = name
         self.instances = instances
         self.nodestack = nodestack
         self.blacklister = blacklister
         self.nodeInfo = nodeInfo
         self.notifierEventTriggeringConfig = notifierEventTriggeringConfig
+        self.handlerTimings = handlerTimings
 
         self.Delta = Delta
         self.Lambda = Lambda
@@ -112,8 +115,11 @@ class Monitor(HasActionQueue, PluginLoaderHelper):
             'accum': []
         }
 
-        psutil.cpu_percent(interval=None)
-        self.lastKnownTraffic = self.calculateTraffic()
+        # Metrics of the host and of the node's process, sampled by a thread
+        # of its own once started
+        self.systemMetrics = SystemMetricsSampler(
+            config.SystemMetricsSamplingPeriod)
+        self.lastKnownTraffic = self.systemMetrics.snapshot.trafficKb
 
         self.totalViewChanges = 0
         self._lastPostedViewChange = 0
@@ -132,6 +138,20 @@ class Monitor(HasActionQueue, PluginLoaderHelper):
     def __repr__(self):
         return self.name
 
+    def memoryContainers(self):
+        """
+        Name and container of everything the monitor keeps for requests or
+        clients, for memory accounting
+        """
+        yield 'requestOrderingStarted', self.requestOrderingStarted
+        yield 'masterReqLatencies', self.masterReqLatencies
+        for latencies in self.clientAvgReqLatencies:
+            yield 'clientAvgReqLatencies', latencies
+        yield 'orderedRequestsInLast', self.orderedRequestsInLast
+        yield 'latenciesByMasterInLast', self.latenciesByMasterInLast
+        for latencies in self.latenciesByBackupsInLast.values():
+            yield 'latenciesByBackupsInLast', latencies
+
     def metrics(self):
         """
         Calculate and return the metrics.
@@ -167,10 +187,7 @@ class Monitor(HasActionQueue, PluginLoaderHelper):
         return "\n            ".join(rendered)
 
     def calculateTraffic(self):
-        currNetwork = psutil.net_io_counters()
-        currNetwork = currNetwork.bytes_sent + currNetwork.bytes_recv
-        currNetwork /= 1024
-        return currNetwork
+        return self.systemMetrics.latest().trafficKb
 
     def reset(self):
         """
@@ -420,6 +437,7 @@ class Monitor(HasActionQueue, PluginLoaderHelper):
         self.sendNodeInfo()
         self.sendSystemPerfomanceInfo()
         self.sendTotalRequests()
+        self.sendHandlerTimings()
 
     def checkPerformance(self):
         self.sendClusterThroughputSpike()
@@ -531,30 +549,45 @@ class Monitor(HasActionQueue, PluginLoaderHelper):
 
         self._sendStatsDataIfRequired(EVENT_PERIODIC_STATS_TOTAL_REQUESTS, totalRequests)
 
+    def sendHandlerTimings(self):
+        if self.handlerTimings is None or not self.handlerTimings.enabled:
+            return
+        logger.debug("{} sending handler timings".format(self))
+        handlerTimings = dict(
+            nodeName=self.name,
+            timings=self.handlerTimings.asDict()
+        )
+        self._sendStatsDataIfRequired(EVENT_PERIODIC_STATS_HANDLER_TIMINGS,
+                                      handlerTimings)
+
     def captureSystemPerformance(self):
         logger.debug("{} capturing system performance".format(self))
-        timestamp = time.time()
-        cpu = psutil.cpu_percent(interval=None)
-        ram = psutil.virtual_memory()
-        curr_network = self.calculateTraffic()
+        metrics = self.systemMetrics.latest()
+        timestamp = metrics.time
+        curr_network = metrics.trafficKb
         network = curr_network - self.lastKnownTraffic
         self.lastKnownTraffic = curr_network
         cpu_data = {
             'time': timestamp,
-            'value': cpu
+            'value': metrics.cpuPercent
         }
         ram_data = {
             'time': timestamp,
-            'value': ram.percent
+            'value': metrics.ramPercent
         }
         traffic_data = {
             'time': timestamp,
             'value': network
         }
+        process_data = {
+            'time': timestamp,
+            'value': metrics.process._asdict()
+        }
         return {
             'cpu': cpu_data,
             'ram': ram_data,
-            'traffic': traffic_data
+            'traffic': traffic_data,
+            'process': process_data
         }
 
     def postOnReqOrdered(self):
@@ -1,5 +1,6 @@
 import asyncio
 import json
+import logging
 import os
 import random
 import shutil
@@ -32,10 +33,13 @@ from plenum.common.exceptions import SuspiciousNode, SuspiciousClient, \
     InvalidClientMessageException, KeysNotFoundException as REx, BlowUp
 from plenum.common.has_file_storage import HasFileStorage
 from plenum.common.keygen_utils import areKeysSetup
-from plenum.common.ledger import Ledger
+from plenum.common.ledger import Ledger, ensureDurabilityOnWrite
 from plenum.common.ledger_manager import LedgerManager
+from plenum.common.memory_accounting import MemoryAccounting
 from plenum.common.message_processor import MessageProcessor
 from plenum.common.motor import Motor
+from plenum.common.perf_util import HandlerTimings
+from plenum.common.system_metrics import systemMetricsAsDict
 from plenum.common.plugin_helper import loadPlugins
 from plenum.common.request import Request, SafeRequest
 from plenum.common.roles import Roles
@@ -54,17 +58,21 @@ from plenum.common.types import Propagate, \
     Reject
 from plenum.common.util import friendlyEx, getMaxFailures, pop_keys
 from plenum.common.verifier import DidVerifier
+from plenum.persistence.cached_state import CachedState, cacheState
 from plenum.persistence.leveldb_hash_store import LevelDbHashStore
 from plenum.persistence.req_id_to_txn import ReqIdrToTxn
+from plenum.persistence.state_markers import StateMarkers
 
 from plenum.persistence.storage import Storage, initStorage, initKeyValueStorage
 from plenum.persistence.util import txnsWithMerkleInfo
 from plenum.server import primary_elector
 from plenum.server import replica
+from plenum.server.replica_process import RemoteReplica
 from plenum.server.blacklister import Blacklister
 from plenum.server.blacklister import SimpleBlacklister
 from plenum.server.client_authn import ClientAuthNr, SimpleAuthNr
 from plenum.server.domain_req_handler import DomainRequestHandler
+from plenum.server.group_commit import GroupCommit
 from plenum.server.has_action_queue import HasActionQueue
 from plenum.server.instances import Instances
 from plenum.server.models import InstanceChanges
@@ -80,7 +88,8 @@ from plenum.server.propagator import Propagator
 from plenum.server.router import Router
 from plenum.server.suspicion_codes import Suspicions
 from state.pruning_state import PruningState
-from stp_core.common.log import getlogger
+from state.trie.pruning_trie import BLANK_ROOT
+from plenum.common.lazy_log import getlogger
 from stp_core.crypto.signer import Signer
 from stp_core.network.network_interface import NetworkInterface
 from stp_core.ratchet import Ratchet
@@ -148,16 +157,28 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
 
         self.primaryStorage = storage or self.getPrimaryStorage()
         self.states = {}  # type: Dict[int, State]
+        self.stateMarkers = self.loadStateMarkers()
 
+        # Time taken (in seconds) by each phase of node initialisation
+        self.startupTimings = OrderedDict()  # type: OrderedDict[str, float]
+
+        start = time.perf_counter()
         self.states[DOMAIN_LEDGER_ID] = self.loadDomainState()
         self.reqHandler = self.getDomainReqHandler()
         self.initDomainState()
+        self.startupTimings['domainState'] = time.perf_counter() - start
 
         self.clientAuthNr = clientAuthNr or self.defaultAuthNr()
 
+        start = time.perf_counter()
         self.addGenesisNyms()
+        self.startupTimings['genesisNyms'] = time.perf_counter() - start
 
+        start = time.perf_counter()
         self.initPoolManager(nodeRegistry, ha, cliname, cliha)
+        self.startupTimings['poolManager'] = time.perf_counter() - start
+        logger.info("{} startup timings: {}".
+                    format(self, dict(self.startupTimings)))
 
         if isinstance(self.poolManager, RegistryPoolManager):
             self.mode = Mode.discovered
@@ -205,6 +226,11 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
             'data': {}
         }
 
+        # Time taken by the handlers of each type of message and by each
+        # phase of `prod`, when enabled
+        self.handlerTimings = HandlerTimings(
+            enabled=self.config.HandlerTimingsEnabled)
+
         self.instances = Instances()
         # QUESTION: Why does the monitor need blacklister?
         self.monitor = Monitor(self.name,
@@ -217,7 +243,8 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
                                nodeInfo=self.nodeInfo,
                                notifierEventTriggeringConfig=self.
                                config.notifierEventTriggeringConfig,
-                               pluginPaths=pluginPaths)
+                               pluginPaths=pluginPaths,
+                               handlerTimings=self.handlerTimings)
 
         self.replicas = []  # type: List[replica.Replica]
         # Requests that are to be given to the replicas by the node. Each
@@ -255,8 +282,8 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
                           [Nomination, Primary, Reelection])
 
         nodeRoutes.extend((msgTyp, self.sendToReplica) for msgTyp in
-                          [PrePrepare, Prepare, Commit, Checkpoint,
-                           ThreePCState])
+                          [PrePrepare, Prepare, Commit, Checkpoint])
+        nodeRoutes.append((ThreePCState, self.sendThreePCStateToReplica))
 
         self.perfCheckFreq = self.config.PerfCheckFreq
         self.nodeRequestSpikeMonitorData = {
@@ -272,6 +299,19 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
                             .notifierEventTriggeringConfig[
                                 'nodeRequestSpike']['freq'])
 
+        # Replies wait for the ledgers to be synced to disk once for many
+        # batches, when enabled
+        self.groupCommit = GroupCommit(
+            window=self.config.LedgerGroupCommitWindow) \
+            if self.config.LedgerGroupCommit else None
+
+        self.memoryAccounting = MemoryAccounting(
+            sampleSize=self.config.MemoryAccountingSampleSize,
+            resampleEvery=self.config.MemoryAccountingResampleEvery)
+        if self.config.MemoryAccountingFreq:
+            self.startRepeating(self.accountMemory,
+                                self.config.MemoryAccountingFreq)
+
         self.initInsChngThrottling()
 
         # BE CAREFUL HERE
@@ -301,12 +341,14 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
             (CatchupRep, self.ledgerManager.processCatchupRep)
         ])
 
-        self.nodeMsgRouter = Router(*nodeRoutes)
+        self.nodeMsgRouter = Router(*nodeRoutes,
+                                    timings=self.handlerTimings, name='node')
 
         self.clientMsgRouter = Router(
             (Request, self.processRequest),
             (LedgerStatus, self.ledgerManager.processLedgerStatus),
             (CatchupReq, self.ledgerManager.processCatchupReq),
+            timings=self.handlerTimings, name='client'
         )
 
         # Ordered requests received from replicas while the node was not
@@ -329,7 +371,7 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
         self.lost_primary_at = None
 
         tp = loadPlugins(self.basedirpath)
-        logger.debug("total plugins loaded in node: {}".format(tp))
+        logger.debug("total plugins loaded in node: {}", tp)
         # TODO: this is already happening in `start`, why here then?
         self.logNodeInfo()
         self._id = None
@@ -376,6 +418,14 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
                 self.config.seqNoDbName)
         )
 
+    def loadStateMarkers(self):
+        return StateMarkers(
+            initKeyValueStorage(
+                self.config.stateMarkersStorage,
+                self.dataLocation,
+                self.config.stateMarkersDbName)
+        )
+
     # noinspection PyAttributeOutsideInit
     def setF(self):
         nodeNames = set(self.nodeReg.keys())
@@ -447,15 +497,16 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
                                        self.config.domainTransactionsFile)
             if not os.path.exists(defaultTxnFile):
                 logger.debug("Not using default initialization file for "
-                             "domain ledger, since it does not exist: {}"
-                             .format(defaultTxnFile))
+                             "domain ledger, since it does not exist: {}",
+                             defaultTxnFile)
                 defaultTxnFile = None
 
             return Ledger(CompactMerkleTree(hashStore=self.hashStore),
                           dataDir=self.dataLocation,
                           serializer=CompactSerializer(fields=fields),
                           fileName=self.config.domainTransactionsFile,
-                          ensureDurability=self.config.EnsureLedgerDurability,
+                          ensureDurability=ensureDurabilityOnWrite(
+                              self.config),
                           defaultFile=defaultTxnFile)
         else:
             # TODO: we need to rethink this functionality
@@ -487,7 +538,8 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
                                     self.domainLedger,
                                     preCatchupStartClbk=self.preDomainLedgerCatchUp,
                                     postCatchupCompleteClbk=self.postDomainLedgerCaughtUp,
-                                    postTxnAddedToLedgerClbk=self.postTxnFromCatchupAddedToLedger)
+                                    postTxnAddedToLedgerClbk=self.postTxnFromCatchupAddedToLedger,
+                                    postTxnsAddedToLedgerClbk=self.postTxnsFromCatchupAddedToLedger)
         self.on_new_ledger_added(DOMAIN_LEDGER_ID)
         if isinstance(self.poolManager, TxnPoolManager):
             self.ledgerManager.addLedger(POOL_LEDGER_ID, self.poolLedger,
@@ -503,12 +555,13 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
                 r.requestQueues[ledger_id] = OrderedSet()
 
     def loadDomainState(self):
-        return PruningState(
-            initKeyValueStorage(
-                self.config.domainStateStorage,
-                self.dataLocation,
-                self.config.domainStateDbName)
-        )
+        return cacheState(
+            PruningState(
+                initKeyValueStorage(
+                    self.config.domainStateStorage,
+                    self.dataLocation,
+                    self.config.domainStateDbName)),
+            self.config.StateCacheSize)
 
     @classmethod
     def ledgerIdForRequest(cls, request: Request):
@@ -523,9 +576,10 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
                         format(self, self.status.name))
         else:
             super().start(loop)
+            self.monitor.systemMetrics.start()
             self.primaryStorage.start(loop,
                                       ensureDurability=
-                                      self.config.EnsureLedgerDurability)
+                                      ensureDurabilityOnWrite(self.config))
             if self.hashStore.closed:
                 self.hashStore = self.getHashStore(self.name)
 
@@ -581,6 +635,11 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
         # Log stats should happen before any kind of reset or clearing
         self.logstats()
 
+        # Replies of the batches already committed are not held back anymore
+        self.flushGroupCommit(force=True)
+
+        self.monitor.systemMetrics.stop()
+
         self.reset()
 
         # Stop the ledgers
@@ -616,6 +675,11 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
         self.nodestack.stop()
         self.clientstack.stop()
 
+        # Replicas in worker processes are started again when serviced
+        for r in self.replicas:
+            if isinstance(r, RemoteReplica):
+                r.stop()
+
         self.closeAllKVStores()
 
         self.mode = None
@@ -634,12 +698,14 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
                 state.close()
         if self.seqNoDB:
             self.seqNoDB.close()
+        if self.stateMarkers:
+            self.stateMarkers.close()
 
     def reset(self):
         logger.info("{} reseting...".format(self), extra={"cli": False})
         self.nodestack.nextCheck = 0
-        logger.debug("{} clearing aqStash of size {}".format(self,
-                                                             len(self.aqStash)))
+        logger.debug("{} clearing aqStash of size {}", self,
+                     len(self.aqStash))
         self.nodestack.conns.clear()
         # TODO: Should `self.clientstack.conns` be cleared too
         # self.clientstack.conns.clear()
@@ -657,14 +723,26 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
         """
         c = 0
         if self.status is not Status.stopped:
+            timings = self.handlerTimings
+            t = timings.clock()
             c += await self.serviceReplicas(limit)
+            t = timings.lap('prod.serviceReplicas', t)
             c += await self.serviceNodeMsgs(limit)
+            t = timings.lap('prod.serviceNodeMsgs', t)
             c += await self.serviceClientMsgs(limit)
+            t = timings.lap('prod.serviceClientMsgs', t)
             c += self._serviceActions()
+            t = timings.lap('prod.actions', t)
             c += self.ledgerManager.service()
+            t = timings.lap('prod.ledgerManager', t)
             c += self.monitor._serviceActions()
+            t = timings.lap('prod.monitor', t)
             c += await self.serviceElector()
+            t = timings.lap('prod.serviceElector', t)
+            self.flushGroupCommit()
+            t = timings.lap('prod.groupCommit', t)
             self.nodestack.flushOutBoxes()
+            timings.lap('prod.flushOutBoxes', t)
         if self.isGoing():
             self.nodestack.serviceLifecycle()
             self.clientstack.serviceClientStack()
@@ -742,7 +820,7 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
         if self.master_primary in joined:
             self.lost_primary_at = None
         if self.master_primary in left:
-            logger.debug('{} lost connection to primary of master'.format(self))
+            logger.debug('{} lost connection to primary of master', self)
             self.lost_master_primary()
 
         if self.isReady():
@@ -751,20 +829,25 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
             # otherwise too?
             if isinstance(self.elector, PrimaryElector) and joined:
                 msgs = self.elector.getElectionMsgsForLaggedNodes()
-                logger.debug("{} has msgs {} for new nodes {}".
-                             format(self, msgs, joined))
+                logger.debug("{} has msgs {} for new nodes {}",
+                             self, msgs, joined)
                 for joinedNode in joined:
                     self.sendElectionMsgsToLaggingNode(joinedNode, msgs)
                     # Communicate current view number if any view change
                     # happened to the connected node
                     if self.viewNo > 0:
-                        logger.debug("{} communicating view number {} to {}"
-                                     .format(self, self.viewNo-1, joinedNode))
+                        logger.debug("{} communicating view number {} to {}",
+                                     self, self.viewNo-1, joinedNode)
                         rid = self.nodestack.getRemote(joinedNode).uid
                         self.send(
                             self._create_instance_change_msg(self.viewNo, 0),
                             rid)
 
+        for n in left:
+            self.nodestack.forgetCodecs(n)
+        for n in joined:
+            self.nodestack.advertiseCodecs(n)
+
         # Send ledger status whether ready (connected to enough nodes) or not
         for n in joined:
             self.send_ledger_status_to_newly_connected_node(n)
@@ -792,8 +875,8 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
         self.adjustReplicas()
 
     def sendPoolInfoToClients(self, txn):
-        logger.debug("{} sending new node info {} to all clients".format(self,
-                                                                         txn))
+        logger.debug("{} sending new node info {} to all clients", self,
+                     txn)
         msg = PoolLedgerTxns(txn)
         self.clientstack.transmitToClients(msg,
                                            list(self.clientstack.connectedClients))
@@ -812,8 +895,8 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
     def sendElectionMsgsToLaggingNode(self, nodeName: str, msgs: List[Any]):
         rid = self.nodestack.getRemote(nodeName).uid
         for msg in msgs:
-            logger.debug("{} sending election message {} to lagged node {}".
-                         format(self, msg, nodeName))
+            logger.debug("{} sending election message {} to lagged node {}",
+                         self, msg, nodeName)
             self.send(msg, rid)
 
     def _statusChanged(self, old: Status, new: Status) -> None:
@@ -834,8 +917,8 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
         established.
         """
         logger.debug("{} choosing to start election on the basis of count {} "
-                     "and nodes {}".format(self, self.connectedNodeCount,
-                                           self.nodestack.conns))
+                     "and nodes {}", self, self.connectedNodeCount,
+                     self.nodestack.conns)
         self._schedule(self.decidePrimaries)
 
     def adjustReplicas(self):
@@ -876,8 +959,8 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
                                          "{}".format(instId),
                              logMethod=logger.warn)
             i += 1
-        logger.debug("{} processed {} stashed msgs for replica {}".
-                     format(self, i, instId))
+        logger.debug("{} processed {} stashed msgs for replica {}",
+                     self, i, instId)
 
     def processStashedMsgsForView(self, view_no: int):
         if view_no not in self.msgsForFutureViews:
@@ -890,8 +973,8 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
                                          "{}".format(view_no),
                              logMethod=logger.warn)
             i += 1
-        logger.debug("{} processed {} stashed msgs for view no {}".
-                     format(self, i, view_no))
+        logger.debug("{} processed {} stashed msgs for view no {}",
+                     self, i, view_no)
 
     def decidePrimaries(self):
         """
@@ -909,8 +992,11 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
         :param instId: protocol instance number
         :param isMaster: does this replica belong to the master protocol
             instance?
-        :return: a new instance of Replica
+        :return: a new instance of Replica, or of RemoteReplica for a backup
+            instance if backup replicas run in worker processes
         """
+        if not isMaster and self.config.BackupReplicasInProcesses:
+            return RemoteReplica(self, instId)
         return replica.Replica(self, instId, isMaster)
 
     def addReplica(self):
@@ -939,6 +1025,8 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
         replica = self.replicas[-1]
         self.replicas = self.replicas[:-1]
         self.msgsToReplicas = self.msgsToReplicas[:-1]
+        if isinstance(replica, RemoteReplica):
+            replica.stop()
         self.monitor.addInstance()
         logger.display("{} removed replica {} from instance {}".
                        format(self, replica, replica.instId),
@@ -977,7 +1065,8 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
                 if isinstance(msg, (PrePrepare,
                                     Prepare,
                                     Commit,
-                                    Checkpoint)):
+                                    Checkpoint,
+                                    ThreePCState)):
                     self.send(msg)
                 elif isinstance(msg, Ordered):
                     # Checking for request in received catchup replies as a
@@ -988,8 +1077,8 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
                     if self.isParticipating and not recvd:
                         self.processOrdered(msg)
                     else:
-                        logger.debug("{} stashing {} since mode is {} and {}".
-                                     format(self, msg, self.mode, recvd))
+                        logger.debug("{} stashing {} since mode is {} and {}",
+                                     self, msg, self.mode, recvd)
                         self.stashedOrderedReqs.append(msg)
                 elif isinstance(msg, Reject):
                     reqKey = (msg.identifier, msg.reqId)
@@ -1105,7 +1194,7 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
                 self.msgsForFutureReplicas[instId] = deque()
             self.msgsForFutureReplicas[instId].append((msg, frm))
             logger.debug("{} queueing message {} for future protocol "
-                         "instance {}".format(self, msg, instId))
+                         "instance {}", self, msg, instId)
             return False
         return True
 
@@ -1141,6 +1230,18 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
                 self.msgHasAcceptableViewNo(msg, frm):
             self.msgsToReplicas[msg.instId].append((msg, frm))
 
+    def sendThreePCStateToReplica(self, msg: ThreePCState, frm):
+        """
+        Send the 3 phase state of a node to the intended replica. It has no
+        view number, it is about the views before the one the sender changed
+        to.
+
+        :param msg: the message to send
+        :param frm: the name of the node which sent this `msg`
+        """
+        if self.msgHasAcceptableInstId(msg, frm):
+            self.msgsToReplicas[msg.instId].append((msg, frm))
+
     def sendToElector(self, msg, frm):
         """
         Send the message to the intended elector.
@@ -1150,8 +1251,8 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
         """
         if self.msgHasAcceptableInstId(msg, frm) and \
                 self.msgHasAcceptableViewNo(msg, frm):
-            logger.debug("{} sending message to elector: {}".
-                         format(self, (msg, frm)))
+            logger.debug("{} sending message to elector: {}",
+                         self, (msg, frm))
             self.msgsToElector.append((msg, frm))
 
     def handleOneNodeMsg(self, wrappedMsg):
@@ -1204,8 +1305,8 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
             self.verifySignature(cMsg)
         except BaseExc as ex:
             raise SuspiciousNode(frm, ex, cMsg) from ex
-        logger.debug("{} received node message from {}: {}".
-                     format(self, frm, cMsg),
+        logger.debug("{} received node message from {}: {}",
+                     self, frm, cMsg,
                      extra={"cli": False})
         return cMsg, frm
 
@@ -1218,9 +1319,15 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
         :param frm: the name of the node that sent this `msg`
         """
         if isinstance(msg, Batch):
-            logger.debug("{} processing a batch {}".format(self, msg))
+            logger.debug("{} processing a batch {}", self, msg)
             for m in msg.messages:
-                m = self.nodestack.deserializeMsg(m)
+                # A message which cannot be deserialized is discarded
+                # alone, not with the rest of the batch
+                try:
+                    m = self.nodestack.deserializeMsg(m)
+                except Exception as ex:
+                    self.discard(m, ex)
+                    continue
                 self.handleOneNodeMsg((m, frm))
         else:
             self.postToNodeInBox(msg, frm)
@@ -1232,7 +1339,8 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
         :param msg: a node message
         :param frm: the name of the node that sent this `msg`
         """
-        logger.debug("{} appending to nodeInbox {}".format(self, msg))
+        logger.debugSampled(self.config.HighRateDebugLogSampleEvery,
+                            "{} appending to nodeInbox {}", self, msg)
         self.nodeInBox.append((msg, frm))
 
     async def processNodeInBox(self):
@@ -1332,8 +1440,8 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
             #     raise
             # except Exception as ex:
             #     raise SuspiciousClient from ex
-        logger.trace("{} received CLIENT message: {}".
-                     format(self.clientstack.name, cMsg))
+        logger.trace("{} received CLIENT message: {}",
+                     self.clientstack.name, cMsg)
         return cMsg, frm
 
     def unpackClientMsg(self, msg, frm):
@@ -1430,11 +1538,32 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
             rh.updateState([txn], isCommitted=True)
             state = self.getState(ledgerId)
             state.commit(rootHash=state.headHash)
+            self.recordStateMarker(ledgerId, txn[F.seqNo.name])
         self.updateSeqNoMap([txn])
 
+    def postTxnsFromCatchupAddedToLedger(self, ledgerId: int, txns: List):
+        """
+        Batched version of `postTxnFromCatchupAddedToLedger`, the state is
+        updated with all the txns and committed once.
+        """
+        self.reqsFromCatchupReplies.update((txn.get(f.IDENTIFIER.nm),
+                                            txn.get(f.REQ_ID.nm))
+                                           for txn in txns)
+        rh = None
+        for txn in txns:
+            rh = self.postRecvTxnFromCatchup(ledgerId, txn)
+        if rh:
+            rh.updateState(txns, isCommitted=True)
+            state = self.getState(ledgerId)
+            state.commit(rootHash=state.headHash)
+            self.recordStateMarker(ledgerId, txns[-1][F.seqNo.name])
+        self.updateSeqNoMap(txns)
+
     def postRecvTxnFromCatchup(self, ledgerId: int, txn: Any):
         rh = None
         if ledgerId == POOL_LEDGER_ID:
+            # The request handler only reads the index of the pool's nodes
+            self.poolManager.poolMembership.catchUp(self.poolManager.ledger)
             self.poolManager.onPoolMembershipChange(txn)
             rh = self.poolManager.reqHandler
         if ledgerId == DOMAIN_LEDGER_ID:
@@ -1459,6 +1588,15 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
     def getState(self, ledgerId):
         return self.states.get(ledgerId)
 
+    @property
+    def stateCacheStats(self):
+        """
+        Statistics of the cache of each ledger's state which has one
+        """
+        return {ledgerId: state.stats.asDict()
+                for ledgerId, state in self.states.items()
+                if isinstance(state, CachedState)}
+
     def post_txn_from_catchup_added_to_domain_ledger(self, txn):
         if txn.get(TXN_TYPE) == NYM:
             self.addNewRole(txn)
@@ -1481,8 +1619,8 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
             rid = self.nodestack.getRemote(nodeName).uid
             self.send(ledgerStatus, rid)
         else:
-            logger.debug("{} not sending ledger {} status to {} as it is null"
-                         .format(self, ledgerId, nodeName))
+            logger.debug("{} not sending ledger {} status to {} as it is null",
+                         self, ledgerId, nodeName)
 
     def doStaticValidation(self, identifier, reqId, operation):
         if TXN_TYPE not in operation:
@@ -1533,8 +1671,8 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
         :param request: the REQUEST from the client
         :param frm: the name of the client that sent this REQUEST
         """
-        logger.debug("{} received client request: {} from {}".
-                     format(self.name, request, frm))
+        logger.debug("{} received client request: {} from {}",
+                     self.name, request, frm)
         self.nodeRequestSpikeMonitorData['accum'] += 1
 
         # TODO: What if client sends requests with same request id quickly so
@@ -1555,8 +1693,15 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
         reply = self.getReplyFromLedger(ledger, request)
         if reply:
             logger.debug("{} returning REPLY from already processed "
-                         "REQUEST: {}".format(self, request))
-            self.transmitToClient(reply, frm)
+                         "REQUEST: {}", self, request)
+            if self.groupCommit is not None:
+                # The txn might not be synced to disk yet, the reply waits
+                # for the next sync like those of newly ordered requests
+                if not self.isProcessingReq(*request.key):
+                    self.startedProcessingReq(*request.key, frm)
+                self.groupCommit.add([(reply, request.key)])
+            else:
+                self.transmitToClient(reply, frm)
         else:
             if not self.isProcessingReq(*request.key):
                 self.startedProcessingReq(*request.key, frm)
@@ -1577,10 +1722,11 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
         :param msg: the propagateRequest
         :param frm: the name of the node which sent this `msg`
         """
-        logger.debug("Node {} received propagated request: {}".
-                     format(self.name, msg))
+        logger.debug("Node {} received propagated request: {}",
+                     self.name, msg)
         reqDict = msg.request
-        request = SafeRequest(**reqDict)
+        request = self.requests.sameRequest(reqDict) or \
+            SafeRequest(**reqDict)
 
         clientName = msg.senderClient
 
@@ -1625,8 +1771,8 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
             reqs = [self.requests[i, r].finalised for (i, r) in req_idrs
                     if (i, r) in self.requests and self.requests[i, r].finalised]
             if len(reqs) == len(req_idrs):
-                logger.debug("{} executing Ordered batch {} {} of {} requests".
-                             format(self.name, view_no, pp_seq_no, len(req_idrs)))
+                logger.debug("{} executing Ordered batch {} {} of {} requests",
+                             self.name, view_no, pp_seq_no, len(req_idrs))
                 self.executeBatch(pp_seq_no, pp_time, reqs, ledger_id, state_root,
                                   txn_root)
                 r = True
@@ -1636,8 +1782,8 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
                                                       len(reqs)))
                 return None
         else:
-            logger.trace("{} got ordered requests from backup replica {}".
-                         format(self, inst_id))
+            logger.trace("{} got ordered requests from backup replica {}",
+                         self, inst_id)
             r = False
         self.monitor.requestOrdered(req_idrs, inst_id, byMaster=r)
         return r
@@ -1658,8 +1804,8 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
         :param instChg: the instance change request
         :param frm: the name of the node that sent this `msg`
         """
-        logger.debug("{} received instance change request: {} from {}".
-                     format(self, instChg, frm))
+        logger.debug("{} received instance change request: {} from {}",
+                     self, instChg, frm)
 
         # TODO: add sender to blacklist?
         if not isinstance(instChg.viewNo, int):
@@ -1688,7 +1834,7 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
                 logger.debug(
                     "{} received instance change message {} but did not "
                     "find the master to be slow or has already sent an instance"
-                    " change message".format(self, instChg))
+                    " change message", self, instChg)
 
     def do_view_change_if_possible(self, view_no):
         # TODO: Need to handle skewed distributions which can arise due to
@@ -1707,7 +1853,7 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
         Check if master instance is slow and send an instance change request.
         :returns True if master performance is OK, otherwise False
         """
-        logger.trace("{} checking its performance".format(self))
+        logger.trace("{} checking its performance", self)
 
         # Move ahead only if the node has synchronized its state with other
         # nodes
@@ -1719,16 +1865,16 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
             if self.monitor.isMasterDegraded():
                 self.sendInstanceChange(self.viewNo+1)
                 logger.debug('{} sent view change since performance degraded '
-                             'of master instance'.format(self))
+                             'of master instance', self)
                 self.do_view_change_if_possible(self.viewNo+1)
                 return False
             else:
-                logger.debug("{}'s master has higher performance than backups".
-                             format(self))
+                logger.debug("{}'s master has higher performance than backups",
+                             self)
         return True
 
     def checkNodeRequestSpike(self):
-        logger.debug("{} checking its request amount".format(self))
+        logger.debug("{} checking its request amount", self)
 
         if not self.isParticipating:
             return
@@ -1780,8 +1926,8 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
             self.send(msg)
             self._record_inst_change_msg(msg, self.name)
         else:
-            logger.debug("{} cannot send instance change sooner then {} seconds"
-                         .format(self, cooldown))
+            logger.debug("{} cannot send instance change sooner then {} seconds",
+                         self, cooldown)
 
     # noinspection PyAttributeOutsideInit
     def initInsChngThrottling(self):
@@ -1829,7 +1975,7 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
             self.sendInstanceChange(view_no,
                                     Suspicions.PRIMARY_DISCONNECTED)
             logger.debug('{} sent view change since was disconnected '
-                         'from primary for too long'.format(self))
+                         'from primary for too long', self)
             self.do_view_change_if_possible(view_no)
 
     # TODO: consider moving this to pool manager
@@ -1841,8 +1987,8 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
         """
         self.lost_primary_at = time.perf_counter()
 
-        logger.debug('{} scheduling a view change in {} sec'.
-                     format(self, self.config.ToleratePrimaryDisconnection))
+        logger.debug('{} scheduling a view change in {} sec',
+                     self, self.config.ToleratePrimaryDisconnection)
         self._schedule(self.propose_view_change,
                        self.config.ToleratePrimaryDisconnection)
 
@@ -1855,9 +2001,14 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
         """
         self.view_change_in_progress = True
         self.viewNo = proposedViewNo
-        logger.debug("{} resetting monitor stats after view change".
-                     format(self))
+        logger.debug("{} resetting monitor stats after view change",
+                     self)
         self.monitor.reset()
+        if self.config.ViewChangePreparedCertificates:
+            # Replicas send what they prepared in the earlier views before
+            # any message of the new view is processed
+            for replica in self.replicas:
+                replica.on_view_change_start()
         self.processStashedMsgsForView(proposedViewNo)
         # Now communicate the view change to the elector which will
         # contest primary elections across protocol all instances
@@ -1873,11 +2024,11 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
         the last ppSeqno and state and txn root for previous view
         """
         self.view_change_in_progress = False
-        self.instanceChanges.pop(view_no-1, None)
+        self.instanceChanges.pruneTill(view_no-1)
 
     def ordered_prev_view_msgs(self, inst_id, pp_seqno):
-        logger.debug('{} ordered previous view batch {} by instance {}'.
-                     format(self, pp_seqno, inst_id))
+        logger.debug('{} ordered previous view batch {} by instance {}',
+                     self, pp_seqno, inst_id)
 
     def verifySignature(self, msg):
         """
@@ -1892,14 +2043,20 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
         if isinstance(msg, Propagate):
             typ = 'propagate '
             req = msg.request
+            # Other nodes propagate the same request, which is serialised
+            # only for the first of them
+            known = self.requests.sameRequest(req)
+            serialized = known.signingBytes if known else None
         else:
             typ = ''
             req = msg
+            serialized = msg.signingBytes if isinstance(msg, Request) \
+                else None
 
         if not isinstance(req, Mapping):
             req = msg.as_dict
 
-        identifier = self.authNr(req).authenticate(req)
+        identifier = self.authNr(req).authenticate(req, serialized=serialized)
         logger.display("{} authenticated {} signature on {} request {}".
                        format(self, identifier, typ, req['reqId']),
                        extra={"cli": True,
@@ -1931,13 +2088,14 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
                                                        txnRoot)
         if committedTxns:
             lastTxnSeqNo = committedTxns[-1][F.seqNo.name]
+            self.recordStateMarker(ledgerId, lastTxnSeqNo)
             self.batchToSeqNos[ppSeqNo] = (ledgerId, lastTxnSeqNo)
-            logger.debug('{} storing ppSeqno {} for ledger {} seqNo {}'.
-                         format(self, ppSeqNo, ledgerId, lastTxnSeqNo))
+            logger.debug('{} storing ppSeqno {} for ledger {} seqNo {}',
+                         self, ppSeqNo, ledgerId, lastTxnSeqNo)
             if len(self.batchToSeqNos) > self.config.ProcessedBatchMapsToKeep:
                 x = self.batchToSeqNos.popitem(last=False)
-                logger.debug('{} popped {} from batch to txn seqNo map'.
-                             format(self, x))
+                logger.debug('{} popped {} from batch to txn seqNo map',
+                             self, x)
 
     def updateSeqNoMap(self, committedTxns):
         self.seqNoDB.addBatch((txn[f.IDENTIFIER.nm], txn[f.REQ_ID.nm],
@@ -1977,8 +2135,8 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
         elif ledgerId == DOMAIN_LEDGER_ID:
             self.reqHandler.onBatchCreated(stateRoot)
         else:
-            logger.debug('{} did not know how to handle for ledger {}'.
-                         format(self, ledgerId))
+            logger.debug('{} did not know how to handle for ledger {}',
+                         self, ledgerId)
 
     def onBatchRejected(self, ledgerId, stateRoot=None):
         """
@@ -1994,23 +2152,42 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
         elif ledgerId == DOMAIN_LEDGER_ID:
             self.reqHandler.onBatchRejected(stateRoot)
         else:
-            logger.debug('{} did not know how to handle for ledger {}'.
-                         format(self, ledgerId))
+            logger.debug('{} did not know how to handle for ledger {}',
+                         self, ledgerId)
 
     @classmethod
     def ledgerId(cls, txnType: str):
         return POOL_LEDGER_ID if txnType in POOL_TXN_TYPES else DOMAIN_LEDGER_ID
 
     def sendRepliesToClients(self, committedTxns, ppTime):
+        replies = []
         for txn in committedTxns:
             # TODO: Send txn and state proof to the client
             txn[TXN_TIME] = ppTime
-            self.sendReplyToClient(Reply(txn), (txn[f.IDENTIFIER.nm],
-                                                txn[f.REQ_ID.nm]))
+            replies.append((Reply(txn), (txn[f.IDENTIFIER.nm],
+                                         txn[f.REQ_ID.nm])))
+        if self.groupCommit is not None:
+            self.groupCommit.add(replies)
+            return
+        for reply, reqKey in replies:
+            self.sendReplyToClient(reply, reqKey)
+
+    def flushGroupCommit(self, force=False):
+        """
+        Sync the ledgers and send the replies held back for the batches
+        committed since the last sync, once the group commit window is over
+        """
+        if self.groupCommit is None or \
+                not (force or self.groupCommit.isDue()):
+            return
+        ledgers = [ledgerInfo.ledger for ledgerInfo in
+                   self.ledgerManager.ledgerRegistry.values()]
+        for reply, reqKey in self.groupCommit.flush(ledgers):
+            self.sendReplyToClient(reply, reqKey)
 
     def sendReplyToClient(self, reply, reqKey):
         if self.isProcessingReq(*reqKey):
-            logger.debug('{} sending reply for {} to client'.format(self, reqKey))
+            logger.debug('{} sending reply for {} to client', self, reqKey)
             self.transmitToClient(reply, self.requestSender[reqKey])
             self.doneProcessingReq(*reqKey)
 
@@ -2034,21 +2211,84 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
                                          verkey=v.verkey,
                                          role=role)
 
-    @staticmethod
-    def initStateFromLedger(state: State, ledger: Ledger, reqHandler):
-        # If the trie is empty then initialize it by applying
-        # txns from ledger
+    def initStateFromLedger(self, state: State, ledger: Ledger, reqHandler,
+                            ledgerId=None):
+        """
+        Bring the committed state up to date with the ledger. If the trie is
+        empty, all txns of the ledger are applied to it, otherwise only the
+        txns after the one recorded in the state marker of the ledger are
+        applied, provided the marker matches the committed state. If it does
+        not, or is ahead of the ledger, the state is rebuilt from all the
+        txns of the ledger.
+        """
+        marker = self.stateMarkers.get(ledgerId) \
+            if ledgerId is not None else None
+        rebuild = False
         if state.isEmpty:
-            txns = [_ for _ in ledger.getAllTxn().values()]
-            reqHandler.updateState(txns, isCommitted=True)
+            fromSeqNo = 1
+        elif marker is None:
+            # No marker persisted (the state was created before markers were
+            # introduced), the state is considered up to date with the ledger
+            fromSeqNo = ledger.size + 1
+        else:
+            seqNo, stateRoot = marker
+            if seqNo > ledger.size:
+                logger.error('{} found state marker of ledger {} at seqNo {} '
+                             'ahead of the ledger of size {}, rebuilding the '
+                             'state from the ledger'.
+                             format(self, ledgerId, seqNo, ledger.size))
+                rebuild = True
+            elif stateRoot != state.committedHeadHash:
+                # Either the state was committed but the node stopped before
+                # the marker could be recorded or the state is corrupt, which
+                # cannot be told apart
+                logger.error('{} found state marker of ledger {} at seqNo {} '
+                             'not matching the committed state, rebuilding '
+                             'the state from the ledger'.
+                             format(self, ledgerId, seqNo))
+                rebuild = True
+            else:
+                fromSeqNo = seqNo + 1
+        if rebuild:
+            # The txns are applied reading the committed state, so it is
+            # emptied too
+            state.revertToHead(BLANK_ROOT)
+            state.commit(rootHash=BLANK_ROOT)
+            fromSeqNo = 1
+
+        if fromSeqNo <= ledger.size:
+            logger.info('{} applying txns {} to {} of ledger {} to state'.
+                        format(self, fromSeqNo, ledger.size, ledgerId))
+            batchSize = self.config.StateRecoveryBatchSize
+            txns = []
+            for _, txn in ledger.iterTxns(fromSeqNo, batchSize=batchSize):
+                txns.append(txn)
+                if len(txns) == batchSize:
+                    reqHandler.updateState(txns, isCommitted=True)
+                    txns = []
+            if txns:
+                reqHandler.updateState(txns, isCommitted=True)
             state.commit(rootHash=state.headHash)
 
+        if ledgerId is not None:
+            self.recordStateMarker(ledgerId, ledger.size, state)
+
     def initDomainState(self):
         self.initStateFromLedger(self.states[DOMAIN_LEDGER_ID],
-                                 self.domainLedger, self.reqHandler)
+                                 self.domainLedger, self.reqHandler,
+                                 DOMAIN_LEDGER_ID)
+
+    def recordStateMarker(self, ledgerId, seqNo, state: State = None):
+        """
+        Record that txns till `seqNo` of the ledger have been applied to its
+        committed state
+        """
+        state = state if state is not None else self.getState(ledgerId)
+        self.stateMarkers.set(ledgerId, seqNo, state.committedHeadHash)
 
     def addGenesisNyms(self):
-        for _, txn in self.domainLedger.getAllTxn().items():
+        for _, txn in self.domainLedger.iterTxns(
+                batchSize=self.config.StateRecoveryBatchSize):
             if txn.get(TXN_TYPE) == NYM:
                 self.addNewRole(txn)
 
@@ -2062,20 +2302,20 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
             msg = self.stashedOrderedReqs.popleft()
             if msg.ppSeqNo <= self.ledgerManager.lastCaughtUpPpSeqNo:
                 logger.debug('{} ignoring stashed ordered msg {} since ledger '
-                             'manager has lastCaughtUpPpSeqNo as {}'.
-                             format(self, msg,
-                                    self.ledgerManager.lastCaughtUpPpSeqNo))
+                             'manager has lastCaughtUpPpSeqNo as {}',
+                             self, msg,
+                             self.ledgerManager.lastCaughtUpPpSeqNo)
                 continue
             if not self.gotInCatchupReplies(msg):
                 if msg.instId == 0:
-                    logger.debug('{} applying stashed Ordered msg {}'.
-                                 format(self, msg))
+                    logger.debug('{} applying stashed Ordered msg {}',
+                                 self, msg)
                     for reqKey in msg.reqIdr:
                         req = self.requests[reqKey].finalised
                         self.applyReq(req)
                 self.processOrdered(msg)
             i += 1
-        logger.debug("{} processed {} stashed ordered requests".format(self, i))
+        logger.debug("{} processed {} stashed ordered requests", self, i)
         # Resetting monitor after executing all stashed requests so no view
         # change can be proposed
         self.monitor.reset()
@@ -2211,17 +2451,20 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
         self.clientstack.transmitToClient(msg, remoteName)
 
     def send(self, msg: Any, *rids: Iterable[int], signer: Signer = None):
-        if rids:
-            remoteNames = [self.nodestack.remotes[rid].name for rid in rids]
-            recipientsNum = len(remoteNames)
-        else:
-            # so it is broadcast
-            remoteNames = [remote.name for remote in
-                           self.nodestack.remotes.values()]
-            recipientsNum = 'all'
-
-        logger.debug("{} sending message {} to {} recipients: {}"
-                     .format(self, msg, recipientsNum, remoteNames))
+        if logger.isEnabledFor(logging.DEBUG):
+            if rids:
+                remoteNames = [self.nodestack.remotes[rid].name
+                               for rid in rids]
+                recipientsNum = len(remoteNames)
+            else:
+                # so it is broadcast
+                remoteNames = [remote.name for remote in
+                               self.nodestack.remotes.values()]
+                recipientsNum = 'all'
+
+            logger.debugSampled(self.config.HighRateDebugLogSampleEvery,
+                                "{} sending message {} to {} recipients: {}",
+                                self, msg, recipientsNum, remoteNames)
         self.nodestack.send(msg, *rids, signer=signer)
 
     def getReplyFromLedger(self, ledger, request):
@@ -2258,6 +2501,44 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
     def __exit__(self, exc_type, exc_val, exc_tb):
         self.stop()
 
+    def memoryContainers(self):
+        """
+        Name and container of everything the node and its replicas, monitor
+        and ledgers keep which can grow with the load, for memory accounting
+        """
+        yield 'requests', self.requests
+        yield 'requestSender', self.requestSender
+        yield 'batchToSeqNos', self.batchToSeqNos
+        yield 'nodeInBox', self.nodeInBox
+        yield 'clientInBox', self.clientInBox
+        yield 'stashedOrderedReqs', self.stashedOrderedReqs
+        yield 'reqsFromCatchupReplies', self.reqsFromCatchupReplies
+        yield 'msgsForFutureViews', self.msgsForFutureViews
+        yield 'msgsForFutureReplicas', self.msgsForFutureReplicas
+        for msgs in self.msgsToReplicas:
+            yield 'msgsToReplicas', msgs
+        yield 'msgsToElector', self.msgsToElector
+        for msgs in self.nodestack.outBoxes.values():
+            yield 'nodestack.outBoxes', msgs
+        for name, container in self.clientstack.memoryContainers():
+            yield 'clientstack.{}'.format(name), container
+        if self.groupCommit is not None:
+            yield 'groupCommit.heldReplies', self.groupCommit.heldReplies
+        for replica in self.replicas:
+            for name, container in replica.memoryContainers():
+                yield 'replica{}.{}'.format(replica.instId, name), container
+        for name, container in self.monitor.memoryContainers():
+            yield 'monitor.{}'.format(name), container
+        for ledgerId, ledgerInfo in self.ledgerManager.ledgerRegistry.items():
+            yield 'ledger{}.uncommittedTxns'.format(ledgerId), \
+                ledgerInfo.ledger.uncommittedTxns
+
+    def accountMemory(self):
+        self.memoryAccounting.account(self.memoryContainers())
+        logger.info("{} estimates its containers take {} bytes, the most "
+                    "{}".format(self, self.memoryAccounting.totalBytes,
+                                self.memoryAccounting.top(5)))
+
     def logstats(self):
         """
         Print the node's current statistics to log.
@@ -2287,18 +2568,22 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
                     format(len(self.actionQueue), id(self.actionQueue)))
         l("action queue stash      : {} {}".
                     format(len(self.aqStash), id(self.aqStash)))
+        for ledgerId, stats in self.stateCacheStats.items():
+            l("state {} cache hit rate  : {} ({} trie reads saved)".
+                        format(ledgerId, stats['hitRate'],
+                               stats['savedTrieReads']))
+        l("estimated memory        : {}".
+                    format(self.memoryAccounting.totalBytes))
+        for name, stats in self.handlerTimings.top(10):
+            l("time in {:<16}: {:.3f}s for {} (max {:.6f}s)".
+                        format(name, stats.total, stats.count, stats.max))
 
         logger.info("\n".join(lines), extra={"cli": False})
 
     def collectNodeInfo(self):
         nodeAddress = None
         if self.poolLedger:
-            txns = self.poolLedger.getAllTxn()
-            for key, txn in txns.items():
-                data = txn[DATA]
-                if data[ALIAS] == self.name:
-                    nodeAddress = data[NODE_IP]
-                    break
+            nodeAddress = self.poolManager.poolMembership.nodeAddress(self.name)
 
         info = {
             'name': self.name,
@@ -2308,8 +2593,17 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
             'baseDir': self.basedirpath,
             'portN': self.nodestack.ha[1],
             'portC': self.clientstack.ha[1],
-            'address': nodeAddress
+            'address': nodeAddress,
+            'startupTimings': self.startupTimings,
+            'stateCache': {str(ledgerId): stats for ledgerId, stats
+                           in self.stateCacheStats.items()},
+            'handlerTimings': self.handlerTimings.asDict(),
+            'memory': self.memoryAccounting.asDict(),
+            'system': systemMetricsAsDict(
+                self.monitor.systemMetrics.snapshot)
         }
+        if self.groupCommit is not None:
+            info['groupCommit'] = self.groupCommit.asDict()
         return info
 
     def logNodeInfo(self):
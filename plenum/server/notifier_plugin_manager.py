@@ -1,6 +1,5 @@
-import pip
 import importlib
-from typing import Dict
+from typing import Dict, List
 import time
 
 from stp_core.common.log import getlogger
@@ -20,8 +19,28 @@ notifierPluginTriggerEvents = {
 }
 
 
+def iterEntryPoints(group: str):
+    # `pkg_resources` reads every installed distribution when imported so it
+    # is only imported once plugins are looked for
+    import pkg_resources
+    return pkg_resources.iter_entry_points(group)
+
+
+def installedDistributions():
+    import pkg_resources
+    return list(pkg_resources.working_set)
+
+
 class PluginManager:
+    """
+    Sends notifications to the notifier plugins. Plugins are found and
+    imported when the first notification is sent, not when the manager is
+    created, from the modules declared as entry points in the
+    `entryPointGroup` group and from the distributions whose names start
+    with `prefix`.
+    """
     prefix = 'sovrinnotifier'
+    entryPointGroup = 'sovrinnotifier'
     __instance = None
 
     def __new__(cls):
@@ -30,9 +49,19 @@ class PluginManager:
         return PluginManager.__instance
 
     def __init__(self):
-        self.plugins = []
+        # Imported on first use
+        self._plugins = None
         self.topics = notifierPluginTriggerEvents
-        self.importPlugins()
+
+    @property
+    def plugins(self) -> List:
+        if self._plugins is None:
+            self.importPlugins()
+        return self._plugins
+
+    @plugins.setter
+    def plugins(self, plugins: List):
+        self._plugins = plugins
 
     def sendMessageUponNodeUpgradeScheduled(self, message='Node uprgade has been scheduled'):
         return self._sendMessage(self.topics['nodeUpgradeScheduled'], message)
@@ -100,7 +129,10 @@ class PluginManager:
                              .format(plugin.__name__, e))
         return i, len(self.plugins)
 
-    def _findPlugins(self):
-        return [pkg.key
-                for pkg in pip.utils.get_installed_distributions()
-                if pkg.key.startswith(PluginManager.prefix)]
\ No newline at end of file
+    def _findPlugins(self) -> List[str]:
+        plugins = [entryPoint.module_name for entryPoint in
+                   iterEntryPoints(PluginManager.entryPointGroup)]
+        plugins.extend(pkg.key for pkg in installedDistributions()
+                       if pkg.key.startswith(PluginManager.prefix) and
+                       pkg.key not in plugins)
+        return plugins
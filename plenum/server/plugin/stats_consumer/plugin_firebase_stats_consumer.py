@@ -7,23 +7,44 @@ from plenum.common.types import EVENT_PERIODIC_STATS_THROUGHPUT, \
     EVENT_NODE_STARTED, EVENT_REQ_ORDERED, EVENT_PERIODIC_STATS_LATENCIES, \
     PLUGIN_TYPE_STATS_CONSUMER, EVENT_VIEW_CHANGE, EVENT_PERIODIC_STATS_NODES, \
     EVENT_PERIODIC_STATS_TOTAL_REQUESTS, EVENT_PERIODIC_STATS_NODE_INFO,\
-    EVENT_PERIODIC_STATS_SYSTEM_PERFORMANCE_INFO
+    EVENT_PERIODIC_STATS_SYSTEM_PERFORMANCE_INFO, \
+    EVENT_PERIODIC_STATS_HANDLER_TIMINGS
 from stp_core.common.log import getlogger
+from plenum.common.config_util import getConfig
 from plenum.config import STATS_SERVER_IP, STATS_SERVER_PORT
 from plenum.server.plugin.stats_consumer.stats_publisher import StatsPublisher,\
-    Topic
+    BatchingStatsPublisher, Topic
 from plenum.server.plugin_loader import HasDynamicallyImportedModules
 from plenum.server.stats_consumer import StatsConsumer
 
 logger = getlogger()
 
+# Topics of periodic stats, of which only the latest value not sent yet needs
+# to be sent
+GAUGE_TOPICS = {
+    Topic.PublishMtrStats,
+    Topic.PublishLatenciesStats,
+    Topic.PublishTotalTransactions,
+    Topic.PublishNodestackStats,
+    Topic.PublishTotalRequestsStats,
+    Topic.PublishNodeStats,
+    Topic.PublishSystemStats,
+    Topic.PublishHandlerTimings,
+}
+GAUGE_EVENT_NAMES = {str(topic) for topic in GAUGE_TOPICS}
+
 
 class FirebaseStatsConsumer(StatsConsumer, HasDynamicallyImportedModules):
     pluginType = PLUGIN_TYPE_STATS_CONSUMER
 
     def __init__(self):
         super().__init__()
-        self.statsPublisher = StatsPublisher(STATS_SERVER_IP, STATS_SERVER_PORT)
+        if getConfig().STATS_SERVER_BATCHING:
+            self.statsPublisher = BatchingStatsPublisher(STATS_SERVER_IP,
+                                                         STATS_SERVER_PORT)
+        else:
+            self.statsPublisher = StatsPublisher(STATS_SERVER_IP,
+                                                 STATS_SERVER_PORT)
         self._eventToFunc = {
             EVENT_REQ_ORDERED: self._sendStatsOnReqOrdered,
             EVENT_NODE_STARTED: self._sendStatsOnNodeStart,
@@ -33,7 +54,8 @@ class FirebaseStatsConsumer(StatsConsumer, HasDynamicallyImportedModules):
             EVENT_PERIODIC_STATS_NODES: self._sendKnownNodesInfo,
             EVENT_PERIODIC_STATS_TOTAL_REQUESTS: self._sendTotalRequests,
             EVENT_PERIODIC_STATS_NODE_INFO: self._sendNodeInfo,
-            EVENT_PERIODIC_STATS_SYSTEM_PERFORMANCE_INFO: self._sendSystemPerformanceInfo
+            EVENT_PERIODIC_STATS_SYSTEM_PERFORMANCE_INFO: self._sendSystemPerformanceInfo,
+            EVENT_PERIODIC_STATS_HANDLER_TIMINGS: self._sendHandlerTimings
         }
 
     @abstractmethod
@@ -41,7 +63,9 @@ class FirebaseStatsConsumer(StatsConsumer, HasDynamicallyImportedModules):
         return True
 
     def _send(self, data: Dict[str, object]):
-        self.statsPublisher.send(jsonpickle.dumps(data))
+        eventName = data.get("eventName")
+        key = eventName if eventName in GAUGE_EVENT_NAMES else None
+        self.statsPublisher.send(jsonpickle.dumps(data), key)
 
     def sendStats(self, event: str, stats: Dict[str, object]):
         self._eventToFunc[event](stats)
@@ -95,6 +119,10 @@ class FirebaseStatsConsumer(StatsConsumer, HasDynamicallyImportedModules):
         performanceInfo["eventName"] = str(Topic.PublishSystemStats)
         self._send(performanceInfo)
 
+    def _sendHandlerTimings(self, handlerTimings: Dict[str, object]):
+        handlerTimings["eventName"] = str(Topic.PublishHandlerTimings)
+        self._send(handlerTimings)
+
     def _sendTotalRequests(self, totalRequests: Dict[str, object]):
         totalRequests["eventName"] = str(Topic.PublishTotalRequestsStats)
         self._send(totalRequests)
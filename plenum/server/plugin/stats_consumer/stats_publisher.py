@@ -1,4 +1,5 @@
 import asyncio
+import time
 from collections import deque
 from enum import Enum, unique
 
@@ -31,7 +32,10 @@ class StatsPublisher:
         self._messageBuffer.appendleft(message)
         return True
 
-    def send(self, message):
+    def send(self, message, key=None):
+        """
+        :param key: ignored, every message is sent
+        """
         self.addMsgToBuffer(message)
 
         if self._loop.is_running():
@@ -84,6 +88,182 @@ class StatsPublisher:
         self._writer = None
 
 
+class BatchingStatsPublisher:
+    """
+    Sends data to the stats collecting service like `StatsPublisher`, but
+    from a bounded ring buffer by a single task which writes the messages in
+    batches, each batch being one write of newline framed messages.
+
+    A message sent with a key replaces the message with the same key which
+    is not sent yet, so only the latest value of a periodic stat is sent.
+    When the buffer is full the oldest message is dropped. The connection is
+    made by the sending task, again after a delay doubling with every failed
+    attempt, so `send` never waits for it. Messages of a batch which could
+    not be written are put back in the buffer.
+    """
+
+    def __init__(self, destIp, destPort, bufferSize=None, batchSize=None,
+                 minReconnectDelay=None, maxReconnectDelay=None):
+        self.ip = destIp
+        self.port = destPort
+        self.bufferSize = bufferSize or \
+            config.STATS_SERVER_MESSAGE_BUFFER_MAX_SIZE
+        self.batchSize = batchSize or config.STATS_SERVER_BATCH_MAX_SIZE
+        self.minReconnectDelay = minReconnectDelay \
+            if minReconnectDelay is not None \
+            else config.STATS_SERVER_RECONNECT_MIN_DELAY
+        self.maxReconnectDelay = maxReconnectDelay \
+            if maxReconnectDelay is not None \
+            else config.STATS_SERVER_RECONNECT_MAX_DELAY
+        self._writer = None
+        # Entries are [key, message] so that a newer message with the same
+        # key can replace the message in place
+        self._buffer = deque()
+        self._keyed = {}
+        self._loop = asyncio.get_event_loop()
+        self._sending = False
+        self._retryHandle = None
+        self._reconnectDelay = 0
+        self._reconnectAt = 0
+        self.counters = {
+            'sent': 0,
+            'batches': 0,
+            'coalesced': 0,
+            'dropped': 0,
+            'failedBatches': 0,
+            'connects': 0,
+            'failedConnects': 0,
+        }
+
+    @property
+    def pending(self):
+        return len(self._buffer)
+
+    def addMsgToBuffer(self, message, key=None):
+        if key is not None and key in self._keyed:
+            self._keyed[key][1] = message
+            self.counters['coalesced'] += 1
+            return True
+        if len(self._buffer) >= self.bufferSize:
+            self._forget(self._buffer.popleft())
+            self.counters['dropped'] += 1
+        entry = [key, message]
+        self._buffer.append(entry)
+        if key is not None:
+            self._keyed[key] = entry
+        return True
+
+    def send(self, message, key=None):
+        self.addMsgToBuffer(message, key)
+        self._startSending()
+
+    def _retry(self):
+        self._retryHandle = None
+        self._startSending()
+
+    def _startSending(self):
+        if self._sending:
+            return
+        self._sending = True
+        if self._loop.is_running():
+            self._loop.create_task(self.sendMessagesFromBuffer())
+        else:
+            self._loop.run_until_complete(self.sendMessagesFromBuffer())
+
+    async def sendMessagesFromBuffer(self):
+        try:
+            while self._buffer:
+                if not await self._checkConnectionAndConnect():
+                    break
+                batch = self._takeBatch()
+                try:
+                    await self._doSendBatch(batch)
+                except Exception as ex:
+                    self._batchFailed(batch, ex)
+                    break
+        finally:
+            self._sending = False
+        if self._buffer and self._retryHandle is None and \
+                self._loop.is_running():
+            retryIn = max(self._reconnectAt - time.perf_counter(), 0)
+            self._retryHandle = self._loop.call_later(retryIn, self._retry)
+
+    async def _checkConnectionAndConnect(self):
+        if self._writer is not None:
+            return True
+        now = time.perf_counter()
+        if now < self._reconnectAt:
+            return False
+        try:
+            _, self._writer = await asyncio.open_connection(host=self.ip,
+                                                            port=self.port)
+        except Exception as ex:
+            self._reconnectDelay = min(max(self._reconnectDelay * 2,
+                                           self.minReconnectDelay),
+                                       self.maxReconnectDelay)
+            self._reconnectAt = now + self._reconnectDelay
+            self.counters['failedConnects'] += 1
+            logger.debug("Cannot connect to stats server {}:{}, retrying in "
+                         "{} sec: {}".format(self.ip, self.port,
+                                             self._reconnectDelay, ex))
+            return False
+        self._reconnectDelay = 0
+        self.counters['connects'] += 1
+        return True
+
+    def _takeBatch(self):
+        batch = []
+        while self._buffer and len(batch) < self.batchSize:
+            entry = self._buffer.popleft()
+            self._forget(entry)
+            batch.append(entry)
+        return batch
+
+    async def _doSendBatch(self, batch):
+        self._writer.write(''.join(message + '\n'
+                                   for _, message in batch).encode('utf-8'))
+        await self._writer.drain()
+        self.counters['sent'] += len(batch)
+        self.counters['batches'] += 1
+
+    def _batchFailed(self, batch, ex):
+        logger.debug("Cannot publish {} stats messages: {}".
+                     format(len(batch), ex))
+        self.counters['failedBatches'] += 1
+        self._closeWriter()
+        for entry in reversed(batch):
+            key = entry[0]
+            if key is not None and key in self._keyed:
+                # A newer value is waiting already
+                self.counters['coalesced'] += 1
+            elif len(self._buffer) >= self.bufferSize:
+                self.counters['dropped'] += 1
+            else:
+                self._buffer.appendleft(entry)
+                if key is not None:
+                    self._keyed[key] = entry
+
+    def _forget(self, entry):
+        key = entry[0]
+        if key is not None and self._keyed.get(key) is entry:
+            del self._keyed[key]
+
+    def _closeWriter(self):
+        if self._writer is not None:
+            try:
+                self._writer.close()
+            except Exception as ex:
+                logger.debug("Error while closing connection to stats "
+                             "server: {}".format(ex))
+            self._writer = None
+
+    def close(self):
+        if self._retryHandle is not None:
+            self._retryHandle.cancel()
+            self._retryHandle = None
+        self._closeWriter()
+
+
 @unique
 class Topic(Enum):
     ComputeLatencies = 1
@@ -101,6 +281,7 @@ class Topic(Enum):
     PublishTotalRequestsStats = 13
     PublishNodeStats = 14
     PublishSystemStats = 15
+    PublishHandlerTimings = 16
 
     def __str__(self):
         return self.name
@@ -16,6 +16,7 @@ from plenum.common.exceptions import UnsupportedOperation, \
 from plenum.common.request import Request
 from plenum.common.stack_manager import TxnStackManager
 from plenum.common.types import NodeDetail
+from plenum.persistence.cached_state import cacheState
 from plenum.persistence.storage import initKeyValueStorage
 from plenum.persistence.util import txnsWithMerkleInfo
 from plenum.server.pool_req_handler import PoolRequestHandler
@@ -85,18 +86,21 @@ class TxnPoolManager(PoolManager, TxnStackManager):
 
     def getPoolReqHandler(self):
         return PoolRequestHandler(self.ledger, self.state,
-                                  self.node.states[DOMAIN_LEDGER_ID])
+                                  self.node.states[DOMAIN_LEDGER_ID],
+                                  poolMembership=self.poolMembership)
 
     def loadState(self):
-        return PruningState(
-            initKeyValueStorage(
-                self.config.poolStateStorage,
-                self.node.dataLocation,
-                self.config.poolStateDbName)
-        )
+        return cacheState(
+            PruningState(
+                initKeyValueStorage(
+                    self.config.poolStateStorage,
+                    self.node.dataLocation,
+                    self.config.poolStateDbName)),
+            self.config.StateCacheSize)
 
     def initPoolState(self):
-        self.node.initStateFromLedger(self.state, self.ledger, self.reqHandler)
+        self.node.initStateFromLedger(self.state, self.ledger, self.reqHandler,
+                                      POOL_LEDGER_ID)
 
     @property
     def hasLedger(self):
@@ -112,7 +116,7 @@ class TxnPoolManager(PoolManager, TxnStackManager):
 
     def getStackParamsAndNodeReg(self, name, basedirpath, nodeRegistry=None,
                                  ha=None, cliname=None, cliha=None):
-        nodeReg, cliNodeReg, nodeKeys = self.parseLedgerForHaAndKeys(self.ledger)
+        nodeReg, cliNodeReg, nodeKeys = self.poolMembership.haAndKeys()
 
         self.addRemoteKeysFromLedger(nodeKeys)
 
@@ -151,6 +155,7 @@ class TxnPoolManager(PoolManager, TxnStackManager):
         """
         committedTxns = self.reqHandler.commit(len(reqs), stateRoot, txnRoot)
         self.node.updateSeqNoMap(committedTxns)
+        self.poolMembership.catchUp(self.ledger)
         for txn in committedTxns:
             self.onPoolMembershipChange(deepcopy(txn))
         committedTxns = txnsWithMerkleInfo(self.reqHandler.ledger, committedTxns)
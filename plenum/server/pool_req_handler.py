@@ -1,14 +1,18 @@
 import json
+from copy import deepcopy
 from functools import lru_cache
+from itertools import chain
 
 from ledger.serializers.json_serializer import JsonSerializer
 from plenum.common.constants import TXN_TYPE, NODE, TARGET_NYM, DATA, ALIAS, NODE_IP, NODE_PORT, CLIENT_IP, CLIENT_PORT, \
     SERVICES
 from plenum.common.exceptions import UnauthorizedClientRequest
 from plenum.common.ledger import Ledger
+from plenum.common.pool_membership import PoolMembership
 from plenum.common.request import Request
 from plenum.common.txn_util import reqToTxn
 from plenum.common.types import f
+from plenum.persistence.cached_state import getDecoded
 from plenum.persistence.util import txnsWithSeqNo
 from plenum.server.domain_req_handler import DomainRequestHandler
 from plenum.server.req_handler import RequestHandler
@@ -21,10 +25,13 @@ logger = getlogger()
 class PoolRequestHandler(RequestHandler):
 
     def __init__(self, ledger: Ledger, state: State,
-                 domainState: State):
+                 domainState: State, poolMembership: PoolMembership = None):
         super().__init__(ledger, state)
         self.domainState = domainState
         self.stateSerializer = JsonSerializer()
+        # Index of the committed nodes, when not given the nodes are found
+        # by walking the state
+        self.poolMembership = poolMembership
 
     def validate(self, req: Request, config=None):
         typ = req.operation.get(TXN_TYPE)
@@ -97,8 +104,10 @@ class PoolRequestHandler(RequestHandler):
 
     def getNodeData(self, nym, isCommitted: bool = True):
         key = nym.encode()
-        data = self.state.get(key, isCommitted)
-        return json.loads(data.decode()) if data else {}
+        data = getDecoded(self.state, key, isCommitted)
+        # A deep copy since the decoded value can be shared through the
+        # state's cache and callers update what is returned, nested values too
+        return deepcopy(data) if data else {}
 
     def updateNodeData(self, nym, data):
         key = nym.encode()
@@ -117,12 +126,36 @@ class PoolRequestHandler(RequestHandler):
         # Cannot use lru_cache since a steward might have a node in future and
         # unfortunately lru_cache does not allow single entries to be cleared
         # TODO: Modify lru_cache to clear certain entities
-        for nodeNym, nodeData in self.state.as_dict.items():
-            nodeData = json.loads(nodeData.decode())
+        for nodeNym, nodeData in self.uncommittedNodesData():
             if nodeData.get(f.IDENTIFIER.nm) == stewardNym:
                 return True
         return False
 
+    def uncommittedNodesData(self):
+        """
+        (nym, data) of every node as the uncommitted state has them, which is
+        the nodes of the index updated with the txns it has not seen yet. The
+        index is only read here, it is caught up with the ledger when txns
+        are committed or added by catchup
+        """
+        if self.poolMembership is None:
+            for nodeNym, nodeData in self.state.as_dict.items():
+                yield nodeNym.decode(), json.loads(nodeData.decode())
+            return
+        nodesData = self.poolMembership.nodesData()
+        notIndexed = (txn for _, txn in
+                      self.ledger.iterTxns(self.poolMembership.seqNo + 1)) \
+            if self.ledger.size > self.poolMembership.seqNo else ()
+        for txn in chain(notIndexed, self.ledger.uncommittedTxns):
+            if txn.get(TXN_TYPE) != NODE:
+                continue
+            nodeData = nodesData.get(txn.get(TARGET_NYM))
+            if nodeData is None:
+                nodeData = nodesData[txn.get(TARGET_NYM)] = \
+                    {f.IDENTIFIER.nm: txn.get(f.IDENTIFIER.nm)}
+            nodeData.update(txn.get(DATA, {}))
+        yield from nodesData.items()
+
     @staticmethod
     def dataErrorWhileValidating(data, skipKeys):
         reqKeys = {NODE_IP, NODE_PORT, CLIENT_IP, CLIENT_PORT, ALIAS}
@@ -157,9 +190,7 @@ class PoolRequestHandler(RequestHandler):
                 nodeData.pop(SERVICES, None)
                 nodeData.update(data)
 
-        for otherNode, otherNodeData in self.state.as_dict.items():
-            otherNode = otherNode.decode()
-            otherNodeData = json.loads(otherNodeData.decode())
+        for otherNode, otherNodeData in self.uncommittedNodesData():
             otherNodeData.pop(f.IDENTIFIER.nm, None)
             otherNodeData.pop(SERVICES, None)
             if not nodeNym or otherNode != nodeNym:
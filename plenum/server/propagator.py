@@ -1,12 +1,11 @@
 from collections import OrderedDict
 from collections import deque
-from typing import Dict, Tuple, Union
+from typing import Dict, Mapping, Optional, Tuple, Union
 import weakref
 
-from plenum.common.types import Propagate
+from plenum.common.types import Propagate, f, OPERATION
 from plenum.common.request import Request, ReqKey
-from stp_core.common.log import getlogger
-from plenum.common.util import checkIfMoreThanFSameItems
+from plenum.common.lazy_log import getlogger
 
 logger = getlogger()
 
@@ -14,22 +13,57 @@ logger = getlogger()
 class ReqState:
     """
     Object to store the state of the request.
+
+    Nodes mostly propagate the same request, so only one request object is
+    kept for every distinct request received and `propagates` maps each
+    sender to the one it sent instead of keeping a copy per sender.
     """
+    __slots__ = ('request', 'forwarded', 'forwardedTo', 'propagates',
+                 'finalised', '_distinct', '_votes')
+
     def __init__(self, request: Request):
         self.request = request
         self.forwarded = False
         # forwardedTo helps in finding to how many replicas has this request
         # been forwarded to, helps in garbage collection, see `gc` of `Replica`
         self.forwardedTo = 0
-        self.propagates = {}
+        self.propagates = {}  # type: Dict[str, Request]
         self.finalised = None
+        # Distinct requests received, keyed by their content, and the number
+        # of senders which sent each of them
+        self._distinct = {self.contentKey(request): request}
+        self._votes = {}  # type: Dict[Tuple[str, str], int]
+
+    @staticmethod
+    def contentKey(request: Request) -> Tuple[str, str]:
+        # The digest covers everything in the request except the signature
+        return request.digest, request.signature
+
+    def addPropagate(self, request: Request, sender: str):
+        key = self.contentKey(request)
+        request = self._distinct.setdefault(key, request)
+        previous = self.propagates.get(sender)
+        if previous is not None:
+            self._votes[self.contentKey(previous)] -= 1
+        self.propagates[sender] = request
+        self._votes[key] = self._votes.get(key, 0) + 1
+
+    def sameRequest(self, operation, signature) -> Optional[Request]:
+        """
+        Return the request received earlier with the given operation and
+        signature, if any
+        """
+        for request in self._distinct.values():
+            if request.signature == signature and \
+                    request.operation == operation:
+                return request
+        return None
 
     def isFinalised(self, f):
-        if self.finalised is None:
-            req = checkIfMoreThanFSameItems([v.__getstate__() for v in
-                                             self.propagates.values()], f)
-            if req:
-                self.finalised = Request.fromState(req)
+        if self.finalised is None and self._votes:
+            key = max(self._votes, key=self._votes.get)
+            if self._votes[key] > f:
+                self.finalised = self._distinct[key]
         return self.finalised
 
 
@@ -42,6 +76,9 @@ class Requests(OrderedDict):
     by the node and returned to the transaction store, the key for that
     request is popped out
     """
+    requestFields = frozenset((f.IDENTIFIER.nm, f.REQ_ID.nm, OPERATION,
+                               f.SIG.nm))
+
     def add(self, req: Request):
         """
         Add the specified request to this request store.
@@ -73,7 +110,24 @@ class Requests(OrderedDict):
         :param sender: the name of the node sending the msg
         """
         data = self.add(req)
-        data.propagates[sender] = req
+        data.addPropagate(req, sender)
+
+    def sameRequest(self, reqDict: Mapping) -> Optional[Request]:
+        """
+        Return the request received earlier with the same content and
+        signature as `reqDict`, like the request of a PROPAGATE, if any. Its
+        signing bytes and digest can be used for `reqDict` instead of
+        serialising it again.
+        """
+        if not self.requestFields.issuperset(reqDict):
+            # Any other field would be part of what is signed
+            return None
+        state = self.get((reqDict.get(f.IDENTIFIER.nm),
+                          reqDict.get(f.REQ_ID.nm)))
+        if state is None:
+            return None
+        return state.sameRequest(reqDict.get(OPERATION),
+                                 reqDict.get(f.SIG.nm))
 
     def votes(self, req) -> int:
         """
@@ -127,7 +181,7 @@ class Propagator:
         :param request: the REQUEST to propagate
         """
         if self.requests.hasPropagated(request, self.name):
-            logger.trace("{} already propagated {}".format(self, request))
+            logger.trace("{} already propagated {}", self, request)
         else:
             self.requests.addPropagate(request, self.name)
             # Only propagate if the node is participating in the consensus
@@ -152,7 +206,7 @@ class Propagator:
         if not isinstance(request, (Request, dict)):
             logger.error("Request not formatted properly to create propagate")
             return
-        logger.debug("Creating PROPAGATE for REQUEST {}".format(request))
+        logger.debug("Creating PROPAGATE for REQUEST {}", request)
         request = request.as_dict if isinstance(request, Request) else \
             request
         if isinstance(identifier, bytes):
@@ -186,8 +240,8 @@ class Propagator:
         :param request: the REQUEST to propagate
         """
         key = request.key
+        logger.debug('{} forwarding request {} to replicas', self, key)
         for q in self.msgsToReplicas:
-            logger.debug('{} forwarding request {} to replicas'.format(self, key))
             q.append(ReqKey(*key))
 
         self.monitor.requestUnOrdered(*key)
@@ -221,4 +275,4 @@ class Propagator:
             self.forward(request)
         else:
             logger.debug("{} not forwarding request {} to its replicas "
-                         "since {}".format(self, request, msg))
+                         "since {}", self, request, msg)
@@ -24,9 +24,9 @@ from plenum.common.types import PrePrepare, \
 from plenum.common.request import ReqDigest, Request, ReqKey
 from plenum.common.message_processor import MessageProcessor
 from plenum.common.util import updateNamedTuple
-from stp_core.common.log import getlogger
+from plenum.common.lazy_log import getlogger
 from plenum.server.has_action_queue import HasActionQueue
-from plenum.server.models import Commits, Prepares
+from plenum.server.models import Commits, Prepares, OrderedTracker
 from plenum.server.router import Router
 from plenum.server.suspicion_codes import Suspicions
 
@@ -71,6 +71,19 @@ class Stats:
                            for k, v in self.stats.items())
 
 
+class PendingPrePrepare:
+    """
+    A PRE-PREPARE waiting for some of its requests to be finalised, along
+    with the number of its requests that are not finalised yet
+    """
+    __slots__ = ('pp', 'sender', 'nonFinalised')
+
+    def __init__(self, pp: PrePrepare, sender: str, nonFinalised: int):
+        self.pp = pp
+        self.sender = sender
+        self.nonFinalised = nonFinalised
+
+
 class Replica(HasActionQueue, MessageProcessor):
     def __init__(self, node: 'plenum.server.node.Node', instId: int,
                  isMaster: bool = False):
@@ -94,12 +107,18 @@ class Replica(HasActionQueue, MessageProcessor):
         routerArgs.append((Checkpoint, self.processCheckpoint))
         routerArgs.append((ThreePCState, self.process3PhaseState))
 
-        self.inBoxRouter = Router(*routerArgs)
+        # Times of master and backup replicas are recorded apart, those of
+        # the three phase router are part of those of the inbox router
+        timingsName = 'master' if isMaster else 'backup'
+        self.inBoxRouter = Router(*routerArgs, timings=node.handlerTimings,
+                                  name=timingsName)
 
         self.threePhaseRouter = Router(
                 (PrePrepare, self.processPrePrepare),
                 (Prepare, self.processPrepare),
-                (Commit, self.processCommit)
+                (Commit, self.processCommit),
+                timings=node.handlerTimings,
+                name='{}.3pc'.format(timingsName)
         )
 
         self.node = node
@@ -141,8 +160,15 @@ class Replica(HasActionQueue, MessageProcessor):
         # forwarded the request by the node but is getting 3 phase messages.
         # The value is a list since a malicious entry might send PRE-PREPARE
         # with a different digest and since we dont have the request finalised
-        # yet, we store all PRE-PPREPARES
-        self.prePreparesPendingFinReqs = []   # type: List[Tuple[PrePrepare, str, Set[Tuple[str, int]]]]
+        # yet, we store all PRE-PPREPARES. Key is the id of the
+        # `PendingPrePrepare`
+        self.prePreparesPendingFinReqs = {}   # type: Dict[int, PendingPrePrepare]
+
+        # Reverse index of `prePreparesPendingFinReqs`, key is the key of a
+        # request which is not finalised yet and value is the list of
+        # PRE-PREPAREs waiting for it. Once the request is forwarded to the
+        # replica, only these PRE-PREPAREs are updated.
+        self.prePreparesPendingReq = {}   # type: Dict[Tuple[str, int], List[PendingPrePrepare]]
 
         # PrePrepares waiting for previous PrePrepares, key being tuple of view
         # number and pre-prepare sequence numbers and value being tuple of
@@ -186,9 +212,9 @@ class Replica(HasActionQueue, MessageProcessor):
         self.commits = Commits()
         # type: Dict[Tuple[int, int], Tuple[Tuple[str, int], Set[str]]]
 
-        # Set of tuples to keep track of ordered requests. Each tuple is
-        # (viewNo, ppSeqNo)
-        self.ordered = OrderedSet()        # type: OrderedSet[Tuple[int, int]]
+        # Keeps track of ordered batches by their (viewNo, ppSeqNo),
+        # pruned at every stable checkpoint
+        self.ordered = OrderedTracker()
 
         # Dictionary to keep track of the which replica was primary during each
         # view. Key is the view no and value is the name of the primary
@@ -238,6 +264,63 @@ class Replica(HasActionQueue, MessageProcessor):
         # GC when ordered last batch of the view
         self.view_ends_at = OrderedDict()
 
+        # PRE-PREPAREs of earlier views which each node prepared after its
+        # last stable checkpoint, as sent by it when the view changed. The
+        # primary of the new view proposes again the ones of the latest views
+        # it did not order. Key is the node name and value a dictionary of
+        # ppSeqNo to PRE-PREPARE
+        self.preparedCertificates = {}  # type: Dict[str, Dict[int, PrePrepare]]
+
+        # View for which this replica, if it becomes its primary, has to
+        # propose again the prepared PRE-PREPAREs, and the time since which
+        # it waits for a quorum of nodes to send theirs
+        self.reproposeView = None  # type: Optional[int]
+        self.reproposeSince = None  # type: Optional[float]
+
+        # PRE-PREPAREs ordered in earlier views by their ppSeqNo, and the 3
+        # phase keys of the PRE-PREPAREs of the current view which propose
+        # them again, so that they are not executed twice
+        self.orderedInPrevViews = {}  # type: Dict[int, PrePrepare]
+        self.reorderedKeys = set()  # type: Set[Tuple[int, int]]
+
+        # Highest ppSeqNo of the PRE-PREPAREs the nodes prepared in earlier
+        # views, the primary does not create batches at or below it other
+        # than by proposing them again
+        self.preparedTill = 0
+
+    def memoryContainers(self):
+        """
+        Name and container of everything the replica keeps which can grow
+        with the load, for memory accounting
+        """
+        yield 'inBox', self.inBox
+        yield 'outBox', self.outBox
+        yield 'inBoxStash', self.inBoxStash
+        yield 'postElectionMsgs', self.postElectionMsgs
+        yield 'prePreparesPendingFinReqs', self.prePreparesPendingFinReqs
+        yield 'prePreparesPendingReq', self.prePreparesPendingReq
+        yield 'prePreparesPendingPrevPP', self.prePreparesPendingPrevPP
+        yield 'preparesWaitingForPrePrepare', self.preparesWaitingForPrePrepare
+        yield 'commitsWaitingForPrepare', self.commitsWaitingForPrepare
+        yield 'sentPrePrepares', self.sentPrePrepares
+        yield 'prePrepares', self.prePrepares
+        yield 'prepares', self.prepares
+        yield 'commits', self.commits
+        for keptSeqNos in self.ordered.keptSeqNos():
+            yield 'ordered', keptSeqNos
+        yield 'stashingWhileCatchingUp', self.stashingWhileCatchingUp
+        for commits in self.stashed_out_of_order_commits.values():
+            yield 'stashedOutOfOrderCommits', commits
+        yield 'checkpoints', self.checkpoints
+        yield 'stashedRecvdCheckpoints', self.stashedRecvdCheckpoints
+        yield 'stashingWhileOutsideWaterMarks', \
+            self.stashingWhileOutsideWaterMarks
+        for queue in self.requestQueues.values():
+            yield 'requestQueues', queue
+        yield 'batches', self.batches
+        for certificates in self.preparedCertificates.values():
+            yield 'preparedCertificates', certificates
+
     def ledger_uncommitted_size(self, ledgerId):
         if not self.isMaster:
             return None
@@ -272,7 +355,7 @@ class Replica(HasActionQueue, MessageProcessor):
     def h(self, n):
         self._h = n
         self.H = self._h + self.config.LOG_SIZE
-        logger.debug('{} set watermarks as {} {}'.format(self, self.h, self.H))
+        logger.debug('{} set watermarks as {} {}', self, self.h, self.H)
 
     @property
     def lastPrePrepareSeqNo(self):
@@ -349,10 +432,17 @@ class Replica(HasActionQueue, MessageProcessor):
         self.primaryNames[self.viewNo] = value
         if not value == self._primaryName:
             self._primaryName = value
-            logger.debug("{} setting primaryName for view no {} to: {}".
-                         format(self, self.viewNo, value))
+            logger.debug("{} setting primaryName for view no {} to: {}",
+                         self, self.viewNo, value)
             if self.isMaster:
                 self.removeObsoletePpReqs()
+            if value is not None and self.reproposeView == self.viewNo:
+                if value == self.name:
+                    self.reproposeSince = time.perf_counter()
+                else:
+                    # Only the primary proposes the prepared PRE-PREPAREs
+                    self.reproposeView = None
+                    self.preparedCertificates = {}
             self._stateChanged()
 
     def primaryChanged(self, primaryName, lastOrderedPPSeqNo):
@@ -484,8 +574,8 @@ class Replica(HasActionQueue, MessageProcessor):
         # pp.discarded indicates the index from where the discarded requests
         #  starts hence the count of accepted requests, prevStateRoot is
         # tracked to revert this PRE-PREPARE
-        logger.debug('{} tracking batch for {} with state root {}'.
-                     format(self, pp, prevStateRootHash))
+        logger.debug('{} tracking batch for {} with state root {}',
+                     self, pp, prevStateRootHash)
         self.batches[pp.ppSeqNo] = [pp.discarded, pp.ppTime, prevStateRootHash]
 
     def send3PCBatch(self):
@@ -555,8 +645,8 @@ class Replica(HasActionQueue, MessageProcessor):
                                    self.stateRootHash(ledger_id),
                                    self.txnRootHash(ledger_id)
                                    )
-        logger.debug('{} created a PRE-PREPARE with {} requests for ledger {}'
-                     .format(self, len(validReqs), ledger_id))
+        logger.debug('{} created a PRE-PREPARE with {} requests for ledger {}',
+                     self, len(validReqs), ledger_id)
         self.lastPrePrepareSeqNo = ppSeqNo
         if self.isMaster:
             self.outBox.extend(rejects)
@@ -572,6 +662,20 @@ class Replica(HasActionQueue, MessageProcessor):
         cls = self.node.__class__
         fin_req = self.requests[key].finalised
         self.requestQueues[cls.ledgerIdForRequest(fin_req)].add(key)
+        self.onRequestFinalised(key)
+
+    def onRequestFinalised(self, key: Tuple[str, int]):
+        """
+        Update the PRE-PREPAREs waiting for the request to be finalised, the
+        ones which have no more requests to wait for are queued for processing
+        """
+        for pending in self.prePreparesPendingReq.pop(tuple(key), ()):
+            pending.nonFinalised -= 1
+            if pending.nonFinalised == 0:
+                self.prePreparesPendingFinReqs.pop(id(pending), None)
+                pp = pending.pp
+                self.prePreparesPendingPrevPP[pp.viewNo, pp.ppSeqNo] = \
+                    (pp, pending.sender)
 
     def serviceQueues(self, limit=None):
         """
@@ -583,8 +687,12 @@ class Replica(HasActionQueue, MessageProcessor):
         # TODO should handle SuspiciousNode here
         r = self.dequeuePrePrepares() if self.node.isParticipating else 0
         r += self.inBoxRouter.handleAllSync(self.inBox, limit)
-        r += self.send3PCBatch() if (self.isPrimary and
-                                     self.node.isParticipating) else 0
+        if self.isPrimary and self.node.isParticipating:
+            # New batches come after the PRE-PREPAREs proposed again
+            if self.reproposeSince is not None:
+                r += self.reproposePrepared()
+            if self.canCreateBatches:
+                r += self.send3PCBatch()
         r += self._serviceActions()
         return r
         # Messages that can be processed right now needs to be added back to the
@@ -597,7 +705,7 @@ class Replica(HasActionQueue, MessageProcessor):
         """
         while self.postElectionMsgs:
             msg = self.postElectionMsgs.popleft()
-            logger.debug("{} processing pended msg {}".format(self, msg))
+            logger.debug("{} processing pended msg {}", self, msg)
             self.dispatchThreePhaseMsg(*msg)
 
     @property
@@ -633,8 +741,8 @@ class Replica(HasActionQueue, MessageProcessor):
                 self.node.reportSuspiciousNodeEx(ex)
         else:
             logger.debug("{} stashing 3 phase message {} since ppSeqNo {} is "
-                         "not between {} and {}".
-                         format(self, msg, msg.ppSeqNo, self.h, self.H))
+                         "not between {} and {}",
+                         self, msg, msg.ppSeqNo, self.h, self.H)
             self.stashOutsideWatermarks((msg, sender))
 
     def processThreePhaseMsg(self, msg: ThreePhaseMsg, sender: str):
@@ -649,8 +757,8 @@ class Replica(HasActionQueue, MessageProcessor):
         """
         if self.isPrimary is None:
             self.postElectionMsgs.append((msg, sender))
-            logger.debug("Replica {} pended request {} from {}".
-                         format(self, msg, sender))
+            logger.debug("Replica {} pended request {} from {}",
+                         self, msg, sender)
             return
         self.dispatchThreePhaseMsg(msg, sender)
 
@@ -663,17 +771,21 @@ class Replica(HasActionQueue, MessageProcessor):
         :param sender: name of the node that sent this message
         """
         key = (pp.viewNo, pp.ppSeqNo)
-        logger.debug("{} received PRE-PREPARE{} from {} at {}".
-                     format(self, key, sender, time.perf_counter()))
+        logger.debug("{} received PRE-PREPARE{} from {} at {}",
+                     self, key, sender, time.perf_counter())
         # Converting each req_idrs from list to tuple
         pp = updateNamedTuple(pp, **{f.REQ_IDR.nm: [(i, r)
                                                     for i, r in pp.reqIdr]})
         oldStateRoot = self.stateRootHash(pp.ledgerId, toHex=False)
         if self.canProcessPrePrepare(pp, sender):
             self.addToPrePrepares(pp)
+            if key in self.reorderedKeys:
+                logger.debug('{} ordered the batch of PRE-PREPARE{} in an '
+                             'earlier view', self, key)
+                return
             if not self.node.isParticipating:
                 self.stashingWhileCatchingUp.add(key)
-                logger.debug('{} stashing PRE-PREPARE{}'.format(self, key))
+                logger.debug('{} stashing PRE-PREPARE{}', self, key)
                 return
 
             if self.isMaster:
@@ -681,7 +793,7 @@ class Replica(HasActionQueue, MessageProcessor):
                                          self.stateRootHash(pp.ledgerId,
                                                             toHex=False))
             self.trackBatches(pp, oldStateRoot)
-            logger.debug("{} processed incoming PRE-PREPARE{}".format(self, key),
+            logger.debug("{} processed incoming PRE-PREPARE{}", self, key,
                          extra={"tags": ["processing"]})
 
     def tryPrepare(self, pp: PrePrepare):
@@ -693,7 +805,7 @@ class Replica(HasActionQueue, MessageProcessor):
         if rv:
             self.doPrepare(pp)
         else:
-            logger.debug("{} cannot send PREPARE since {}".format(self, msg))
+            logger.debug("{} cannot send PREPARE since {}", self, msg)
 
     def processPrepare(self, prepare: Prepare, sender: str) -> None:
         """
@@ -704,8 +816,8 @@ class Replica(HasActionQueue, MessageProcessor):
         :param sender: name of the node that sent the PREPARE
         """
         # TODO move this try/except up higher
-        logger.debug("{} received PREPARE{} from {}".
-                     format(self, (prepare.viewNo, prepare.ppSeqNo), sender))
+        logger.debug("{} received PREPARE{} from {}",
+                     self, (prepare.viewNo, prepare.ppSeqNo), sender)
         if self.isPpSeqNoStable(prepare.ppSeqNo):
             self.discard(prepare,
                          "achieved stable checkpoint for Preapre",
@@ -715,13 +827,12 @@ class Replica(HasActionQueue, MessageProcessor):
             if self.validatePrepare(prepare, sender):
                 self.addToPrepares(prepare, sender)
                 self.stats.inc(TPCStat.PrepareRcvd)
-                logger.debug("{} processed incoming PREPARE {}".
-                             format(self, (prepare.viewNo, prepare.ppSeqNo)))
+                logger.debug("{} processed incoming PREPARE {}",
+                             self, (prepare.viewNo, prepare.ppSeqNo))
             else:
                 # TODO let's have isValidPrepare throw an exception that gets
                 # handled and possibly logged higher
-                logger.debug("{} cannot process incoming PREPARE".
-                               format(self))
+                logger.debug("{} cannot process incoming PREPARE", self)
         except SuspiciousNode as ex:
             self.node.reportSuspiciousNodeEx(ex)
 
@@ -733,8 +844,8 @@ class Replica(HasActionQueue, MessageProcessor):
         :param commit: an incoming COMMIT message
         :param sender: name of the node that sent the COMMIT
         """
-        logger.debug("{} received COMMIT{} from {}".
-                     format(self, (commit.viewNo, commit.ppSeqNo), sender))
+        logger.debug("{} received COMMIT{} from {}",
+                     self, (commit.viewNo, commit.ppSeqNo), sender)
         if self.isPpSeqNoStable(commit.ppSeqNo):
             self.discard(commit,
                          "achieved stable checkpoint for Commit",
@@ -744,8 +855,8 @@ class Replica(HasActionQueue, MessageProcessor):
         if self.validateCommit(commit, sender):
             self.stats.inc(TPCStat.CommitRcvd)
             self.addToCommits(commit, sender)
-            logger.debug("{} processed incoming COMMIT{}".
-                         format(self, (commit.viewNo, commit.ppSeqNo)))
+            logger.debug("{} processed incoming COMMIT{}",
+                         self, (commit.viewNo, commit.ppSeqNo))
 
     def tryCommit(self, prepare: Prepare):
         """
@@ -756,8 +867,8 @@ class Replica(HasActionQueue, MessageProcessor):
         if rv:
             self.doCommit(prepare)
         else:
-            logger.debug("{} cannot send COMMIT since {}".
-                         format(self, reason))
+            logger.debug("{} cannot send COMMIT since {}",
+                         self, reason)
 
     def tryOrder(self, commit: Commit):
         """
@@ -765,16 +876,16 @@ class Replica(HasActionQueue, MessageProcessor):
         """
         canOrder, reason = self.canOrder(commit)
         if canOrder:
-            logger.trace("{} returning request to node".format(self))
+            logger.trace("{} returning request to node", self)
             self.doOrder(commit)
         else:
-            logger.debug("{} cannot return request to node: {}".
-                         format(self, reason))
+            logger.debug("{} cannot return request to node: {}",
+                         self, reason)
         return canOrder
 
     def doPrepare(self, pp: PrePrepare):
-        logger.debug("{} Sending PREPARE {} at {}".
-                     format(self, (pp.viewNo, pp.ppSeqNo), time.perf_counter()))
+        logger.debug("{} Sending PREPARE {} at {}",
+                     self, (pp.viewNo, pp.ppSeqNo), time.perf_counter())
         prepare = Prepare(self.instId,
                           pp.viewNo,
                           pp.ppSeqNo,
@@ -791,8 +902,8 @@ class Replica(HasActionQueue, MessageProcessor):
         commit phase
         :param p: the prepare message
         """
-        logger.debug("{} Sending COMMIT{} at {}".
-                     format(self, (p.viewNo, p.ppSeqNo), time.perf_counter()))
+        logger.debug("{} Sending COMMIT{} at {}",
+                     self, (p.viewNo, p.ppSeqNo), time.perf_counter())
         commit = Commit(self.instId,
                         p.viewNo,
                         p.ppSeqNo)
@@ -819,11 +930,37 @@ class Replica(HasActionQueue, MessageProcessor):
             lastPpSeqNo = self.lastOrderedPPSeqNo
 
         if ppSeqNo - lastPpSeqNo != 1:
-            logger.debug('{} missing PRE-PREPAREs between {} and {}'.
-                         format(self, ppSeqNo, lastPpSeqNo))
+            logger.debug('{} missing PRE-PREPAREs between {} and {}',
+                         self, ppSeqNo, lastPpSeqNo)
+            return False
+        return True
+
+    def isNextReproposed(self, ppSeqNo: int):
+        """
+        Whether a PRE-PREPARE of this view for a batch ordered in an earlier
+        view follows the ones of this view already received, if any
+        """
+        inView = [p for v, p in self.prePrepares if v == self.viewNo]
+        if inView and ppSeqNo - max(inView) != 1:
+            logger.debug('{} missing PRE-PREPAREs of view {} between {} and '
+                         '{}', self, self.viewNo, ppSeqNo, max(inView))
             return False
         return True
 
+    def isNextPending(self, viewNo: int, ppSeqNo: int):
+        if viewNo == self.viewNo and ppSeqNo in self.orderedInPrevViews:
+            return self.isNextReproposed(ppSeqNo)
+        return self.isNextPrePrepare(ppSeqNo)
+
+    @staticmethod
+    def isSameBatch(pp: PrePrepare, other: PrePrepare) -> bool:
+        return all(getattr(pp, field) == getattr(other, field)
+                   for field in (f.DIGEST.nm, f.LEDGER_ID.nm,
+                                 f.DISCARDED.nm, f.STATE_ROOT.nm,
+                                 f.TXN_ROOT.nm)) and \
+            [tuple(k) for k in pp.reqIdr] == \
+            [tuple(k) for k in other.reqIdr]
+
     def revert(self, ledgerId, stateRootHash, reqCount):
         ledger = self.node.getLedger(ledgerId)
         state = self.node.getState(ledgerId)
@@ -847,8 +984,8 @@ class Replica(HasActionQueue, MessageProcessor):
             # If this PRE-PREPARE is not valid then state and ledger should be
             # reverted
             oldStateRoot = self.stateRootHash(pp.ledgerId, toHex=False)
-            logger.debug('{} state root before processing {} is {}'.
-                         format(self, pp, oldStateRoot))
+            logger.debug('{} state root before processing {} is {}',
+                         self, pp, oldStateRoot)
 
         for reqKey in pp.reqIdr:
             req = self.requests[reqKey].finalised
@@ -918,6 +1055,20 @@ class Replica(HasActionQueue, MessageProcessor):
             self.enqueuePrePrepare(pp, sender, nonFinReqs)
             return False
 
+        ordered = self.orderedInPrevViews.get(pp.ppSeqNo) \
+            if pp.viewNo == self.viewNo else None
+        if ordered is not None:
+            # The batch proposed again was ordered by this replica in an
+            # earlier view, its requests are not applied again and it only
+            # takes part in ordering it for the other nodes
+            if not self.isSameBatch(pp, ordered):
+                raise SuspiciousNode(sender, Suspicions.PPR_DIGEST_WRONG, pp)
+            if not self.isNextReproposed(pp.ppSeqNo):
+                self.enqueuePrePrepare(pp, sender)
+                return False
+            self.reorderedKeys.add((pp.viewNo, pp.ppSeqNo))
+            return True
+
         if not self.isNextPrePrepare(pp.ppSeqNo):
             self.enqueuePrePrepare(pp, sender)
             return False
@@ -1083,8 +1234,8 @@ class Replica(HasActionQueue, MessageProcessor):
 
         if (key not in self.prepares and
                 key not in self.preparesWaitingForPrePrepare):
-            logger.debug("{} rejecting COMMIT{} due to lack of prepares".
-                         format(self, key))
+            logger.debug("{} rejecting COMMIT{} due to lack of prepares",
+                         self, key)
             # raise SuspiciousNode(sender, Suspicions.UNKNOWN_CM_SENT, commit)
             return False
         elif self.commits.hasCommitFrom(commit, sender):
@@ -1147,7 +1298,7 @@ class Replica(HasActionQueue, MessageProcessor):
         # structures to make it efficient.
         viewNo, ppSeqNo = commit.viewNo, commit.ppSeqNo
 
-        if self.ordered and self.ordered[-1] == (viewNo, ppSeqNo-1):
+        if self.ordered and self.ordered.last == (viewNo, ppSeqNo-1):
             # Last ordered was in same view as this COMMIT
             return True
 
@@ -1171,10 +1322,10 @@ class Replica(HasActionQueue, MessageProcessor):
     def process_stashed_out_of_order_commits(self):
         # This method is called periodically to check for any commits that
         # were stashed due to lack of commits before them and orders them if it can
-        logger.debug('{} trying to order from out of order commits. {} {}'.
-                     format(self, self.ordered, self.stashed_out_of_order_commits))
+        logger.debug('{} trying to order from out of order commits. {} {}',
+                     self, self.ordered, self.stashed_out_of_order_commits)
         if self.ordered:
-            lastOrdered = self.ordered[-1]
+            lastOrdered = self.ordered.last
             vToRemove = set()
             for v in self.stashed_out_of_order_commits:
                 if v < lastOrdered[0] and self.stashed_out_of_order_commits[v]:
@@ -1188,8 +1339,8 @@ class Replica(HasActionQueue, MessageProcessor):
                         continue
                     if (v == lastOrdered[0] and lastOrdered == (v, p - 1)) or \
                             (v > lastOrdered[0] and self.isLowestCommitInView(commit)):
-                        logger.debug("{} ordering stashed commit {}".
-                                     format(self, commit))
+                        logger.debug("{} ordering stashed commit {}",
+                                     self, commit)
                         if self.tryOrder(commit):
                             lastOrdered = (v, p)
                             pToRemove.add(p)
@@ -1208,12 +1359,12 @@ class Replica(HasActionQueue, MessageProcessor):
     def isLowestCommitInView(self, commit):
         view_no = commit.viewNo
         if view_no > self.viewNo:
-            logger.debug('{} encountered {} which belongs to a later view'
-                         .format(self, commit))
+            logger.debug('{} encountered {} which belongs to a later view',
+                         self, commit)
             return False
         if view_no != self.viewNo and view_no not in self.view_ends_at:
             logger.debug('{} encountered {} from past view for which dont know '
-                         'the end of view'.format(self, commit))
+                         'the end of view', self, commit)
             return False
 
         ppSeqNos = []
@@ -1224,10 +1375,17 @@ class Replica(HasActionQueue, MessageProcessor):
 
     def doOrder(self, commit: Commit):
         key = (commit.viewNo, commit.ppSeqNo)
-        logger.debug("{} ordering COMMIT{}".format(self, key))
+        logger.debug("{} ordering COMMIT{}", self, key)
         pp = self.getPrePrepare(*key)
         assert pp
         self.addToOrdered(*key)
+        if key in self.reorderedKeys:
+            # Executed when ordered in the earlier view
+            self.reorderedKeys.remove(key)
+            for k in pp.reqIdr:
+                self.requestQueues[pp.ledgerId].discard(k)
+            logger.debug("{} ordered again request {}", self, key)
+            return True
         ordered = Ordered(self.instId,
                           pp.viewNo,
                           pp.reqIdr[:pp.discarded],
@@ -1243,7 +1401,7 @@ class Replica(HasActionQueue, MessageProcessor):
                 # While this request arrived the node was catching up but the
                 # node has caught up and applied the stash so apply this request
                 logger.debug('{} found that 3PC of ppSeqNo {} outlived the '
-                             'catchup process'.format(self, pp.ppSeqNo))
+                             'catchup process', self, pp.ppSeqNo)
                 for reqKey in pp.reqIdr[:pp.discarded]:
                     req = self.requests[reqKey].finalised
                     self.node.applyReq(req)
@@ -1258,13 +1416,13 @@ class Replica(HasActionQueue, MessageProcessor):
             self.requestQueues[pp.ledgerId].discard(k)
 
         self.send(ordered, TPCStat.OrderSent)
-        logger.debug("{} ordered request {}".format(self, key))
+        logger.debug("{} ordered request {}", self, key)
         self.addToCheckpoint(pp.ppSeqNo, pp.digest)
         return True
 
     def processCheckpoint(self, msg: Checkpoint, sender: str):
-        logger.debug('{} received checkpoint {} from {}'.
-                     format(self, msg, sender))
+        logger.debug('{} received checkpoint {} from {}',
+                     self, msg, sender)
         seqNoEnd = msg.seqNoEnd
         if self.isPpSeqNoStable(seqNoEnd):
             self.discard(msg, reason="Checkpoint already stable",
@@ -1290,8 +1448,8 @@ class Replica(HasActionQueue, MessageProcessor):
 
     def _newCheckpointState(self, ppSeqNo, digest) -> CheckpointState:
         s, e = ppSeqNo, ppSeqNo + self.config.CHK_FREQ - 1
-        logger.debug("{} adding new checkpoint state for {}".
-                     format(self, (s, e)))
+        logger.debug("{} adding new checkpoint state for {}",
+                     self, (s, e))
         state = CheckpointState(ppSeqNo, [digest, ], None, {}, False)
         self.checkpoints[s, e] = state
         return state
@@ -1334,10 +1492,10 @@ class Replica(HasActionQueue, MessageProcessor):
             return
         self.h = seqNo
         for k in previousCheckpoints:
-            logger.debug("{} removing previous checkpoint {}".format(self, k))
+            logger.debug("{} removing previous checkpoint {}", self, k)
             self.checkpoints.pop(k)
         self.gc(seqNo)
-        logger.debug("{} marked stable checkpoint {}".format(self, (s, e)))
+        logger.debug("{} marked stable checkpoint {}", self, (s, e))
         self.processStashedMsgsForNewWaterMarks()
 
     def checkIfCheckpointStable(self, key: Tuple[int, int]):
@@ -1346,8 +1504,8 @@ class Replica(HasActionQueue, MessageProcessor):
             self.markCheckPointStable(ckState.seqNo)
             return True
         else:
-            logger.debug('{} has state.receivedDigests as {}'.
-                         format(self, ckState.receivedDigests.keys()))
+            logger.debug('{} has state.receivedDigests as {}',
+                         self, ckState.receivedDigests.keys())
             return False
 
     def stashCheckpoint(self, ck: Checkpoint, sender: str):
@@ -1362,12 +1520,12 @@ class Replica(HasActionQueue, MessageProcessor):
             for sender, ck in self.stashedRecvdCheckpoints[key].items():
                 self.processCheckpoint(ck, sender)
                 i += 1
-        logger.debug('{} processed {} stashed checkpoints for {}'.
-                     format(self, i, key))
+        logger.debug('{} processed {} stashed checkpoints for {}',
+                     self, i, key)
         return i
 
     def gc(self, tillSeqNo):
-        logger.debug("{} cleaning up till {}".format(self, tillSeqNo))
+        logger.debug("{} cleaning up till {}", self, tillSeqNo)
         tpcKeys = set()
         reqKeys = set()
         for (v, p), pp in self.sentPrePrepares.items():
@@ -1381,24 +1539,26 @@ class Replica(HasActionQueue, MessageProcessor):
                 for reqKey in pp.reqIdr:
                     reqKeys.add(reqKey)
 
-        logger.debug("{} found {} 3 phase keys to clean".
-                     format(self, len(tpcKeys)))
-        logger.debug("{} found {} request keys to clean".
-                     format(self, len(reqKeys)))
+        logger.debug("{} found {} 3 phase keys to clean",
+                     self, len(tpcKeys))
+        logger.debug("{} found {} request keys to clean",
+                     self, len(reqKeys))
 
         for k in tpcKeys:
             self.sentPrePrepares.pop(k, None)
             self.prePrepares.pop(k, None)
-            self.prepares.pop(k, None)
-            self.commits.pop(k, None)
+        self.prepares.pruneTill(tillSeqNo)
+        self.commits.pruneTill(tillSeqNo)
 
         for k in reqKeys:
             self.requests[k].forwardedTo -= 1
             if self.requests[k].forwardedTo == 0:
-                logger.debug('{} clearing requests {} from previous checkpoints'.
-                             format(self, len(reqKeys)))
+                logger.debug('{} clearing requests {} from previous checkpoints',
+                             self, len(reqKeys))
                 self.requests.pop(k)
 
+        self.ordered.prune(tillSeqNo)
+
     def stashOutsideWatermarks(self, item: Union[ReqDigest, Tuple]):
         self.stashingWhileOutsideWaterMarks.append(item)
 
@@ -1411,7 +1571,7 @@ class Replica(HasActionQueue, MessageProcessor):
         while itemsToConsume:
             item = self.stashingWhileOutsideWaterMarks.popleft()
             logger.debug("{} processing stashed item {} after new stable "
-                         "checkpoint".format(self, item))
+                         "checkpoint", self, item)
 
             if isinstance(item, tuple) and len(item) == 2:
                 self.dispatchThreePhaseMsg(*item)
@@ -1461,7 +1621,7 @@ class Replica(HasActionQueue, MessageProcessor):
         return self.h < ppSeqNo <= self.H
 
     def addToOrdered(self, viewNo: int, ppSeqNo: int):
-        self.ordered.add((viewNo, ppSeqNo))
+        self.ordered.add(viewNo, ppSeqNo)
         if ppSeqNo > self.lastOrderedPPSeqNo:
             self.lastOrderedPPSeqNo = ppSeqNo
 
@@ -1469,14 +1629,17 @@ class Replica(HasActionQueue, MessageProcessor):
                           nonFinReqs: Set=None):
         if nonFinReqs:
             logger.debug("Queueing pre-prepares due to unavailability of finalised "
-                         "requests. PrePrepare {} from {}".format(ppMsg, sender))
-            self.prePreparesPendingFinReqs.append((ppMsg, sender, nonFinReqs))
+                         "requests. PrePrepare {} from {}", ppMsg, sender)
+            pending = PendingPrePrepare(ppMsg, sender, len(nonFinReqs))
+            self.prePreparesPendingFinReqs[id(pending)] = pending
+            for key in nonFinReqs:
+                self.prePreparesPendingReq.setdefault(key, []).append(pending)
         else:
             # Possible exploit, an malicious party can send an invalid
             # pre-prepare and over-write the correct one?
             logger.debug(
                 "Queueing pre-prepares due to unavailability of previous "
-                "pre-prepares. PrePrepare {} from {}".format(ppMsg, sender))
+                "pre-prepares. PrePrepare {} from {}", ppMsg, sender)
             self.prePreparesPendingPrevPP[ppMsg.viewNo, ppMsg.ppSeqNo] = (ppMsg, sender)
 
     def dequeuePrePrepares(self):
@@ -1485,27 +1648,11 @@ class Replica(HasActionQueue, MessageProcessor):
         or the replica was missing any PRE-PREPAREs before it
         :return:
         """
-        ppsReady = []
-        # Check if any requests have become finalised belonging to any stashed
-        # PRE-PREPAREs.
-        for i, (pp, sender, reqIds) in enumerate(self.prePreparesPendingFinReqs):
-            finalised = set()
-            for r in reqIds:
-                if self.requests.isFinalised(r):
-                    finalised.add(r)
-            diff = reqIds.difference(finalised)
-            # All requests become finalised
-            if not diff:
-                ppsReady.append(i)
-            self.prePreparesPendingFinReqs[i] = (pp, sender, diff)
-
-        for i in sorted(ppsReady, reverse=True):
-            pp, sender, _ = self.prePreparesPendingFinReqs.pop(i)
-            self.prePreparesPendingPrevPP[pp.viewNo, pp.ppSeqNo] = (pp, sender)
-
+        # PRE-PREPAREs waiting for requests to be finalised are moved to
+        # `prePreparesPendingPrevPP` by `onRequestFinalised`
         r = 0
-        while self.prePreparesPendingPrevPP and self.isNextPrePrepare(
-                self.prePreparesPendingPrevPP.iloc[0][1]):
+        while self.prePreparesPendingPrevPP and self.isNextPending(
+                *self.prePreparesPendingPrevPP.iloc[0]):
             _, (pp, sender) = self.prePreparesPendingPrevPP.popitem(last=False)
             if not self.can_pp_seq_no_be_in_view(pp.viewNo, pp.ppSeqNo):
                 self.discard(pp, "Pre-Prepare from a previous view",
@@ -1517,7 +1664,7 @@ class Replica(HasActionQueue, MessageProcessor):
 
     def enqueuePrepare(self, pMsg: Prepare, sender: str):
         logger.debug("Queueing prepare due to unavailability of PRE-PREPARE. "
-                     "Prepare {} from {}".format(pMsg, sender))
+                     "Prepare {} from {}", pMsg, sender)
         key = (pMsg.viewNo, pMsg.ppSeqNo)
         if key not in self.preparesWaitingForPrePrepare:
             self.preparesWaitingForPrePrepare[key] = deque()
@@ -1531,17 +1678,17 @@ class Replica(HasActionQueue, MessageProcessor):
             while self.preparesWaitingForPrePrepare[key]:
                 prepare, sender = self.preparesWaitingForPrePrepare[
                     key].popleft()
-                logger.debug("{} popping stashed PREPARE{}".format(self, key))
+                logger.debug("{} popping stashed PREPARE{}", self, key)
                 self.processPrepare(prepare, sender)
                 i += 1
             self.preparesWaitingForPrePrepare.pop(key)
             logger.debug("{} processed {} PREPAREs waiting for PRE-PREPARE for"
-                         " view no {} and seq no {}".
-                         format(self, i, viewNo, ppSeqNo))
+                         " view no {} and seq no {}",
+                         self, i, viewNo, ppSeqNo)
 
     def enqueueCommit(self, request: Commit, sender: str):
         logger.debug("Queueing commit due to unavailability of PREPARE. "
-                     "Request {} from {}".format(request, sender))
+                     "Request {} from {}", request, sender)
         key = (request.viewNo, request.ppSeqNo)
         if key not in self.commitsWaitingForPrepare:
             self.commitsWaitingForPrepare[key] = deque()
@@ -1555,13 +1702,13 @@ class Replica(HasActionQueue, MessageProcessor):
             while self.commitsWaitingForPrepare[key]:
                 commit, sender = self.commitsWaitingForPrepare[
                     key].popleft()
-                logger.debug("{} popping stashed COMMIT{}".format(self, key))
+                logger.debug("{} popping stashed COMMIT{}", self, key)
                 self.processCommit(commit, sender)
                 i += 1
             self.commitsWaitingForPrepare.pop(key)
             logger.debug("{} processed {} COMMITs waiting for PREPARE for"
-                         " view no {} and seq no {}".
-                         format(self, i, viewNo, ppSeqNo))
+                         " view no {} and seq no {}",
+                         self, i, viewNo, ppSeqNo)
 
     def getDigestFor3PhaseKey(self, key: ThreePhaseKey) -> Optional[str]:
         reqKey = self.getReqKeyFrom3PhaseKey(key)
@@ -1569,7 +1716,7 @@ class Replica(HasActionQueue, MessageProcessor):
         if not digest:
             logger.debug("{} could not find digest in sent or received "
                          "PRE-PREPAREs or PREPAREs for 3 phase key {} and req "
-                         "key {}".format(self, key, reqKey))
+                         "key {}", self, key, reqKey)
             return None
         else:
             return digest
@@ -1583,8 +1730,8 @@ class Replica(HasActionQueue, MessageProcessor):
         elif key in self.prepares:
             reqKey = self.prepares[key][0]
         else:
-            logger.debug("Could not find request key for 3 phase key {}".
-                         format(key))
+            logger.debug("Could not find request key for 3 phase key {}",
+                         key)
         return reqKey
 
     def can_pp_seq_no_be_in_view(self, view_no, pp_seq_no):
@@ -1601,18 +1748,238 @@ class Replica(HasActionQueue, MessageProcessor):
 
     @property
     def threePhaseState(self):
-        # TODO: This method is incomplete
-        # Gets the current stable and unstable checkpoints and creates digest
-        # of unstable checkpoints
-        if self.checkpoints:
-            pass
-        else:
-            state = []
-        return ThreePCState(self.instId, state)
+        """
+        The PRE-PREPAREs of earlier views this replica prepared, which it
+        sends to the other nodes when the view changes
+        """
+        return ThreePCState(self.instId, [dict(pp._asdict()) for pp in
+                                          self.preparedInPrevViews()])
 
     def process3PhaseState(self, msg: ThreePCState, sender: str):
-        # TODO: This is not complete
-        pass
+        """
+        Keep the PRE-PREPAREs of earlier views prepared by the sender, which
+        the primary of the new view may propose again
+        """
+        if not self.config.ViewChangePreparedCertificates:
+            return
+        certificates = {}
+        for fields in msg.messages:
+            try:
+                pp = PrePrepare(**fields)
+            except (TypeError, AssertionError) as ex:
+                self.discard(msg, 'invalid PRE-PREPARE {}: {}'.
+                             format(fields, ex), logger.warning)
+                return
+            if pp.instId != self.instId or pp.viewNo > self.viewNo:
+                self.discard(msg, 'PRE-PREPARE {} is not of an earlier view '
+                                  'of this instance'.format(pp),
+                             logger.warning)
+                return
+            if not self.isPpSeqNoBetweenWaterMarks(pp.ppSeqNo):
+                logger.warning('{} dropping PRE-PREPARE {} from {} since it '
+                               'is outside the watermarks {} {}'.
+                               format(self, pp, sender, self.h, self.H))
+                continue
+            certificates[pp.ppSeqNo] = updateNamedTuple(
+                pp, **{f.REQ_IDR.nm: [tuple(k) for k in pp.reqIdr]})
+        logger.debug('{} got {} prepared PRE-PREPAREs from {}',
+                     self, len(certificates), sender)
+        self.preparedCertificates[sender] = certificates
+
+    def preparedInPrevViews(self) -> List[PrePrepare]:
+        """
+        PRE-PREPAREs of earlier views with a quorum of PREPAREs after the
+        last stable checkpoint, ordered or not like the prepared certificates
+        of PBFT's VIEW-CHANGE, so that the nodes which did not order a batch
+        learn of it from those which did. The one of the latest view for
+        each ppSeqNo, by ppSeqNo
+        """
+        prepared = {}  # type: Dict[int, PrePrepare]
+        for ppDict in (self.sentPrePrepares, self.prePrepares):
+            for (v, p), pp in ppDict.items():
+                if self.h < p and v < self.viewNo and \
+                        (p not in prepared or v > prepared[p].viewNo) and \
+                        self.prepares.hasQuorum(pp, self.f):
+                    prepared[p] = pp
+        return [prepared[p] for p in sorted(prepared)]
+
+    def on_view_change_start(self):
+        """
+        Send the PRE-PREPAREs of earlier views this replica prepared to the
+        other nodes, so the primary of the new view can propose again the
+        ones it did not order, then forget whatever was not ordered in those
+        views, reverting the batches applied for it
+        """
+        state = self.threePhaseState
+        self.preparedCertificates[self.node.name] = {
+            pp.ppSeqNo: pp for pp in self.preparedInPrevViews()}
+        self.send(state)
+        self.reproposeView = self.viewNo
+        self.reproposeSince = None
+        self.preparedTill = 0
+        self.orderedInPrevViews = {
+            p: pp
+            for ppDict in (self.sentPrePrepares, self.prePrepares)
+            for (v, p), pp in ppDict.items()
+            if v < self.viewNo and self.hasOrdered(v, p)}
+        self._forgetNotOrdered()
+
+    def _forgetNotOrdered(self):
+        keys = [key for ppDict in (self.sentPrePrepares, self.prePrepares)
+                for key in ppDict
+                if key[0] < self.viewNo and not self.hasOrdered(*key)]
+        # Batches are reverted in the reverse order they were applied
+        for key in sorted(keys, key=itemgetter(1), reverse=True):
+            sent = key in self.sentPrePrepares
+            pp = self.sentPrePrepares.pop(key) if sent \
+                else self.prePrepares.pop(key)
+            if key not in self.stashingWhileCatchingUp and \
+                    pp.ppSeqNo in self.batches:
+                count, _, prevStateRoot = self.batches.pop(pp.ppSeqNo)
+                if self.isMaster:
+                    self.revert(pp.ledgerId, prevStateRoot, count)
+            if sent:
+                # The primary took the requests out of its queue when
+                # creating the batch, they have to be batched again unless
+                # proposed again
+                for reqKey in pp.reqIdr:
+                    if reqKey in self.requests:
+                        self.requestQueues[pp.ledgerId].add(reqKey)
+        for key in keys:
+            self.prepares.pop(key, None)
+            self.commits.pop(key, None)
+            self.stashingWhileCatchingUp.discard(key)
+        for pending in (self.prePreparesPendingPrevPP,
+                        self.preparesWaitingForPrePrepare,
+                        self.commitsWaitingForPrepare):
+            for key in [k for k in pending if k[0] < self.viewNo]:
+                pending.pop(key)
+        if keys:
+            logger.info('{} forgot {} batches not ordered in earlier views'.
+                        format(self, len(keys)))
+        self._lastPrePrepareSeqNo = self.lastOrderedPPSeqNo
+
+    def reproposePrepared(self) -> int:
+        """
+        Propose again in this view the PRE-PREPAREs of earlier views which
+        f+1 nodes prepared, once a quorum of nodes sent the ones they
+        prepared. If some could not be proposed again, no new batch is
+        created at or below the highest ppSeqNo f+1 nodes prepared, since it
+        might have been committed by some nodes
+
+        :return: the number of PRE-PREPAREs proposed again
+        """
+        if len(self.preparedCertificates) < self.quorum:
+            return 0
+        certificates, self.preparedTill = self.preparedToRepropose()
+        self.reproposeView = None
+        self.reproposeSince = None
+        self.preparedCertificates = {}
+        r = 0
+        for pp in certificates:
+            if not self.reproposePrePrepare(pp):
+                break
+            r += 1
+        logger.info('{} proposed again {} of {} prepared PRE-PREPAREs'.
+                    format(self, r, len(certificates)))
+        if self.lastPrePrepareSeqNo < self.preparedTill:
+            logger.warning('{} will not create batches since it could not '
+                           'propose again the ones prepared till {}'.
+                           format(self, self.preparedTill))
+        return r
+
+    @property
+    def canCreateBatches(self) -> bool:
+        return self.reproposeSince is None and \
+            max(self.lastPrePrepareSeqNo, self.lastOrderedPPSeqNo) >= \
+            self.preparedTill
+
+    def preparedToRepropose(self) -> Tuple[List[PrePrepare], int]:
+        """
+        PRE-PREPAREs to propose again: for each ppSeqNo after the last
+        ordered one, the PRE-PREPARE of the latest view which at least f+1
+        nodes reported prepared, so at least one non faulty node did. They
+        follow the last ordered one without a gap and stop at a ppSeqNo for
+        which f+1 nodes reported different PRE-PREPAREs in the same view.
+
+        :return: the PRE-PREPAREs and the highest ppSeqNo of a PRE-PREPARE
+        reported by f+1 nodes
+        """
+        # For each ppSeqNo, the PRE-PREPAREs reported and who reported them
+        reported = {}  # type: Dict[int, List[Tuple[PrePrepare, Set[str]]]]
+        for sender, certificates in self.preparedCertificates.items():
+            for ppSeqNo, pp in certificates.items():
+                if pp.viewNo >= self.viewNo or \
+                        ppSeqNo <= self.lastOrderedPPSeqNo:
+                    continue
+                candidates = reported.setdefault(ppSeqNo, [])
+                for candidate, senders in candidates:
+                    if candidate == pp:
+                        senders.add(sender)
+                        break
+                else:
+                    candidates.append((pp, {sender}))
+        latest = {}  # type: Dict[int, List[PrePrepare]]
+        for ppSeqNo, candidates in reported.items():
+            accepted = [pp for pp, senders in candidates
+                        if len(senders) > self.f]
+            if accepted:
+                viewNo = max(pp.viewNo for pp in accepted)
+                latest[ppSeqNo] = [pp for pp in accepted
+                                   if pp.viewNo == viewNo]
+        prepared = []
+        ppSeqNo = self.lastOrderedPPSeqNo + 1
+        while len(latest.get(ppSeqNo, ())) == 1:
+            prepared.append(latest[ppSeqNo][0])
+            ppSeqNo += 1
+        if ppSeqNo in latest:
+            logger.warning('{} got different PRE-PREPAREs prepared in view '
+                           '{} for ppSeqNo {}'.
+                           format(self, latest[ppSeqNo][0].viewNo, ppSeqNo))
+        return prepared, max(latest, default=self.lastOrderedPPSeqNo)
+
+    def reproposePrePrepare(self, prepared: PrePrepare) -> bool:
+        """
+        Send a PRE-PREPARE in this view for the batch of `prepared`, applying
+        its requests like for a new batch
+
+        :return: whether the batch could be applied as it was prepared
+        """
+        ledgerId = prepared.ledgerId
+        nonFinReqs = self.nonFinalisedReqs(prepared.reqIdr)
+        if nonFinReqs:
+            logger.warning('{} cannot propose again {} since requests {} are '
+                           'not finalised'.format(self, prepared, nonFinReqs))
+            return False
+        oldStateRoot = self.stateRootHash(ledgerId, toHex=False)
+        validReqs = []
+        inValidReqs = []
+        rejects = []
+        for reqKey in prepared.reqIdr:
+            req = self.requests[reqKey].finalised
+            self.processReqDuringBatch(req, validReqs, inValidReqs, rejects)
+        if len(validReqs) != prepared.discarded or \
+                self.batchDigest(validReqs + inValidReqs) != \
+                prepared.digest or \
+                (self.isMaster and
+                 (prepared.stateRootHash != self.stateRootHash(ledgerId) or
+                  prepared.txnRootHash != self.txnRootHash(ledgerId))):
+            if self.isMaster:
+                self.revert(ledgerId, oldStateRoot, len(validReqs))
+            logger.warning('{} cannot propose again {} since it does not '
+                           'apply as prepared'.format(self, prepared))
+            return False
+        ppReq = updateNamedTuple(prepared, **{f.VIEW_NO.nm: self.viewNo})
+        for reqKey in prepared.reqIdr:
+            self.requestQueues[ledgerId].discard(reqKey)
+        self.lastPrePrepareSeqNo = ppReq.ppSeqNo
+        if self.isMaster:
+            self.outBox.extend(rejects)
+            self.node.onBatchCreated(ledgerId,
+                                     self.stateRootHash(ledgerId, toHex=False))
+        self.sendPrePrepare(ppReq)
+        self.trackBatches(ppReq, oldStateRoot)
+        return True
 
     def send(self, msg, stat=None) -> None:
         """
@@ -1622,9 +1989,9 @@ class Replica(HasActionQueue, MessageProcessor):
         :param rid: remote id of one recipient (sends to all recipients if None)
         :param msg: the message to send
         """
-        logger.display("{} sending {}".format(self, msg.__class__.__name__),
+        logger.display("{} sending {}", self, msg.__class__.__name__,
                        extra={"cli": True, "tags": ['sending']})
-        logger.trace("{} sending {}".format(self, msg))
+        logger.trace("{} sending {}", self, msg)
         if stat:
             self.stats.inc(stat)
         self.outBox.append(msg)
@@ -1639,7 +2006,7 @@ class Replica(HasActionQueue, MessageProcessor):
             if (key[1] <= last_caught_up_pp_seq_no):
                 outdated_pre_prepares.add((pp.viewNo, pp.ppSeqNo, pp.ledgerId))
                 self.prePrepares.pop(key, None)
-                self.ordered.add((pp.viewNo, pp.ppSeqNo))
+                self.ordered.add(pp.viewNo, pp.ppSeqNo)
 
         for key in sorted(list(outdated_pre_prepares), key=itemgetter(1), reverse=True):
             count, _, prevStateRoot = self.batches[key[1]]
@@ -0,0 +1,449 @@
+"""
+Replicas of backup protocol instances running in worker processes.
+
+Backup replicas only order requests so that the node can compare their
+throughput and latency with the master's, they never execute anything. With
+`BackupReplicasInProcesses` set, the node creates a `RemoteReplica` for each
+backup instance. It has what the node and the elector use of a replica and
+hosts the actual `Replica` in a worker process, so the master replica gets the
+node's process to itself.
+
+The messages the node puts in the inBox of a `RemoteReplica`, along with the
+finalised requests they refer to, are sent to the worker over a queue and what
+the replica puts in its outBox, 3 phase messages to send to other nodes and
+`Ordered` for the monitor, comes back the same way. Messages are sent as the
+dictionaries they are serialised from.
+"""
+import multiprocessing
+import os
+import time
+from collections import deque
+from queue import Empty
+from typing import Any, Dict, List, Optional, Tuple
+
+from orderedset import OrderedSet
+
+from plenum.common.constants import OP_FIELD_NAME
+from plenum.common.exceptions import SuspiciousNode
+from plenum.common.messages.message_base import MessageBase
+from plenum.common.request import ReqKey
+from plenum.common.types import TaggedTupleBase, TaggedTuples, ThreePCState
+from plenum.common.lazy_log import getlogger
+from plenum.server.propagator import Requests
+from plenum.server.replica import Replica
+from plenum.server.suspicion_codes import Suspicion
+
+logger = getlogger()
+
+# Kinds of the items exchanged between a node and a worker
+STATE = 'state'
+REQ_KEY = 'reqKey'
+MSG = 'msg'
+PRIMARY_NAME = 'primaryName'
+PRIMARY_CHANGED = 'primaryChanged'
+VIEW_CHANGE_STARTED = 'viewChangeStarted'
+CAUGHT_UP = 'caughtUp'
+STOP = 'stop'
+SUSPICION = 'suspicion'
+RELEASED = 'released'
+LAST_ORDERED = 'lastOrdered'
+THREE_PHASE_STATE = 'threePhaseState'
+
+
+def packMsg(msg) -> Tuple:
+    """
+    Return a picklable form of a message exchanged by a replica and its node
+    """
+    if isinstance(msg, (MessageBase, TaggedTupleBase)):
+        fields = dict(msg._asdict())
+        fields[OP_FIELD_NAME] = msg.typename
+        return MSG, fields
+    if isinstance(msg, SuspiciousNode):
+        offendingMsg = packMsg(msg.offendingMsg) \
+            if msg.offendingMsg is not None else None
+        return SUSPICION, (msg.node, msg.code, msg.reason, offendingMsg)
+    return None, msg
+
+
+def unpackMsg(packed: Tuple):
+    kind, data = packed
+    if kind == MSG:
+        data = dict(data)
+        return TaggedTuples[data.pop(OP_FIELD_NAME)](**data)
+    if kind == SUSPICION:
+        node, code, reason, offendingMsg = data
+        if offendingMsg is not None:
+            offendingMsg = unpackMsg(offendingMsg)
+        suspicion = Suspicion(code, reason) if code is not None else None
+        return SuspiciousNode(node, suspicion, offendingMsg)
+    return data
+
+
+class WorkerRequests(Requests):
+    """
+    Requests of a replica in a worker process, remembers the keys of the ones
+    removed by the replica's garbage collection so that the node can release
+    them too
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.released = []
+
+    def pop(self, key, *args):
+        self.released.append(key)
+        return super().pop(key, *args)
+
+
+class WorkerNode:
+    """
+    Stands in for the node in a worker process and has only what a backup
+    replica uses of its node
+    """
+
+    def __init__(self, name: str, state: Dict[str, Any]):
+        self.name = name
+        self.viewNo = 0
+        self.isParticipating = False
+        self.f = 0
+        self.ledger_ids = []
+        self.requests = WorkerRequests()
+        self.suspicions = []  # type: List[SuspiciousNode]
+        # Times taken by the replica's handlers are not collected in workers
+        self.handlerTimings = None
+        self.update(state)
+
+    @classmethod
+    def forNodeClass(cls, nodeCls):
+        # The replica gets the ledger of a request from the class of its node
+        return type(cls.__name__, (cls, ),
+                    {'ledgerIdForRequest':
+                         staticmethod(nodeCls.ledgerIdForRequest)})
+
+    @property
+    def quorum(self) -> int:
+        return (2 * self.f) + 1
+
+    def update(self, state: Dict[str, Any]):
+        for attr, value in state.items():
+            setattr(self, attr, value)
+
+    def reportSuspiciousNodeEx(self, ex: SuspiciousNode):
+        self.suspicions.append(ex)
+
+
+class ReplicaHost:
+    """
+    Runs a backup replica in a worker process
+    """
+
+    def __init__(self, inQueue, outQueue, nodeCls, nodeName: str,
+                 instId: int, state: Dict[str, Any]):
+        self.inQueue = inQueue
+        self.outQueue = outQueue
+        self.node = WorkerNode.forNodeClass(nodeCls)(nodeName, state)
+        self.replica = Replica(self.node, instId, isMaster=False)
+        self.addLedgerQueues()
+        self.lastOrderedPPSeqNo = self.replica.lastOrderedPPSeqNo
+        self.stopped = False
+
+    def run(self, pollTimeout: float):
+        parentPid = os.getppid()
+        while not self.stopped and os.getppid() == parentPid:
+            try:
+                items = self.inQueue.get(timeout=pollTimeout)
+            except Empty:
+                items = None
+            while items is not None:
+                for item in items:
+                    self.apply(item)
+                try:
+                    items = self.inQueue.get_nowait()
+                except Empty:
+                    items = None
+            # The replica is serviced even if nothing came from the node
+            # since it has timers, like the one for sending a batch
+            self.replica.serviceQueues()
+            self.flush()
+
+    def apply(self, item: Tuple):
+        kind = item[0]
+        replica = self.replica
+        if kind == STATE:
+            self.node.update(item[1])
+            self.addLedgerQueues()
+        elif kind == REQ_KEY:
+            _, key, request = item
+            reqState = self.node.requests.add(request)
+            reqState.finalised = request
+            reqState.forwarded = True
+            reqState.forwardedTo = 1
+            replica.inBox.append(ReqKey(*key))
+        elif kind == MSG:
+            _, packed, frm = item
+            replica.inBox.append((unpackMsg(packed), frm))
+        elif kind == PRIMARY_NAME:
+            replica.primaryName = item[1]
+        elif kind == PRIMARY_CHANGED:
+            replica.primaryChanged(*item[1:])
+        elif kind == VIEW_CHANGE_STARTED:
+            replica.on_view_change_start()
+        elif kind == CAUGHT_UP:
+            replica.caught_up_till_pp_seq_no(item[1])
+        elif kind == THREE_PHASE_STATE:
+            # After what the replica did so far, like for the node
+            self.flush()
+            self.outQueue.put([(THREE_PHASE_STATE,
+                                packMsg(replica.threePhaseState))])
+        elif kind == STOP:
+            self.stopped = True
+        else:
+            logger.error("{} got an unknown item {} from its node",
+                         replica, item)
+
+    def addLedgerQueues(self):
+        for ledgerId in self.node.ledger_ids:
+            if ledgerId not in self.replica.requestQueues:
+                self.replica.requestQueues[ledgerId] = OrderedSet()
+
+    def flush(self):
+        items = []
+        outBox = self.replica.outBox
+        while outBox:
+            items.append(packMsg(outBox.popleft()))
+        while self.node.suspicions:
+            items.append(packMsg(self.node.suspicions.pop(0)))
+        if self.node.requests.released:
+            items.append((RELEASED, self.node.requests.released))
+            self.node.requests.released = []
+        if self.replica.lastOrderedPPSeqNo != self.lastOrderedPPSeqNo:
+            self.lastOrderedPPSeqNo = self.replica.lastOrderedPPSeqNo
+            items.append((LAST_ORDERED, self.lastOrderedPPSeqNo))
+        if items:
+            self.outQueue.put(items)
+
+
+def runReplicaHost(inQueue, outQueue, nodeCls, nodeName, instId, state,
+                   pollTimeout):
+    ReplicaHost(inQueue, outQueue, nodeCls, nodeName, instId,
+                state).run(pollTimeout)
+
+
+class RemoteReplica:
+    """
+    Replica of a backup protocol instance on a node whose replica runs in a
+    worker process
+    """
+
+    def __init__(self, node: 'plenum.server.node.Node', instId: int):
+        self.node = node
+        self.instId = instId
+        self.isMaster = False
+        self.name = Replica.generateName(node.name, instId)
+
+        self.inBox = deque()
+        self.outBox = deque()
+
+        self._primaryName = None  # type: Optional[str]
+        # Updated by the worker as the replica orders batches
+        self.lastOrderedPPSeqNo = 0
+
+        # Request queues are in the worker, kept since the node adds queues
+        # for new ledgers to its replicas
+        self.requestQueues = {ledgerId: OrderedSet()
+                              for ledgerId in node.ledger_ids}
+
+        self._process = None  # type: Optional[multiprocessing.Process]
+        self._inQueue = None
+        self._outQueue = None
+        # Items to send to the worker with the next batch
+        self._pending = []
+        self._sentState = None
+        # 3 phase state of the replica got from the worker
+        self._threePhaseState = None  # type: Optional[ThreePCState]
+
+    def memoryContainers(self):
+        # What the replica itself keeps is in its worker's process
+        yield 'inBox', self.inBox
+        yield 'outBox', self.outBox
+        yield 'pending', self._pending
+
+    def __repr__(self):
+        return self.name
+
+    getNodeName = staticmethod(Replica.getNodeName)
+    generateName = staticmethod(Replica.generateName)
+
+    @property
+    def viewNo(self):
+        return self.node.viewNo
+
+    @property
+    def isPrimary(self):
+        return self._primaryName == self.name \
+            if self._primaryName is not None else None
+
+    @property
+    def primaryName(self):
+        return self._primaryName
+
+    @primaryName.setter
+    def primaryName(self, value: Optional[str]) -> None:
+        self._primaryName = value
+        self._queue((PRIMARY_NAME, value))
+
+    def primaryChanged(self, primaryName, lastOrderedPPSeqNo):
+        if self.lastOrderedPPSeqNo < lastOrderedPPSeqNo:
+            self.lastOrderedPPSeqNo = lastOrderedPPSeqNo
+        self._primaryName = primaryName
+        self._queue((PRIMARY_CHANGED, primaryName, lastOrderedPPSeqNo))
+
+    def caught_up_till_pp_seq_no(self, last_caught_up_pp_seq_no):
+        self._queue((CAUGHT_UP, last_caught_up_pp_seq_no))
+
+    def on_view_change_start(self):
+        self._queue((VIEW_CHANGE_STARTED, ))
+
+    @property
+    def threePhaseState(self) -> ThreePCState:
+        """
+        The 3 phase state of the replica in the worker, waiting for it for at
+        most `BackupReplicaStateTimeout` seconds. Whatever else the worker
+        sends meanwhile is processed as usual
+        """
+        if not self.isRunning:
+            return ThreePCState(self.instId, [])
+        self._threePhaseState = None
+        self._queue((THREE_PHASE_STATE, ))
+        self._inQueue.put(self._pending)
+        self._pending = []
+        deadline = time.perf_counter() + \
+            self.node.config.BackupReplicaStateTimeout
+        while self._threePhaseState is None:
+            timeout = deadline - time.perf_counter()
+            try:
+                items = self._outQueue.get(timeout=max(timeout, 0))
+            except Empty:
+                logger.warning("{} got no 3 phase state from its worker in "
+                               "{} seconds", self,
+                               self.node.config.BackupReplicaStateTimeout)
+                return ThreePCState(self.instId, [])
+            self._processFromWorker(items)
+        state, self._threePhaseState = self._threePhaseState, None
+        return state
+
+    @property
+    def isRunning(self) -> bool:
+        return self._process is not None and self._process.is_alive()
+
+    def start(self):
+        config = self.node.config
+        ctx = multiprocessing.get_context(config.BackupReplicaStartMethod)
+        self._inQueue = ctx.Queue()
+        self._outQueue = ctx.Queue()
+        self._sentState = self._state()
+        self._process = ctx.Process(
+            target=runReplicaHost,
+            name=self.name,
+            args=(self._inQueue, self._outQueue, type(self.node),
+                  self.node.name, self.instId, self._sentState,
+                  config.BackupReplicaPollTimeout),
+            daemon=True)
+        self._process.start()
+        # A new worker does not know the primary
+        if self._primaryName is not None:
+            self._pending.insert(0, (PRIMARY_CHANGED, self._primaryName,
+                                     self.lastOrderedPPSeqNo))
+        logger.display("{} started replica in process {}",
+                       self, self._process.pid)
+
+    def stop(self, timeout: float = 5):
+        if self._process is None:
+            return
+        if self._process.is_alive():
+            self._inQueue.put([(STOP, )])
+            self._process.join(timeout)
+            if self._process.is_alive():
+                self._process.terminate()
+                self._process.join(timeout)
+        for q in (self._inQueue, self._outQueue):
+            q.close()
+        logger.display("{} stopped replica in process {}",
+                       self, self._process.pid)
+        self._process = self._inQueue = self._outQueue = None
+
+    def serviceQueues(self, limit=None) -> int:
+        """
+        Send the messages in the inBox to the worker and put the messages
+        received from it in the outBox.
+
+        :param limit: the maximum number of messages to send to the worker
+        :return: the number of messages sent and received
+        """
+        if not self.isRunning:
+            self.start()
+        count = 0
+        while self.inBox and (not limit or count < limit):
+            self._queue(self._packInBoxItem(self.inBox.popleft()))
+            count += 1
+        if self._pending:
+            self._inQueue.put(self._pending)
+            self._pending = []
+        while True:
+            try:
+                items = self._outQueue.get_nowait()
+            except Empty:
+                break
+            count += self._processFromWorker(items)
+        return count
+
+    def _state(self) -> Dict[str, Any]:
+        # What the replica uses of the node's state
+        return {
+            'viewNo': self.node.viewNo,
+            'isParticipating': self.node.isParticipating,
+            'f': self.node.f,
+            'ledger_ids': list(self.node.ledger_ids),
+        }
+
+    def _queue(self, item: Tuple):
+        # The replica has to see the node's state as of when the item was
+        # queued, like the view for which the primary is set
+        state = self._state()
+        if state != self._sentState:
+            self._pending.append((STATE, state))
+            self._sentState = state
+        self._pending.append(item)
+
+    def _packInBoxItem(self, item) -> Tuple:
+        if isinstance(item, ReqKey):
+            key = tuple(item)
+            return REQ_KEY, key, self.node.requests[key].finalised
+        msg, frm = item
+        return MSG, packMsg(msg), frm
+
+    def _processFromWorker(self, items: List[Tuple]) -> int:
+        count = 0
+        for item in items:
+            kind = item[0]
+            if kind == RELEASED:
+                self._release(item[1])
+            elif kind == LAST_ORDERED:
+                self.lastOrderedPPSeqNo = item[1]
+            elif kind == THREE_PHASE_STATE:
+                self._threePhaseState = unpackMsg(item[1])
+            else:
+                self.outBox.append(unpackMsg(item))
+                count += 1
+        return count
+
+    def _release(self, keys):
+        # Same as what `Replica.gc` does for the requests it cleans up
+        requests = self.node.requests
+        for key in keys:
+            key = tuple(key)
+            if key not in requests:
+                continue
+            requests[key].forwardedTo -= 1
+            if requests[key].forwardedTo == 0:
+                requests.pop(key)
@@ -1,8 +1,11 @@
+import time
 from collections import deque, OrderedDict
 from inspect import isawaitable
 from typing import Callable, Any, NamedTuple, Union
 from typing import Tuple
 
+from plenum.common.perf_util import HandlerTimings
+
 
 class Router:
     """
@@ -15,15 +18,23 @@ class Router:
     (2) a function that handles the message
     """
 
-    def __init__(self, *routes: Tuple[Union[type, NamedTuple], Callable]):
+    def __init__(self, *routes: Tuple[Union[type, NamedTuple], Callable],
+                 timings: HandlerTimings = None, name: str = None):
         """
         Create a new router with a list of routes
 
         :param routes: each route is a tuple of a type and a callable, so that
         the router knows which callable to invoke when presented with an object
          of a particular type.
+        :param timings: where the time taken by the handler of each type of
+        message is recorded, if it is enabled
+        :param name: prefix of the names the times are recorded by
         """
         self.routes = OrderedDict(routes)
+        self.timings = timings
+        self.name = name
+        # Name the time taken for each type of message is recorded by
+        self._timingNames = {}
 
     def getFunc(self, o: Any) -> Callable:
         """
@@ -51,9 +62,27 @@ class Router:
         # If a plain python tuple and not a named tuple, a better alternative
         # would be to create a named entity with the 3 characteristics below
         if isinstance(msg, tuple) and len(msg) == 2 and not hasattr(msg, '_field_types'):
-            return self.getFunc(msg[0])(*msg)
+            o, args = msg[0], msg
         else:
-            return self.getFunc(msg)(msg)
+            o, args = msg, (msg, )
+        func = self.getFunc(o)
+        if self.timings is None or not self.timings.enabled:
+            return func(*args)
+        start = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            self.timings.record(self.timingName(o),
+                                time.perf_counter() - start)
+
+    def timingName(self, o: Any) -> str:
+        typ = type(o)
+        name = self._timingNames.get(typ)
+        if name is None:
+            name = typ.__name__ if not self.name \
+                else '{}.{}'.format(self.name, typ.__name__)
+            self._timingNames[typ] = name
+        return name
 
     async def handle(self, msg: Any) -> Any:
         """
@@ -0,0 +1,119 @@
+"""
+Benchmark of committing batches of txns to a ledger on disk with each way of
+making it durable:
+
+    write   fsync of the transaction log on every write
+    group   one sync of the ledger for every `groupBatches` batches
+    none    no fsync at all, what a crash of the machine can lose is unknown
+
+A batch counts as acknowledged once it would be replied to, so right after it
+is committed with `write` and `none`, and after the sync of its group with
+`group`. The results are written as JSON like those of `pool_benchmark`:
+
+    python -m plenum.test.benchmarks.durability_benchmark --batches 200 \
+        --batchSize 10 --groupBatches 10 --output durability.json
+"""
+import argparse
+import json
+import os
+import platform
+import tempfile
+import time
+from collections import OrderedDict
+from typing import Dict
+
+from ledger.compact_merkle_tree import CompactMerkleTree
+from ledger.stores.file_hash_store import FileHashStore
+
+from plenum.common.ledger import Ledger
+from plenum.test.benchmarks.pool_benchmark import currentCommit, \
+    latencySummary
+
+MODES = ('write', 'group', 'none')
+
+
+def commitBatches(dataDir: str, mode: str, batches: int, batchSize: int,
+                  groupBatches: int) -> Dict:
+    ledger = Ledger(CompactMerkleTree(hashStore=FileHashStore(dataDir=dataDir)),
+                    dataDir=dataDir,
+                    ensureDurability=mode == 'write')
+    latencies = []
+    # Start times of the batches not acknowledged yet
+    waiting = []
+    start = time.perf_counter()
+    for batch in range(batches):
+        waiting.append(time.perf_counter())
+        txns = [{'reqId': batch * batchSize + i, 'data': 'x' * 64}
+                for i in range(batchSize)]
+        ledger.appendTxns(txns)
+        ledger.commitTxns(len(txns))
+        if mode == 'group' and len(waiting) < groupBatches and \
+                batch < batches - 1:
+            continue
+        if mode == 'group':
+            ledger.sync()
+        now = time.perf_counter()
+        latencies.extend(now - startedAt for startedAt in waiting)
+        waiting = []
+    duration = time.perf_counter() - start
+    ledger.stop()
+    return OrderedDict([
+        ('duration', duration),
+        ('throughput', batches * batchSize / duration if duration else 0.0),
+        ('ackLatency', latencySummary(latencies)),
+    ])
+
+
+def runBenchmark(batches=200, batchSize=10, groupBatches=10, modes=MODES,
+                 baseDir=None) -> Dict:
+    results = OrderedDict()
+    with tempfile.TemporaryDirectory(prefix='durability-benchmark-',
+                                     dir=baseDir) as tmp:
+        for mode in modes:
+            results[mode] = commitBatches(os.path.join(tmp, mode), mode,
+                                          batches, batchSize, groupBatches)
+    return OrderedDict([
+        ('environment', OrderedDict([
+            ('commit', currentCommit()),
+            ('python', platform.python_version()),
+            ('platform', platform.platform()),
+        ])),
+        ('parameters', OrderedDict([
+            ('batches', batches),
+            ('batchSize', batchSize),
+            ('groupBatches', groupBatches),
+        ])),
+        ('results', results),
+    ])
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(
+        description='Compare the cost of fsync on every write, group commit '
+                    'and no fsync for ledger commits')
+    parser.add_argument('--batches', type=int, default=200)
+    parser.add_argument('--batchSize', type=int, default=10,
+                        help='txns in a batch')
+    parser.add_argument('--groupBatches', type=int, default=10,
+                        help='batches synced together with group commit')
+    parser.add_argument('--modes', default=','.join(MODES))
+    parser.add_argument('--baseDir', default=None,
+                        help='directory to put the ledgers in, the disk '
+                             'under it is what gets measured')
+    parser.add_argument('--output', default='-',
+                        help='file to write the JSON results to')
+    args = parser.parse_args(args)
+
+    result = runBenchmark(args.batches, args.batchSize, args.groupBatches,
+                          args.modes.split(','), args.baseDir)
+    output = json.dumps(result, indent=2)
+    if args.output == '-':
+        print(output)
+    else:
+        with open(args.output, 'w') as outFile:
+            outFile.write(output)
+    return result
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,329 @@
+"""
+Stacks which pass messages between nodes and clients of one process through
+memory, standing in for ZStack. Messages are serialized and batched just like
+with ZStack, only the sockets are replaced, so the cost measured with them is
+the cost of the protocol and not of the network.
+"""
+import json
+import sys
+import time
+from collections import deque
+from typing import Any, Callable, Dict, Mapping, Optional
+
+from plenum.common.batched import Batched
+from plenum.common.message_processor import MessageProcessor
+from plenum.common.stacks import ClientZStack
+from stp_core.common.log import getlogger
+from stp_core.network.keep_in_touch import KITNetworkInterface
+from stp_core.network.network_interface import NetworkInterface
+from stp_core.types import HA
+
+logger = getlogger()
+
+LOCAL_IPS = ('127.0.0.1', '0.0.0.0', 'localhost')
+
+
+def _address(ha) -> HA:
+    host, port = ha
+    return HA('127.0.0.1' if host in LOCAL_IPS else host, port)
+
+
+class InMemoryNetwork:
+    """
+    Delivers messages between the started stacks attached to it, finding
+    them by name or by the address they listen at
+    """
+
+    def __init__(self):
+        self._byName = {}  # type: Dict[str, InMemoryStack]
+        self._byAddress = {}  # type: Dict[HA, InMemoryStack]
+        self.messages = 0
+        self.bytes = 0
+
+    def attach(self, stack: 'InMemoryStack'):
+        self._byName[stack.name] = stack
+        self._byAddress[_address(stack.ha)] = stack
+
+    def detach(self, stack: 'InMemoryStack'):
+        if self._byName.get(stack.name) is stack:
+            del self._byName[stack.name]
+        address = _address(stack.ha)
+        if self._byAddress.get(address) is stack:
+            del self._byAddress[address]
+
+    def stackAt(self, name: str, ha) -> Optional['InMemoryStack']:
+        """
+        The stack listening at `ha`, if it is the one called `name`
+        """
+        stack = self._byAddress.get(_address(ha))
+        return stack if stack is not None and stack.name == name else None
+
+    def stackNamed(self, name: str) -> Optional['InMemoryStack']:
+        return self._byName.get(name)
+
+    def deliver(self, frm: str, to: 'InMemoryStack', msg: bytes) -> bool:
+        if to is None:
+            return False
+        to.received(msg, frm)
+        self.messages += 1
+        self.bytes += len(msg)
+        return True
+
+
+class InMemoryRemote:
+    def __init__(self, network: InMemoryNetwork, name: str, ha):
+        self.network = network
+        self.name = name
+        self.uid = name
+        self.ha = HA(*ha)
+
+    @property
+    def isConnected(self) -> bool:
+        return self.network.stackAt(self.name, self.ha) is not None
+
+    def __repr__(self):
+        return '{}:{}'.format(self.name, self.ha)
+
+
+class InMemoryStack(NetworkInterface):
+    def __init__(self, stackParams: dict, msgHandler: Callable,
+                 network: InMemoryNetwork, onlyListener=False, seed=None):
+        self._name = stackParams['name']
+        self.ha = HA(*stackParams['ha'])
+        self.msgHandler = msgHandler
+        self.network = network
+        self.onlyListener = onlyListener
+        self.seed = seed
+        self._created = time.perf_counter()
+        self._remotes = {}  # type: Dict[str, InMemoryRemote]
+        self._conns = set()
+        # Names of the stacks which sent a message to a listener
+        self.peersWithoutRemotes = set()
+        self.rxMsgs = deque()
+        self.opened = False
+        self.messageTimeout = None
+        self.connectNicelyUntil = 0
+
+    @property
+    def remotes(self):
+        return self._remotes
+
+    @property
+    def created(self):
+        return self._created
+
+    @property
+    def name(self):
+        return self._name
+
+    @property
+    def keyhex(self):
+        return self.seed.hex() if isinstance(self.seed, bytes) else self.seed
+
+    @property
+    def connecteds(self):
+        if self.onlyListener:
+            return {name for name in self.peersWithoutRemotes
+                    if self.network.stackNamed(name) is not None}
+        return super().connecteds
+
+    @staticmethod
+    def isRemoteConnected(r) -> bool:
+        return r.isConnected
+
+    # Stacks in memory need no keys
+
+    @staticmethod
+    def initLocalKeys(name, baseDir, sigseed, override=False):
+        return None, None
+
+    @staticmethod
+    def initRemoteKeys(name, remoteName, baseDir, verkey, override=False):
+        pass
+
+    @staticmethod
+    def areKeysSetup(name, baseDir):
+        return True
+
+    @staticmethod
+    def learnKeysFromOthers(baseDir, name, others):
+        pass
+
+    def tellKeysToOthers(self, others):
+        pass
+
+    @staticmethod
+    def getHaFromLocal(name, basedirpath):
+        return None
+
+    def onHostAddressChanged(self):
+        pass
+
+    def start(self):
+        self.network.attach(self)
+        self.opened = True
+
+    def stop(self):
+        self.network.detach(self)
+        self.opened = False
+
+    def connect(self, name=None, remoteId=None, ha=None, verKeyRaw=None,
+                publicKeyRaw=None):
+        if not name:
+            raise ValueError('Remote name should be specified')
+        remote = self._remotes.get(name)
+        if remote is None:
+            remote = InMemoryRemote(self.network, name, ha)
+            self._remotes[name] = remote
+        return remote.uid
+
+    def disconnectByName(self, name: str):
+        # A remote is connected as long as the other stack runs
+        pass
+
+    def removeRemote(self, r, clear=True):
+        self._remotes.pop(r.name, None)
+
+    def hasRemote(self, name):
+        return not self.onlyListener and super().hasRemote(name)
+
+    def send(self, msg: Any, remoteName: str = None, ha=None):
+        if self.onlyListener:
+            return self.transmitThroughListener(msg, remoteName)
+        if remoteName is None:
+            msg = self.serializeMsg(msg)
+            results = [self.transmit(msg, uid, serialized=True)[0]
+                       for uid in self._remotes]
+            return all(results), None
+        return self.transmit(msg, remoteName)
+
+    def transmit(self, msg, uid, timeout=None, serialized=False):
+        remote = self._remotes.get(uid)
+        if remote is None:
+            logger.debug("Remote {} does not exist!".format(uid))
+            return False, None
+        if not serialized:
+            msg = self.serializeMsg(msg)
+        to = self.network.stackAt(remote.name, remote.ha)
+        if not self.network.deliver(self.name, to, msg):
+            return False, '{} is not connected'.format(remote.name)
+        return True, None
+
+    def transmitThroughListener(self, msg, ident):
+        if isinstance(ident, bytes):
+            ident = ident.decode()
+        if not self.network.deliver(self.name,
+                                    self.network.stackNamed(ident),
+                                    self.serializeMsg(msg)):
+            return False, '{} is not connected'.format(ident)
+        return True, None
+
+    def received(self, msg: bytes, frm: str):
+        if self.onlyListener:
+            self.peersWithoutRemotes.add(frm)
+        self.rxMsgs.append((msg, frm))
+
+    async def service(self, limit=None) -> int:
+        if not self.opened:
+            logger.info("{} is stopped".format(self))
+            return 0
+        return self.processReceived(limit or sys.maxsize)
+
+    def processReceived(self, limit):
+        processed = 0
+        while self.rxMsgs and processed < limit:
+            msg, frm = self.rxMsgs.popleft()
+            processed += 1
+            if not self.onlyListener and frm not in self._remotes:
+                logger.warning('{} received message from unknown remote {}'.
+                               format(self, frm))
+                continue
+            try:
+                msg = self.deserializeMsg(msg)
+            except Exception as ex:
+                logger.error('Error {} while converting message {} to JSON '
+                             'from {}'.format(ex, msg, frm))
+                continue
+            msg = self.doProcessReceived(msg, frm, frm)
+            if msg:
+                self.msgHandler((msg, frm))
+        return processed
+
+    def handlePingPong(self, msg, frm, ident):
+        # Connections in memory are never checked with pings
+        return False
+
+    def doProcessReceived(self, msg, frm, ident):
+        return msg
+
+    @staticmethod
+    def serializeMsg(msg) -> bytes:
+        if isinstance(msg, Mapping):
+            msg = json.dumps(msg)
+        if isinstance(msg, str):
+            msg = msg.encode()
+        return msg
+
+    @staticmethod
+    def deserializeMsg(msg):
+        if isinstance(msg, (bytes, memoryview)):
+            msg = bytes(msg).decode()
+        return json.loads(msg)
+
+    def __repr__(self):
+        return self.name
+
+
+class InMemoryKITStack(InMemoryStack, KITNetworkInterface):
+    # Stack in memory which connects to the stacks in its registry
+
+    def __init__(self, stackParams: dict, msgHandler: Callable,
+                 registry: Dict[str, HA], network: InMemoryNetwork,
+                 seed=None):
+        KITNetworkInterface.__init__(self, registry=registry)
+        InMemoryStack.__init__(self, stackParams, msgHandler, network,
+                               seed=seed)
+
+    def start(self):
+        super().start()
+        # Knowing the registered stacks right away so that messages they
+        # send are not taken as coming from unknown remotes
+        self.maintainConnections(force=True)
+
+    def maintainConnections(self, force=False):
+        for name in self.reconcileNodeReg():
+            self.connect(name, ha=self.registry[name])
+        return True
+
+    def reconcileNodeReg(self) -> set:
+        """
+        Names in the registry without a remote at the registered address
+        """
+        matches = {name for name, remote in self._remotes.items()
+                   if name in self.registry and
+                   _address(remote.ha) == _address(self.registry[name])}
+        return self.registry.keys() - matches - {self.name}
+
+
+class InMemoryNodeStack(Batched, InMemoryKITStack):
+    def __init__(self, stackParams: dict, msgHandler: Callable,
+                 registry: Dict[str, HA], seed=None, sighex: str = None,
+                 network: InMemoryNetwork = None):
+        Batched.__init__(self)
+        InMemoryKITStack.__init__(self, stackParams, msgHandler, registry,
+                                  network, seed=seed)
+        MessageProcessor.__init__(self, allowDictOnly=False)
+
+
+class InMemoryClientStack(InMemoryStack, MessageProcessor):
+    def __init__(self, stackParams: dict, msgHandler: Callable, seed=None,
+                 network: InMemoryNetwork = None):
+        InMemoryStack.__init__(self, stackParams, msgHandler, network,
+                               onlyListener=True, seed=seed)
+        MessageProcessor.__init__(self, allowDictOnly=False)
+        self.connectedClients = set()
+
+    serviceClientStack = ClientZStack.serviceClientStack
+    newClientsConnected = ClientZStack.newClientsConnected
+    transmitToClient = ClientZStack.transmitToClient
+    transmitToClients = ClientZStack.transmitToClients
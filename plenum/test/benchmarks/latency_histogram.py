@@ -0,0 +1,124 @@
+"""
+Histogram of latencies in the manner of HdrHistogram.
+
+Buckets get wider as latencies grow so that any recorded latency is kept
+with `significantDigits` decimal digits of precision while the histogram
+stays small whatever the range of latencies. Only buckets with a count are
+stored, so histograms are cheap to send between processes and to merge.
+"""
+import math
+from typing import Dict
+
+
+class LatencyHistogram:
+    # Latencies are counted in microseconds
+    UNIT = 1e-6
+
+    def __init__(self, significantDigits: int = 3):
+        self.significantDigits = significantDigits
+        subBucketCount = 2 ** math.ceil(math.log2(2 * 10 ** significantDigits))
+        self._halfCountMagnitude = int(math.log2(subBucketCount)) - 1
+        self._subBucketMask = subBucketCount - 1
+        # Lowest value of a bucket to the number of values in it
+        self.counts = {}  # type: Dict[int, int]
+        self.count = 0
+        self._sum = 0
+        self._min = None
+        self._max = 0
+
+    def _bucketShift(self, value: int) -> int:
+        # Values below the sub bucket count are kept exactly, each doubling
+        # of the value above it doubles the width of its bucket
+        return max((value | self._subBucketMask).bit_length() -
+                   self._halfCountMagnitude - 1, 0)
+
+    def record(self, latency: float, times: int = 1):
+        """
+        Record `latency` seconds `times` times
+        """
+        value = max(int(round(latency / self.UNIT)), 0)
+        shift = self._bucketShift(value)
+        lowest = (value >> shift) << shift
+        self.counts[lowest] = self.counts.get(lowest, 0) + times
+        self.count += times
+        self._sum += value * times
+        self._min = value if self._min is None else min(self._min, value)
+        self._max = max(self._max, value)
+
+    def merge(self, other: 'LatencyHistogram'):
+        if other.significantDigits != self.significantDigits:
+            raise ValueError('cannot merge histograms of {} and {} '
+                             'significant digits'.format(
+                                 self.significantDigits,
+                                 other.significantDigits))
+        for lowest, times in other.counts.items():
+            self.counts[lowest] = self.counts.get(lowest, 0) + times
+        self.count += other.count
+        self._sum += other._sum
+        if other._min is not None:
+            self._min = other._min if self._min is None \
+                else min(self._min, other._min)
+        self._max = max(self._max, other._max)
+
+    @property
+    def min(self) -> float:
+        return (self._min or 0) * self.UNIT
+
+    @property
+    def max(self) -> float:
+        return self._max * self.UNIT
+
+    @property
+    def mean(self) -> float:
+        return self._sum / self.count * self.UNIT if self.count else 0.0
+
+    def percentile(self, pct: float) -> float:
+        """
+        Latency in seconds which `pct` percent of the recorded latencies do
+        not exceed, as the highest value of the bucket it falls in
+        """
+        if not self.count:
+            return 0.0
+        rank = max(math.ceil(pct / 100 * self.count), 1)
+        seen = 0
+        for lowest in sorted(self.counts):
+            seen += self.counts[lowest]
+            if seen >= rank:
+                highest = lowest + (1 << self._bucketShift(lowest)) - 1
+                return min(highest, self._max) * self.UNIT
+        return self.max
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            'count': self.count,
+            'min': self.min,
+            'mean': self.mean,
+            'p50': self.percentile(50),
+            'p90': self.percentile(90),
+            'p99': self.percentile(99),
+            'p999': self.percentile(99.9),
+            'max': self.max,
+        }
+
+    def asDict(self) -> Dict:
+        return {
+            'significantDigits': self.significantDigits,
+            'count': self.count,
+            'sum': self._sum,
+            'min': self._min,
+            'max': self._max,
+            # JSON only has string keys
+            'counts': {str(lowest): times
+                       for lowest, times in self.counts.items()},
+        }
+
+    @classmethod
+    def fromDict(cls, d: Dict) -> 'LatencyHistogram':
+        histogram = cls(d['significantDigits'])
+        histogram.counts = {int(lowest): times
+                            for lowest, times in d['counts'].items()}
+        histogram.count = d['count']
+        histogram._sum = d['sum']
+        histogram._min = d['min']
+        histogram._max = d['max']
+        return histogram
@@ -0,0 +1,375 @@
+"""
+Open loop load generator for a pool of nodes.
+
+Each of a number of worker processes runs its own `Client` with its own
+signer, the identity `Client<n>` of a pool set up by `TestNetworkSetup`,
+and sends pre-signed requests at a fixed rate whatever the pool's replies
+are, so the pool can be pushed past what it can order and the queueing that
+follows is seen. The latency of a request is measured from the time it was
+scheduled to be sent and not the time it was sent, so a worker falling
+behind its schedule does not hide the delay, which is the coordinated
+omission a closed loop client suffers from. Latencies of the first ACK and
+of the f + 1 matching REPLYs are recorded in `LatencyHistogram`s which are
+merged from all workers into a JSON summary.
+
+The pool can be one set up with `generate_plenum_pool_transactions` with at
+least as many clients as workers, or one set up and started in local
+processes by the load generator itself:
+
+    python -m plenum.test.benchmarks.load_generator --startPool 4 \
+        --workers 4 --rate 50 --duration 30 --output load.json
+"""
+import argparse
+import asyncio
+import json
+import logging
+import multiprocessing
+import platform
+import queue
+import tempfile
+import time
+from collections import OrderedDict
+from contextlib import ExitStack
+from typing import Dict, List, Sequence
+
+from plenum.client.client import Client
+from plenum.client.wallet import Wallet
+from plenum.common.config_util import getConfig
+from plenum.common.constants import REJECT, REQACK, REQNACK
+from plenum.common.signer_simple import SimpleSigner
+from plenum.common.startable import Mode
+from plenum.common.test_network_setup import TestNetworkSetup
+from plenum.common.txn_util import getTxnOrderedFields
+from plenum.common.types import OP_FIELD_NAME, f
+from plenum.server.node import Node
+from plenum.test.benchmarks.latency_histogram import LatencyHistogram
+from plenum.test.benchmarks.pool_benchmark import currentCommit
+from plenum.test.helper import randomOperation
+from stp_core.common.log import Logger, getlogger
+from stp_core.loop.eventually import eventually
+from stp_core.loop.looper import Looper
+from stp_core.network.port_dispenser import genHa
+
+logger = getlogger()
+
+# Ports of the nodes of a pool started by the load generator
+STARTING_PORT = 9600
+
+# Seconds a worker gets to connect to the pool before the load starts
+CONNECT_TIMEOUT = 120
+
+# Seconds the parent waits for the workers beyond the planned run
+RESULT_GRACE = 60
+
+
+class LoadClient(Client):
+    """
+    Client noting the latencies of the requests it sends
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Request key to [time it was scheduled at, time it was sent at,
+        # whether it was acknowledged]
+        self.inFlight = {}
+        self.ackLatency = LatencyHistogram()
+        self.replyLatency = LatencyHistogram()
+        # Latencies from the time requests were actually sent, not
+        # corrected for coordinated omission
+        self.replyServiceTime = LatencyHistogram()
+        self.nacked = 0
+
+    def submitAt(self, req, scheduledAt: float):
+        self.inFlight[req.key] = [scheduledAt, time.perf_counter(), False]
+        self.submitReqs(req)
+
+    def handleOneNodeMsg(self, wrappedMsg, excludeFromCli=None):
+        super().handleOneNodeMsg(wrappedMsg, excludeFromCli=excludeFromCli)
+        # Replies are only counted so the messages need not be kept
+        self.inBox.clear()
+        msg, _ = wrappedMsg
+        op = msg.get(OP_FIELD_NAME)
+        key = (msg.get(f.IDENTIFIER.nm), msg.get(f.REQ_ID.nm))
+        if op == REQACK:
+            entry = self.inFlight.get(key)
+            if entry is not None and not entry[2]:
+                entry[2] = True
+                self.ackLatency.record(time.perf_counter() - entry[0])
+        elif op in (REQNACK, REJECT):
+            if self.inFlight.pop(key, None) is not None:
+                self.nacked += 1
+
+    def postReplyRecvd(self, identifier, reqId, frm, result, numReplies):
+        reply = super().postReplyRecvd(identifier, reqId, frm, result,
+                                       numReplies)
+        if reply:
+            entry = self.inFlight.pop((identifier, reqId), None)
+            if entry is not None:
+                now = time.perf_counter()
+                self.replyLatency.record(now - entry[0])
+                self.replyServiceTime.record(now - entry[1])
+        return reply
+
+
+def workerWallet(idx: int) -> Wallet:
+    name = 'Client{}'.format(idx)
+    wallet = Wallet(name)
+    wallet.addIdentifier(signer=SimpleSigner(
+        seed=TestNetworkSetup.getSigningSeed(name)))
+    return wallet
+
+
+async def sendOnSchedule(client: LoadClient, reqs, interval: float,
+                         start: float, drainTimeout: float):
+    """
+    Send request `i` at `start + i * interval` and wait for the replies.
+    Return how far behind the schedule sending got.
+    """
+    maxLag = 0.0
+    for i, req in enumerate(reqs):
+        scheduledAt = start + i * interval
+        delay = scheduledAt - time.perf_counter()
+        # Yielding even when late so that the client sends what it has
+        await asyncio.sleep(max(delay, 0))
+        maxLag = max(maxLag, time.perf_counter() - scheduledAt)
+        client.submitAt(req, scheduledAt)
+    deadline = time.perf_counter() + drainTimeout
+    while client.inFlight and time.perf_counter() < deadline:
+        await asyncio.sleep(.01)
+    return maxLag
+
+
+def runWorker(idx: int, workers: int, baseDir: str, rate: float,
+              duration: float, drainTimeout: float, logLevel: int,
+              startBarrier, results):
+    """
+    Body of a worker process, puts a dict with its results in `results`
+    """
+    Logger.setLogLevel(logLevel)
+    config = getConfig(baseDir)
+    config.baseDir = baseDir
+    try:
+        wallet = workerWallet(idx)
+        # Signed before the run so that signing is not part of the load
+        reqs = [wallet.signOp(randomOperation())
+                for _ in range(int(rate * duration))]
+        client = LoadClient('loadClient{}'.format(idx), ha=genHa(),
+                            basedirpath=baseDir, config=config)
+        with Looper(debug=False) as looper:
+            looper.add(client)
+
+            def connected():
+                assert client.mode == Mode.discovered
+                assert client.hasSufficientConnections
+
+            looper.run(eventually(connected, retryWait=.5,
+                                  timeout=CONNECT_TIMEOUT))
+            startBarrier.wait(CONNECT_TIMEOUT)
+            interval = 1 / rate
+            # Workers take turns so that the pool gets requests evenly
+            start = time.perf_counter() + interval * idx / workers
+            maxLag = looper.run(sendOnSchedule(client, reqs, interval, start,
+                                               drainTimeout))
+            runDuration = time.perf_counter() - start
+        results.put({
+            'worker': idx,
+            'sent': len(reqs),
+            'completed': client.replyLatency.count,
+            'nacked': client.nacked,
+            'timedOut': len(client.inFlight),
+            'runDuration': runDuration,
+            'maxLag': maxLag,
+            'ackLatency': client.ackLatency.asDict(),
+            'replyLatency': client.replyLatency.asDict(),
+            'replyServiceTime': client.replyServiceTime.asDict(),
+        })
+    except Exception as ex:
+        # Not leaving the other workers waiting for this one to connect
+        startBarrier.abort()
+        results.put({'worker': idx, 'error': repr(ex)})
+
+
+def summarise(workerResults: Sequence[Dict], rate: float) -> Dict:
+    histograms = OrderedDict((name, LatencyHistogram())
+                             for name in ('ackLatency', 'replyLatency',
+                                          'replyServiceTime'))
+    totals = OrderedDict((k, 0) for k in
+                         ('sent', 'completed', 'nacked', 'timedOut'))
+    errors = []
+    maxLag = 0.0
+    runDuration = 0.0
+    for result in workerResults:
+        if 'error' in result:
+            errors.append('worker {}: {}'.format(result['worker'],
+                                                 result['error']))
+            continue
+        for k in totals:
+            totals[k] += result[k]
+        for name, histogram in histograms.items():
+            histogram.merge(LatencyHistogram.fromDict(result[name]))
+        maxLag = max(maxLag, result['maxLag'])
+        runDuration = max(runDuration, result['runDuration'])
+    summary = OrderedDict(totals)
+    summary['errors'] = errors
+    summary['offeredRate'] = rate * len(workerResults)
+    summary['throughput'] = totals['completed'] / runDuration \
+        if runDuration else 0.0
+    summary['runDuration'] = runDuration
+    summary['maxScheduleLag'] = maxLag
+    for name, histogram in histograms.items():
+        summary[name] = histogram.summary()
+    return summary
+
+
+def runNode(name: str, port: int, clientPort: int, baseDir: str,
+            logLevel: int):
+    Logger.setLogLevel(logLevel)
+    config = getConfig(baseDir)
+    config.baseDir = baseDir
+    with Looper(debug=False) as looper:
+        node = Node(name, nodeRegistry=None, basedirpath=baseDir,
+                    ha=('0.0.0.0', port), cliha=('0.0.0.0', clientPort),
+                    config=config)
+        looper.add(node)
+        looper.run()
+
+
+def startLocalPool(baseDir: str, nodeCount: int, clientCount: int,
+                   logLevel: int) -> List[multiprocessing.Process]:
+    """
+    Write the genesis transactions of a pool of `nodeCount` nodes and
+    `clientCount` clients to `baseDir` and start each node in a process
+    """
+    config = getConfig(baseDir)
+    config.baseDir = baseDir
+    stewardDefs, nodeDefs = TestNetworkSetup.gen_defs(None, nodeCount,
+                                                      STARTING_PORT)
+    TestNetworkSetup.bootstrapTestNodesCore(
+        config, None, False, getTxnOrderedFields(),
+        TestNetworkSetup.gen_trustee_def(1), stewardDefs, nodeDefs,
+        TestNetworkSetup.gen_client_defs(clientCount),
+        {nd.idx for nd in nodeDefs}, None)
+    processes = []
+    for nd in nodeDefs:
+        process = multiprocessing.Process(
+            target=runNode, name=nd.name, daemon=True,
+            args=(nd.name, nd.port, nd.client_port, baseDir, logLevel))
+        process.start()
+        processes.append(process)
+    return processes
+
+
+def generateLoad(baseDir: str, workers=4, rate=10.0, duration=30.0,
+                 drainTimeout=30.0, logLevel=logging.WARNING) -> List[Dict]:
+    """
+    Run `workers` worker processes each sending `rate` requests a second for
+    `duration` seconds and return their results
+    """
+    startBarrier = multiprocessing.Barrier(workers)
+    results = multiprocessing.Queue()
+    processes = [multiprocessing.Process(
+        target=runWorker, name='loadWorker{}'.format(idx),
+        args=(idx, workers, baseDir, rate, duration, drainTimeout, logLevel,
+              startBarrier, results))
+        for idx in range(1, workers + 1)]
+    for process in processes:
+        process.start()
+    workerResults = []
+    deadline = time.perf_counter() + 2 * CONNECT_TIMEOUT + duration + \
+        drainTimeout + RESULT_GRACE
+    try:
+        while len(workerResults) < workers:
+            workerResults.append(results.get(
+                timeout=max(deadline - time.perf_counter(), 0)))
+    except queue.Empty:
+        missing = set(range(1, workers + 1)) - \
+            {r['worker'] for r in workerResults}
+        workerResults.extend({'worker': idx, 'error': 'no result'}
+                             for idx in sorted(missing))
+    for process in processes:
+        process.join(RESULT_GRACE)
+        if process.is_alive():
+            process.terminate()
+    return sorted(workerResults, key=lambda r: r['worker'])
+
+
+def runLoad(baseDir=None, workers=4, rate=10.0, duration=30.0,
+            drainTimeout=30.0, startPool=0, logLevel=logging.WARNING) -> Dict:
+    """
+    Generate load against the pool set up in `baseDir`, or against a pool of
+    `startPool` nodes started in local processes, and return the summary
+    """
+    with ExitStack() as exitStack:
+        if startPool:
+            if not baseDir:
+                baseDir = exitStack.enter_context(
+                    tempfile.TemporaryDirectory(prefix='load-'))
+            nodes = startLocalPool(baseDir, startPool, workers, logLevel)
+
+            def stopNodes():
+                for process in nodes:
+                    process.terminate()
+                    process.join()
+
+            exitStack.callback(stopNodes)
+        baseDir = baseDir or getConfig().baseDir
+        workerResults = generateLoad(baseDir, workers, rate, duration,
+                                     drainTimeout, logLevel)
+    return OrderedDict([
+        ('benchmark', 'load'),
+        ('commit', currentCommit()),
+        ('timestamp', time.time()),
+        ('python', platform.python_version()),
+        ('parameters', OrderedDict([
+            ('workers', workers),
+            ('ratePerWorker', rate),
+            ('duration', duration),
+            ('drainTimeout', drainTimeout),
+            ('startedPool', startPool),
+        ])),
+        ('results', summarise(workerResults, rate)),
+        ('workers', [{k: v for k, v in r.items()
+                      if not isinstance(v, dict)} for r in workerResults]),
+    ])
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(
+        description='Send requests to a pool at a fixed rate from several '
+                    'processes and measure their latencies')
+    parser.add_argument('--workers', type=int, default=4,
+                        help='number of processes sending requests, each '
+                             'signs as Client<n> of the pool')
+    parser.add_argument('--rate', type=float, default=10,
+                        help='requests a second sent by each worker')
+    parser.add_argument('--duration', type=float, default=30,
+                        help='seconds requests are sent for')
+    parser.add_argument('--drainTimeout', type=float, default=30,
+                        help='seconds to wait for replies after the last '
+                             'request is sent')
+    parser.add_argument('--startPool', type=int, default=0,
+                        help='set up a pool of this many nodes and run it in '
+                             'local processes')
+    parser.add_argument('--baseDir', default=None,
+                        help='directory of the pool, the configured base '
+                             'directory if not given')
+    parser.add_argument('--output', default='-',
+                        help='file to write the JSON summary to')
+    parser.add_argument('--logLevel', default='WARNING')
+    args = parser.parse_args(args)
+
+    logLevel = getattr(logging, args.logLevel.upper())
+    Logger.setLogLevel(logLevel)
+    result = runLoad(args.baseDir, args.workers, args.rate, args.duration,
+                     args.drainTimeout, args.startPool, logLevel)
+    output = json.dumps(result, indent=2)
+    if args.output == '-':
+        print(output)
+    else:
+        with open(args.output, 'w') as outFile:
+            outFile.write(output)
+    return result
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,372 @@
+"""
+Throughput and latency benchmark of a pool of nodes running in one looper.
+
+The nodes and the client talk through an `InMemoryNetwork` instead of ZStack
+so that the results show the cost of the protocol and not of the sockets. A
+fixed number of pre-signed requests is sent keeping at most `window` of them
+in flight, and the results are written as JSON so that they can be compared
+between commits:
+
+    python -m plenum.test.benchmarks.pool_benchmark --nodes 4 \
+        --requests 2000 --window 200 --mix buy=0.8,nym=0.2 --output bench.json
+"""
+import argparse
+import asyncio
+import json
+import logging
+import math
+import os
+import platform
+import random
+import subprocess
+import tempfile
+import time
+from collections import OrderedDict, deque
+from contextlib import ExitStack
+from functools import partial
+from typing import Dict, List, Sequence
+
+import psutil
+
+from plenum.client.client import Client
+from plenum.client.wallet import Wallet
+from plenum.common.config_util import getConfig
+from plenum.common.constants import NYM, REJECT, REQNACK, TARGET_NYM, \
+    TXN_TYPE, VERKEY, CLIENT_STACK_SUFFIX
+from plenum.common.signer_simple import SimpleSigner
+from plenum.common.test_network_setup import TestNetworkSetup
+from plenum.common.txn_util import getTxnOrderedFields
+from plenum.common.types import OP_FIELD_NAME, f
+from plenum.server.node import Node
+from plenum.test.benchmarks.in_memory_stack import InMemoryClientStack, \
+    InMemoryNetwork, InMemoryNodeStack
+from plenum.test.helper import randomOperation
+from plenum.test.test_node import ensureElectionsDone
+from stp_core.common.log import Logger, getlogger
+from stp_core.loop.eventually import eventually
+from stp_core.loop.looper import Looper
+from stp_core.types import HA
+
+logger = getlogger()
+
+# Ports only tell the stacks apart, nothing listens on them
+STARTING_PORT = 9700
+
+# Seconds the pool gets to connect and elect primaries before the run
+READY_TIMEOUT = 60
+
+DEFAULT_MIX = OrderedDict([('buy', 1.0)])
+
+
+def buyOperation():
+    return randomOperation()
+
+
+def nymOperation():
+    signer = SimpleSigner()
+    return {
+        TXN_TYPE: NYM,
+        TARGET_NYM: signer.identifier,
+        VERKEY: signer.verkey
+    }
+
+
+# Kinds of requests the benchmark can send, `buy` is only written to the
+# ledger while `nym` also changes the state
+REQUEST_KINDS = {
+    'buy': buyOperation,
+    'nym': nymOperation,
+}
+
+
+class BenchmarkNode(Node):
+    def __init__(self, *args, network: InMemoryNetwork, **kwargs):
+        self.network = network
+        super().__init__(*args, **kwargs)
+
+    @property
+    def nodeStackClass(self):
+        return partial(InMemoryNodeStack, network=self.network)
+
+    @property
+    def clientStackClass(self):
+        return partial(InMemoryClientStack, network=self.network)
+
+
+class BenchmarkClient(Client):
+    """
+    Client noting how long each request took to get enough matching replies
+    """
+
+    def __init__(self, *args, network: InMemoryNetwork, **kwargs):
+        self.network = network
+        super().__init__(*args, **kwargs)
+        # Time each request in flight was submitted at, by request key
+        self.submittedAt = {}
+        self.latencies = []  # type: List[float]
+        self.rejected = 0
+
+    @property
+    def nodeStackClass(self):
+        return partial(InMemoryNodeStack, network=self.network)
+
+    def submitReqs(self, *reqs):
+        now = time.perf_counter()
+        for req in reqs:
+            self.submittedAt[req.key] = now
+        return super().submitReqs(*reqs)
+
+    def handleOneNodeMsg(self, wrappedMsg, excludeFromCli=None):
+        super().handleOneNodeMsg(wrappedMsg, excludeFromCli=excludeFromCli)
+        msg, _ = wrappedMsg
+        if msg.get(OP_FIELD_NAME) in (REQNACK, REJECT):
+            key = (msg.get(f.IDENTIFIER.nm), msg.get(f.REQ_ID.nm))
+            if self.submittedAt.pop(key, None) is not None:
+                self.rejected += 1
+
+    def postReplyRecvd(self, identifier, reqId, frm, result, numReplies):
+        reply = super().postReplyRecvd(identifier, reqId, frm, result,
+                                       numReplies)
+        if reply:
+            submittedAt = self.submittedAt.pop((identifier, reqId), None)
+            if submittedAt is not None:
+                self.latencies.append(time.perf_counter() - submittedAt)
+        return reply
+
+
+def parseMix(mix: str) -> Dict[str, float]:
+    """
+    Parse a request mix like `buy=0.8,nym=0.2`
+    """
+    weights = OrderedDict()
+    for part in mix.split(','):
+        kind, _, weight = part.partition('=')
+        kind = kind.strip()
+        if kind not in REQUEST_KINDS:
+            raise ValueError('unknown request kind {}, known are {}'.
+                             format(kind, ', '.join(sorted(REQUEST_KINDS))))
+        weights[kind] = float(weight) if weight else 1.0
+    return weights
+
+
+def percentile(values: Sequence[float], pct: float) -> float:
+    """
+    Nearest rank percentile of sorted `values`
+    """
+    if not values:
+        return 0.0
+    rank = max(math.ceil(pct / 100 * len(values)) - 1, 0)
+    return values[min(rank, len(values) - 1)]
+
+
+def latencySummary(latencies: Sequence[float]) -> Dict[str, float]:
+    values = sorted(latencies)
+    return {
+        'mean': sum(values) / len(values) if values else 0.0,
+        'p50': percentile(values, 50),
+        'p90': percentile(values, 90),
+        'p99': percentile(values, 99),
+        'max': values[-1] if values else 0.0,
+    }
+
+
+def currentCommit():
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', 'HEAD'], stderr=subprocess.DEVNULL,
+            cwd=os.path.dirname(os.path.abspath(__file__))).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class PoolBenchmark:
+    """
+    Runs `nodeCount` nodes and one client in a looper, all in memory
+    """
+
+    clientClass = BenchmarkClient
+
+    def __init__(self, baseDir: str, nodeCount=4, requests=1000, window=100,
+                 mix: Dict[str, float] = None, timeout=300, seed=None,
+                 config=None):
+        self.config = config or getConfig(baseDir)
+        self.config.baseDir = baseDir
+        self.baseDir = baseDir
+        self.nodeCount = nodeCount
+        self.requests = requests
+        self.window = window
+        self.mix = mix or DEFAULT_MIX
+        self.timeout = timeout
+        self.random = random.Random(seed)
+        self.network = InMemoryNetwork()
+        self.nodes = []  # type: List[BenchmarkNode]
+        self.client = None  # type: BenchmarkClient
+
+    def createGenesis(self):
+        stewardDefs, nodeDefs = TestNetworkSetup.gen_defs(
+            None, self.nodeCount, STARTING_PORT)
+        trusteeDef = TestNetworkSetup.gen_trustee_def(1)
+        TestNetworkSetup.bootstrapTestNodesCore(
+            self.config, None, False, getTxnOrderedFields(), trusteeDef,
+            stewardDefs, nodeDefs, [], None, None)
+        self.stewardWallet = Wallet(stewardDefs[0].name)
+        self.stewardWallet.addIdentifier(signer=SimpleSigner(
+            seed=TestNetworkSetup.getSigningSeed(stewardDefs[0].name)))
+        self.nodeDefs = nodeDefs
+
+    def createRequests(self):
+        """
+        All requests are signed before the run so that signing them is not
+        part of what is measured
+        """
+        kinds = list(self.mix.keys())
+        weights = [self.mix[k] for k in kinds]
+        total = sum(weights)
+        reqs = []
+        for _ in range(self.requests):
+            point = self.random.random() * total
+            for kind, weight in zip(kinds, weights):
+                point -= weight
+                if point < 0:
+                    break
+            reqs.append(self.stewardWallet.signOp(REQUEST_KINDS[kind]()))
+        return reqs
+
+    def cliNodeReg(self):
+        return OrderedDict(
+            (nd.name + CLIENT_STACK_SUFFIX, HA(nd.ip, nd.client_port))
+            for nd in self.nodeDefs)
+
+    def waitTillReady(self, looper, nodes, client):
+        ensureElectionsDone(looper=looper, nodes=nodes,
+                            customTimeout=READY_TIMEOUT)
+
+        def clientConnected():
+            assert client.hasSufficientConnections
+
+        looper.run(eventually(clientConnected, retryWait=.1,
+                              timeout=READY_TIMEOUT))
+
+    async def drive(self, client: BenchmarkClient, reqs):
+        pending = deque(reqs)
+        deadline = time.perf_counter() + self.timeout
+        while (pending or client.submittedAt) and \
+                time.perf_counter() < deadline:
+            free = self.window - len(client.submittedAt)
+            if pending and free > 0:
+                batch = [pending.popleft()
+                         for _ in range(min(free, len(pending)))]
+                client.submitReqs(*batch)
+            await asyncio.sleep(self.config.Max3PCBatchWait)
+        return len(pending)
+
+    def run(self) -> Dict:
+        self.createGenesis()
+        reqs = self.createRequests()
+        with ExitStack() as exitStack:
+            looper = exitStack.enter_context(Looper(debug=False))
+            nodes = self.nodes
+            for nd in self.nodeDefs:
+                node = exitStack.enter_context(BenchmarkNode(
+                    nd.name, basedirpath=self.baseDir, config=self.config,
+                    network=self.network))
+                looper.add(node)
+                nodes.append(node)
+            client = self.clientClass(
+                'benchmarkClient', nodeReg=self.cliNodeReg(),
+                ha=HA('127.0.0.1', STARTING_PORT + 2 * self.nodeCount + 1),
+                basedirpath=self.baseDir, config=self.config,
+                network=self.network)
+            self.client = client
+            looper.add(client)
+            self.waitTillReady(looper, nodes, client)
+
+            process = psutil.Process()
+            rssBefore = process.memory_info().rss
+            messagesBefore = self.network.messages
+            bytesBefore = self.network.bytes
+            cpuBefore = time.process_time()
+            start = time.perf_counter()
+            notSent = looper.run(self.drive(client, reqs))
+            duration = time.perf_counter() - start
+            cpu = time.process_time() - cpuBefore
+            rssAfter = process.memory_info().rss
+
+        completed = len(client.latencies)
+        messages = self.network.messages - messagesBefore
+        sent = self.network.bytes - bytesBefore
+        perRequest = completed or 1
+        return OrderedDict([
+            ('benchmark', 'pool'),
+            ('commit', currentCommit()),
+            ('timestamp', time.time()),
+            ('python', platform.python_version()),
+            ('parameters', OrderedDict([
+                ('nodes', self.nodeCount),
+                ('requests', self.requests),
+                ('window', self.window),
+                ('mix', self.mix),
+                ('max3PCBatchSize', self.config.Max3PCBatchSize),
+            ])),
+            ('results', OrderedDict([
+                ('duration', duration),
+                ('completed', completed),
+                ('rejected', client.rejected),
+                ('timedOut', len(client.submittedAt) + notSent),
+                ('throughput', completed / duration if duration else 0.0),
+                ('latency', latencySummary(client.latencies)),
+                ('cpuPerRequest', cpu / perRequest),
+                ('rssBefore', rssBefore),
+                ('rssAfter', rssAfter),
+                ('memoryGrowth', rssAfter - rssBefore),
+                ('messagesPerRequest', messages / perRequest),
+                ('bytesPerRequest', sent / perRequest),
+            ])),
+        ])
+
+
+def runBenchmark(nodeCount=4, requests=1000, window=100, mix=None,
+                 timeout=300, seed=None, baseDir=None) -> Dict:
+    if baseDir:
+        return PoolBenchmark(baseDir, nodeCount, requests, window, mix,
+                             timeout, seed).run()
+    with tempfile.TemporaryDirectory(prefix='pool-benchmark-') as tmp:
+        return PoolBenchmark(tmp, nodeCount, requests, window, mix, timeout,
+                             seed).run()
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(
+        description='Measure ordering throughput and latency of a pool of '
+                    'nodes running in memory')
+    parser.add_argument('--nodes', type=int, default=4)
+    parser.add_argument('--requests', type=int, default=1000)
+    parser.add_argument('--window', type=int, default=100,
+                        help='most requests in flight at a time')
+    parser.add_argument('--mix', type=parseMix, default=DEFAULT_MIX,
+                        help='weights of request kinds, like '
+                             'buy=0.8,nym=0.2')
+    parser.add_argument('--timeout', type=float, default=300)
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--baseDir', default=None,
+                        help='directory for the nodes\' data, a temporary '
+                             'one if not given')
+    parser.add_argument('--output', default='-',
+                        help='file to write the JSON results to')
+    parser.add_argument('--logLevel', default='WARNING')
+    args = parser.parse_args(args)
+
+    Logger.setLogLevel(getattr(logging, args.logLevel.upper()))
+    result = runBenchmark(args.nodes, args.requests, args.window, args.mix,
+                          args.timeout, args.seed, args.baseDir)
+    output = json.dumps(result, indent=2)
+    if args.output == '-':
+        print(output)
+    else:
+        with open(args.output, 'w') as outFile:
+            outFile.write(output)
+    return result
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+"""
+Benchmark of how long a process takes to import `plenum.server.node` and to
+construct a node. Each measurement is made in a new interpreter so that
+nothing is imported already, and the results are written as JSON like those
+of `pool_benchmark`:
+
+    python -m plenum.test.benchmarks.startup_benchmark --repeats 5 \
+        --output startup.json
+"""
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+from collections import OrderedDict
+from typing import Dict, List
+
+from plenum.test.benchmarks.pool_benchmark import currentCommit, \
+    latencySummary
+
+IMPORT_NODE = """
+import json, time
+start = time.perf_counter()
+import plenum.server.node
+print(json.dumps({'import': time.perf_counter() - start}))
+"""
+
+CONSTRUCT_NODE = """
+import json, sys, time
+start = time.perf_counter()
+from plenum.common.config_util import getConfig
+from plenum.common.types import NodeDetail
+from plenum.server.node import Node
+from stp_core.crypto.util import randomSeed
+from stp_core.types import HA
+imported = time.perf_counter() - start
+baseDir = sys.argv[1]
+nodeReg = {name: NodeDetail(HA('127.0.0.1', 9700 + 2 * i), name + 'C',
+                            HA('127.0.0.1', 9701 + 2 * i))
+           for i, name in enumerate(('Alpha', 'Beta', 'Gamma', 'Delta'))}
+start = time.perf_counter()
+node = Node('Alpha', nodeRegistry=nodeReg, basedirpath=baseDir,
+            config=getConfig(baseDir), seed=randomSeed())
+constructed = time.perf_counter() - start
+node.closeAllKVStores()
+print(json.dumps({'import': imported, 'construct': constructed,
+                  'startupTimings': node.startupTimings}))
+"""
+
+
+def runMeasurement(code: str, *args) -> Dict:
+    output = subprocess.check_output([sys.executable, '-c', code] +
+                                     list(args))
+    # Only the last line is the result, the node may log before it
+    return json.loads(output.decode().strip().splitlines()[-1])
+
+
+def summarise(values: List[float]) -> Dict[str, float]:
+    summary = latencySummary(values)
+    summary['min'] = min(values) if values else 0.0
+    return summary
+
+
+def runBenchmark(repeats=5) -> Dict:
+    imports = []
+    importsWithNode = []
+    constructions = []
+    startupTimings = None
+    for _ in range(repeats):
+        imports.append(runMeasurement(IMPORT_NODE)['import'])
+        with tempfile.TemporaryDirectory(prefix='startup-benchmark-') as tmp:
+            result = runMeasurement(CONSTRUCT_NODE, tmp)
+        importsWithNode.append(result['import'])
+        constructions.append(result['construct'])
+        startupTimings = result['startupTimings']
+    return OrderedDict([
+        ('environment', OrderedDict([
+            ('commit', currentCommit()),
+            ('python', platform.python_version()),
+            ('platform', platform.platform()),
+        ])),
+        ('parameters', OrderedDict([
+            ('repeats', repeats),
+        ])),
+        ('results', OrderedDict([
+            ('importNode', summarise(imports)),
+            ('importForConstruction', summarise(importsWithNode)),
+            ('constructNode', summarise(constructions)),
+            ('startupTimings', startupTimings),
+        ])),
+    ])
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(
+        description='Measure the time taken to import plenum.server.node and '
+                    'to construct a node, each in a new process')
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--output', default='-',
+                        help='file to write the JSON results to')
+    args = parser.parse_args(args)
+
+    result = runBenchmark(args.repeats)
+    output = json.dumps(result, indent=2)
+    if args.output == '-':
+        print(output)
+    else:
+        with open(args.output, 'w') as outFile:
+            outFile.write(output)
+    return result
+
+
+if __name__ == '__main__':
+    main()
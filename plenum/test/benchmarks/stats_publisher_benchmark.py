@@ -0,0 +1,189 @@
+"""
+Benchmark of the cost on the event loop of publishing stats, with
+`StatsPublisher` sending every message by itself and with
+`BatchingStatsPublisher` sending them in batches and coalescing the periodic
+ones. Every tick `gauges` periodic stats and `events` other stats are
+published, like a monitor under load does, to a stats server run in a thread.
+
+The time taken by `send` and the lag of a task sleeping on the same loop are
+measured, and the results are written as JSON like those of `pool_benchmark`:
+
+    python -m plenum.test.benchmarks.stats_publisher_benchmark --ticks 500 \
+        --gauges 8 --events 20 --output stats_publisher.json
+"""
+import argparse
+import asyncio
+import json
+import platform
+import socket
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict
+
+from plenum.config import STATS_SERVER_IP
+from plenum.server.plugin.stats_consumer.stats_publisher import \
+    StatsPublisher, BatchingStatsPublisher
+from plenum.test.benchmarks.pool_benchmark import currentCommit, \
+    latencySummary
+
+MODES = OrderedDict([
+    ('perMessage', StatsPublisher),
+    ('batching', BatchingStatsPublisher),
+])
+
+
+class LineCounter:
+    """
+    Stats server counting the lines it receives, in threads of its own so
+    that it does not load the loop measured
+    """
+
+    def __init__(self):
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._sock.bind((STATS_SERVER_IP, 0))
+        self._sock.listen(5)
+        self.port = self._sock.getsockname()[1]
+        self.lines = 0
+        self._lock = threading.Lock()
+        threading.Thread(target=self._accept, daemon=True).start()
+
+    def _accept(self):
+        while True:
+            try:
+                conn, _ = self._sock.accept()
+            except OSError:
+                return
+            threading.Thread(target=self._read, args=(conn,),
+                             daemon=True).start()
+
+    def _read(self, conn):
+        with conn:
+            while True:
+                data = conn.recv(65536)
+                if not data:
+                    return
+                with self._lock:
+                    self.lines += data.count(b'\n')
+
+    def close(self):
+        self._sock.close()
+
+
+async def publish(publisher, ticks, gauges, events, tickInterval):
+    sendTimes = []
+    for tick in range(ticks):
+        for i in range(gauges):
+            message = json.dumps({'eventName': 'gauge{}'.format(i),
+                                  'tick': tick})
+            start = time.perf_counter()
+            publisher.send(message, 'gauge{}'.format(i))
+            sendTimes.append(time.perf_counter() - start)
+        for i in range(events):
+            message = json.dumps({'eventName': 'event', 'tick': tick, 'i': i})
+            start = time.perf_counter()
+            publisher.send(message)
+            sendTimes.append(time.perf_counter() - start)
+        await asyncio.sleep(tickInterval)
+    return sendTimes
+
+
+async def probeLag(interval, stop):
+    lags = []
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append(time.perf_counter() - start - interval)
+    return lags
+
+
+def runMode(mode: str, ticks: int, gauges: int, events: int,
+            tickInterval: float, drainTimeout: float) -> Dict:
+    server = LineCounter()
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    publisher = MODES[mode](STATS_SERVER_IP, server.port)
+
+    async def run():
+        stop = asyncio.Event()
+        probe = asyncio.ensure_future(probeLag(tickInterval / 2, stop))
+        start = time.perf_counter()
+        sendTimes = await publish(publisher, ticks, gauges, events,
+                                  tickInterval)
+        published = time.perf_counter() - start
+        stop.set()
+        return sendTimes, published, await probe
+
+    sendTimes, published, lags = loop.run_until_complete(run())
+    # Let what is left in the buffer be sent
+    deadline = time.perf_counter() + drainTimeout
+    lines = -1
+    while time.perf_counter() < deadline and lines != server.lines:
+        lines = server.lines
+        loop.run_until_complete(asyncio.sleep(0.2))
+    server.close()
+    if isinstance(publisher, BatchingStatsPublisher):
+        publisher.close()
+        counters = dict(publisher.counters)
+    else:
+        counters = {}
+    loop.close()
+    return OrderedDict([
+        ('messages', len(sendTimes)),
+        ('received', server.lines),
+        ('publishTime', published),
+        ('sendTime', sum(sendTimes)),
+        ('send', latencySummary(sendTimes)),
+        ('loopLag', latencySummary(lags)),
+        ('counters', counters),
+    ])
+
+
+def runBenchmark(ticks=500, gauges=8, events=20, tickInterval=0.002,
+                 drainTimeout=5, modes=tuple(MODES)) -> Dict:
+    return OrderedDict([
+        ('environment', OrderedDict([
+            ('commit', currentCommit()),
+            ('python', platform.python_version()),
+            ('platform', platform.platform()),
+        ])),
+        ('parameters', OrderedDict([
+            ('ticks', ticks),
+            ('gauges', gauges),
+            ('events', events),
+            ('tickInterval', tickInterval),
+        ])),
+        ('results', OrderedDict(
+            (mode, runMode(mode, ticks, gauges, events, tickInterval,
+                           drainTimeout))
+            for mode in modes)),
+    ])
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(
+        description='Measure the cost on the event loop of publishing stats '
+                    'one message at a time and in batches')
+    parser.add_argument('--ticks', type=int, default=500)
+    parser.add_argument('--gauges', type=int, default=8)
+    parser.add_argument('--events', type=int, default=20)
+    parser.add_argument('--tickInterval', type=float, default=0.002)
+    parser.add_argument('--modes', nargs='+', default=list(MODES),
+                        choices=list(MODES))
+    parser.add_argument('--output', default='-',
+                        help='file to write the JSON results to')
+    args = parser.parse_args(args)
+
+    result = runBenchmark(args.ticks, args.gauges, args.events,
+                          args.tickInterval, modes=tuple(args.modes))
+    output = json.dumps(result, indent=2)
+    if args.output == '-':
+        print(output)
+    else:
+        with open(args.output, 'w') as outFile:
+            outFile.write(output)
+    return result
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,15 @@
+import json
+
+from plenum.test.benchmarks.durability_benchmark import MODES, runBenchmark
+
+
+def testDurabilityBenchmarkRunsAllModes(tdir):
+    result = runBenchmark(batches=6, batchSize=3, groupBatches=4,
+                          baseDir=tdir)
+    results = result['results']
+    assert list(results) == list(MODES)
+    for mode in MODES:
+        assert results[mode]['throughput'] > 0
+        assert results[mode]['ackLatency']['p50'] <= \
+            results[mode]['ackLatency']['max']
+    json.loads(json.dumps(result))
@@ -0,0 +1,56 @@
+import json
+import math
+import random
+
+import pytest
+
+from plenum.test.benchmarks.latency_histogram import LatencyHistogram
+from plenum.test.benchmarks.load_generator import summarise
+
+
+def testPercentilesKeepSignificantDigits():
+    rnd = random.Random(0)
+    latencies = [rnd.expovariate(20) for _ in range(10000)]
+    histogram = LatencyHistogram(significantDigits=3)
+    for latency in latencies:
+        histogram.record(latency)
+    latencies.sort()
+    for pct in (50, 90, 99, 99.9, 100):
+        exact = latencies[math.ceil(pct / 100 * len(latencies)) - 1]
+        assert abs(histogram.percentile(pct) - exact) <= exact * 1e-3 + 1e-6
+    assert abs(histogram.max - latencies[-1]) < 1e-6
+    assert histogram.count == len(latencies)
+
+
+def testMergedHistogramsMatchOne():
+    rnd = random.Random(1)
+    latencies = [rnd.uniform(0, 3) for _ in range(1000)]
+    whole, first, second = (LatencyHistogram() for _ in range(3))
+    for i, latency in enumerate(latencies):
+        whole.record(latency)
+        (first if i % 2 else second).record(latency)
+    merged = LatencyHistogram.fromDict(json.loads(json.dumps(first.asDict())))
+    merged.merge(second)
+    assert merged.counts == whole.counts
+    assert merged.summary() == whole.summary()
+    assert LatencyHistogram().summary()['p99'] == 0.0
+
+
+def testWorkerResultsSummarised():
+    def workerResult(idx, latency):
+        histogram = LatencyHistogram()
+        histogram.record(latency, times=10)
+        return {'worker': idx, 'sent': 10, 'completed': 10, 'nacked': 0,
+                'timedOut': 0, 'runDuration': 2.0, 'maxLag': 0.1 * idx,
+                'ackLatency': histogram.asDict(),
+                'replyLatency': histogram.asDict(),
+                'replyServiceTime': histogram.asDict()}
+
+    summary = summarise([workerResult(1, 0.1), workerResult(2, 0.3),
+                         {'worker': 3, 'error': 'no result'}], rate=5)
+    assert summary['sent'] == summary['completed'] == 20
+    assert summary['errors'] == ['worker 3: no result']
+    assert summary['throughput'] == 10
+    assert summary['maxScheduleLag'] == 0.2
+    assert summary['replyLatency']['p50'] == pytest.approx(0.1, rel=1e-3)
+    assert summary['replyLatency']['p99'] == pytest.approx(0.3, rel=1e-3)
@@ -0,0 +1,70 @@
+import asyncio
+import json
+
+from plenum.test.benchmarks.in_memory_stack import InMemoryClientStack, \
+    InMemoryNetwork, InMemoryNodeStack
+from plenum.test.benchmarks.pool_benchmark import PoolBenchmark, parseMix, \
+    percentile
+from stp_core.types import HA
+
+
+def testInMemoryStacksExchangeMessages():
+    network = InMemoryNetwork()
+    registry = {'Alpha': HA('127.0.0.1', 1), 'Beta': HA('127.0.0.1', 2)}
+    received = {'Alpha': [], 'Beta': [], 'AlphaC': [], 'client': []}
+    alpha, beta = [InMemoryNodeStack({'name': name, 'ha': registry[name]},
+                                     received[name].append, registry,
+                                     network=network)
+                   for name in ('Alpha', 'Beta')]
+    alphaC = InMemoryClientStack({'name': 'AlphaC', 'ha': ('0.0.0.0', 3)},
+                                 received['AlphaC'].append, network=network)
+    client = InMemoryNodeStack({'name': 'client', 'ha': ('127.0.0.1', 4)},
+                               received['client'].append,
+                               {'AlphaC': HA('127.0.0.1', 3)},
+                               network=network)
+    for stack in (alpha, beta, alphaC, client):
+        stack.start()
+    run = asyncio.get_event_loop().run_until_complete
+
+    alpha.serviceLifecycle()
+    assert alpha.conns == {'Beta'}
+    alpha.send({'op': 'TEST', 'value': 1})
+    alpha.flushOutBoxes()
+    assert run(beta.service()) == 1
+    assert received['Beta'] == [({'op': 'TEST', 'value': 1}, 'Alpha')]
+
+    client.send({'op': 'REQUEST'})
+    client.flushOutBoxes()
+    run(alphaC.service())
+    assert received['AlphaC'] == [({'op': 'REQUEST'}, 'client')]
+    alphaC.transmitToClient({'op': 'REPLY'}, 'client')
+    run(client.service())
+    assert received['client'] == [({'op': 'REPLY'}, 'AlphaC')]
+
+    beta.stop()
+    alpha.serviceLifecycle()
+    assert not alpha.conns
+    assert not alpha.transmit(b'{}', 'Beta')[0]
+
+
+def testPercentiles():
+    values = list(range(1, 101))
+    assert percentile(values, 50) == 50
+    assert percentile(values, 99) == 99
+    assert percentile(values, 100) == 100
+    assert percentile([], 50) == 0.0
+    assert parseMix('buy=3,nym=1') == {'buy': 3.0, 'nym': 1.0}
+
+
+def testPoolBenchmarkOrdersAllRequests(tdir):
+    result = PoolBenchmark(tdir, nodeCount=4, requests=20, window=10,
+                           mix=parseMix('buy=0.5,nym=0.5'), seed=1,
+                           timeout=60).run()
+    results = result['results']
+    assert results['completed'] == 20
+    assert results['rejected'] == 0
+    assert results['timedOut'] == 0
+    assert results['throughput'] > 0
+    assert results['latency']['p50'] <= results['latency']['p99']
+    assert results['messagesPerRequest'] > 0
+    json.loads(json.dumps(result))
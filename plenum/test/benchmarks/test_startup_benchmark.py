@@ -0,0 +1,12 @@
+import json
+
+from plenum.test.benchmarks.startup_benchmark import runBenchmark
+
+
+def testStartupBenchmarkMeasuresImportAndConstruction():
+    result = runBenchmark(repeats=1)
+    results = result['results']
+    assert results['importNode']['max'] > 0
+    assert results['constructNode']['max'] > 0
+    assert set(results['startupTimings']) >= {'domainState', 'poolManager'}
+    json.loads(json.dumps(result))
@@ -0,0 +1,15 @@
+import json
+
+from plenum.test.benchmarks.stats_publisher_benchmark import runBenchmark
+
+
+def testBatchingPublisherDeliversAllEvents():
+    result = runBenchmark(ticks=20, gauges=4, events=5, drainTimeout=1,
+                          modes=('batching',))
+    batching = result['results']['batching']
+    assert batching['messages'] == 20 * 9
+    # Every event is received, of the gauges at least the latest value is
+    assert 20 * 5 + 4 <= batching['received'] <= batching['messages']
+    assert batching['counters']['batches'] < batching['received']
+    assert batching['counters']['dropped'] == 0
+    json.loads(json.dumps(result))
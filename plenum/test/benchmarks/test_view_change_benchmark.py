@@ -0,0 +1,34 @@
+import json
+from types import SimpleNamespace
+
+from plenum.test.benchmarks.view_change_benchmark import ViewChangeBenchmark, \
+    runMode
+
+
+def testViewChangeResults(tdir, tconf):
+    benchmark = ViewChangeBenchmark(tdir, requests=10, config=tconf)
+    benchmark.nodes = [SimpleNamespace(viewNo=1), SimpleNamespace(viewNo=1)]
+    benchmark.viewNoBefore = 0
+    benchmark.startedAt = 10.0
+    benchmark.forcedAt = 12.0
+    client = SimpleNamespace(completedAt=[11.0, 11.5, 12.0, 15.0, 15.5, 16.0])
+    results = benchmark.viewChangeResults(client)
+    assert results['viewChanged']
+    assert results['completedBefore'] == 3
+    assert results['completedAfter'] == 3
+    assert results['firstAfter'] == 3.0
+    assert results['gap'] == 3.0
+    assert results['throughputBefore'] == 1.5
+    assert results['throughputAfter'] == 0.75
+
+
+def testViewChangeBenchmarkOrdersAllRequests():
+    results = runMode(True, nodeCount=4, requests=20, window=10,
+                      forceAfter=0.5, timeout=60, seed=1)
+    assert results['completed'] == 20
+    assert results['timedOut'] == 0
+    viewChange = results['viewChange']
+    assert viewChange['forced']
+    assert viewChange['viewChanged']
+    assert viewChange['completedBefore'] + viewChange['completedAfter'] == 20
+    json.loads(json.dumps(results))
@@ -0,0 +1,192 @@
+"""
+Benchmark of how long ordering stalls when the view changes under load. The
+pool of `pool_benchmark` is driven with requests and, once a fraction of
+them completed, every node asks for a view change. The run is done without
+and with `ViewChangePreparedCertificates`, each in a new pool, and the
+results are written as JSON like those of `pool_benchmark`:
+
+    python -m plenum.test.benchmarks.view_change_benchmark --nodes 4 \
+        --requests 1000 --window 100 --output view_change.json
+"""
+import argparse
+import asyncio
+import json
+import logging
+import tempfile
+import time
+from collections import OrderedDict
+from typing import Dict, List
+
+from plenum.common.config_util import getConfig
+from plenum.test.benchmarks.pool_benchmark import BenchmarkClient, \
+    PoolBenchmark, currentCommit, latencySummary
+from stp_core.common.log import Logger
+
+# Runs compared by the benchmark, by the value of
+# `ViewChangePreparedCertificates` they use
+MODES = OrderedDict([
+    ('baseline', False),
+    ('preparedCertificates', True),
+])
+
+
+class ViewChangeClient(BenchmarkClient):
+    """
+    Client noting when each request got enough matching replies
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.completedAt = []  # type: List[float]
+
+    def postReplyRecvd(self, identifier, reqId, frm, result, numReplies):
+        completed = len(self.latencies)
+        reply = super().postReplyRecvd(identifier, reqId, frm, result,
+                                       numReplies)
+        if len(self.latencies) > completed:
+            self.completedAt.append(time.perf_counter())
+        return reply
+
+
+class ViewChangeBenchmark(PoolBenchmark):
+    """
+    Pool benchmark in which every node asks for a view change once
+    `forceAfter` of the requests completed
+    """
+
+    clientClass = ViewChangeClient
+
+    def __init__(self, *args, forceAfter=0.5, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.forceAfter = forceAfter
+        self.startedAt = None
+        self.forcedAt = None
+        self.viewNoBefore = None
+
+    async def drive(self, client: ViewChangeClient, reqs):
+        self.startedAt = time.perf_counter()
+        forcing = asyncio.ensure_future(self.forceViewChange(client))
+        try:
+            return await super().drive(client, reqs)
+        finally:
+            forcing.cancel()
+
+    async def forceViewChange(self, client: ViewChangeClient):
+        while len(client.completedAt) < self.forceAfter * self.requests:
+            await asyncio.sleep(self.config.Max3PCBatchWait)
+        self.viewNoBefore = self.nodes[0].viewNo
+        self.forcedAt = time.perf_counter()
+        for node in self.nodes:
+            node.sendInstanceChange(self.viewNoBefore + 1)
+
+    def viewChangeResults(self, client: ViewChangeClient) -> Dict:
+        """
+        How ordering went around the view change: `gap` is the longest time
+        without any request completing from when the view change was asked
+        for, `firstAfter` the time till the first request completed after it
+        """
+        if self.forcedAt is None:
+            return OrderedDict([('forced', False)])
+        before = [t for t in client.completedAt if t <= self.forcedAt]
+        after = [t for t in client.completedAt if t > self.forcedAt]
+        intervals = [b - a for a, b in zip([self.forcedAt] + after, after)]
+        forcedFor = self.forcedAt - self.startedAt
+        lastAt = after[-1] if after else self.forcedAt
+        return OrderedDict([
+            ('forced', True),
+            ('forcedAt', forcedFor),
+            ('viewNo', [node.viewNo for node in self.nodes]),
+            ('viewChanged', all(node.viewNo > self.viewNoBefore
+                                for node in self.nodes)),
+            ('completedBefore', len(before)),
+            ('completedAfter', len(after)),
+            ('firstAfter', after[0] - self.forcedAt if after else None),
+            ('gap', max(intervals) if intervals else None),
+            ('intervals', latencySummary(intervals)),
+            ('throughputBefore', len(before) / forcedFor
+                if forcedFor else 0.0),
+            ('throughputAfter', len(after) / (lastAt - self.forcedAt)
+                if after else 0.0),
+        ])
+
+    def run(self) -> Dict:
+        result = super().run()
+        result['benchmark'] = 'viewChange'
+        result['parameters']['forceAfter'] = self.forceAfter
+        result['parameters']['preparedCertificates'] = \
+            self.config.ViewChangePreparedCertificates
+        result['results']['viewChange'] = \
+            self.viewChangeResults(self.client)
+        return result
+
+
+def runMode(preparedCertificates: bool, nodeCount=4, requests=1000,
+            window=100, forceAfter=0.5, timeout=120, seed=None) -> Dict:
+    with tempfile.TemporaryDirectory(prefix='view-change-benchmark-') as tmp:
+        config = getConfig(tmp)
+        old = config.ViewChangePreparedCertificates
+        config.ViewChangePreparedCertificates = preparedCertificates
+        try:
+            return ViewChangeBenchmark(
+                tmp, nodeCount, requests, window, timeout=timeout, seed=seed,
+                config=config, forceAfter=forceAfter).run()['results']
+        finally:
+            config.ViewChangePreparedCertificates = old
+
+
+def runBenchmark(nodeCount=4, requests=1000, window=100, forceAfter=0.5,
+                 timeout=120, seed=None, modes=None) -> Dict:
+    results = OrderedDict()
+    for mode in modes or MODES:
+        results[mode] = runMode(MODES[mode], nodeCount, requests, window,
+                                forceAfter, timeout, seed)
+    return OrderedDict([
+        ('benchmark', 'viewChange'),
+        ('commit', currentCommit()),
+        ('timestamp', time.time()),
+        ('parameters', OrderedDict([
+            ('nodes', nodeCount),
+            ('requests', requests),
+            ('window', window),
+            ('forceAfter', forceAfter),
+            ('timeout', timeout),
+        ])),
+        ('results', results),
+    ])
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(
+        description='Measure how long ordering stalls when the view of a '
+                    'pool running in memory changes under load')
+    parser.add_argument('--nodes', type=int, default=4)
+    parser.add_argument('--requests', type=int, default=1000)
+    parser.add_argument('--window', type=int, default=100,
+                        help='most requests in flight at a time')
+    parser.add_argument('--forceAfter', type=float, default=0.5,
+                        help='fraction of the requests to complete before '
+                             'the view change')
+    parser.add_argument('--timeout', type=float, default=120)
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--modes', nargs='+', choices=list(MODES),
+                        default=list(MODES))
+    parser.add_argument('--output', default='-',
+                        help='file to write the JSON results to')
+    parser.add_argument('--logLevel', default='WARNING')
+    args = parser.parse_args(args)
+
+    Logger.setLogLevel(getattr(logging, args.logLevel.upper()))
+    result = runBenchmark(args.nodes, args.requests, args.window,
+                          args.forceAfter, args.timeout, args.seed,
+                          args.modes)
+    output = json.dumps(result, indent=2)
+    if args.output == '-':
+        print(output)
+    else:
+        with open(args.output, 'w') as outFile:
+            outFile.write(output)
+    return result
+
+
+if __name__ == '__main__':
+    main()
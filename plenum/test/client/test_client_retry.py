@@ -188,3 +188,30 @@ def testClientNotRetryingRequestAfterMaxTriesDone(looper,
     assert req.key not in client1.expectingAcksFor
     assert req.key not in client1.expectingRepliesFor
     alpha.processRequest = origTrans
+
+
+def testResentRequestSerializedOnce(looper, nodeSet, client1, wallet1,
+                                    monkeypatch):
+    """
+    A request resent to several nodes is serialized once for all of them
+    """
+    req = sendRandomRequest(wallet1, client1)
+    idr, reqId = req.key
+    wait_for_replies(looper, client1, idr, reqId, 4)
+
+    serialized = []
+    origSerialize = client1.nodestack.signAndSerialize
+
+    def countingSerialize(msg, *args, **kwargs):
+        if isinstance(msg, Request) and msg.key == req.key:
+            serialized.append(msg)
+        return origSerialize(msg, *args, **kwargs)
+
+    monkeypatch.setattr(client1.nodestack, 'signAndSerialize',
+                        countingSerialize)
+    names = [r.name for r in client1.nodestack.remotes.values()]
+    assert len(names) > 1
+    client1.resendRequests({req.key: names})
+    assert len(serialized) == 1
+    assert all(client1.nodestack.outBoxes[rid] for rid in
+               client1.nodestack.remotes)
@@ -0,0 +1,26 @@
+from plenum.client.expected_responses import ExpectedResponses
+
+
+def testOnlyExpiredExpectationsReturned():
+    expected = ExpectedResponses(lambda: 5)
+    expected[('a', 1)] = ({'Alpha'}, 0, 0)
+    expected[('a', 2)] = ({'Alpha'}, 3, 0)
+    expected[('a', 3)] = ({'Alpha'}, 10, 0)
+
+    assert list(expected.expired(4)) == []
+    assert [k for k, _ in expected.expired(8)] == [('a', 1), ('a', 2)]
+    # Already returned expectations are not returned again till set again
+    assert list(expected.expired(8)) == []
+    assert [k for k, _ in expected.expired(15)] == [('a', 3)]
+
+
+def testRemovedOrUpdatedExpectationsSkipped():
+    expected = ExpectedResponses(lambda: 5)
+    expected[('a', 1)] = ({'Alpha'}, 0, 0)
+    expected[('a', 2)] = ({'Alpha'}, 0, 0)
+    expected.pop(('a', 1))
+    # Retried, so the deadline moves
+    expected[('a', 2)] = ({'Alpha'}, 4, 1)
+
+    assert list(expected.expired(6)) == []
+    assert list(expected.expired(9)) == [(('a', 2), ({'Alpha'}, 4, 1))]
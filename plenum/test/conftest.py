@@ -15,7 +15,6 @@ from typing import Dict, Any
 from plenum.test import waits
 
 import gc
-import pip
 import pytest
 from plenum.common.keygen_utils import initNodeKeysForBothStacks
 from stp_core.common.logging.handlers import TestingHandler
@@ -37,11 +36,13 @@ from plenum.common.constants import TXN_TYPE, DATA, NODE, ALIAS, CLIENT_PORT, \
 from plenum.common.txn_util import getTxnOrderedFields
 from plenum.common.types import PLUGIN_TYPE_STATS_CONSUMER
 from plenum.common.util import getNoInstances, getMaxFailures
+from plenum.server import notifier_plugin_manager
 from plenum.server.notifier_plugin_manager import PluginManager
 from plenum.test.helper import randomOperation, \
     checkReqAck, checkLastClientReqForNode, waitForSufficientRepliesForRequests, \
     waitForViewChange, requestReturnedToNode, randomText, \
-    mockGetInstalledDistributions, mockImportModule, chk_all_funcs
+    mockGetInstalledDistributions, mockIterEntryPoints, mockImportModule, \
+    chk_all_funcs
 from plenum.test.node_request.node_request_helper import checkPrePrepared, \
     checkPropagated, checkPrepared, checkCommitted
 from plenum.test.plugin.helper import getPluginPath
@@ -658,10 +659,12 @@ def postingStatsEnabled(request):
 def pluginManager(monkeypatch):
     pluginManager = PluginManager()
     monkeypatch.setattr(importlib, 'import_module', mockImportModule)
+    monkeypatch.setattr(notifier_plugin_manager, 'iterEntryPoints',
+                        partial(mockIterEntryPoints, modules=[]))
     packagesCnt = 3
     packages = [pluginManager.prefix + randomText(10)
                 for _ in range(packagesCnt)]
-    monkeypatch.setattr(pip.utils, 'get_installed_distributions',
+    monkeypatch.setattr(notifier_plugin_manager, 'installedDistributions',
                         partial(mockGetInstalledDistributions,
                                 packages=packages))
     imported, found = pluginManager.importPlugins()
@@ -682,7 +685,7 @@ def patchPluginManager():
 
 @pytest.fixture
 def pluginManagerWithImportedModules(pluginManager, monkeypatch):
-    monkeypatch.setattr(pip.utils, 'get_installed_distributions',
+    monkeypatch.setattr(notifier_plugin_manager, 'installedDistributions',
                         partial(mockGetInstalledDistributions,
                                 packages=[]))
     monkeypatch.setattr(importlib, 'import_module', mockImportModule)
@@ -691,7 +694,7 @@ def pluginManagerWithImportedModules(pluginManager, monkeypatch):
     packagesCnt = 3
     packages = [pluginManager.prefix + randomText(10)
                 for _ in range(packagesCnt)]
-    monkeypatch.setattr(pip.utils, 'get_installed_distributions',
+    monkeypatch.setattr(notifier_plugin_manager, 'installedDistributions',
                         partial(mockGetInstalledDistributions,
                                 packages=packages))
     imported, found = pluginManager.importPlugins()
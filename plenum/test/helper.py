@@ -632,6 +632,15 @@ def mockGetInstalledDistributions(packages):
     return ret
 
 
+def mockIterEntryPoints(group, modules):
+    ret = []
+    for module in modules:
+        obj = type('', (), {})()
+        obj.module_name = module
+        ret.append(obj)
+    return ret
+
+
 def mockImportModule(moduleName):
     obj = type(moduleName, (), {})()
     obj.send_message = lambda *args: None
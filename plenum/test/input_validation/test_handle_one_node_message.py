@@ -1,5 +1,10 @@
+import json
+
 import pytest
 
+from plenum.common.constants import INSTANCE_CHANGE
+from plenum.common.types import Batch, OP_FIELD_NAME, f
+
 
 @pytest.mark.skip('INDY-79. Implement')
 def test_empty_args_fail(testNode):
@@ -18,3 +23,12 @@ def test_too_many_args_fail(testNode):
         testNode.handleOneNodeMsg(())
     assert before_msg == len(testNode.nodeInBox), \
         'nodeInBox has not got a message'
+
+
+def test_bad_message_in_batch_discarded_alone(testNode, monkeypatch):
+    handled = []
+    monkeypatch.setattr(testNode, 'handleOneNodeMsg', handled.append)
+    good = {OP_FIELD_NAME: INSTANCE_CHANGE, f.VIEW_NO.nm: 1}
+    batch = Batch(['{"op": ', json.dumps(good), '{}'], None)
+    testNode.unpackNodeMsg(batch, 'Beta')
+    assert handled == [(good, 'Beta'), ({}, 'Beta')]
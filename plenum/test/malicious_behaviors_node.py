@@ -6,7 +6,7 @@ import time
 
 import plenum.common.error
 from plenum.common.types import Propagate, PrePrepare, Prepare, ThreePhaseMsg, \
-    Commit, Reply, f
+    Commit, Reply, ThreePCState, f
 from plenum.common.request import Request, ReqDigest
 
 from plenum.common import util
@@ -182,6 +182,23 @@ def faultyReply(node):
     node.generateReply = types.MethodType(newGenerateReply, node)
 
 
+def reportsPreparedCertificates(node, change, instId: int=0):
+    """
+    Make the replica of the node report the PRE-PREPAREs it prepared as
+    `change` returns them when the view changes
+    """
+    replica = node.replicas[instId]
+    oldSend = replica.send
+
+    def evilSend(self, msg, stat=None):
+        if isinstance(msg, ThreePCState):
+            logger.debug("EVIL: changing prepared PRE-PREPAREs {}".
+                         format(msg.messages))
+            msg = ThreePCState(msg.instId, change(msg.messages))
+        return oldSend(msg, stat)
+    replica.send = types.MethodType(evilSend, replica)
+
+
 def slow_primary(nodes, inst_id=0, delay=5):
     # make primary replica slow to send PRE-PREPAREs
     def ifPrePrepare(msg):
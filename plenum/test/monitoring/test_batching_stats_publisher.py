@@ -0,0 +1,96 @@
+import asyncio
+
+import pytest
+
+from plenum.config import STATS_SERVER_IP
+from plenum.server.plugin.stats_consumer.stats_publisher import \
+    BatchingStatsPublisher
+
+
+@pytest.fixture(scope="function")
+def collector():
+    """
+    Stats server on a free port, collecting the lines it receives
+    """
+    received = []
+
+    async def _acceptClient(clientReader, clientWriter):
+        while True:
+            line = await clientReader.readline()
+            if not line:
+                break
+            received.append(line.decode().rstrip('\n'))
+
+    loop = asyncio.get_event_loop()
+    server = loop.run_until_complete(
+        asyncio.start_server(_acceptClient, host=STATS_SERVER_IP, port=0))
+    server.port = server.sockets[0].getsockname()[1]
+    server.received = received
+    yield server
+    server.close()
+    loop.run_until_complete(server.wait_closed())
+
+
+def runLoop(seconds=0.1):
+    loop = asyncio.get_event_loop()
+    loop.run_until_complete(asyncio.sleep(seconds))
+
+
+def testGaugesCoalescedAndOldestDropped():
+    publisher = BatchingStatsPublisher(STATS_SERVER_IP, 1, bufferSize=3)
+    publisher.addMsgToBuffer("latency1", key="latency")
+    publisher.addMsgToBuffer("ordered1")
+    publisher.addMsgToBuffer("latency2", key="latency")
+    assert publisher.pending == 2
+    assert publisher.counters['coalesced'] == 1
+
+    publisher.addMsgToBuffer("ordered2")
+    publisher.addMsgToBuffer("ordered3")
+    assert publisher.pending == 3
+    assert publisher.counters['dropped'] == 1
+    # The dropped message was the latest latency, so a new one is queued
+    publisher.addMsgToBuffer("latency3", key="latency")
+    assert [message for _, message in publisher._buffer] == \
+        ["ordered2", "ordered3", "latency3"]
+
+
+def testBufferedMessagesSentInOneBatch(collector):
+    publisher = BatchingStatsPublisher(STATS_SERVER_IP, collector.port,
+                                       batchSize=10)
+    for i in range(14):
+        publisher.addMsgToBuffer("testMessage{}".format(i))
+    publisher.send("testMessage14")
+    runLoop()
+
+    assert collector.received == ["testMessage{}".format(i)
+                                  for i in range(15)]
+    assert publisher.counters['sent'] == 15
+    assert publisher.counters['batches'] == 2
+    assert publisher.counters['connects'] == 1
+    assert publisher.pending == 0
+    publisher.close()
+
+
+def testReconnectsWithBackoff(collector):
+    port = collector.port
+    collector.close()
+    asyncio.get_event_loop().run_until_complete(collector.wait_closed())
+
+    publisher = BatchingStatsPublisher(STATS_SERVER_IP, port,
+                                       minReconnectDelay=60,
+                                       maxReconnectDelay=120)
+    publisher.send("testMessage1")
+    assert publisher.counters['failedConnects'] == 1
+    assert publisher.pending == 1
+
+    # No attempt to connect is made before the delay
+    publisher.send("testMessage2")
+    assert publisher.counters['failedConnects'] == 1
+    assert publisher.pending == 2
+
+    publisher._reconnectAt = 0
+    publisher.send("testMessage3")
+    assert publisher.counters['failedConnects'] == 2
+    assert publisher._reconnectDelay == 120
+    assert publisher.counters['sent'] == 0
+    assert publisher.pending == 3
@@ -0,0 +1,60 @@
+from collections import deque
+
+from plenum.common.perf_util import HandlerTimings
+from plenum.server.router import Router
+from plenum.test.helper import sendReqsToNodesAndVerifySuffReplies
+
+
+class Ping:
+    pass
+
+
+class Pong:
+    pass
+
+
+def testRouterRecordsTimingsOnlyWhenEnabled():
+    handled = []
+    timings = HandlerTimings()
+    router = Router((Ping, handled.append),
+                    (Pong, lambda msg, frm: handled.append(frm)),
+                    timings=timings, name='test')
+    router.handleAllSync(deque([Ping(), (Pong(), 'Alpha')]))
+    assert len(handled) == 2
+    assert timings.timings == {}
+    assert timings.lap('phase', timings.clock()) is None
+
+    timings.enabled = True
+    router.handleAllSync(deque([Ping(), Ping(), (Pong(), 'Beta')]))
+    assert handled[-1] == 'Beta'
+    assert timings.timings['test.Ping'].count == 2
+    assert timings.timings['test.Pong'].count == 1
+    start = timings.clock()
+    assert timings.lap('phase', start) >= start
+
+    info = timings.asDict()
+    assert set(info) == {'test.Ping', 'test.Pong', 'phase'}
+    ping = info['test.Ping']
+    assert ping['total'] >= ping['max'] > 0
+    assert sum(count for _, count in ping['histogram']) == 2
+    assert ping['max'] <= ping['histogram'][-1][0]
+    assert [name for name, _ in timings.top(1)] == \
+        [max(info, key=lambda name: info[name]['total'])]
+
+
+def testHandlerTimingsInNodeInfo(looper, nodeSet, up, wallet1, client1):
+    for node in nodeSet:
+        assert node.collectNodeInfo()['handlerTimings'] == {}
+        node.handlerTimings.enabled = True
+    sendReqsToNodesAndVerifySuffReplies(looper, wallet1, client1, 5,
+                                        nodeSet.f)
+    for node in nodeSet:
+        timings = node.collectNodeInfo()['handlerTimings']
+        for name in ('node.Propagate', 'client.SafeRequest',
+                     'master.Commit', 'master.3pc.Commit',
+                     'backup.3pc.Commit', 'prod.serviceReplicas',
+                     'prod.serviceNodeMsgs', 'prod.serviceClientMsgs',
+                     'prod.actions', 'prod.ledgerManager'):
+            assert timings[name]['count'] > 0, name
+        node.handlerTimings.enabled = False
+        node.handlerTimings.reset()
@@ -0,0 +1,63 @@
+import sys
+from collections import deque
+
+from plenum.common.memory_accounting import MemoryAccounting
+from plenum.common.perf_util import get_size
+from plenum.test.helper import sendReqsToNodesAndVerifySuffReplies
+
+
+def testEstimatesFromCountsAndSampledEntries():
+    accounting = MemoryAccounting(sampleSize=2, resampleEvery=3)
+    requests = {i: 'request {}'.format(i) for i in range(100)}
+    queues = [deque(range(10)), deque(range(5))]
+
+    def containers():
+        yield 'requests', requests
+        for queue in queues:
+            yield 'queues', queue
+        yield 'empty', []
+
+    report = accounting.account(containers())
+    assert report['requests']['count'] == 100
+    assert report['queues']['count'] == 15
+    assert report['empty'] == {'count': 0, 'bytes': sys.getsizeof([])}
+    entrySize = (get_size((0, requests[0])) + get_size((1, requests[1]))) / 2
+    assert report['requests']['bytes'] == \
+        sys.getsizeof(requests) + int(100 * entrySize)
+    assert accounting.totalBytes == \
+        sum(entry['bytes'] for entry in report.values())
+    assert accounting.top(1)[0][0] == 'requests'
+
+    # Entries are measured again only every `resampleEvery` accountings
+    for i in range(100):
+        requests[i] = requests[i] * 10
+    assert accounting.account(containers())['requests']['bytes'] == \
+        report['requests']['bytes']
+    accounting.account(containers())
+    assert accounting.account(containers())['requests']['bytes'] > \
+        report['requests']['bytes']
+    assert accounting.asDict()['containers'] is accounting.last
+
+
+def testMemoryAccountedInNodeInfo(looper, nodeSet, up, wallet1, client1):
+    sendReqsToNodesAndVerifySuffReplies(looper, wallet1, client1, 5,
+                                        nodeSet.f)
+    for node in nodeSet:
+        node.accountMemory()
+        memory = node.collectNodeInfo()['memory']
+        containers = memory['containers']
+        for name in ('requests', 'batchToSeqNos', 'clientInBox',
+                     'replica0.prepares', 'replica0.commits',
+                     'replica1.prePrepares', 'monitor.masterReqLatencies',
+                     'ledger1.uncommittedTxns'):
+            assert name in containers, name
+        assert containers['batchToSeqNos']['count'] > 0
+        # Messages queued for and from clients are accounted too
+        clientQueues = [name for name in containers
+                        if name.startswith('clientstack.')]
+        assert 'clientstack.rxMsgs' in clientQueues
+        assert len(clientQueues) == \
+            len(list(node.clientstack.memoryContainers()))
+        assert ('groupCommit.heldReplies' in containers) == \
+            (node.groupCommit is not None)
+        assert memory['estimatedBytes'] > 0
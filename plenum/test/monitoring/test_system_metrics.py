@@ -0,0 +1,42 @@
+import time
+
+from plenum.common.system_metrics import SystemMetricsSampler, \
+    systemMetricsAsDict
+
+
+def testProcessMetricsSampled():
+    sampler = SystemMetricsSampler()
+    metrics = sampler.latest()
+    assert metrics.process.rss > 0
+    assert metrics.process.numThreads >= 1
+    assert metrics.process.voluntaryCtxSwitches >= 0
+    assert metrics.trafficKb >= 0
+    assert systemMetricsAsDict(metrics)['process']['rss'] == \
+        metrics.process.rss
+    # Without a sampling thread every read samples
+    assert sampler.latest() is not metrics
+
+
+def testSamplingThreadPublishesSnapshots():
+    sampler = SystemMetricsSampler(period=0.05)
+    first = sampler.snapshot
+    sampler.start()
+    try:
+        assert sampler.running
+        deadline = time.perf_counter() + 5
+        while sampler.snapshot is first and time.perf_counter() < deadline:
+            time.sleep(0.01)
+        assert sampler.snapshot is not first
+        assert sampler.snapshot.time > first.time
+    finally:
+        sampler.stop()
+    assert not sampler.running
+
+
+def testReadingDoesNotSampleWhileThreadDoes():
+    sampler = SystemMetricsSampler(period=60)
+    sampler.start()
+    try:
+        assert sampler.latest() is sampler.snapshot
+    finally:
+        sampler.stop()
@@ -35,10 +35,12 @@ def testSystemStats(monkeypatch, testNode):
     monkeypatch.setattr(psutil, 'virtual_memory', test_virtual_memory)
     monkeypatch.setattr(psutil, 'net_io_counters', test_traffic)
     testNode.monitor.lastKnownTraffic = 0
+    testNode.monitor.systemMetrics.sample()
     data1 = testNode.monitor.captureSystemPerformance()
     assert 'cpu' in data1
     assert 'ram' in data1
     assert 'traffic' in data1
+    assert data1['process']['value']['rss'] > 0
     assert data1['cpu']['value'] == cpu
     assert data1['ram']['value'] == ram
     assert data1['traffic']['value'] == bytes / 1024
@@ -46,6 +48,7 @@ def testSystemStats(monkeypatch, testNode):
     ram = 60
     bytes = 2048
     assert testNode.monitor.lastKnownTraffic == data1['traffic']['value']
+    testNode.monitor.systemMetrics.sample()
     data2 = testNode.monitor.captureSystemPerformance()
     assert data2['cpu']['value'] == cpu
     assert data2['ram']['value'] == ram
@@ -0,0 +1,56 @@
+from types import SimpleNamespace
+
+from ledger.compact_merkle_tree import CompactMerkleTree
+from ledger.stores.file_hash_store import FileHashStore
+from ledger.util import F
+from plenum.common.constants import DOMAIN_LEDGER_ID, POOL_LEDGER_ID
+from plenum.common.ledger import Ledger
+from plenum.common.ledger_manager import LedgerManager
+from plenum.server.node import Node
+from plenum.test.node_catchup.helper import checkNodeDataForEquality
+
+# Do not remove the next import
+from plenum.test.node_catchup.conftest import whitelist
+
+txnCount = 5
+
+
+def testCatchupAppliesTxnsInBatches(tconf, newNodeCaughtUp, txnPoolNodeSet,
+                                    nodeSetWithNodeAddedAfterSomeTxns):
+    """
+    A new node applies the domain transactions it gets during catchup to its
+    state in batches, which together cover the caught up range in order
+    """
+    newNode = newNodeCaughtUp
+    batches = [c.params['txns'] for c in
+               newNode.spylog.getAll(
+                   Node.postTxnsFromCatchupAddedToLedger.__name__)
+               if c.params['ledgerId'] == DOMAIN_LEDGER_ID]
+    assert batches
+    assert all(0 < len(b) <= tconf.CatchupTxnApplyBatchSize for b in batches)
+
+    seqNos = [txn[F.seqNo.name] for b in batches for txn in b]
+    assert seqNos == list(range(seqNos[0], seqNos[-1] + 1))
+    assert seqNos[-1] == newNode.domainLedger.size
+    checkNodeDataForEquality(newNode, *txnPoolNodeSet[:-1])
+
+
+def testPerTxnCallbackSeesLedgerAsOfItsTxn(tdir):
+    """
+    A ledger with only a per-txn callback, like the pool ledger, gets each
+    txn added right before its callback, so the callback does not see the
+    txns after it
+    """
+    ledger = Ledger(CompactMerkleTree(hashStore=FileHashStore(dataDir=tdir)),
+                    dataDir=tdir)
+    seen = []
+
+    def postTxnAdded(ledgerId, txn):
+        seen.append((txn[F.seqNo.name], ledger.size))
+
+    manager = LedgerManager(SimpleNamespace(name='Alpha'), ownedByNode=False)
+    manager.addLedger(POOL_LEDGER_ID, ledger,
+                      postTxnAddedToLedgerClbk=postTxnAdded)
+    manager._addVerifiedTxns(POOL_LEDGER_ID, ledger,
+                             [{'reqId': i} for i in range(5)])
+    assert seen == [(i, i) for i in range(1, 6)]
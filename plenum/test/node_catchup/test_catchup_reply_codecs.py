@@ -0,0 +1,67 @@
+import os
+from types import SimpleNamespace
+
+import pytest
+
+from ledger.compact_merkle_tree import CompactMerkleTree
+from ledger.stores.file_hash_store import FileHashStore
+
+from plenum.common.ledger import Ledger
+from plenum.common.ledger_manager import LedgerManager
+from plenum.common.message_codecs import availableCodecs
+from plenum.common.types import CatchupRep, ConsistencyProof, \
+    OP_FIELD_NAME, f
+
+LEDGER_ID = 1
+TXN_COUNT = 10
+
+
+def openLedger(dataDir):
+    return Ledger(CompactMerkleTree(hashStore=FileHashStore(dataDir=dataDir)),
+                  dataDir=dataDir)
+
+
+@pytest.fixture(params=list(availableCodecs))
+def codec(request):
+    return availableCodecs[request.param]
+
+
+def testCatchupReplyThroughCodec(tdir, codec):
+    """
+    A catchup reply made of what `getAllTxn` gives, with integer seqNo keys,
+    is usable by the catchup of the receiving node whichever codec the
+    nodes negotiated
+    """
+    source = openLedger(os.path.join(tdir, 'source-' + codec.name))
+    for i in range(TXN_COUNT):
+        source.add({'reqId': i})
+    txns = source.getAllTxn(1, TXN_COUNT)
+    assert all(isinstance(seqNo, int) for seqNo in txns)
+    consProof = [Ledger.hashToStr(p) for p in
+                 source.tree.consistency_proof(TXN_COUNT, TXN_COUNT)]
+    sent = CatchupRep(LEDGER_ID, txns, consProof)
+    msg = dict(sent._asdict())
+    msg[OP_FIELD_NAME] = sent.typename
+    received = codec.decode(codec.encode(msg).decode())
+    received.pop(OP_FIELD_NAME)
+    rep = CatchupRep(**received)
+
+    target = openLedger(os.path.join(tdir, 'target-' + codec.name))
+    manager = LedgerManager(SimpleNamespace(name='Alpha'), ownedByNode=False)
+    manager.addLedger(LEDGER_ID, target)
+    ledgerInfo = manager.getLedgerInfoByType(LEDGER_ID)
+    ledgerInfo.catchUpTill = ConsistencyProof(
+        LEDGER_ID, 0, TXN_COUNT, 1, Ledger.hashToStr(target.tree.root_hash),
+        Ledger.hashToStr(source.tree.root_hash), [])
+    ledgerInfo.recvdCatchupRepliesFrm['Beta'] = [rep]
+
+    catchUpReplies = sorted((int(s), t) for s, t in
+                            getattr(rep, f.TXNS.nm).items())
+    assert manager._getCatchupReplyForSeqNo(LEDGER_ID, 1) == ('Beta', rep)
+    verified, nodeName, count = manager.hasValidCatchupReplies(
+        LEDGER_ID, target, 1, catchUpReplies)
+    assert verified
+    assert nodeName == 'Beta'
+    assert count == TXN_COUNT
+    manager._removePrcdCatchupReply(LEDGER_ID, 'Beta', 1)
+    assert ledgerInfo.recvdCatchupRepliesFrm['Beta'] == []
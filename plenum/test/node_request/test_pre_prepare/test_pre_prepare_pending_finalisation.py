@@ -0,0 +1,37 @@
+from stp_core.loop.eventually import eventually
+
+from plenum.test import waits
+from plenum.test.delayers import ppgDelay
+from plenum.test.helper import sendRandomRequests
+from plenum.test.test_node import getNonPrimaryReplicas
+
+
+def testPrePrepareProcessedOnceRequestsFinalised(looper, nodeSet, up,
+                                                 client1, wallet1):
+    """
+    A non primary replica which gets a PRE-PREPARE before the requests in it
+    are finalised keeps it pending and processes it as soon as the PROPAGATEs
+    finalising the requests arrive
+    """
+    delay = 5
+    slowRep = getNonPrimaryReplicas(nodeSet, 0)[0]
+    slowNode = slowRep.node
+    slowNode.nodeIbStasher.delay(ppgDelay(delay))
+    orderedBefore = slowRep.spylog.count(slowRep.doOrder.__name__)
+
+    sendRandomRequests(wallet1, client1, 2)
+
+    def chkPending():
+        assert slowRep.prePreparesPendingFinReqs
+        assert slowRep.prePreparesPendingReq
+
+    timeout = waits.expectedPrePrepareTime(len(nodeSet))
+    looper.run(eventually(chkPending, retryWait=.5, timeout=timeout))
+
+    def chkOrdered():
+        assert not slowRep.prePreparesPendingFinReqs
+        assert not slowRep.prePreparesPendingReq
+        assert slowRep.spylog.count(slowRep.doOrder.__name__) > orderedBefore
+
+    timeout = waits.expectedOrderingTime(len(nodeSet)) + delay
+    looper.run(eventually(chkOrdered, retryWait=1, timeout=timeout))
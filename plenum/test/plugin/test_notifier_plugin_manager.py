@@ -1,6 +1,7 @@
-import pip.utils as utils
+from plenum.server import notifier_plugin_manager
+from plenum.server.notifier_plugin_manager import PluginManager
 from plenum.test.helper import randomText, mockGetInstalledDistributions, \
-    mockImportModule
+    mockIterEntryPoints, mockImportModule
 from functools import partial
 import importlib
 
@@ -12,17 +13,46 @@ def testPluginManagerFindsPlugins(monkeypatch, pluginManager):
                      for _ in range(validPackagesCnt)]
     invalidPackages = [randomText(10) for _ in range(invalidPackagesCnt)]
 
-    monkeypatch.setattr(utils, 'get_installed_distributions',
+    monkeypatch.setattr(notifier_plugin_manager, 'installedDistributions',
                         partial(mockGetInstalledDistributions, packages=validPackages+invalidPackages))
     assert len(pluginManager._findPlugins()) == validPackagesCnt
 
 
+def testPluginManagerFindsDeclaredPlugins(monkeypatch, pluginManager):
+    declared = [randomText(10) for _ in range(2)]
+    packages = [pluginManager.prefix + randomText(10), declared[0]]
+    monkeypatch.setattr(notifier_plugin_manager, 'iterEntryPoints',
+                        partial(mockIterEntryPoints, modules=declared))
+    monkeypatch.setattr(notifier_plugin_manager, 'installedDistributions',
+                        partial(mockGetInstalledDistributions,
+                                packages=packages))
+    assert pluginManager._findPlugins() == declared + packages[:1]
+
+
+def testPluginManagerImportsPluginsOnFirstUse(monkeypatch, pluginManager):
+    found = []
+
+    def findPlugins(self):
+        found.append(True)
+        return [pluginManager.prefix + randomText(10)]
+
+    monkeypatch.setattr(PluginManager, '_findPlugins', findPlugins)
+    monkeypatch.setattr(importlib, 'import_module', mockImportModule)
+    pluginManager = PluginManager()
+    assert not found
+    assert pluginManager._sendMessage(randomText(10), randomText(20)) == \
+        (1, 1)
+    assert pluginManager._sendMessage(randomText(10), randomText(20)) == \
+        (1, 1)
+    assert len(found) == 1
+
+
 def testPluginManagerImportsPlugins(monkeypatch, pluginManager):
     packagesCnt = 3
     packages = [pluginManager.prefix + randomText(10)
                      for _ in range(packagesCnt)]
 
-    monkeypatch.setattr(utils, 'get_installed_distributions',
+    monkeypatch.setattr(notifier_plugin_manager, 'installedDistributions',
                         partial(mockGetInstalledDistributions,
                                 packages=packages))
     monkeypatch.setattr(importlib, 'import_module', mockImportModule)
@@ -0,0 +1,104 @@
+import os
+
+from ledger.compact_merkle_tree import CompactMerkleTree
+
+from plenum.common.constants import TXN_TYPE, NODE, TARGET_NYM, DATA, ALIAS, \
+    NODE_IP, NODE_PORT, CLIENT_IP, CLIENT_PORT, SERVICES, VALIDATOR
+from plenum.common.ledger import Ledger
+from plenum.common.pool_membership import PoolMembership
+from plenum.common.signer_simple import SimpleSigner
+from plenum.common.types import f
+from plenum.common.util import cryptonymToHex
+from plenum.server.pool_req_handler import PoolRequestHandler
+from stp_core.types import HA
+
+
+def nodeTxn(nym, steward, **data):
+    return {
+        TXN_TYPE: NODE,
+        TARGET_NYM: nym,
+        f.IDENTIFIER.nm: steward,
+        DATA: data,
+    }
+
+
+def newNodeTxn(nym, steward, alias, port):
+    return nodeTxn(nym, steward, **{ALIAS: alias,
+                                    NODE_IP: '127.0.0.1', NODE_PORT: port,
+                                    CLIENT_IP: '127.0.0.1',
+                                    CLIENT_PORT: port + 1,
+                                    SERVICES: [VALIDATOR]})
+
+
+def testIndexCaughtUpWithLedgerAndSaved(tdir):
+    dataDir = os.path.join(tdir, 'membership')
+    ledger = Ledger(CompactMerkleTree(), dataDir=dataDir, fileName='pool')
+    alpha, beta = SimpleSigner().identifier, SimpleSigner().identifier
+    ledger.add(newNodeTxn(alpha, 'StewardA', 'Alpha', 9701))
+    ledger.add(newNodeTxn(beta, 'StewardB', 'Beta', 9703))
+    ledger.add(nodeTxn(alpha, 'StewardA', **{ALIAS: 'Alpha',
+                                             NODE_IP: '10.0.0.1',
+                                             NODE_PORT: 9801}))
+
+    filePath = os.path.join(dataDir, 'pool_membership.json')
+    membership = PoolMembership.forLedger(ledger, filePath)
+    assert membership.seqNo == 3
+    nodeReg, cliNodeReg, nodeKeys = membership.haAndKeys()
+    assert nodeReg == {'Alpha': HA('10.0.0.1', 9801),
+                       'Beta': HA('127.0.0.1', 9703)}
+    assert cliNodeReg['AlphaC'] == HA('127.0.0.1', 9702)
+    assert nodeKeys['Beta'] == cryptonymToHex(beta)
+    assert membership.stewardOf(alpha) == 'StewardA'
+    assert membership.nodeAddress('Alpha') == '10.0.0.1'
+
+    seqNos, info = membership.nodeInfo(alpha)
+    assert seqNos == [1, 3]
+    assert info[DATA][NODE_IP] == '127.0.0.1'
+    _, info = membership.nodeInfo(alpha, excludeLast=False)
+    assert info[DATA][NODE_IP] == '10.0.0.1'
+    assert info[DATA][CLIENT_PORT] == 9702
+
+    # Only the txns after the ones seen are read
+    ledger.add(nodeTxn(beta, 'StewardB', **{ALIAS: 'Beta', SERVICES: []}))
+    assert membership.catchUp(ledger) == 1
+    assert 'Beta' not in membership.haAndKeys()[0]
+    assert membership.nodesData()[beta][SERVICES] == []
+
+    # A saved index matching the ledger is used as it is, one which does not
+    # match is built again
+    loaded = PoolMembership.load(filePath)
+    assert loaded.asDict() == membership.asDict()
+    assert PoolMembership.forLedger(ledger, filePath).haAndKeys() == \
+        membership.haAndKeys()
+    ledger.add(newNodeTxn(SimpleSigner().identifier, 'StewardC', 'Gamma',
+                          9705))
+    membership = PoolMembership.forLedger(ledger, filePath)
+    assert membership.seqNo == 5
+    assert 'Gamma' in membership.haAndKeys()[0]
+    ledger.stop()
+
+
+def testValidationDoesNotChangeIndex(tdir):
+    """
+    The nodes the request handler validates against include the txns the
+    index has not seen, committed or not, without the index being updated
+    """
+    dataDir = os.path.join(tdir, 'membershipReadOnly')
+    ledger = Ledger(CompactMerkleTree(), dataDir=dataDir, fileName='pool')
+    alpha, beta, gamma = (SimpleSigner().identifier for _ in range(3))
+    ledger.add(newNodeTxn(alpha, 'StewardA', 'Alpha', 9701))
+    filePath = os.path.join(dataDir, 'pool_membership.json')
+    membership = PoolMembership.forLedger(ledger, filePath)
+    handler = PoolRequestHandler(ledger, None, None, membership)
+
+    ledger.add(newNodeTxn(beta, 'StewardB', 'Beta', 9703))
+    ledger.appendTxns([newNodeTxn(gamma, 'StewardC', 'Gamma', 9705)])
+    savedAt = os.path.getmtime(filePath)
+    nodesData = dict(handler.uncommittedNodesData())
+    assert set(nodesData) == {alpha, beta, gamma}
+    assert nodesData[beta][f.IDENTIFIER.nm] == 'StewardB'
+    assert handler.stewardHasNode('StewardC')
+    assert membership.seqNo == 1
+    assert not membership.hasNode(beta)
+    assert os.path.getmtime(filePath) == savedAt
+    ledger.stop()
@@ -0,0 +1,63 @@
+import json
+
+from stp_core.common.log import getlogger
+from plenum.common.perf_util import get_size
+from plenum.common.request import Request
+from plenum.server.propagator import Requests
+from plenum.test.helper import sendReqsToNodesAndVerifySuffReplies
+
+logger = getlogger()
+
+nodeCount = 4
+
+
+def propagatedCopy(req: Request) -> Request:
+    # Each PROPAGATE is deserialized into a new request object
+    return Request.fromState(json.loads(json.dumps(req.__getstate__())))
+
+
+def testSamePropagatesShareOneRequest():
+    senders = ['Alpha', 'Beta', 'Gamma', 'Delta']
+    req = Request('idr', 1, {'type': 'buy', 'amount': 'x' * 1000}, 'sig')
+    requests = Requests()
+    requests.add(req)
+    for sender in senders:
+        requests.addPropagate(propagatedCopy(req), sender)
+
+    state = requests[req.key]
+    assert len(state.propagates) == len(senders)
+    assert requests.votes(req) == len(senders)
+    assert all(state.propagates[s] is state.request for s in senders)
+    assert state.isFinalised(1) == req
+
+    # Four propagates take much less memory than four copies of the request
+    assert get_size(requests) < get_size(req) + \
+        len(senders) * get_size(req) / 2
+
+
+def testDifferentPropagatesAreKept():
+    req = Request('idr', 1, {'type': 'buy'}, 'sig')
+    forged = Request('idr', 1, {'type': 'sell'}, 'sig')
+    requests = Requests()
+    requests.addPropagate(forged, 'Alpha')
+    assert not requests[req.key].isFinalised(1)
+    requests.addPropagate(req, 'Beta')
+    assert not requests[req.key].isFinalised(1)
+    requests.addPropagate(propagatedCopy(req), 'Gamma')
+    state = requests[req.key]
+    assert state.propagates['Alpha'] == forged
+    assert state.propagates['Gamma'] is state.propagates['Beta']
+    assert state.isFinalised(1) == req
+
+
+def testRequestsSizeUnderLoad(looper, nodeSet, client1, wallet1):
+    numReqs = 100
+    sendReqsToNodesAndVerifySuffReplies(looper, wallet1, client1, numReqs)
+    for node in nodeSet:
+        size = get_size(node.requests)
+        logger.info("{} has {} requests taking {} bytes, {} bytes per "
+                    "request".format(node, len(node.requests), size,
+                                     size // max(len(node.requests), 1)))
+        for state in node.requests.values():
+            # Every node propagated the same request
+            assert len({id(r) for r in state.propagates.values()}) == 1
@@ -0,0 +1,60 @@
+import pytest
+
+from plenum.server.replica_process import RemoteReplica
+from plenum.test import waits
+from plenum.test.helper import sendReqsToNodesAndVerifySuffReplies
+from plenum.test.pool_transactions.conftest import looper, clientAndWallet1, \
+    client1, wallet1, client1Connected
+from plenum.test.test_node import ensureElectionsDone
+from plenum.test.view_change.helper import ensure_view_change
+from stp_core.loop.eventually import eventually
+
+
+@pytest.fixture(scope="module")
+def tconf(tconf, request):
+    oldInProcesses = tconf.BackupReplicasInProcesses
+    tconf.BackupReplicasInProcesses = True
+
+    def reset():
+        tconf.BackupReplicasInProcesses = oldInProcesses
+
+    request.addfinalizer(reset)
+    return tconf
+
+
+def backupReplicas(nodes):
+    return [replica for node in nodes for replica in node.replicas[1:]]
+
+
+def testBackupReplicasInProcessesOrderAcrossViewChange(tconf, looper,
+                                                        txnPoolNodeSet,
+                                                        client1Connected,
+                                                        wallet1):
+    """
+    A pool whose backup replicas run in worker processes orders requests, on
+    the backup instances too, before and after a view change
+    """
+    replicas = backupReplicas(txnPoolNodeSet)
+    assert replicas
+    assert all(isinstance(replica, RemoteReplica) for replica in replicas)
+    timeout = waits.expectedOrderingTime(len(txnPoolNodeSet[0].replicas))
+
+    def chkBackupsOrdered(since):
+        for replica in replicas:
+            assert replica.isRunning
+            assert replica.lastOrderedPPSeqNo > since[replica]
+
+    sendReqsToNodesAndVerifySuffReplies(looper, wallet1, client1Connected, 5)
+    looper.run(eventually(chkBackupsOrdered,
+                          {replica: 0 for replica in replicas},
+                          retryWait=1, timeout=timeout))
+
+    ensure_view_change(looper, txnPoolNodeSet, client1Connected, wallet1)
+    ensureElectionsDone(looper=looper, nodes=txnPoolNodeSet)
+    for replica in replicas:
+        assert replica.threePhaseState.instId == replica.instId
+
+    lastOrdered = {replica: replica.lastOrderedPPSeqNo for replica in replicas}
+    sendReqsToNodesAndVerifySuffReplies(looper, wallet1, client1Connected, 5)
+    looper.run(eventually(chkBackupsOrdered, lastOrdered,
+                          retryWait=1, timeout=timeout))
@@ -0,0 +1,67 @@
+from plenum.server.models import OrderedTracker
+
+
+def testOrderedTrackerKeepsRangeAndOutOfRangeKeys():
+    ordered = OrderedTracker()
+    assert not ordered
+    for p in range(1, 6):
+        ordered.add(0, p)
+    ordered.add(0, 8)
+    assert ordered.last == (0, 8)
+    assert all((0, p) in ordered for p in (1, 2, 3, 4, 5, 8))
+    assert (0, 6) not in ordered
+    assert (0, 7) not in ordered
+    assert (1, 3) not in ordered
+
+    ordered.add(0, 7)
+    ordered.add(0, 6)
+    assert ordered.last == (0, 6)
+    assert all((0, p) in ordered for p in range(1, 9))
+
+    # Adding an already ordered key does not change the last ordered key
+    ordered.add(0, 2)
+    assert ordered.last == (0, 6)
+
+
+def testOrderedTrackerAcrossViews():
+    ordered = OrderedTracker()
+    for p in range(1, 4):
+        ordered.add(0, p)
+    ordered.add(1, 4)
+    ordered.add(1, 5)
+    assert ordered.last == (1, 5)
+    assert (0, 3) in ordered
+    assert (0, 4) not in ordered
+    assert (1, 3) not in ordered
+    assert (1, 4) in ordered
+
+
+def testOrderedTrackerPrune():
+    ordered = OrderedTracker()
+    for p in range(1, 101):
+        ordered.add(0, p)
+    for p in range(101, 151):
+        ordered.add(1, p)
+    ordered.add(1, 160)
+
+    ordered.prune(120)
+    assert ordered.stableTill == 120
+    # Everything till the stable checkpoint is considered ordered
+    assert (0, 50) in ordered
+    assert (1, 110) in ordered
+    assert (1, 130) in ordered
+    assert (1, 155) not in ordered
+    assert (1, 160) in ordered
+    assert 0 not in ordered._views
+    assert ordered.last == (1, 160)
+
+    ordered.prune(155)
+    assert (1, 155) in ordered
+    assert (1, 156) not in ordered
+    assert (1, 160) in ordered
+    ordered.add(1, 156)
+    assert (1, 156) in ordered
+
+    # Pruning never moves back
+    ordered.prune(100)
+    assert ordered.stableTill == 155
@@ -0,0 +1,122 @@
+import time
+from types import SimpleNamespace
+
+from plenum.common.constants import DOMAIN_LEDGER_ID
+from plenum.common.types import PrePrepare, ThreePCState
+from plenum.server.replica import Replica
+
+
+def replicaInView(viewNo, lastOrderedPPSeqNo=0):
+    """
+    Master replica of a pool of 4 nodes with just what choosing the
+    PRE-PREPAREs to propose again needs
+    """
+    replica = Replica.__new__(Replica)
+    replica.node = SimpleNamespace(name='Alpha', viewNo=viewNo, f=1, quorum=3)
+    replica.name = 'Alpha:0'
+    replica.lastOrderedPPSeqNo = lastOrderedPPSeqNo
+    replica._lastPrePrepareSeqNo = lastOrderedPPSeqNo
+    replica.preparedCertificates = {}
+    replica.reproposeSince = None
+    replica.preparedTill = 0
+    return replica
+
+
+def prePrepare(viewNo, ppSeqNo, digest):
+    return PrePrepare(0, viewNo, ppSeqNo, time.time(),
+                      [('4AdS22kC7xzb4bcqg9JATuCfAMNcQYcZa1u5eWzs6cSJ',
+                        ppSeqNo)],
+                      1, digest, DOMAIN_LEDGER_ID, None, None)
+
+
+def testBatchPreparedByFPlusOneNodesIsProposedAgain():
+    replica = replicaInView(1)
+    prepared = prePrepare(0, 1, 'a')
+    replica.preparedCertificates = {
+        'Alpha': {},
+        'Beta': {1: prepared},
+        'Gamma': {1: prepared},
+    }
+    assert replica.preparedToRepropose() == ([prepared], 1)
+
+
+def testBatchReportedByOneNodeIsNotProposedAgain():
+    """
+    A single, possibly faulty, node can neither get a batch proposed again
+    nor stop the primary from creating batches by reporting a high ppSeqNo
+    """
+    replica = replicaInView(1)
+    replica.preparedCertificates = {
+        'Alpha': {},
+        'Beta': {1: prePrepare(0, 1, 'a'), 1000: prePrepare(0, 1000, 'b')},
+        'Gamma': {},
+    }
+    certificates, replica.preparedTill = replica.preparedToRepropose()
+    assert certificates == []
+    assert replica.preparedTill == 0
+    assert replica.canCreateBatches
+
+
+def testCertificateOfLatestViewIsProposedAgain():
+    replica = replicaInView(2, lastOrderedPPSeqNo=3)
+    older = prePrepare(0, 4, 'a')
+    latest = prePrepare(1, 4, 'b')
+    following = prePrepare(0, 5, 'c')
+    replica.preparedCertificates = {
+        'Alpha': {4: older, 5: following},
+        'Beta': {4: latest, 5: following},
+        'Gamma': {3: prePrepare(0, 3, 'd'), 4: latest},
+        'Delta': {4: older},
+    }
+    assert replica.preparedToRepropose() == ([latest, following], 5)
+
+
+def testConflictingCertificateOfOneNodeIsIgnored():
+    replica = replicaInView(1)
+    first = prePrepare(0, 1, 'a')
+    replica.preparedCertificates = {
+        'Alpha': {1: first},
+        'Beta': {1: first},
+        'Gamma': {1: prePrepare(0, 1, 'b'), 2: prePrepare(0, 2, 'c')},
+    }
+    assert replica.preparedToRepropose() == ([first], 1)
+
+
+def testNoBatchCreatedBelowConflictingCertificates():
+    """
+    If f+1 nodes report different batches prepared in the same view for a
+    ppSeqNo, none of them is proposed again and the primary does not create
+    a batch at or below the highest ppSeqNo f+1 nodes prepared
+    """
+    replica = replicaInView(1)
+    replica.node = SimpleNamespace(name='Alpha', viewNo=1, f=2, quorum=5)
+    first = prePrepare(0, 1, 'a')
+    second = prePrepare(0, 1, 'b')
+    following = prePrepare(0, 2, 'c')
+    replica.preparedCertificates = {
+        'Alpha': {1: first},
+        'Beta': {1: first},
+        'Gamma': {1: first, 2: following},
+        'Delta': {1: second, 2: following},
+        'Epsilon': {1: second, 2: following},
+        'Zeta': {1: second},
+    }
+    certificates, replica.preparedTill = replica.preparedToRepropose()
+    assert certificates == []
+    assert replica.preparedTill == 2
+    assert not replica.canCreateBatches
+
+    replica.lastOrderedPPSeqNo = 2
+    assert replica.canCreateBatches
+
+
+def testCertificatesOutsideWatermarksAreDropped():
+    replica = replicaInView(1)
+    replica.instId = 0
+    replica.config = SimpleNamespace(ViewChangePreparedCertificates=True,
+                                     LOG_SIZE=10)
+    replica.h = 0
+    prepared = [prePrepare(0, 1, 'a'), prePrepare(0, 11, 'b')]
+    replica.process3PhaseState(
+        ThreePCState(0, [dict(pp._asdict()) for pp in prepared]), 'Beta')
+    assert replica.preparedCertificates['Beta'] == {1: prepared[0]}
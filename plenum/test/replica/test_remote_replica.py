@@ -0,0 +1,119 @@
+import time
+
+import pytest
+
+from plenum.common.constants import DOMAIN_LEDGER_ID, NYM, POOL_LEDGER_ID, \
+    TXN_TYPE
+from plenum.common.exceptions import SuspiciousNode
+from plenum.common.request import ReqKey, Request
+from plenum.common.types import Checkpoint, Prepare, PrePrepare, \
+    ThreePCState
+from plenum.config import BackupReplicaPollTimeout, \
+    BackupReplicaStateTimeout, Max3PCBatchWait
+from plenum.server.propagator import Requests
+from plenum.server.replica_process import RemoteReplica, packMsg, \
+    unpackMsg, THREE_PHASE_STATE
+from plenum.server.suspicion_codes import Suspicions
+
+
+class FakeConfig:
+    BackupReplicaPollTimeout = BackupReplicaPollTimeout
+    BackupReplicaStateTimeout = BackupReplicaStateTimeout
+    BackupReplicaStartMethod = None
+
+
+class FakeNode:
+    def __init__(self):
+        self.name = 'Alpha'
+        self.config = FakeConfig()
+        self.viewNo = 0
+        self.isParticipating = True
+        self.f = 1
+        self.ledger_ids = [POOL_LEDGER_ID, DOMAIN_LEDGER_ID]
+        self.requests = Requests()
+
+    @classmethod
+    def ledgerIdForRequest(cls, request):
+        return DOMAIN_LEDGER_ID
+
+
+@pytest.fixture()
+def remoteReplica():
+    replica = RemoteReplica(FakeNode(), 1)
+    yield replica
+    replica.stop()
+
+
+def serviceUntil(replica, condition, timeout=10):
+    end = time.perf_counter() + timeout
+    while time.perf_counter() < end:
+        replica.serviceQueues()
+        if condition():
+            return
+        time.sleep(Max3PCBatchWait)
+    raise AssertionError('condition not met in {} seconds'.format(timeout))
+
+
+def testMessagesSurvivePacking():
+    prepare = Prepare(1, 0, 3, 'digest', None, None)
+    checkpoint = Checkpoint(1, 0, 1, 10, 'digest')
+    for msg in (prepare, checkpoint):
+        unpacked = unpackMsg(packMsg(msg))
+        assert type(unpacked) == type(msg)
+        assert unpacked == msg
+
+    ex = SuspiciousNode('Beta:1', Suspicions.PR_DIGEST_WRONG, prepare)
+    unpacked = unpackMsg(packMsg(ex))
+    assert isinstance(unpacked, SuspiciousNode)
+    assert (unpacked.node, unpacked.code, unpacked.reason) == \
+        ('Beta', ex.code, ex.reason)
+    assert unpacked.offendingMsg == prepare
+
+
+def testRemoteReplicaCreatesPrePrepare(remoteReplica):
+    """
+    A primary backup replica in a worker process gets a finalised request
+    and sends a PRE-PREPARE for it through its node
+    """
+    node = remoteReplica.node
+    remoteReplica.primaryName = remoteReplica.name
+    assert remoteReplica.isPrimary
+
+    request = Request('id1', 1, {TXN_TYPE: NYM}, 'signature')
+    node.requests.add(request).finalised = request
+    node.requests.flagAsForwarded(request, 2)
+    remoteReplica.inBox.append(ReqKey(*request.key))
+
+    serviceUntil(remoteReplica, lambda: remoteReplica.outBox)
+    assert remoteReplica.isRunning
+    pp = remoteReplica.outBox.popleft()
+    assert isinstance(pp, PrePrepare)
+    assert (pp.instId, pp.viewNo, pp.ppSeqNo) == (1, 0, 1)
+    assert [tuple(k) for k in pp.reqIdr] == [request.key]
+
+    remoteReplica.stop()
+    assert not remoteReplica.isRunning
+
+
+def testThreePhaseStateFromWorker(remoteReplica):
+    """
+    The 3 phase state of a remote replica is the one of the replica in its
+    worker process, not a stand-in
+    """
+    assert remoteReplica.threePhaseState == ThreePCState(1, [])
+    serviceUntil(remoteReplica, lambda: remoteReplica.isRunning)
+
+    kinds = []
+    origProcess = remoteReplica._processFromWorker
+
+    def processFromWorker(items):
+        kinds.extend(item[0] for item in items)
+        return origProcess(items)
+    remoteReplica._processFromWorker = processFromWorker
+
+    state = remoteReplica.threePhaseState
+    assert isinstance(state, ThreePCState)
+    assert state.instId == 1
+    assert state.messages == []
+    assert THREE_PHASE_STATE in kinds
+    assert not remoteReplica.outBox
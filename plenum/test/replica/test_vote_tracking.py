@@ -0,0 +1,62 @@
+from plenum.common.types import Commit, Prepare
+from plenum.server.models import Commits, InstanceChanges, Prepares
+
+DIGEST = 'digest'
+
+
+def prepare(viewNo, ppSeqNo):
+    return Prepare(0, viewNo, ppSeqNo, DIGEST, None, None)
+
+
+def testVotesKeptAsBitsOfVoterIndices():
+    prepares = Prepares()
+    msg = prepare(0, 1)
+    assert not prepares.hasPrepare(msg)
+    for voter in ('Alpha:0', 'Beta:0', 'Beta:0'):
+        prepares.addVote(msg, voter)
+    assert prepares.hasPrepare(msg)
+    assert prepares.hasPrepareFrom(msg, 'Beta:0')
+    assert not prepares.hasPrepareFrom(msg, 'Gamma:0')
+    assert prepares[(0, 1)].mask == 0b11
+    assert prepares[(0, 1)].voters == {'Alpha:0', 'Beta:0'}
+    assert prepares.hasQuorum(msg, 1)
+    assert not prepares.hasQuorum(msg, 2)
+
+    # Indices are shared by the messages of a tracker
+    prepares.addVote(prepare(0, 2), 'Gamma:0')
+    prepares.addVote(prepare(0, 2), 'Alpha:0')
+    assert prepares[(0, 2)].mask == 0b101
+
+    commits = Commits()
+    for voter in ('Alpha:0', 'Beta:0', 'Gamma:0'):
+        commits.addVote(Commit(0, 0, 1), voter)
+    assert commits.hasQuorum(Commit(0, 0, 1), 1)
+    assert not commits.hasQuorum(Commit(0, 0, 2), 1)
+
+
+def testPruneTillDropsLowerSeqNosOfEveryView():
+    prepares = Prepares()
+    for viewNo, ppSeqNo in ((0, 1), (0, 2), (0, 3), (1, 4), (1, 5), (2, 9)):
+        prepares.addVote(prepare(viewNo, ppSeqNo), 'Alpha:0')
+    prepares.pop((0, 2))
+    assert prepares.pruneTill(4) == 3
+    assert set(prepares) == {(1, 5), (2, 9)}
+    assert prepares.pruneTill(4) == 0
+    # Keys popped or added after a prune are still pruned by seqNo
+    prepares.addVote(prepare(2, 7), 'Beta:0')
+    del prepares[(2, 9)]
+    assert prepares.pruneTill(8) == 2
+    assert not prepares
+
+
+def testInstanceChangesPrunedByView():
+    instanceChanges = InstanceChanges()
+    for viewNo in (1, 2, 3):
+        for voter in ('Alpha', 'Beta', 'Gamma'):
+            instanceChanges.addVote(viewNo, voter)
+    assert instanceChanges.hasQuorum(2, 1)
+    assert instanceChanges.hasInstChngFrom(2, 'Gamma')
+    assert instanceChanges[2].viewNo == 2
+    instanceChanges.pruneTill(2)
+    assert not instanceChanges.hasView(2)
+    assert instanceChanges.hasView(3)
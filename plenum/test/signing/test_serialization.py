@@ -0,0 +1,150 @@
+import time
+
+from plenum.common.constants import NYM, TARGET_NYM, TXN_TYPE, VERKEY, \
+    ROLE, ALIAS, STEWARD
+from plenum.common.request import Request
+from plenum.common.signing import serialize, serializeMsg
+from plenum.common.types import f, OPERATION
+from plenum.server.propagator import Requests
+from plenum.test.helper import randomText
+
+from stp_core.common.log import getlogger
+
+logger = getlogger()
+
+
+def recursiveSerialize(obj, level=0, topLevelKeysToIgnore=None):
+    # The serialisation `serialize` has to keep producing
+    if isinstance(obj, str):
+        return obj
+    if isinstance(obj, dict):
+        keys = [k for k in obj.keys()
+                if level > 0 or k not in (topLevelKeysToIgnore or [])]
+        return "|".join(str(k) + ":" +
+                        recursiveSerialize(obj[k], level + 1)
+                        for k in sorted(keys))
+    if isinstance(obj, list):
+        return ",".join(recursiveSerialize(o, level + 1) for o in obj)
+    return "" if obj is None else str(obj)
+
+
+def nymRequest(reqId):
+    return {
+        f.IDENTIFIER.nm: randomText(22),
+        f.REQ_ID.nm: reqId,
+        OPERATION: {
+            TXN_TYPE: NYM,
+            TARGET_NYM: randomText(22),
+            VERKEY: '~' + randomText(22),
+            ROLE: STEWARD,
+            ALIAS: randomText(10),
+        },
+        f.SIG.nm: randomText(88),
+    }
+
+
+def testSerialize():
+    assert serialize("str") == "str"
+    assert serialize([1, 2, 3]) == "1,2,3"
+    assert serialize({1: 'a', 2: 'b', 3: [1, {2: 'k'}]}) == '1:a|2:b|3:1,2:k'
+    assert serialize({'b': None, 'a': [], 'c': {}, 'd': 1.5}) == \
+        'a:|b:|c:|d:1.5'
+    msg = {'sig': 'x', 'a': {'sig': [True, None, 'y']}, 'z': [[1, 2], [3]]}
+    assert serialize(msg, topLevelKeysToIgnore=['sig']) == \
+        'a:sig:True,,y|z:1,2,3'
+    for i in range(10):
+        req = nymRequest(i)
+        assert serialize(req, topLevelKeysToIgnore=[f.SIG.nm]) == \
+            recursiveSerialize(req, topLevelKeysToIgnore=[f.SIG.nm])
+
+
+def testSerializeDeeplyNested():
+    obj = 'leaf'
+    for i in range(5000):
+        obj = {'k': [obj]}
+    assert serialize(obj) == 'k:' * 5000 + 'leaf'
+
+
+def testSerializeRejectsOtherTypes():
+    for obj in ({'a': {'b': (1, 2)}}, [b'bytes']):
+        try:
+            serialize(obj)
+        except Exception as ex:
+            assert 'invalid type found' in str(ex)
+        else:
+            raise AssertionError('{} serialized'.format(obj))
+
+
+def testSigningBytesComputedWithDigest():
+    req = Request(**nymRequest(1))
+    signingBytes = req.signingBytes
+    assert signingBytes == serializeMsg(req.signingState)
+    assert req.signingBytes is signingBytes
+    assert '_signingBytes' not in req.__getstate__()
+
+    req.reqId = 2
+    req.digest = req.getDigest()
+    assert req.signingBytes == serializeMsg(req.signingState)
+    assert req.signingBytes != signingBytes
+
+    restored = Request.fromState(req.__getstate__())
+    assert restored.signingBytes == req.signingBytes
+
+
+def testSameRequestFoundForPropagatedCopy():
+    requests = Requests()
+    reqDict = nymRequest(1)
+    req = Request(**reqDict)
+    requests.addPropagate(req, 'Alpha')
+
+    assert requests.sameRequest(dict(reqDict)) is req
+    changed = dict(reqDict, operation=dict(reqDict[OPERATION], alias='x'))
+    assert requests.sameRequest(changed) is None
+    resigned = dict(reqDict, signature=randomText(88))
+    assert requests.sameRequest(resigned) is None
+    withDigest = dict(reqDict, digest=req.digest)
+    assert requests.sameRequest(withDigest) is None
+    assert requests.sameRequest(nymRequest(2)) is None
+
+
+def testSerializationBenchmark():
+    """
+    Serialising NYM requests, and how much a node saves by reusing the
+    signing bytes of a request instead of serialising it for each
+    verification
+    """
+    reqs = [nymRequest(i) for i in range(10000)]
+    ignore = [f.SIG.nm]
+
+    start = time.perf_counter()
+    for req in reqs:
+        recursiveSerialize(req, topLevelKeysToIgnore=ignore)
+    recursive = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for req in reqs:
+        serialize(req, topLevelKeysToIgnore=ignore)
+    iterative = time.perf_counter() - start
+
+    requests = [Request(**req) for req in reqs]
+    # A request is verified once from the client and once for each
+    # PROPAGATE of the other nodes of a 4 node pool
+    verifications = 4
+    start = time.perf_counter()
+    for req in requests:
+        for _ in range(verifications):
+            serializeMsg(req.signingState)
+    serialising = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for req in requests:
+        for _ in range(verifications):
+            req.signingBytes
+    memoised = time.perf_counter() - start
+
+    logger.info("Serialising {} NYM requests took {:.4f} sec recursively and "
+                "{:.4f} sec iteratively. Getting their signing bytes {} times "
+                "each took {:.4f} sec serialising and {:.4f} sec memoised".
+                format(len(reqs), recursive, iterative, verifications,
+                       serialising, memoised))
+    assert memoised < serialising
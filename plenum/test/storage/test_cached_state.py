@@ -0,0 +1,118 @@
+import json
+
+import pytest
+
+from plenum.persistence.cached_state import CachedState, cacheState, \
+    getDecoded
+from plenum.server.domain_req_handler import DomainRequestHandler
+from state.kv.kv_in_memory import KeyValueStorageInMemory
+from state.pruning_state import PruningState
+
+
+def encoded(value):
+    return json.dumps(value).encode()
+
+
+@pytest.fixture()
+def state():
+    return CachedState(PruningState(KeyValueStorageInMemory()), 100)
+
+
+def testCacheDisabledWithZeroSize():
+    state = PruningState(KeyValueStorageInMemory())
+    assert cacheState(state, 0) is state
+    assert isinstance(cacheState(state, 10), CachedState)
+    state.set(b'k', encoded({'a': 1}))
+    assert getDecoded(state, b'k', isCommitted=False) == {'a': 1}
+    assert getDecoded(state, b'k') is None
+
+
+def testReadsCachedForEachHead(state):
+    state.set(b'k1', encoded({'a': 1}))
+    assert state.getDecoded(b'k1', isCommitted=False) == {'a': 1}
+    assert state.getDecoded(b'k1', isCommitted=False) is \
+        state.getDecoded(b'k1', isCommitted=False)
+    assert state.get(b'k1') is None
+    assert state.get(b'k1') is None
+    assert (state.stats.hits, state.stats.misses) == (4, 1)
+
+    state.commit(rootHash=state.headHash)
+    assert state.getDecoded(b'k1') == {'a': 1}
+    assert state.stats.asDict()['savedTrieReads'] == state.stats.hits
+
+
+def testRevertDropsOnlyLaterChanges(state):
+    state.set(b'k1', encoded(1))
+    state.set(b'k2', encoded(2))
+    head = state.headHash
+    state.set(b'k2', encoded(3))
+    state.set(b'k3', encoded(4))
+    assert state.getDecoded(b'k3', isCommitted=False) == 4
+
+    state.revertToHead(head)
+    assert state.stats.invalidations == 2
+    misses = state.stats.misses
+    assert state.getDecoded(b'k1', isCommitted=False) == 1
+    assert state.stats.misses == misses
+    assert state.getDecoded(b'k2', isCommitted=False) == 2
+    assert state.getDecoded(b'k3', isCommitted=False) is None
+    assert state.stats.misses == misses + 2
+
+
+def testRevertToUnknownHeadFlushes(state):
+    state.set(b'k1', encoded(1))
+    state.state.set(b'k1', encoded(2))
+    head = state.state.headHash
+    state.set(b'k1', encoded(3))
+    state.revertToHead(head)
+    assert state.stats.flushes == 1
+    assert state.getDecoded(b'k1', isCommitted=False) == 2
+
+
+def testCommitDropsCommittedChanges(state):
+    state.set(b'k1', encoded(1))
+    firstBatch = state.headHash
+    state.set(b'k2', encoded(2))
+    secondBatch = state.headHash
+    assert state.get(b'k1') is None
+    assert state.get(b'k2') is None
+
+    state.commit(rootHash=firstBatch)
+    assert state.getDecoded(b'k1') == 1
+    assert state.getDecoded(b'k2') is None
+    # The uncommitted head is still after the second batch
+    assert state.getDecoded(b'k2', isCommitted=False) == 2
+
+    state.commit(rootHash=secondBatch)
+    assert state.getDecoded(b'k2') == 2
+    assert state.stats.flushes == 0
+
+    state.set(b'k1', encoded(5))
+    state.revertToHead(state.committedHeadHash)
+    assert state.getDecoded(b'k1', isCommitted=False) == 1
+
+
+def testLeastRecentlyUsedKeysEvicted():
+    state = CachedState(PruningState(KeyValueStorageInMemory()), 2)
+    for i in range(3):
+        state.set(str(i).encode(), encoded(i))
+    misses = state.stats.misses
+    assert state.getDecoded(b'2', isCommitted=False) == 2
+    assert state.getDecoded(b'1', isCommitted=False) == 1
+    assert state.stats.misses == misses
+    assert state.getDecoded(b'0', isCommitted=False) == 0
+    assert state.stats.misses == misses + 1
+
+
+def testDetailsReadFromCacheCopiedDeeply(state):
+    """
+    Changing what is read through a request handler, even nested values,
+    does not change the decoded value in the cache
+    """
+    state.set(b'nym1', encoded({'role': '2', 'verkey': {'keys': ['k1']}}))
+    details = DomainRequestHandler.getNymDetails(state, 'nym1',
+                                                 isCommitted=False)
+    details['role'] = None
+    details['verkey']['keys'].append('k2')
+    assert state.getDecoded(b'nym1', isCommitted=False) == \
+        {'role': '2', 'verkey': {'keys': ['k1']}}
@@ -1,3 +1,9 @@
+from plenum.common.constants import TXN_TYPE, NYM, TARGET_NYM
+from plenum.common.request import Request
+from plenum.common.types import f
+from plenum.persistence.client_req_rep_store_file import ClientReqRepStoreFile
+
+
 def testReqAcks(replied1, client1):
     reqId = replied1.reqId
     identifier = replied1.identifier
@@ -5,3 +11,48 @@ def testReqAcks(replied1, client1):
                                                                    reqId))
     assert set(client1.nodeReg.keys()) == \
         set(client1.reqRepStore.getAcks(identifier, reqId))
+
+
+def makeRequest(reqId):
+    return Request(identifier='idr1', reqId=reqId,
+                   operation={TXN_TYPE: NYM, TARGET_NYM: 'nym{}'.format(reqId)})
+
+
+def testReqRepStoreSurvivesReopen(tdir):
+    store = ClientReqRepStoreFile('reopened', tdir)
+    req = makeRequest(1)
+    store.addRequest(req)
+    store.addAck({f.IDENTIFIER.nm: 'idr1', f.REQ_ID.nm: 1}, 'Alpha')
+    store.addNack({f.IDENTIFIER.nm: 'idr1', f.REQ_ID.nm: 1,
+                   f.REASON.nm: 'some~reason'}, 'Beta')
+    result = {f.IDENTIFIER.nm: 'idr1', f.REQ_ID.nm: 1, TXN_TYPE: NYM,
+              TARGET_NYM: 'nym1'}
+    assert store.addReply('idr1', 1, 'Alpha', result) == 1
+    assert store.addReply('idr1', 1, 'Gamma', result) == 2
+    store.close()
+
+    store = ClientReqRepStoreFile('reopened', tdir)
+    assert store.hasRequest('idr1', 1)
+    assert store.getRequest('idr1', 1).digest == req.digest
+    assert store.getAcks('idr1', 1) == ['Alpha']
+    assert store.getNacks('idr1', 1) == {'Beta': 'some~reason'}
+    assert set(store.getReplies('idr1', 1).keys()) == {'Alpha', 'Gamma'}
+    assert store.lastReqId == 1
+    store.close()
+
+
+def testReqRepStorePurgesOldRequests(tdir):
+    store = ClientReqRepStoreFile('purged', tdir, maxRequests=5)
+    for reqId in range(1, 10):
+        store.addRequest(makeRequest(reqId))
+    assert store.size == 9
+    store.addRequest(makeRequest(10))
+    assert store.size == 5
+    assert not store.hasRequest('idr1', 5)
+    assert store.hasRequest('idr1', 6)
+    store.close()
+
+    store = ClientReqRepStoreFile('purged', tdir, maxRequests=5)
+    assert store.size == 5
+    assert store.lastReqId == 10
+    store.close()
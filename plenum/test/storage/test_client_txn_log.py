@@ -0,0 +1,21 @@
+from plenum.common.constants import TXN_TYPE, NYM, TARGET_NYM
+from plenum.common.types import f
+from plenum.persistence.client_txn_log import ClientTxnLog
+
+
+def testHasTxn(tdir):
+    txnLog = ClientTxnLog('txnLogClient', tdir)
+    txn = {f.IDENTIFIER.nm: 'idr1', f.REQ_ID.nm: 1, TXN_TYPE: NYM,
+           TARGET_NYM: 'nym1'}
+    assert not txnLog.hasTxn('idr1', 1)
+    txnLog.append('idr1', 1, txn)
+    assert txnLog.hasTxn('idr1', 1)
+    # Only the exact identifier and request id pair is found
+    assert not txnLog.hasTxn('idr2', 1)
+    assert not txnLog.hasTxn('idr1', 2)
+    txnLog.close()
+
+    txnLog = ClientTxnLog('txnLogClient', tdir)
+    assert txnLog.hasTxn('idr1', 1)
+    assert not txnLog.hasTxn('idr2', 1)
+    txnLog.close()
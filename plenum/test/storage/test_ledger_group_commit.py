@@ -0,0 +1,177 @@
+import multiprocessing
+import os
+import signal
+
+import pytest
+
+from ledger.compact_merkle_tree import CompactMerkleTree
+from ledger.stores.file_hash_store import FileHashStore
+
+from plenum.common.ledger import Ledger
+from plenum.persistence.leveldb_hash_store import LevelDbHashStore
+from plenum.server.group_commit import GroupCommit
+from plenum.test.helper import sendReqsToNodesAndVerifySuffReplies
+from plenum.test.pool_transactions.conftest import looper, clientAndWallet1, \
+    client1, wallet1, client1Connected
+from stp_core.loop.eventually import eventually
+
+
+@pytest.fixture(scope="module")
+def tconf(tconf, request):
+    oldGroupCommit = tconf.LedgerGroupCommit
+    tconf.LedgerGroupCommit = True
+
+    def reset():
+        tconf.LedgerGroupCommit = oldGroupCommit
+
+    request.addfinalizer(reset)
+    return tconf
+
+
+def openLedger(dataDir):
+    return Ledger(CompactMerkleTree(hashStore=FileHashStore(dataDir=dataDir)),
+                  dataDir=dataDir)
+
+
+def commitAndCrash(dataDir, groups, groupSize, acknowledged):
+    ledger = openLedger(dataDir)
+    for group in range(groups):
+        txns = [{'reqId': group * groupSize + i} for i in range(groupSize)]
+        ledger.appendTxns(txns)
+        ledger.commitTxns(len(txns))
+        ledger.sync()
+        acknowledged.put(ledger.size)
+    # Committed but neither synced nor acknowledged when the process dies
+    ledger.appendTxns([{'reqId': -1}])
+    ledger.commitTxns(1)
+    os.kill(os.getpid(), signal.SIGKILL)
+
+
+def testAcknowledgedTxnsSurviveCrash(tdir):
+    # Killing the process only shows that acknowledged txns were written out
+    # of it, that they reach the disk is checked by the tests of `sync`
+    dataDir = os.path.join(tdir, 'crashed')
+    acknowledged = multiprocessing.Queue()
+    # Enough txns for the transaction log to move to a new chunk
+    process = multiprocessing.Process(target=commitAndCrash,
+                                      args=(dataDir, 24, 50, acknowledged))
+    process.start()
+    process.join(timeout=60)
+    assert process.exitcode == -signal.SIGKILL
+    acknowledgedSize = 0
+    while not acknowledged.empty():
+        acknowledgedSize = acknowledged.get()
+    assert acknowledgedSize == 1200
+
+    restarted = openLedger(dataDir)
+    assert restarted.size >= acknowledgedSize
+    for seqNo in range(1, acknowledgedSize + 1):
+        assert restarted.getBySeqNo(seqNo)['reqId'] == seqNo - 1
+
+    # The merkle tree is recovered for whatever made it to the log
+    reference = Ledger(CompactMerkleTree(),
+                       dataDir=os.path.join(tdir, 'reference'))
+    for _, txn in sorted(restarted.getAllTxn().items()):
+        reference.add(txn)
+    assert restarted.root_hash == reference.root_hash
+    restarted.stop()
+    reference.stop()
+
+
+def testSyncUsesHashStoreHook(tdir, monkeypatch):
+    """
+    `sync` makes the hash store durable through its own `sync`, like the
+    LevelDB one of the domain ledger whose hashes are not in files
+    """
+    dataDir = os.path.join(tdir, 'leveldbHashStore')
+    hashStore = LevelDbHashStore(dataDir=dataDir)
+    ledger = Ledger(CompactMerkleTree(hashStore=hashStore), dataDir=dataDir)
+    hashStoreSyncs = []
+    origSync = hashStore.sync
+    monkeypatch.setattr(hashStore, 'sync',
+                        lambda: hashStoreSyncs.append(1) or origSync())
+    fsyncs = []
+    origFsync = os.fsync
+    monkeypatch.setattr(os, 'fsync',
+                        lambda fd: fsyncs.append(fd) or origFsync(fd))
+
+    ledger.appendTxns([{'reqId': i} for i in range(5)])
+    ledger.commitTxns(5)
+    assert ledger.sync()
+    assert hashStoreSyncs == [1]
+    # The transaction log is fsynced
+    assert fsyncs
+    # Nothing new to sync
+    assert not ledger.sync()
+    assert hashStoreSyncs == [1]
+    ledger.stop()
+
+
+class FakeLedger:
+    def __init__(self):
+        self.syncs = 0
+
+    def sync(self):
+        self.syncs += 1
+        return True
+
+
+def testRepliesHeldTillGroupIsSynced():
+    now = [0]
+    groupCommit = GroupCommit(window=0.01, getTime=lambda: now[0])
+    ledger = FakeLedger()
+    assert not groupCommit.isDue()
+    assert groupCommit.flush([ledger]) == []
+    assert ledger.syncs == 0
+
+    groupCommit.add([('r1', 'k1'), ('r2', 'k2')])
+    now[0] = 0.005
+    groupCommit.add([('r3', 'k3')])
+    assert groupCommit.pending == 3
+    assert not groupCommit.isDue()
+
+    now[0] = 0.01
+    assert groupCommit.isDue()
+    assert groupCommit.flush([ledger, object()]) == \
+        [('r1', 'k1'), ('r2', 'k2'), ('r3', 'k3')]
+    assert ledger.syncs == 1
+    assert groupCommit.pending == 0
+    assert not groupCommit.isDue()
+    assert groupCommit.asDict()['batchesPerGroup'] == 2
+
+
+def testRepliesSentAfterGroupCommit(tconf, looper, txnPoolNodeSet,
+                                    client1Connected, wallet1):
+    sendReqsToNodesAndVerifySuffReplies(looper, wallet1, client1Connected, 10)
+    for node in txnPoolNodeSet:
+        assert node.groupCommit.groups > 0
+        assert node.groupCommit.pending == 0
+        assert node.domainLedger._syncedSize == node.domainLedger.size
+
+
+def testReplyForTxnInLedgerSentAfterGroupCommit(tconf, looper,
+                                                txnPoolNodeSet,
+                                                client1Connected, wallet1):
+    """
+    The reply to a request sent again after it was ordered, made from the
+    ledger, is held back till the next sync like the one sent on ordering
+    """
+    req, = sendReqsToNodesAndVerifySuffReplies(looper, wallet1,
+                                               client1Connected, 1)
+    heldBack = {node.name: [] for node in txnPoolNodeSet}
+    for node in txnPoolNodeSet:
+        origAdd = node.groupCommit.add
+
+        def add(replies, held=heldBack[node.name], origAdd=origAdd):
+            held.extend(reqKey for _, reqKey in replies)
+            origAdd(replies)
+        node.groupCommit.add = add
+    client1Connected.send(req)
+
+    def chk():
+        for node in txnPoolNodeSet:
+            assert heldBack[node.name] == [req.key]
+            assert node.groupCommit.pending == 0
+            assert not node.isProcessingReq(*req.key)
+
+    looper.run(eventually(chk, retryWait=1, timeout=10))
@@ -0,0 +1,72 @@
+from plenum.common.constants import POOL_LEDGER_ID
+from state.trie.pruning_trie import BLANK_ROOT
+
+
+def poolStateAt(node, seqNo):
+    """
+    Commit the pool state of the node as of txn `seqNo` of the pool ledger,
+    with the state marker pointing to it
+
+    :return: the committed state root
+    """
+    state = node.poolManager.state
+    state.revertToHead(BLANK_ROOT)
+    state.commit(rootHash=BLANK_ROOT)
+    txns = [txn for _, txn in node.poolLedger.getAllTxn(1, seqNo).items()]
+    node.poolManager.reqHandler.updateState(txns, isCommitted=True)
+    state.commit(rootHash=state.headHash)
+    node.recordStateMarker(POOL_LEDGER_ID, seqNo, state)
+    return state.committedHeadHash
+
+
+def initPoolState(node, monkeypatch):
+    """
+    Bring the pool state of the node up to date with the pool ledger
+
+    :return: the number of txns applied to the state
+    """
+    applied = []
+    reqHandler = node.poolManager.reqHandler
+    updateState = reqHandler.updateState
+    monkeypatch.setattr(reqHandler, 'updateState',
+                        lambda txns, isCommitted=False:
+                        applied.extend(txns) or
+                        updateState(txns, isCommitted=isCommitted))
+    node.poolManager.initPoolState()
+    monkeypatch.undo()
+    state = node.poolManager.state
+    assert node.stateMarkers.get(POOL_LEDGER_ID) == \
+        (node.poolLedger.size, state.committedHeadHash)
+    return len(applied)
+
+
+def testOnlyTxnsAfterMarkerApplied(txnPoolNodeSet, monkeypatch):
+    node = txnPoolNodeSet[0]
+    ledgerSize = node.poolLedger.size
+    assert ledgerSize > 1
+    expected = node.poolManager.state.committedHeadHash
+    assert poolStateAt(node, ledgerSize - 1) != expected
+    assert initPoolState(node, monkeypatch) == 1
+    assert node.poolManager.state.committedHeadHash == expected
+
+
+def testStateNotMatchingMarkerRebuilt(txnPoolNodeSet, monkeypatch):
+    node = txnPoolNodeSet[0]
+    ledgerSize = node.poolLedger.size
+    expected = node.poolManager.state.committedHeadHash
+    poolStateAt(node, ledgerSize - 1)
+    node.stateMarkers.set(POOL_LEDGER_ID, ledgerSize, b'\x01' * 32)
+    assert initPoolState(node, monkeypatch) == ledgerSize
+    assert node.poolManager.state.committedHeadHash == expected
+
+
+def testStateAheadOfLedgerRebuilt(txnPoolNodeSet, monkeypatch):
+    node = txnPoolNodeSet[0]
+    ledgerSize = node.poolLedger.size
+    expected = node.poolManager.state.committedHeadHash
+    state = node.poolManager.state
+    state.set(b'extra', b'value')
+    state.commit(rootHash=state.headHash)
+    node.recordStateMarker(POOL_LEDGER_ID, ledgerSize + 1)
+    assert initPoolState(node, monkeypatch) == ledgerSize
+    assert node.poolManager.state.committedHeadHash == expected
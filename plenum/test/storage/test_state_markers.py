@@ -0,0 +1,29 @@
+from stp_core.loop.eventually import eventually
+from plenum.common.constants import DOMAIN_LEDGER_ID
+from plenum.persistence.state_markers import StateMarkers
+from plenum.test import waits
+from state.kv.kv_in_memory import KeyValueStorageInMemory
+
+
+def testStateMarkersReadWrite():
+    markers = StateMarkers(KeyValueStorageInMemory())
+    assert markers.get(DOMAIN_LEDGER_ID) is None
+    markers.set(DOMAIN_LEDGER_ID, 5, b'\x01' * 32)
+    assert markers.get(DOMAIN_LEDGER_ID) == (5, b'\x01' * 32)
+    markers.set(DOMAIN_LEDGER_ID, 7, b'\x02' * 32)
+    assert markers.get(DOMAIN_LEDGER_ID) == (7, b'\x02' * 32)
+
+
+def testStateMarkerRecordedOnCommit(nodeSet, looper, replied1):
+    """
+    After a batch is committed, the state marker of the ledger points to the
+    last txn of the ledger and to the committed state root
+    """
+    def chk():
+        for node in nodeSet:
+            state = node.getState(DOMAIN_LEDGER_ID)
+            assert node.stateMarkers.get(DOMAIN_LEDGER_ID) == \
+                (node.domainLedger.size, state.committedHeadHash)
+
+    timeout = waits.expectedTransactionExecutionTime(len(nodeSet))
+    looper.run(eventually(chk, retryWait=1, timeout=timeout))
@@ -0,0 +1,113 @@
+import logging
+
+import pytest
+
+from plenum.common.lazy_log import getlogger
+
+
+class RecordingHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+class CountingRepr:
+    def __init__(self):
+        self.calls = 0
+
+    def __repr__(self):
+        self.calls += 1
+        return 'x' * 100
+
+    __str__ = __repr__
+
+
+@pytest.fixture()
+def lazyLogger(request):
+    logger = getlogger('plenum.test.lazy_log_test')
+    handler = RecordingHandler()
+    logger.addHandler(handler)
+    logger.logger.propagate = False
+    oldLevel = logger.level
+
+    def reset():
+        logger.removeHandler(handler)
+        logger.setLevel(oldLevel)
+        logger.logger.propagate = True
+
+    request.addfinalizer(reset)
+    return logger, handler
+
+
+def testNotFormattedWhenLevelDisabled(lazyLogger):
+    logger, handler = lazyLogger
+    logger.setLevel(logging.INFO)
+    arg = CountingRepr()
+    logger.debug("{} is not formatted", arg)
+    logger.trace("{} is not formatted", arg)
+    assert arg.calls == 0
+    assert not handler.records
+
+
+def testFormattedOnceWhenEmitted(lazyLogger):
+    logger, handler = lazyLogger
+    logger.setLevel(logging.DEBUG)
+    arg = CountingRepr()
+    logger.debug("{} has braces {{}}", arg)
+    assert len(handler.records) == 1
+    record = handler.records[0]
+    assert record.getMessage() == 'x' * 100 + ' has braces {}'
+    assert record.getMessage() == 'x' * 100 + ' has braces {}'
+    assert arg.calls == 1
+    # The caller is reported, not the facade
+    assert record.funcName == testFormattedOnceWhenEmitted.__name__
+    assert record.pathname == __file__
+
+    # Messages without arguments are logged as they are
+    logger.debug("already formatted {}")
+    assert handler.records[1].getMessage() == "already formatted {}"
+
+
+def testMessagesWithExtraAreStrings(lazyLogger):
+    logger, handler = lazyLogger
+    logger.setLevel(logging.DEBUG)
+    logger.info("{} info", 1)
+    logger.debug("{} tagged", 2, extra={"tags": ["test"]})
+    assert [r.msg for r in handler.records] == ["1 info", "2 tagged"]
+    assert handler.records[1].tags == ["test"]
+
+
+def testDebugSampled(lazyLogger):
+    logger, handler = lazyLogger
+    logger.setLevel(logging.DEBUG)
+    for i in range(10):
+        logger.debugSampled(4, "sampled {}", i)
+    assert [r.getMessage() for r in handler.records] == \
+        ["sampled 0", "sampled 4", "sampled 8"]
+
+
+def testArgsNotEvaluatedForDisabledLevels(lazyLogger):
+    """
+    With debug logs disabled, as with the default log levels of a deployed
+    node, the arguments of the messages below the level are never
+    converted to strings, however many messages are logged
+    """
+    logger, handler = lazyLogger
+    logger.setLevel(logging.WARNING)
+    arg = CountingRepr()
+    for i in range(1000):
+        logger.trace("{} sending message {}", arg, i)
+        logger.debug("{} sending message {}", arg, i)
+        logger.debugSampled(10, "{} sending message {}", arg, i)
+        logger.info("{} sending message {}", arg, i)
+        logger.display("{} sending message {}", arg, i)
+        logger.log(logging.DEBUG, "{} sending message {}", arg, i)
+    assert arg.calls == 0
+    assert not handler.records
+
+    logger.warning("{} sending message {}", arg, 0)
+    assert arg.calls == 1
+    assert len(handler.records) == 1
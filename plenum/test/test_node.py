@@ -105,7 +105,8 @@ class TestNodeCore(StackedTester):
                                    MockedNodeStack(), MockedBlacklister(),
                                    nodeInfo=self.nodeInfo,
                                    notifierEventTriggeringConfig=notifierEventTriggeringConfig,
-                                   pluginPaths=pluginPaths)
+                                   pluginPaths=pluginPaths,
+                                   handlerTimings=self.handlerTimings)
         for i in range(len(self.replicas)):
             self.monitor.addInstance()
 
@@ -236,7 +237,8 @@ class TestNodeCore(StackedTester):
                   Node.checkPerformance,
                   Node.processStashedOrderedReqs,
                   Node.lost_master_primary,
-                  Node.propose_view_change
+                  Node.propose_view_change,
+                  Node.postTxnsFromCatchupAddedToLedger
                   ])
 class TestNode(TestNodeCore, Node):
 
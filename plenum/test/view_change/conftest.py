@@ -34,3 +34,15 @@ def simulate_slow_master(nodeSet, looper, up, wallet1, client1, viewNo):
         new_m_primary_node = get_master_primary_node(list(nodeSet.nodes.values()))
         return adict(old=m_primary_node, new=new_m_primary_node)
     return _
+
+
+@pytest.fixture(scope="module")
+def preparedCertificates(tconf, request):
+    old = tconf.ViewChangePreparedCertificates
+    tconf.ViewChangePreparedCertificates = True
+
+    def reset():
+        tconf.ViewChangePreparedCertificates = old
+
+    request.addfinalizer(reset)
+    return tconf
@@ -1,5 +1,6 @@
 import types
 
+from plenum.test.delayers import cDelay
 from plenum.test.helper import checkViewNoForNodes, sendRandomRequests, \
     sendReqsToNodesAndVerifySuffReplies
 from plenum.test.test_node import get_master_primary_node
@@ -112,3 +113,38 @@ def disconnect_master_primary(nodes):
         if node != pr_node:
             node.nodestack.getRemote(pr_node.nodestack.name).disconnect()
     return pr_node
+
+
+def prepare_without_ordering(looper, nodes, wallet, client, count,
+                             unordered_nodes=None):
+    """
+    Send requests which the master instance's replicas of `unordered_nodes`,
+    all the nodes by default, prepare but do not order since the COMMITs
+    for them do not arrive. The delays are reset once the view changed
+
+    :return: the requests sent
+    """
+    unordered_nodes = unordered_nodes or nodes
+    for node in unordered_nodes:
+        node.nodeIbStasher.delay(cDelay(300, 0))
+    reqs = sendRandomRequests(wallet, client, count)
+
+    def chk():
+        for node in unordered_nodes:
+            replica = node.replicas[0]
+            pp = replica.lastPrePrepare
+            assert pp is not None
+            assert set(pp.reqIdr) == {(r.identifier, r.reqId) for r in reqs}
+            assert replica.prepares.hasQuorum(pp, replica.f)
+
+    looper.run(eventually(chk, retryWait=1,
+                          timeout=waits.expectedPrepareTime(len(nodes))))
+    return reqs
+
+
+def primary_name_for_view(nodes, view_no):
+    """
+    Name of the node whose replica is the master primary in view `view_no`
+    with `PrimarySelector`
+    """
+    return sorted(node.name for node in nodes)[view_no % len(nodes)]
@@ -0,0 +1,101 @@
+from plenum.common.types import f
+from plenum.server.primary_selector import PrimarySelector
+from plenum.test.helper import waitForSufficientRepliesForRequests, \
+    sendReqsToNodesAndVerifySuffReplies, checkViewNoForNodes
+from plenum.test.malicious_behaviors_node import reportsPreparedCertificates
+from plenum.test.node_catchup.helper import checkNodeDataForEquality
+from plenum.test.test_node import ensureElectionsDone, \
+    get_master_primary_node
+from plenum.test.view_change.helper import ensure_view_change, \
+    prepare_without_ordering, primary_name_for_view
+
+nodeCount = 7
+
+PrimaryDecider = PrimarySelector
+
+CONFLICTING_DIGEST = 'conflicting'
+
+
+def changeViewWithFaultyReports(looper, nodeSet, wallet, client, change):
+    """
+    Change the view after the nodes prepared a batch of the master instance
+    without ordering it, with f nodes, none of them the old or new primary,
+    reporting the PRE-PREPAREs they prepared as `change` returns them
+
+    :return: the PRE-PREPARE prepared, the new view and the honest nodes
+    """
+    nodes = list(nodeSet)
+    viewNo = checkViewNoForNodes(nodes)
+    oldPrimary = get_master_primary_node(nodes)
+    newPrimary = nodeSet.nodes[primary_name_for_view(nodes, viewNo + 1)]
+    faulty = [n for n in nodes
+              if n not in (oldPrimary, newPrimary)][:newPrimary.f]
+    honestSends = {node: node.replicas[0].send for node in faulty}
+    for node in faulty:
+        reportsPreparedCertificates(node, change(node.replicas[0]))
+
+    reqs = prepare_without_ordering(looper, nodeSet, wallet, client, 3)
+    prepared = newPrimary.replicas[0].lastPrePrepare
+
+    newViewNo = ensure_view_change(looper, nodeSet, client, wallet)
+    for node in nodeSet:
+        node.resetDelays()
+    ensureElectionsDone(looper=looper, nodes=nodeSet)
+    # The next tests of the module pick their own faulty nodes
+    for node, send in honestSends.items():
+        node.replicas[0].send = send
+    waitForSufficientRepliesForRequests(looper, client, requests=reqs)
+    assert get_master_primary_node(nodes) == newPrimary
+    return prepared, newViewNo, [n for n in nodes if n not in faulty]
+
+
+def checkReproposed(nodeSet, prepared, newViewNo, honest):
+    for node in honest:
+        replica = node.replicas[0]
+        for ppDict in (replica.sentPrePrepares, replica.prePrepares):
+            for (v, p), pp in ppDict.items():
+                assert pp.digest != CONFLICTING_DIGEST
+                if (v, p) == (newViewNo, prepared.ppSeqNo):
+                    assert pp.digest == prepared.digest
+    for node in nodeSet:
+        checkNodeDataForEquality(node, *[n for n in nodeSet if n != node])
+
+
+def testConflictingCertificatesOfFaultyNodesIgnored(preparedCertificates,
+                                                    looper, nodeSet, up,
+                                                    wallet1, client1):
+    """
+    f nodes reporting a different batch than the one prepared cannot get it
+    proposed again, the new primary proposes the prepared one
+    """
+    def conflicting(replica):
+        return lambda prepared: [dict(pp, **{f.DIGEST.nm: CONFLICTING_DIGEST})
+                                 for pp in prepared]
+
+    prepared, newViewNo, honest = changeViewWithFaultyReports(
+        looper, nodeSet, wallet1, client1, conflicting)
+    checkReproposed(nodeSet, prepared, newViewNo, honest)
+    sendReqsToNodesAndVerifySuffReplies(looper, wallet1, client1, 2)
+
+
+def testCertificatesAboveWatermarksOfFaultyNodesIgnored(preparedCertificates,
+                                                        looper, nodeSet, up,
+                                                        wallet1, client1):
+    """
+    f nodes reporting batches prepared at the high watermark or above it
+    stop neither the new primary from creating batches nor the pool from
+    ordering
+    """
+    def aboveWatermarks(replica):
+        return lambda prepared: prepared + [
+            dict(prepared[-1], **{f.PP_SEQ_NO.nm: ppSeqNo,
+                                  f.DIGEST.nm: CONFLICTING_DIGEST})
+            for ppSeqNo in (replica.H, replica.H + 1)]
+
+    prepared, newViewNo, honest = changeViewWithFaultyReports(
+        looper, nodeSet, wallet1, client1, aboveWatermarks)
+    checkReproposed(nodeSet, prepared, newViewNo, honest)
+    primary = get_master_primary_node(list(nodeSet)).replicas[0]
+    assert primary.preparedTill == prepared.ppSeqNo
+    assert primary.canCreateBatches
+    sendReqsToNodesAndVerifySuffReplies(looper, wallet1, client1, 2)
@@ -0,0 +1,92 @@
+from plenum.server.primary_selector import PrimarySelector
+from plenum.test import waits
+from plenum.test.helper import waitForSufficientRepliesForRequests, \
+    sendReqsToNodesAndVerifySuffReplies, checkViewNoForNodes
+from plenum.test.node_catchup.helper import checkNodeDataForEquality
+from plenum.test.test_node import ensureElectionsDone, \
+    get_master_primary_node
+from plenum.test.view_change.helper import ensure_view_change, \
+    prepare_without_ordering, primary_name_for_view
+from stp_core.loop.eventually import eventually
+
+nodeCount = 7
+
+PrimaryDecider = PrimarySelector
+
+
+def testPreparedReproposedAfterViewChange(preparedCertificates, looper,
+                                          nodeSet, up, wallet1, client1):
+    """
+    Requests of the master instance which every node prepared but did not
+    order before the view changed are ordered in the new view from the
+    PRE-PREPAREs the new primary proposes again, the client does not have to
+    send them again
+    """
+    sendReqsToNodesAndVerifySuffReplies(looper, wallet1, client1, 2)
+    oldPrimary = get_master_primary_node(list(nodeSet.nodes.values()))
+
+    reqs = prepare_without_ordering(looper, nodeSet, wallet1, client1, 3)
+    prepared = nodeSet.nodes[oldPrimary.name].replicas[0].lastPrePrepare
+
+    newViewNo = ensure_view_change(looper, nodeSet, client1, wallet1)
+    # COMMITs of the earlier view are discarded
+    for node in nodeSet:
+        node.resetDelays()
+    ensureElectionsDone(looper=looper, nodes=nodeSet)
+    waitForSufficientRepliesForRequests(looper, client1, requests=reqs)
+
+    newPrimary = get_master_primary_node(list(nodeSet.nodes.values()))
+    assert newPrimary.name != oldPrimary.name
+    reproposed = newPrimary.replicas[0].sentPrePrepares[newViewNo,
+                                                         prepared.ppSeqNo]
+    assert reproposed.digest == prepared.digest
+    assert reproposed.stateRootHash == prepared.stateRootHash
+    for node in nodeSet:
+        checkNodeDataForEquality(node, *[n for n in nodeSet if n != node])
+
+
+def testBatchOrderedBySomeNodesReproposed(preparedCertificates, looper,
+                                          nodeSet, up, wallet1, client1):
+    """
+    A batch which some nodes ordered before the view changed but the new
+    primary did not is proposed again. The nodes which ordered it take part
+    in ordering it in the new view without executing it again
+    """
+    nodes = list(nodeSet)
+    viewNo = checkViewNoForNodes(nodes)
+    oldPrimary = get_master_primary_node(nodes)
+    newPrimary = nodeSet.nodes[primary_name_for_view(nodes, viewNo + 1)]
+    others = [n for n in nodes if n not in (oldPrimary, newPrimary)]
+    unordered = [newPrimary] + others[:newPrimary.f]
+    ordered = [n for n in nodes if n not in unordered]
+
+    reqs = prepare_without_ordering(looper, nodeSet, wallet1, client1, 2,
+                                    unordered_nodes=unordered)
+    prepared = newPrimary.replicas[0].lastPrePrepare
+
+    def chkOrdered(someNodes, inView):
+        for node in someNodes:
+            assert node.replicas[0].hasOrdered(inView, prepared.ppSeqNo)
+
+    looper.run(eventually(chkOrdered, ordered, prepared.viewNo, retryWait=1,
+                          timeout=waits.expectedOrderingTime(
+                              len(newPrimary.replicas))))
+    waitForSufficientRepliesForRequests(looper, client1, requests=reqs)
+
+    newViewNo = ensure_view_change(looper, nodeSet, client1, wallet1)
+    for node in nodeSet:
+        node.resetDelays()
+    ensureElectionsDone(looper=looper, nodes=nodeSet)
+    assert get_master_primary_node(nodes) == newPrimary
+    looper.run(eventually(chkOrdered, nodes, newViewNo, retryWait=1,
+                          timeout=waits.expectedOrderingTime(
+                              len(newPrimary.replicas))))
+
+    reproposed = newPrimary.replicas[0].sentPrePrepares[newViewNo,
+                                                         prepared.ppSeqNo]
+    assert reproposed.digest == prepared.digest
+    for node in ordered:
+        assert not node.replicas[0].reorderedKeys
+    for node in nodeSet:
+        checkNodeDataForEquality(node, *[n for n in nodeSet if n != node])
+    sendReqsToNodesAndVerifySuffReplies(looper, wallet1, client1, 2)
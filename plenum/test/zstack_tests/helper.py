@@ -0,0 +1,61 @@
+import json
+
+from plenum.common.batched import Batched
+
+
+class FakeRemote:
+    def __init__(self, uid, name):
+        self.uid = uid
+        self.name = name
+
+
+class FakeZStack:
+    pingMessage = 'pi'
+    pongMessage = 'po'
+
+    @staticmethod
+    def serializeMsg(msg):
+        return json.dumps(msg).encode()
+
+    @staticmethod
+    def deserializeMsg(msg):
+        if isinstance(msg, bytes):
+            msg = msg.decode()
+        return json.loads(msg)
+
+
+class FakeStack(Batched, FakeZStack):
+    """
+    Batched with just enough of a stack to record what is transmitted
+    """
+    messageTimeout = None
+
+    def __init__(self, name, remoteNames=('Beta', )):
+        super().__init__()
+        self.name = name
+        self.allowDictOnly = False
+        self.remotes = {uid: FakeRemote(uid, remoteName)
+                        for uid, remoteName in enumerate(remoteNames, 1)}
+        # (remote id, payload) of every transmission
+        self.transmitted = []
+        # (message, sender) of every ping and pong received
+        self.pingPongs = []
+
+    def getRemote(self, name):
+        return next(r for r in self.remotes.values() if r.name == name)
+
+    def transmit(self, msg, uid, timeout=None, serialized=False):
+        self.transmitted.append((uid, msg))
+
+    def handlePingPong(self, msg, frm, ident):
+        if msg in (self.pingMessage, self.pongMessage):
+            self.pingPongs.append((msg, frm))
+            return True
+        return False
+
+    def payloadsTo(self, remoteName):
+        uid = self.getRemote(remoteName).uid
+        return [msg for rid, msg in self.transmitted if rid == uid]
+
+    def __repr__(self):
+        return self.name
@@ -0,0 +1,97 @@
+import json
+from collections import deque
+
+import pytest
+
+from plenum.common.batched import frameBatch, unframeBatch, \
+    isFramedBatch, FRAMED_BATCH_FORMAT, JSON_BATCH_FORMAT
+from plenum.common.constants import BATCH
+from plenum.common.types import OP_FIELD_NAME, f
+from plenum.test.zstack_tests.helper import FakeStack
+
+
+def fakeStack(batchFormat, maxBatchSize):
+    stack = FakeStack('Alpha')
+    stack.batchFormat = batchFormat
+    stack.maxBatchSize = maxBatchSize
+    return stack
+
+
+def serialized(i):
+    return json.dumps({OP_FIELD_NAME: 'TEST', 'i': i, 'd': 'x' * 10}).encode()
+
+
+def testFrameAndUnframeBatch():
+    msgs = [serialized(i) for i in range(5)] + [b'', b'{"a": "1:2"}']
+    data = frameBatch(msgs)
+    assert isFramedBatch(data)
+    assert isFramedBatch(data.decode())
+    assert not isFramedBatch(msgs[0])
+    unframed = unframeBatch(data)
+    assert all(isinstance(m, memoryview) for m in unframed)
+    assert [m.tobytes() for m in unframed] == msgs
+    assert [m.tobytes() for m in unframeBatch(data.decode())] == msgs
+
+
+def testUnframeMalformedBatch():
+    data = frameBatch([serialized(1), serialized(2)])
+    with pytest.raises(ValueError):
+        unframeBatch(data[:-1])
+    with pytest.raises(ValueError):
+        unframeBatch(b'#B9#' + data[4:])
+
+
+def testReceivingFramedBatch():
+    stack = fakeStack(FRAMED_BATCH_FORMAT, 1024)
+    msgs = [serialized(i) for i in range(3)]
+    batch = stack.deserializeMsg(frameBatch(msgs))
+    assert batch[OP_FIELD_NAME] == BATCH
+    assert [stack.deserializeMsg(m) for m in batch[f.MSGS.nm]] == \
+        [json.loads(m.decode()) for m in msgs]
+
+
+@pytest.mark.parametrize('batchFormat', [JSON_BATCH_FORMAT,
+                                         FRAMED_BATCH_FORMAT])
+def testBatchesSplitAtMaxSize(batchFormat):
+    msgs = [serialized(i) for i in range(10)]
+    size = len(msgs[0])
+    stack = fakeStack(batchFormat, 4 * size)
+    stack.outBoxes[1] = deque(msgs)
+    stack.flushOutBoxes()
+    assert not stack.outBoxes[1]
+    assert len(stack.transmitted) == 3
+
+    received = []
+    for payload in stack.payloadsTo('Beta'):
+        msg = stack.deserializeMsg(payload)
+        if msg.get(OP_FIELD_NAME) == BATCH:
+            received.extend(stack.deserializeMsg(m)
+                            for m in msg[f.MSGS.nm])
+        else:
+            received.append(msg)
+    assert [m['i'] for m in received] == list(range(10))
+
+
+def testMessageBiggerThanMaxSizeSentAlone():
+    stack = fakeStack(FRAMED_BATCH_FORMAT, 10)
+    msgs = [serialized(i) for i in range(2)]
+    stack.outBoxes[1] = deque(msgs)
+    stack.flushOutBoxes()
+    assert stack.payloadsTo('Beta') == msgs
+
+
+def testPingInFramedBatch():
+    """
+    Pings and pongs in a framed batch are handled by the stack and not
+    passed on with the other messages
+    """
+    stack = fakeStack(FRAMED_BATCH_FORMAT, 1024)
+    msgs = [serialized(1), b'pi', serialized(2), b'po']
+    batch = stack.deserializeMsg(frameBatch(msgs))
+    batch = stack.doProcessReceived(batch, 'Beta', None)
+    assert stack.pingPongs == [('pi', 'Beta'), ('po', 'Beta')]
+    assert [m.tobytes() for m in batch[f.MSGS.nm]] == \
+        [serialized(1), serialized(2)]
+
+    batch = stack.deserializeMsg(frameBatch([b'pi']))
+    assert stack.doProcessReceived(batch, 'Beta', None) is None
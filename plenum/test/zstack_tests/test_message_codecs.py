@@ -0,0 +1,186 @@
+import json
+import time
+
+import pytest
+
+from plenum.common.batched import FRAMED_BATCH_FORMAT
+from plenum.common.constants import PREPREPARE, PROPAGATE, CATCHUP_REP, \
+    CODECS, BATCH
+from plenum.common.message_codecs import JsonCodec, MsgPackCodec, \
+    availableCodecs, registerCodec, codecForPayload, JSON_CODEC, jsonKeys
+from plenum.common.types import OP_FIELD_NAME, f
+from stp_core.common.log import getlogger
+from plenum.test.zstack_tests.helper import FakeStack
+
+logger = getlogger()
+
+
+class MarkedJsonCodec(JsonCodec):
+    """
+    JSON with a marker, to test negotiation without optional dependencies
+    """
+    name = 'markedJson'
+    marker = b'#T'
+
+    def encode(self, msg):
+        return self.marker + super().encode(msg)
+
+    def decode(self, data):
+        return super().decode(data[len(self.marker):])
+
+
+@pytest.fixture(scope="module")
+def markedJsonCodec(request):
+    codec = MarkedJsonCodec()
+    registerCodec(codec)
+    request.addfinalizer(lambda: availableCodecs.pop(codec.name))
+    return codec
+
+
+def request(i):
+    return {
+        f.IDENTIFIER.nm: '4AdS22kC7xzb4bcqg9JATuCfAMNcQYcZa1u5eWzs6cSJ',
+        f.REQ_ID.nm: 1499000000000000 + i,
+        'operation': {'type': '1', 'dest': 'GEzcdDLhCpGCYRHW82kjHd',
+                      'verkey': '~HmUWn928bnFT6Ephf65YXv'},
+        f.SIG.nm: '4f5ZpAvsbVf7HgUPXKqSnBWPJk7ZwtWYnrBQG9v14aaeUX6HG1fpVD'
+                  'Rjf5TjZtXdEZC2jUG8kbYwD6JqnyvjoMxW'
+    }
+
+
+def messages():
+    prePrepare = {
+        OP_FIELD_NAME: PREPREPARE, f.INST_ID.nm: 0, f.VIEW_NO.nm: 0,
+        f.PP_SEQ_NO.nm: 7, f.PP_TIME.nm: 1499000000.123456,
+        f.REQ_IDR.nm: [[request(i)[f.IDENTIFIER.nm], request(i)[f.REQ_ID.nm]]
+                       for i in range(100)],
+        f.DISCARDED.nm: 100,
+        f.DIGEST.nm: 'f0b4b1ab5d5b7d6a52f1a2ea9d9f7bd54c0f5c3f3c1e5c1a8f2b1c'
+                     '9d3a2e1f0a',
+        f.LEDGER_ID.nm: 1,
+        f.STATE_ROOT.nm: 'DqQ7G4fgDHBfdfVLrE6DCdYyyED1fY5oKw76aQpGJbx5',
+        f.TXN_ROOT.nm: 'EKdEc6VoN9SAr7oX5xNMbHGSKLTbCnZvBzG8Ar5wNz1c'
+    }
+    propagate = {OP_FIELD_NAME: PROPAGATE, f.REQUEST.nm: request(0),
+                 f.SENDER_CLIENT.nm: 'ClientA'}
+    catchupRep = {
+        OP_FIELD_NAME: CATCHUP_REP, f.LEDGER_ID.nm: 1,
+        # Keyed by seqNo like `getAllTxn` gives them
+        f.TXNS.nm: {i: dict(request(i), seqNo=i, txnTime=1499000000)
+                    for i in range(1, 1001)},
+        f.CONS_PROOF.nm: ['Gj5ysXpAR4nzzFtkbyRh5JyCyeXTtfnWY3xT8yn9k6tu'] * 10
+    }
+    return [prePrepare, propagate, catchupRep]
+
+
+def testCodecsRoundTrip(markedJsonCodec):
+    for codec in availableCodecs.values():
+        for msg in messages():
+            encoded = codec.encode(msg)
+            # Encoded messages go through the stack as UTF-8 text
+            text = encoded.decode()
+            assert codecForPayload(text) is (None if codec == JSON_CODEC
+                                             else codec)
+            # Every codec decodes a message the same as JSON
+            expected = json.loads(json.dumps(msg))
+            assert codec.decode(text) == expected
+            assert codec.decode(encoded) == expected
+            assert codec.decode(memoryview(encoded)) == expected
+
+
+def testMsgPackRoundTrip():
+    pytest.importorskip('msgpack')
+    codec = availableCodecs[MsgPackCodec.name]
+    msg = {'ints': {1: 'a', 2.5: 'b', True: 'c', None: 'd'},
+           'text': 'ünïcödé', 'float': 1.5, 'list': [{3: 'e'}]}
+    assert codec.decode(codec.encode(msg).decode()) == \
+        json.loads(json.dumps(msg))
+
+
+def testJsonKeysDoesNotCopyStringKeyedMessages():
+    msg = messages()[0]
+    assert jsonKeys(msg) is msg
+
+
+def testCodecNegotiation(markedJsonCodec):
+    alpha = FakeStack('Alpha', ('Beta', 'Gamma'))
+    beta = FakeStack('Beta', ('Alpha', ))
+    gamma = FakeStack('Gamma', ('Alpha', ))
+    alpha.codecs = beta.codecs = [markedJsonCodec, JSON_CODEC]
+    # Gamma does not know the codec
+    gamma.codecs = [JSON_CODEC]
+
+    # As if Gamma supported the codec before being restarted
+    alpha.peerCodecs['Gamma'] = markedJsonCodec
+
+    alpha.advertiseCodecs('Beta')
+    alpha.advertiseCodecs('Gamma')
+    beta.advertiseCodecs('Alpha')
+    # A stack supporting only JSON advertises it too
+    gamma.advertiseCodecs('Alpha')
+    assert gamma.transmitted
+
+    for sender, receiver in ((alpha, beta), (beta, alpha), (gamma, alpha)):
+        for payload in sender.payloadsTo(receiver.name):
+            msg = receiver.deserializeMsg(payload)
+            assert msg[OP_FIELD_NAME] == CODECS
+            assert receiver.doProcessReceived(msg, sender.name, None) is None
+    assert alpha.peerCodecs == {'Beta': markedJsonCodec}
+    assert beta.peerCodecs == {'Alpha': markedJsonCodec}
+
+    alpha.transmitted.clear()
+    msg = messages()[1]
+    alpha.send(msg)
+    alpha.flushOutBoxes()
+    toBeta, = alpha.payloadsTo('Beta')
+    toGamma, = alpha.payloadsTo('Gamma')
+    assert codecForPayload(toBeta) == markedJsonCodec
+    assert codecForPayload(toGamma) is None
+    assert beta.deserializeMsg(toBeta.decode()) == msg
+    assert gamma.deserializeMsg(toGamma.decode()) == msg
+
+    # After a disconnection JSON is used till the codecs are advertised again
+    alpha.forgetCodecs('Beta')
+    alpha.transmitted.clear()
+    alpha.send(msg)
+    alpha.flushOutBoxes()
+    assert all(codecForPayload(p) is None for _, p in alpha.transmitted)
+
+
+def testMixedCodecsInFramedBatch(markedJsonCodec):
+    alpha = FakeStack('Alpha')
+    alpha.batchFormat = FRAMED_BATCH_FORMAT
+    alpha.peerCodecs['Beta'] = markedJsonCodec
+    msgs = messages()[:2]
+    for msg in msgs:
+        alpha.send(msg)
+    alpha.flushOutBoxes()
+    payload, = alpha.payloadsTo('Beta')
+    batch = alpha.deserializeMsg(payload.decode())
+    assert batch[OP_FIELD_NAME] == BATCH
+    assert [alpha.deserializeMsg(m) for m in batch[f.MSGS.nm]] == msgs
+
+
+def testCodecsBenchmark():
+    """
+    Encoding and decoding time and size of different types of messages for
+    every available codec
+    """
+    count = 20
+    for msg in messages():
+        for codec in availableCodecs.values():
+            if isinstance(codec, MarkedJsonCodec):
+                continue
+            start = time.perf_counter()
+            for _ in range(count):
+                encoded = codec.encode(msg)
+            encodeTime = (time.perf_counter() - start) / count
+            text = encoded.decode()
+            start = time.perf_counter()
+            for _ in range(count):
+                codec.decode(text)
+            decodeTime = (time.perf_counter() - start) / count
+            logger.info("{:>10} with {:>8}: {:>8} bytes, encoded in {:.6f} "
+                        "sec, decoded in {:.6f} sec".
+                        format(msg[OP_FIELD_NAME], codec.name, len(encoded),
+                               encodeTime, decodeTime))
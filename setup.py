@@ -62,9 +62,10 @@ setup(
                       'state-trie-dev==0.1.15', 'jsonpickle',
                       'prompt_toolkit==0.57', 'pygments',
                       'ioflo==1.5.4', 'semver', 'base58', 'orderedset',
-                      'sortedcontainers==1.5.7', 'psutil', 'pip'],
+                      'sortedcontainers==1.5.7', 'psutil', 'setuptools'],
     extras_require={
-        'stats': ['python-firebase']
+        'stats': ['python-firebase'],
+        'msgpack': ['msgpack>=0.5.2']
     },
     setup_requires=['pytest-runner'],
     tests_require=['pytest', 'pytest-xdist'],